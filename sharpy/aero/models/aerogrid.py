@@ -19,8 +19,9 @@ import scipy.interpolate
 
 import sharpy.utils.algebra as algebra
 import sharpy.utils.cout_utils as cout
-from sharpy.utils.datastructures import AeroTimeStepInfo
+from sharpy.utils.datastructures import AeroTimeStepInfo, copy_to_history
 import sharpy.utils.generator_interface as gen_interface
+import sharpy.aero.utils.mapping as mapping
 
 
 class Aerogrid(object):
@@ -45,6 +46,7 @@ class Aerogrid(object):
         self.airfoil_db = dict()
         self.struct2aero_mapping = None
         self.aero2struct_mapping = []
+        self.force_mapping = None
 
         self.n_node = 0
         self.n_elem = 0
@@ -178,11 +180,16 @@ class Aerogrid(object):
         for i_surf in range(self.n_surf):
             self.aero_dimensions_star[i_surf, 0] = self.aero_settings['mstar'].value
 
-    def add_timestep(self):
-        try:
-            self.timestep_info.append(self.timestep_info[-1].copy())
-        except IndexError:
-            self.timestep_info.append(self.ini_info.copy())
+    def add_timestep(self, tstep=None):
+        """
+        Appends a copy of ``tstep`` (by default, the latest time step) to ``timestep_info``.
+        """
+        if tstep is None:
+            try:
+                tstep = self.timestep_info[-1]
+            except IndexError:
+                tstep = self.ini_info
+        self.timestep_info.append(copy_to_history(tstep, self.timestep_info))
 
     def generate_zeta_timestep_info(self, structure_tstep, aero_tstep, beam, aero_settings, it=None, dt=None):
         if it is None:
@@ -387,6 +394,9 @@ class Aerogrid(object):
                         continue
                     self.aero2struct_mapping[i_surf][i_n] = i_global_node
 
+        # precomputed aero to structural force mapping operator
+        self.force_mapping = mapping.AeroStructForceMapping(self.struct2aero_mapping, self.beam.connectivities)
+
     def update_orientation(self, quat, ts=-1):
         rot = algebra.quat2rotation(quat)
         self.timestep_info[ts].update_orientation(rot.T)
@@ -53,62 +53,122 @@ def aero2struct_force_mapping(aero_forces,
         np.ndarray: structural forces in an ``n_node x 6`` vector
     """
 
-    n_node, _ = pos_def.shape
-    n_elem, _, _ = psi_def.shape
-    struct_forces = np.zeros((n_node, 6))
-
-    nodes = []
-
-    # load airfoil efficiency (if it exists); else set to one (to avoid multiple ifs in the loops)
-    force_efficiency = None
-    moment_efficiency = None
-    struct2aero_force_function = local_aero2struct_forces
-
-    if aero_dict is not None:
-        try:
-            airfoil_efficiency = aero_dict['airfoil_efficiency']
-            # force efficiency dimensions [n_elem, n_node_elem, 2, [fx, fy, fz]] - all defined in B frame
-            force_efficiency = np.zeros((n_elem, 3, 2, 3))
-            force_efficiency[:, :, :, 1] = airfoil_efficiency[:, :, :, 0]
-            force_efficiency[:, :, :, 2] = airfoil_efficiency[:, :, :, 1]
-
-            # moment efficiency dimensions [n_elem, n_node_elem, 2, [mx, my, mz]] - all defined in B frame
-            moment_efficiency = np.zeros_like(force_efficiency)
-            moment_efficiency[:, :, :, 0] = airfoil_efficiency[:, :, :, 2]
-
-            struct2aero_force_function = efficiency_local_aero2struct_forces
-
-        except KeyError:
-            pass
-
-    for i_elem in range(n_elem):
-        for i_local_node in range(3):
-
-            i_global_node = conn[i_elem, i_local_node]
-            if i_global_node in nodes:
-                continue
-
-            nodes.append(i_global_node)
-            for mapping in struct2aero_mapping[i_global_node]:
-                i_surf = mapping['i_surf']
-                i_n = mapping['i_n']
-                _, n_m, _ = aero_forces[i_surf].shape
-
-                crv = psi_def[i_elem, i_local_node, :]
-                cab = algebra.crv2rotation(crv)
-                cbg = np.dot(cab.T, cag)
-
-                for i_m in range(n_m):
-                    chi_g = zeta[i_surf][:, i_m, i_n] - np.dot(cag.T, pos_def[i_global_node, :])
-                    struct_forces[i_global_node, :] += struct2aero_force_function(aero_forces[i_surf][:, i_m, i_n],
-                                                                                  chi_g,
-                                                                                  cbg,
-                                                                                  force_efficiency,
-                                                                                  moment_efficiency,
-                                                                                  i_elem,
-                                                                                  i_local_node)
-
-    return struct_forces
+    force_mapping = AeroStructForceMapping(struct2aero_mapping, conn)
+    return force_mapping.map_forces(aero_forces, zeta, pos_def, psi_def, cag, aero_dict)
+
+
+class AeroStructForceMapping(object):
+    r"""
+    Precomputed operator mapping the aerodynamic forces at the lattice to the structural nodes.
+
+    The pairs of structural node and spanwise lattice section given by ``struct2aero_mapping`` are stored in index
+    arrays when the object is created, such that every call to :meth:`map_forces` is a batched array operation
+    equivalent to :func:`~sharpy.aero.utils.mapping.aero2struct_force_mapping`. Since the mapping is linear in the
+    vertex forces, these are first summed chordwise and then rotated to the ``B`` frame:
+
+    .. math::
+        \mathbf{f}_{struct}^B &= C^{BG}\sum\limits_{i=0}^{m+1}\mathbf{f}_{i,aero}^G \\
+        \mathbf{m}_{struct}^B &= C^{BG}\left(\sum\limits_{i=0}^{m+1}\mathbf{m}_{i,aero}^G +
+        \sum\limits_{i=0}^{m+1}\tilde{\boldsymbol{\zeta}}_i^G\mathbf{f}_{i, aero}^G -
+        \tilde{\mathbf{r}}^G\sum\limits_{i=0}^{m+1}\mathbf{f}_{i,aero}^G\right)
+
+    where :math:`\mathbf{r}^G` is the position of the structural node.
+
+    Args:
+        struct2aero_mapping (list): Structural to aerodynamic node mapping, as in
+          :attr:`sharpy.aero.models.aerogrid.Aerogrid.struct2aero_mapping`
+        conn (np.ndarray): Connectivities matrix
+    """
+    def __init__(self, struct2aero_mapping, conn):
+        i_node = []
+        i_elem = []
+        i_local_node = []
+        i_surf = []
+        i_n = []
+
+        # every node is mapped with the rotation of the first element in which it appears
+        nodes = set()
+        n_elem, n_node_elem = conn.shape
+        for elem in range(n_elem):
+            for local_node in range(n_node_elem):
+                global_node = conn[elem, local_node]
+                if global_node in nodes:
+                    continue
+                nodes.add(global_node)
+
+                for mapping in struct2aero_mapping[global_node]:
+                    i_node.append(global_node)
+                    i_elem.append(elem)
+                    i_local_node.append(local_node)
+                    i_surf.append(mapping['i_surf'])
+                    i_n.append(mapping['i_n'])
+
+        self.i_node = np.array(i_node, dtype=int)
+        self.i_elem = np.array(i_elem, dtype=int)
+        self.i_local_node = np.array(i_local_node, dtype=int)
+        self.i_surf = np.array(i_surf, dtype=int)
+        self.i_n = np.array(i_n, dtype=int)
+
+        # entries grouped by surface, such that the lattice arrays are sliced once per surface
+        self.surface_entries = [np.where(self.i_surf == surf)[0] for surf in np.unique(self.i_surf)]
+
+    def map_forces(self, aero_forces, zeta, pos_def, psi_def, cag=np.eye(3), aero_dict=None):
+        r"""
+        Maps the aerodynamic forces at the lattice to the structural nodes.
+
+        See :func:`~sharpy.aero.utils.mapping.aero2struct_force_mapping` for the description of the arguments.
+
+        Returns:
+            np.ndarray: structural forces in an ``n_node x 6`` vector
+        """
+        n_node, _ = pos_def.shape
+        struct_forces = np.zeros((n_node, 6))
+        n_entries = len(self.i_node)
+        if n_entries == 0:
+            return struct_forces
+
+        # chordwise sums of the forces, moments and moments of the forces around the origin
+        sum_forces = np.zeros((n_entries, 3))
+        sum_moments = np.zeros((n_entries, 3))
+        sum_zeta_cross_forces = np.zeros((n_entries, 3))
+        n_vertices = np.zeros((n_entries,))
+        for entries in self.surface_entries:
+            surf = self.i_surf[entries[0]]
+            section_forces = aero_forces[surf][:, :, self.i_n[entries]]
+            section_zeta = zeta[surf][:, :, self.i_n[entries]]
+            sum_forces[entries] = np.sum(section_forces[0:3], axis=1).T
+            sum_moments[entries] = np.sum(section_forces[3:6], axis=1).T
+            sum_zeta_cross_forces[entries] = np.sum(np.cross(section_zeta, section_forces[0:3], axis=0), axis=1).T
+            n_vertices[entries] = section_forces.shape[1]
+
+        # C^{BG} for every entry
+        cab = algebra.crv2rotation_vec(psi_def[self.i_elem, self.i_local_node, :])
+        cbg = np.matmul(np.transpose(cab, (0, 2, 1)), cag)
+
+        node_pos_g = np.dot(pos_def[self.i_node, :], cag)
+        moments_g = sum_moments + sum_zeta_cross_forces - np.cross(node_pos_g, sum_forces)
+
+        local_forces = np.zeros((n_entries, 6))
+        local_forces[:, 0:3] = np.matmul(cbg, sum_forces[:, :, None])[:, :, 0]
+        local_forces[:, 3:6] = np.matmul(cbg, moments_g[:, :, None])[:, :, 0]
+
+        if aero_dict is not None:
+            try:
+                airfoil_efficiency = aero_dict['airfoil_efficiency']
+            except KeyError:
+                pass
+            else:
+                # efficiency dimensions [n_entries, 2, [fx, fy, fz, mx, my, mz]] - all defined in B frame
+                # ``airfoil_efficiency`` only defines the fy, fz and mx factors, the rest of components are zeroed
+                efficiency = np.zeros((n_entries, 2, 6))
+                efficiency[:, :, 1] = airfoil_efficiency[self.i_elem, self.i_local_node, :, 0]
+                efficiency[:, :, 2] = airfoil_efficiency[self.i_elem, self.i_local_node, :, 1]
+                efficiency[:, :, 3] = airfoil_efficiency[self.i_elem, self.i_local_node, :, 2]
+                local_forces = local_forces*efficiency[:, 0, :] + n_vertices[:, None]*efficiency[:, 1, :]
+
+        np.add.at(struct_forces, self.i_node, local_forces)
+
+        return struct_forces
 
 
 def local_aero2struct_forces(local_aero_forces, chi_g, cbg, force_efficiency=None, moment_efficiency=None, i_elem=None,
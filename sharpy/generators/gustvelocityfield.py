@@ -38,6 +38,13 @@ def gust(arg):
 
 # @gust
 class BaseGust(metaclass=ABCMeta):
+    """
+    Base class for the gust profiles.
+
+    The ``gust_shape(x, y, z, time)`` method of every gust takes the coordinates either as scalars or as arrays of any
+    (common) shape and returns the velocity as an array of shape ``(3,) + x.shape``, such that a whole lattice is
+    evaluated in a single call.
+    """
 
     settings_types = dict()
     settings_default = dict()
@@ -100,11 +107,11 @@ class one_minus_cos(BaseGust):
         gust_length = self.settings['gust_length'].value
         gust_intensity = self.settings['gust_intensity'].value
 
-        vel = np.zeros((3,))
-        if x > 0.0 or x < -gust_length:
-            return vel
+        x = np.asarray(x, dtype=float)
+        vel = np.zeros((3,) + x.shape)
+        in_gust = (x <= 0.0) & (x >= -gust_length)
 
-        vel[2] = (1.0 - np.cos(2.0 * np.pi * x / gust_length)) * gust_intensity * 0.5
+        vel[2, in_gust] = (1.0 - np.cos(2.0 * np.pi * x[in_gust] / gust_length)) * gust_intensity * 0.5
         return vel
 
 
@@ -148,12 +155,12 @@ class DARPA(BaseGust):
         gust_intensity = self.settings['gust_intensity'].value
         span = self.settings['span'].value
 
-        vel = np.zeros((3,))
-        if x > 0.0 or x < -gust_length:
-            return vel
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        vel = np.zeros((3,) + x.shape)
+        in_gust = (x <= 0.0) & (x >= -gust_length)
 
-        vel[2] = (1.0 - np.cos(2.0 * np.pi * x / gust_length)) * gust_intensity * 0.5
-        vel[2] *= -np.cos(y / span * np.pi)
+        vel[2, in_gust] = (1.0 - np.cos(2.0 * np.pi * x[in_gust] / gust_length)) * gust_intensity * 0.5
+        vel[2, in_gust] *= -np.cos(y[in_gust] / span * np.pi)
         return vel
 
 
@@ -192,11 +199,11 @@ class continuous_sin(BaseGust):
         gust_length = self.settings['gust_length'].value
         gust_intensity = self.settings['gust_intensity'].value
 
-        vel = np.zeros((3,))
-        if x > 0.0:
-            return vel
+        x = np.asarray(x, dtype=float)
+        vel = np.zeros((3,) + x.shape)
+        in_gust = x <= 0.0
 
-        vel[2] = 0.5 * gust_intensity * np.sin(2 * np.pi * x / gust_length)
+        vel[2, in_gust] = 0.5 * gust_intensity * np.sin(2 * np.pi * x[in_gust] / gust_length)
         return vel
 
 
@@ -231,11 +238,11 @@ class lateral_one_minus_cos(BaseGust):
         gust_length = self.settings['gust_length'].value
         gust_intensity = self.settings['gust_intensity'].value
 
-        vel = np.zeros((3,))
-        if x > 0.0 or x < -gust_length:
-            return vel
+        x = np.asarray(x, dtype=float)
+        vel = np.zeros((3,) + x.shape)
+        in_gust = (x <= 0.0) & (x >= -gust_length)
 
-        vel[1] = (1.0 - np.cos(2.0 * np.pi * x / gust_length)) * gust_intensity * 0.5
+        vel[1, in_gust] = (1.0 - np.cos(2.0 * np.pi * x[in_gust] / gust_length)) * gust_intensity * 0.5
         return vel
 
 
@@ -274,14 +281,14 @@ class time_varying(BaseGust):
         self.file_info = np.loadtxt(self.settings['file'])
 
     def gust_shape(self, x, y, z, time=0):
-        vel = np.zeros((3,))
-        d = np.dot(np.array([x, y, z]), self.u_inf_direction)
-        if d > 0.0:
-            return vel
-
-        vel[0] = np.interp(d, -self.file_info[::-1, 0] * self.u_inf, self.file_info[::-1, 1])
-        vel[1] = np.interp(d, -self.file_info[::-1, 0] * self.u_inf, self.file_info[::-1, 2])
-        vel[2] = np.interp(d, -self.file_info[::-1, 0] * self.u_inf, self.file_info[::-1, 3])
+        d = x * self.u_inf_direction[0] + y * self.u_inf_direction[1] + z * self.u_inf_direction[2]
+        d = np.asarray(d, dtype=float)
+        vel = np.zeros((3,) + d.shape)
+        in_gust = d <= 0.0
+
+        vel[0, in_gust] = np.interp(d[in_gust], -self.file_info[::-1, 0] * self.u_inf, self.file_info[::-1, 1])
+        vel[1, in_gust] = np.interp(d[in_gust], -self.file_info[::-1, 0] * self.u_inf, self.file_info[::-1, 2])
+        vel[2, in_gust] = np.interp(d[in_gust], -self.file_info[::-1, 0] * self.u_inf, self.file_info[::-1, 3])
         return vel
 
 
@@ -319,7 +326,7 @@ class time_varying_global(BaseGust):
         self.file_info = np.loadtxt(self.settings['file'])
 
     def gust_shape(self, x, y, z, time=0):
-        vel = np.zeros((3,))
+        vel = np.zeros((3,) + np.shape(x))
 
         vel[0] = np.interp(time, self.file_info[:, 0], self.file_info[:, 1])
         vel[1] = np.interp(time, self.file_info[:, 0], self.file_info[:, 2])
@@ -374,14 +381,15 @@ class span_sine(BaseGust):
             self.settings['span_with_gust'] = self.settings['span']
 
     def gust_shape(self, x, y, z, time=0):
-        d = np.dot(np.array([x, y, z]), self.settings['span_dir'])
-        if np.abs(d) <= self.settings['span_with_gust'].value / 2:
-            vel = 0.5 * self.settings['gust_intensity'].value * np.sin(
-                d * 2. * np.pi / (self.settings['span'].value / self.settings['periods_per_span'].value))
-        else:
-            vel = np.zeros((3,))
+        span_dir = self.settings['span_dir']
+        d = np.asarray(x * span_dir[0] + y * span_dir[1] + z * span_dir[2], dtype=float)
+        in_gust = np.abs(d) <= self.settings['span_with_gust'].value / 2
+
+        vel = np.zeros(d.shape)
+        vel[in_gust] = 0.5 * self.settings['gust_intensity'].value * np.sin(
+            d[in_gust] * 2. * np.pi / (self.settings['span'].value / self.settings['periods_per_span'].value))
 
-        return vel * self.settings['perturbation_dir']
+        return np.multiply.outer(self.settings['perturbation_dir'], vel)
 
 
 @generator_interface.generator
@@ -490,17 +498,16 @@ class GustVelocityField(generator_interface.BaseGenerator):
             if override:
                 uext[i_surf].fill(0.0)
 
-            for i in range(zeta[i_surf].shape[1]):
-                for j in range(zeta[i_surf].shape[2]):
-                    total_offset_val = self.settings['offset'].value
-                    if self.settings['relative_motion']:
-                        uext[i_surf][:, i, j] += self.settings['u_inf'].value * self.settings['u_inf_direction']
-                        total_offset_val -= self.settings['u_inf'].value * t
-
-                    total_offset = total_offset_val * self.settings['u_inf_direction'] + for_pos
-                    uext[i_surf][:, i, j] += self.gust.gust_shape(
-                        zeta[i_surf][0, i, j] + total_offset[0],
-                        zeta[i_surf][1, i, j] + total_offset[1],
-                        zeta[i_surf][2, i, j] + total_offset[2],
-                        t
-                    )
+            total_offset_val = self.settings['offset'].value
+            if self.settings['relative_motion']:
+                uext[i_surf] += (self.settings['u_inf'].value * self.settings['u_inf_direction'])[:, None, None]
+                total_offset_val -= self.settings['u_inf'].value * t
+
+            # the whole surface is evaluated at once
+            total_offset = total_offset_val * self.settings['u_inf_direction'] + for_pos
+            uext[i_surf] += self.gust.gust_shape(
+                zeta[i_surf][0, :, :] + total_offset[0],
+                zeta[i_surf][1, :, :] + total_offset[1],
+                zeta[i_surf][2, :, :] + total_offset[2],
+                t
+            )
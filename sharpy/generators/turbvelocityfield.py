@@ -1,3 +1,5 @@
+import concurrent.futures
+import mmap
 import numpy as np
 import scipy.interpolate as interpolate
 import h5py as h5
@@ -76,6 +78,13 @@ class TurbVelocityField(generator_interface.BaseGenerator):
     settings_default['store_field'] = False
     settings_description['store_field'] = 'If ``True``, the xdmf snapshots are stored in memory. Only two at a time for the linear interpolation'
 
+    settings_types['prefetch'] = 'bool'
+    settings_default['prefetch'] = True
+    settings_description['prefetch'] = 'If ``True`` and the field is not ``frozen``, the next xdmf snapshot is read ' \
+                                       'in a background thread while the current one is in use. If the field is not ' \
+                                       'stored, the snapshot is read into the page cache of the operating system, ' \
+                                       'not into memory'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -105,6 +114,11 @@ class TurbVelocityField(generator_interface.BaseGenerator):
         self.vel_holder0 = 3*[None]
         self.vel_holder1 = 3*[None]
 
+        # background reading of the next snapshot
+        self._prefetch_executor = None
+        self._prefetch_it = -1
+        self._prefetch_future = None
+
     def initialise(self, in_dict):
         self.in_dict = in_dict
         settings.to_custom_types(self.in_dict, self.settings_types, self.settings_default)
@@ -352,27 +366,27 @@ class TurbVelocityField(generator_interface.BaseGenerator):
         if interpolator is None:
             interpolator = self.interpolator
 
-        for isurf in range(len(zeta)):
-            _, n_m, n_n = zeta[isurf].shape
-            for i_m in range(n_m):
-                for i_n in range(n_n):
-                    coord = self.g_2_gstar(self.apply_periodicity(zeta[isurf][:, i_m, i_n] + for_pos[0:3] + offset))
-                    for i_dim in range(3):
-                        try:
-                            u_ext[isurf][i_dim, i_m, i_n] = self.interpolator[i_dim](coord)
-                        except ValueError:
-                            print(coord)
-                            raise ValueError()
-                    u_ext[isurf][:, i_m, i_n] = self.gstar_2_g(u_ext[isurf][:, i_m, i_n])
+        # all the vertices of all the surfaces are interpolated at once
+        n_points = [zeta[isurf][0, :, :].size for isurf in range(len(zeta))]
+        coords = np.concatenate([zeta[isurf].reshape(3, -1) for isurf in range(len(zeta))], axis=1)
+        coords += (for_pos[0:3] + offset)[:, None]
+        coords = self.g_2_gstar(self.apply_periodicity(coords))
 
+        vel = np.zeros_like(coords)
+        for i_dim in range(3):
+            vel[i_dim, :] = interpolator[i_dim](coords.T)
+        vel = self.gstar_2_g(vel)
+
+        i_point = 0
+        for isurf in range(len(zeta)):
+            u_ext[isurf][:] = vel[:, i_point:i_point + n_points[isurf]].reshape(u_ext[isurf].shape)
+            i_point += n_points[isurf]
 
     @staticmethod
     def periodicity(x, bbox):
-        try:
-            new_x = bbox[0] + divmod(x - bbox[0], bbox[1] - bbox[0])[1]
-        except ZeroDivisionError:
-            new_x = x
-        return new_x
+        if bbox[1] == bbox[0]:
+            return x
+        return bbox[0] + np.mod(x - bbox[0], bbox[1] - bbox[0])
 
 
     def apply_periodicity(self, coord):
@@ -445,62 +459,106 @@ class TurbVelocityField(generator_interface.BaseGenerator):
         """
         This function returns an interpolator list of size 3 made of `scipy.interpolate.RegularGridInterpolator`
         objects.
+
+        If the snapshot has been prefetched, it is taken from the background thread. When reading the upper snapshot
+        (``i_cache == 1``) of a non ``frozen`` field, the reading of the following one is started in the background.
+        """
+        if i_cache not in [0, 1]:
+            raise ValueError('i_cache has to be 0 or 1')
+
+        if self._prefetch_future is not None and self._prefetch_it == i_grid:
+            vel_holder, interpolator = self._prefetch_future.result()
+        else:
+            vel_holder, interpolator = self.load_grid(i_grid)
+        self._prefetch_future = None
+        self._prefetch_it = -1
+
+        if i_cache == 0:
+            self.vel_holder0 = vel_holder
+        else:
+            self.vel_holder1 = vel_holder
+
+        if (i_cache == 1 and self.settings['prefetch'] and not self.settings['frozen'] and
+                i_grid + 1 < self.grid_data['n_grid']):
+            if self._prefetch_executor is None:
+                self._prefetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            self._prefetch_it = i_grid + 1
+            self._prefetch_future = self._prefetch_executor.submit(self.load_grid, self._prefetch_it, True)
+        elif i_cache == 1:
+            # there is nothing left to prefetch
+            self.finalise()
+
+        return interpolator
+
+    def finalise(self):
+        """
+        Stops the background reading of snapshots: the pending one, if any, is discarded and the thread is shut down.
+
+        It is called once the last snapshot has been read and at the end of the simulation. Snapshots requested
+        afterwards are read (and prefetched) as usual.
+        """
+        if self._prefetch_future is not None:
+            self._prefetch_future.cancel()
+        self._prefetch_future = None
+        self._prefetch_it = -1
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=True)
+            self._prefetch_executor = None
+
+    @staticmethod
+    def read_mapped(array):
+        """
+        Reads every page of the memory mapped ``array`` from disk without copying it, so that it is kept in the page
+        cache of the operating system.
+        """
+        flat_array = array.reshape(-1, order='A')
+        step = max(mmap.PAGESIZE // flat_array.itemsize, 1)
+        return np.sum(flat_array[::step])
+
+    def load_grid(self, i_grid, prefetch=False):
+        """
+        Reads the velocity snapshot ``i_grid`` and creates its interpolators. It does not modify the state of the
+        generator, so it can be run in a background thread.
+
+        If the field is not stored, the snapshot is only mapped and the file is read when the interpolators access it.
+        With ``prefetch``, the mapped file is read through once (see :meth:`read_mapped`), so that the later accesses
+        are served from the page cache.
+
+        Returns:
+            tuple: list of the 3 velocity component arrays and list of the corresponding interpolators
         """
         velocities = ['ux', 'uy', 'uz']
+        vel_holder = 3*[None]
         interpolator = list()
         for i_dim in range(3):
             file_name = self.grid_data['grid'][i_grid][velocities[i_dim]]['file']
-            if i_cache == 0:
-                if not self.settings['store_field']:
-                    # load file, but dont copy it
-                    self.vel_holder0[i_dim] = np.memmap(self.route + '/' + file_name,
-                                                   # dtype='float64',
-                                                   dtype=self.grid_data['grid'][i_grid][velocities[i_dim]]['Precision'],
-                                                   shape=(self.grid_data['dimensions'][2],
-                                                          self.grid_data['dimensions'][1],
-                                                          self.grid_data['dimensions'][0]),
-                                                   order='F')
-                else:
-                    # load and store file
-                    self.vel_holder0[i_dim] = (np.fromfile(open(self.route + '/' + file_name, 'rb'),
-                                                          dtype=self.grid_data['grid'][i_grid][velocities[i_dim]]['Precision']).\
-                                                          reshape((self.grid_data['dimensions'][2],
-                                                                   self.grid_data['dimensions'][1],
-                                                                   self.grid_data['dimensions'][0]),
-                                                                   order='F'))
-
-                interpolator.append(self.create_interpolator(self.vel_holder0[i_dim],
-                                                        self.grid_data['initial_x_grid'],
-                                                        self.grid_data['initial_y_grid'],
-                                                        self.grid_data['initial_z_grid'],
-                                                        i_dim=i_dim))
-            elif i_cache == 1:
-                if not self.settings['store_field']:
-                    # load file, but dont copy it
-                    self.vel_holder1[i_dim] = np.memmap(self.route + '/' + file_name,
-                                                   # dtype='float64',
-                                                   dtype=self.grid_data['grid'][i_grid][velocities[i_dim]]['Precision'],
-                                                   shape=(self.grid_data['dimensions'][2],
-                                                          self.grid_data['dimensions'][1],
-                                                          self.grid_data['dimensions'][0]),
-                                                   order='F')
-                else:
-                    # load and store file
-                    self.vel_holder1[i_dim] = (np.fromfile(open(self.route + '/' + file_name, 'rb'),
-                                                          dtype=self.grid_data['grid'][i_grid][velocities[i_dim]]['Precision']).\
-                                                          reshape((self.grid_data['dimensions'][2],
-                                                                   self.grid_data['dimensions'][1],
-                                                                   self.grid_data['dimensions'][0]),
-                                                                   order='F'))
-
-                interpolator.append(self.create_interpolator(self.vel_holder1[i_dim],
-                                                        self.grid_data['initial_x_grid'],
-                                                        self.grid_data['initial_y_grid'],
-                                                        self.grid_data['initial_z_grid'],
-                                                        i_dim=i_dim))
+            if not self.settings['store_field']:
+                # load file, but dont copy it
+                vel_holder[i_dim] = np.memmap(self.route + '/' + file_name,
+                                              # dtype='float64',
+                                              dtype=self.grid_data['grid'][i_grid][velocities[i_dim]]['Precision'],
+                                              shape=(self.grid_data['dimensions'][2],
+                                                     self.grid_data['dimensions'][1],
+                                                     self.grid_data['dimensions'][0]),
+                                              order='F')
+                if prefetch:
+                    self.read_mapped(vel_holder[i_dim])
             else:
-                raise Error('i_cache has to be 0 or 1')
-        return interpolator
+                # load and store file
+                with open(self.route + '/' + file_name, 'rb') as vel_file:
+                    vel_holder[i_dim] = (np.fromfile(vel_file,
+                                                     dtype=self.grid_data['grid'][i_grid][velocities[i_dim]]['Precision']).\
+                                                     reshape((self.grid_data['dimensions'][2],
+                                                              self.grid_data['dimensions'][1],
+                                                              self.grid_data['dimensions'][0]),
+                                                             order='F'))
+
+            interpolator.append(self.create_interpolator(vel_holder[i_dim],
+                                                         self.grid_data['initial_x_grid'],
+                                                         self.grid_data['initial_y_grid'],
+                                                         self.grid_data['initial_z_grid'],
+                                                         i_dim=i_dim))
+        return vel_holder, interpolator
 
     @staticmethod
     def g_2_gstar(coord_g):
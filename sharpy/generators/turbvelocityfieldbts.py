@@ -1,3 +1,5 @@
+import concurrent.futures
+
 import numpy as np
 import scipy.interpolate as interpolate
 
@@ -7,77 +9,82 @@ import sharpy.utils.cout_utils as cout
 
 
 def interp_rectgrid_vectorfield(points, grid, vector_field, out_value, regularGrid=False, num_cores=1):
-    # check: https://en.wikipedia.org/wiki/Trilinear_interpolation
+    r"""
+    Trilinear interpolation of a vector field defined on a rectilinear grid
+
+    The cell containing every point is found by direct indexing for regular grids or by binary search
+    (``np.searchsorted``) otherwise. The interpolation weights are then computed in closed form for all points at once.
+    See https://en.wikipedia.org/wiki/Trilinear_interpolation
+
+    Args:
+        points (np.ndarray): ``n_points x 3`` coordinates of the points where the field is interpolated
+        grid (tuple): ``(x_grid, y_grid, z_grid)`` sorted coordinates of the grid
+        vector_field (np.ndarray): ``3 x n_x x n_y x n_z`` values of the field at the grid points
+        out_value (np.ndarray): value assigned to the points outside the grid
+        regularGrid (bool): the grid is uniformly spaced in every direction
+        num_cores (int): number of threads among which the points are distributed
+
+    Returns:
+        np.ndarray: ``n_points x 3`` interpolated field
+    """
     npoints = points.shape[0]
     output = np.zeros((npoints, 3))
-    if regularGrid:
-        length = np.zeros((3))
-        npoints_grid = np.zeros((3), dtype=int)
-        delta = np.zeros((3))
-        for idim in range(3):
-            length[idim] = grid[idim][-1] - grid[idim][0]
-            npoints_grid[idim] = len(grid[idim])
-            delta[idim] = length[idim]/(npoints_grid[idim] - 1)
-
-    for ipoint in range(npoints):
-        # Check if the point is outside the box
-        isout = False
-        for idim in range(3):
-            if (points[ipoint, idim] > grid[idim][-1]) or (points[ipoint, idim] < grid[idim][0]):
-                isout = True
-                output[ipoint, :] = out_value
-                break
-
-        # If the point is in the grid
-        if not isout:
-            # Compute the position
-            igrid = np.zeros((3,), dtype=int)
-            if regularGrid:
-                for idim in range(3):
-                    igrid[idim] = int(np.ceil((points[ipoint, idim] - grid[idim][0])/delta[idim]))
-            else:
-                for idim in range(3):
-                    while points[ipoint, idim] >= grid[idim][igrid[idim]]:
-                        igrid[idim] += 1
-
-            xvec = np.array([grid[0][igrid[0] - 1],
-                             grid[0][igrid[0]    ]])
-            xvec = np.concatenate((xvec, xvec, xvec, xvec))
-            yvec = np.array([grid[1][igrid[1] - 1],
-                             grid[1][igrid[1] - 1],
-                             grid[1][igrid[1]    ],
-                             grid[1][igrid[1]    ]])
-            yvec = np.concatenate((yvec, yvec))
-            zvec = np.ones((8))
-            zvec[0:4] *= grid[2][igrid[2] - 1]
-            zvec[4:8] *= grid[2][igrid[2]    ]
-
-            A = np.zeros((8,8))
-            A[:, 0] = np.ones((8,))
-            A[:, 1] = xvec
-            A[:, 2] = yvec
-            A[:, 3] = zvec
-            A[:, 4] = xvec*yvec
-            A[:, 5] = xvec*zvec
-            A[:, 6] = yvec*zvec
-            A[:, 7] = xvec*yvec*zvec
-
-            Ainv = np.linalg.inv(A)
-            x = points[ipoint, 0]
-            y = points[ipoint, 1]
-            z = points[ipoint, 2]
-            for idim in range(3):
-                b = np.array([vector_field[idim, igrid[0] - 1, igrid[1] - 1, igrid[2] - 1],
-                              vector_field[idim, igrid[0]    , igrid[1] - 1, igrid[2] - 1],
-                              vector_field[idim, igrid[0] - 1, igrid[1]    , igrid[2] - 1],
-                              vector_field[idim, igrid[0]    , igrid[1]    , igrid[2] - 1],
-                              vector_field[idim, igrid[0] - 1, igrid[1] - 1, igrid[2]    ],
-                              vector_field[idim, igrid[0]    , igrid[1] - 1, igrid[2]    ],
-                              vector_field[idim, igrid[0] - 1, igrid[1]    , igrid[2]    ],
-                              vector_field[idim, igrid[0]    , igrid[1]    , igrid[2]    ]
-                             ])
-                f = np.dot(Ainv, b)
-                output[ipoint, idim] = f[0] + f[1]*x + f[2]*y + f[3]*z + f[4]*x*y + f[5]*x*z + f[6]*y*z + f[7]*x*y*z
+    output[:] = out_value
+
+    inside = np.ones((npoints,), dtype=bool)
+    for idim in range(3):
+        inside &= (points[:, idim] <= grid[idim][-1]) & (points[:, idim] >= grid[idim][0])
+    inside = np.where(inside)[0]
+
+    if num_cores > 1 and len(inside) > num_cores:
+        chunks = np.array_split(inside, num_cores)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_cores) as executor:
+            chunk_outputs = executor.map(
+                lambda chunk: trilinear_interpolation(points[chunk, :], grid, vector_field, regularGrid),
+                chunks)
+            for chunk, chunk_output in zip(chunks, chunk_outputs):
+                output[chunk, :] = chunk_output
+    elif len(inside) > 0:
+        output[inside, :] = trilinear_interpolation(points[inside, :], grid, vector_field, regularGrid)
+
+    return output
+
+
+def trilinear_interpolation(points, grid, vector_field, regularGrid=False):
+    """
+    Trilinear interpolation of ``vector_field`` at ``points``, all of which must lie inside the ``grid``.
+
+    See :func:`interp_rectgrid_vectorfield` for the description of the arguments.
+    """
+    npoints = points.shape[0]
+
+    # lower corner of the cell and local coordinates (in [0, 1]) within it
+    icell = np.zeros((npoints, 3), dtype=int)
+    local_coords = np.zeros((npoints, 3))
+    for idim in range(3):
+        npoints_grid = len(grid[idim])
+        if regularGrid:
+            delta = (grid[idim][-1] - grid[idim][0])/(npoints_grid - 1)
+            icell[:, idim] = np.floor((points[:, idim] - grid[idim][0])/delta)
+        else:
+            icell[:, idim] = np.searchsorted(grid[idim], points[:, idim], side='right') - 1
+        icell[:, idim] = np.clip(icell[:, idim], 0, npoints_grid - 2)
+
+        lower = grid[idim][icell[:, idim]]
+        upper = grid[idim][icell[:, idim] + 1]
+        local_coords[:, idim] = (points[:, idim] - lower)/(upper - lower)
+
+    ix, iy, iz = icell[:, 0], icell[:, 1], icell[:, 2]
+    tx, ty, tz = local_coords[:, 0], local_coords[:, 1], local_coords[:, 2]
+
+    output = np.zeros((npoints, 3))
+    for corner_x in range(2):
+        wx = tx if corner_x else 1. - tx
+        for corner_y in range(2):
+            wy = ty if corner_y else 1. - ty
+            for corner_z in range(2):
+                wz = tz if corner_z else 1. - tz
+                output += (wx*wy*wz)[:, None]*vector_field[:, ix + corner_x, iy + corner_y, iz + corner_z].T
 
     return output
 
@@ -129,6 +136,10 @@ class TurbVelocityFieldBts(generator_interface.BaseGenerator):
     settings_default['case_with_tower'] = False
     settings_description['case_with_tower'] = 'Does the SHARPy case will include the tower in the simulation?'
 
+    settings_types['num_cores'] = 'int'
+    settings_default['num_cores'] = 1
+    settings_description['num_cores'] = 'Number of threads used in the interpolation of the velocity field'
+
     setting_table = settings.SettingsTable()
     __doc__ += setting_table.generate(settings_types, settings_default, settings_description)
 
@@ -186,26 +197,24 @@ class TurbVelocityFieldBts(generator_interface.BaseGenerator):
         # if interpolator is None:
         #     interpolator = self.interpolator
 
+        # all the surfaces are interpolated at once
+        points_list = np.concatenate([zeta[isurf].reshape(3, -1) for isurf in range(len(zeta))], axis=1).T
+        points_list += for_pos[0:3] + offset
+
+        # Interpolate
+        list_uext = interp_rectgrid_vectorfield(points_list,
+                                                (self.x_grid, self.y_grid, self.z_grid),
+                                                self.vel,
+                                                self.settings['u_out'],
+                                                regularGrid=True,
+                                                num_cores=self.settings['num_cores'].value)
+
+        # Reorder the values
+        ipoint = 0
         for isurf in range(len(zeta)):
             _, n_m, n_n = zeta[isurf].shape
-
-            # Reorder the coordinates
-            points_list = np.zeros((n_m*n_n, 3))
-            ipoint = 0
-            for i_m in range(n_m):
-                for i_n in range(n_n):
-                    points_list[ipoint, :] = zeta[isurf][:, i_m, i_n] + for_pos[0:3] + offset
-                    ipoint += 1
-
-            # Interpolate
-            list_uext = interp_rectgrid_vectorfield(points_list, (self.x_grid, self.y_grid, self.z_grid), self.vel, self.settings['u_out'], regularGrid=True, num_cores=1)
-
-            # Reorder the values
-            ipoint = 0
-            for i_m in range(n_m):
-                for i_n in range(n_n):
-                    u_ext[isurf][:, i_m, i_n] = list_uext[ipoint, :]
-                    ipoint += 1
+            u_ext[isurf][:] = list_uext[ipoint:ipoint + n_m*n_n, :].T.reshape(3, n_m, n_n)
+            ipoint += n_m*n_n
 
     def read_turbsim_bts(self, fname):
 
@@ -25,6 +25,11 @@ class LinearAeroelastic(ss_interface.BaseElement):
     .. math:: \mathbf{y} = [\mathbf{y}_1;\, \mathbf{y}_2]
 
     Reference the individual systems for the particular ordering of the respective input and output variables.
+
+    If the ``LinearAssembler`` has a cache of linearised systems (see :mod:`sharpy.linear.utils.sscache`), the UVLM
+    system projected onto the structural degrees of freedom (and reduced, if a ROM is used) is stored in it together with
+    the coupling gains. When the same linearisation is found in the cache, the UVLM assembly and reduction are skipped,
+    as well as the computation of the induced velocities of the linearisation reference that the assembly requires.
     """
     sys_id = 'LinearAeroelastic'
 
@@ -63,6 +68,8 @@ class LinearAeroelastic(ss_interface.BaseElement):
         self.beam = None
 
         self.load_uvlm_from_file = False
+        self.load_uvlm_from_cache = False
+        self.cache = None
 
         self.settings = dict()
         self.state_variables = None
@@ -95,14 +102,22 @@ class LinearAeroelastic(ss_interface.BaseElement):
         if self.settings['use_euler']:
             self.settings['beam_settings']['use_euler'] = True
 
-        # Create Linear UVLM
-        self.uvlm = ss_interface.initialise_system('LinearUVLM')
-        self.uvlm.initialise(data, custom_settings=self.settings['aero_settings'])
+        self.cache = getattr(data.linear, 'cache', None)
+
         if self.settings['uvlm_filename'] == '':
-            self.uvlm.assemble(track_body=self.settings['track_body'])
+            if self.cache is not None and 'uvlm' in self.cache:
+                cout.cout_wrap('Projected UVLM system found in the linear system cache', 1)
+                self.load_uvlm_from_cache = True
         else:
             self.load_uvlm_from_file = True
 
+        # Create Linear UVLM
+        self.uvlm = ss_interface.initialise_system('LinearUVLM')
+        self.uvlm.initialise(data, custom_settings=self.settings['aero_settings'],
+                             get_velocities=not self.load_uvlm_from_cache)
+        if not self.load_uvlm_from_file and not self.load_uvlm_from_cache:
+            self.uvlm.assemble(track_body=self.settings['track_body'])
+
         # Create beam
         self.beam = ss_interface.initialise_system('LinearBeam')
         self.beam.initialise(data, custom_settings=self.settings['beam_settings'])
@@ -172,7 +187,15 @@ class LinearAeroelastic(ss_interface.BaseElement):
         else:
             beam.assemble()
 
-        if not self.load_uvlm_from_file:
+        if self.load_uvlm_from_cache:
+            Ksa, Kas = self.load_projected_uvlm()
+            self.couplings['Ksa'] = Ksa
+            self.couplings['Kas'] = Kas
+            if self.settings['beam_settings']['modal_projection'] == True and \
+                    self.settings['beam_settings']['inout_coords'] == 'modes':
+                out_mode_matrix = beam.sys.U.T
+
+        elif not self.load_uvlm_from_file:
             # Projecting the UVLM inputs and outputs onto the structural degrees of freedom
             Ksa = self.Kforces[:beam.sys.num_dof, :]  # maps aerodynamic grid forces to nodal forces
 
@@ -215,6 +238,9 @@ class LinearAeroelastic(ss_interface.BaseElement):
                     for k, rom in uvlm.rom.items():
                         uvlm.ss = rom.run(uvlm.ss)
 
+            if self.cache is not None:
+                self.save_projected_uvlm()
+
         else:
             uvlm.ss = self.load_uvlm(self.settings['uvlm_filename'])
 
@@ -256,6 +282,40 @@ class LinearAeroelastic(ss_interface.BaseElement):
 
         return ss
 
+    def save_projected_uvlm(self):
+        """
+        Stores the projected (and reduced) UVLM system and the gains required to rebuild the aeroelastic system and
+        to reconstruct the aerodynamic variables in the linear system cache.
+        """
+        self.cache.save_ss('uvlm', self.uvlm.ss)
+        self.cache.save_matrix('Ksa', self.couplings['Ksa'])
+        self.cache.save_matrix('Kas', self.couplings['Kas'])
+        self.cache.save_matrix('C_to_vertex_forces', self.uvlm.C_to_vertex_forces)
+        if self.uvlm.gust_assembler is not None:
+            self.cache.save_ss('ss_gust', self.uvlm.gust_assembler.ss_gust)
+        if self.uvlm.gain_cs is not None:
+            self.cache.save_matrix('gain_cs', self.uvlm.gain_cs)
+
+    def load_projected_uvlm(self):
+        """
+        Loads the projected (and reduced) UVLM system from the linear system cache. The input variables of the UVLM
+        are trimmed and the control surface gain restored as in :meth:`LinearUVLM.assemble`, so that the UVLM input
+        vector can be unpacked.
+
+        Returns:
+            tuple: aerodynamic forces to structural forces gain ``Ksa`` and structural to aerodynamic inputs gain
+            ``Kas``
+        """
+        self.uvlm.ss = self.cache.load_ss('uvlm')
+        self.uvlm.C_to_vertex_forces = self.cache.load_matrix('C_to_vertex_forces')
+        if self.uvlm.gust_assembler is not None:
+            self.uvlm.gust_assembler.ss_gust = self.cache.load_ss('ss_gust')
+        if self.uvlm.settings['remove_inputs']:
+            self.uvlm.input_variables.remove(self.uvlm.settings['remove_inputs'])
+        if self.uvlm.control_surface is not None:
+            self.uvlm.gain_cs = self.cache.load_matrix('gain_cs')
+        return self.cache.load_matrix('Ksa'), self.cache.load_matrix('Kas')
+
     def update(self, u_infty):
         """
         Updates the aeroelastic scaled system with the new reference velocity.
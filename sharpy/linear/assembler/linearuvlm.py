@@ -122,6 +122,11 @@ class LinearUVLM(ss_interface.BaseElement):
     settings_description['rom_method_settings'] = 'Dictionary with settings for the desired ROM methods, ' \
                                                   'where the name of the ROM method is the key to the dictionary'
 
+    settings_types['num_cores'] = 'int'
+    settings_default['num_cores'] = 1
+    settings_description['num_cores'] = 'Number of processes used to assemble the aerodynamic influence coefficient ' \
+                                        'matrices and derivatives of each (pair of) surfaces'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
@@ -165,7 +170,16 @@ class LinearUVLM(ss_interface.BaseElement):
 
         self.linearisation_vectors = dict()  # reference conditions at the linearisation
 
-    def initialise(self, data, custom_settings=None):
+    def initialise(self, data, custom_settings=None, get_velocities=True):
+        """
+        Initialises the linear UVLM about the linearisation reference.
+
+        Args:
+            data (sharpy.presharpy.PreSharpy): SHARPy data
+            custom_settings (dict): settings of the system. Taken from the ``LinearAssembler`` settings if ``None``.
+            get_velocities (bool): compute the induced velocities required by :meth:`assemble`. Only ``False`` if the
+                assembled system is not needed, such as when it is loaded from the linear system cache.
+        """
 
         if custom_settings:
             self.settings = custom_settings
@@ -190,7 +204,8 @@ class LinearUVLM(ss_interface.BaseElement):
         uvlm = linuvlm.Dynamic(data.linear.tsaero0,
                                dt=None,
                                dynamic_settings=self.settings,
-                               for_vel=np.hstack((cga.dot(for_vel[:3]), cga.dot(for_vel[3:]))))
+                               for_vel=np.hstack((cga.dot(for_vel[:3]), cga.dot(for_vel[3:]))),
+                               get_velocities=get_velocities)
 
         self.tsaero0 = data.linear.tsaero0
         self.sys = uvlm
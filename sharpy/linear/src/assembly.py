@@ -13,15 +13,30 @@ Includes:
           multi-surfaces configurations
         - ``uc_dncdzeta``: assemble derivative matrix dnc/dzeta*Uc at bound collocation
           points
+
+    - Compression of the wake influence (see ``lowrank``):
+        - ``AICs_compressed`` and ``dfqsdvind_gamma_compressed``: as ``AICs`` and
+          ``dfqsdvind_gamma``, with the far wake blocks in low-rank form.
+
+The blocks associated to each output surface (or pair of surfaces) are independent. ``AICs``, ``nc_dqcdzeta``,
+``dfqsdvind_gamma`` and ``dfqsdvind_zeta`` can compute them in a pool of ``num_processes`` processes, which write into
+output arrays in shared memory. The blocks are computed by the same serial code, so that the results are identical.
 """
 
+import functools
+import itertools
+import mmap
+import multiprocessing
+
 import numpy as np
 import scipy.sparse as sparse
-import itertools
 
 from sharpy.aero.utils.uvlmlib import dvinddzeta_cpp, eval_panel_cpp
+import sharpy.linear.src.gridmapping as gridmapping
 import sharpy.linear.src.libsparse as libsp
 import sharpy.linear.src.lib_dbiot as dbiot
+import sharpy.linear.src.lowrank as lowrank
+import sharpy.linear.src.surface as surface
 import sharpy.linear.src.lib_ucdncdzeta as lib_ucdncdzeta
 import sharpy.utils.algebra as algebra
 
@@ -32,8 +47,60 @@ svec = [0, 1, 2, 3]  # seg. no.
 avec = [0, 1, 2, 3]  # 1st vertex no.
 bvec = [1, 2, 3, 0]  # 2nd vertex no.
 
+# tasks of the pool in run_blocks, inherited by the forked processes
+_parallel_tasks = None
+
+
+def _run_parallel_task(ii):
+    _parallel_tasks[ii]()
+
+
+def run_blocks(tasks, num_processes=1):
+    """
+    Runs the list of ``tasks`` (callables without arguments), in a pool of ``num_processes`` forked processes if
+    ``num_processes > 1``.
+
+    The tasks of the pool do not return anything: they must write their results into arrays allocated with
+    ``shared_zeros(..., shared=True)`` before the call. The tasks are run serially if processes cannot be forked.
+    """
+    global _parallel_tasks
+
+    num_processes = min(num_processes, len(tasks))
+    if num_processes < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        for task in tasks:
+            task()
+        return
+
+    _parallel_tasks = tasks
+    try:
+        with multiprocessing.get_context('fork').Pool(num_processes) as pool:
+            pool.map(_run_parallel_task, range(len(tasks)), chunksize=1)
+    finally:
+        _parallel_tasks = None
+
 
-def AICs(Surfs, Surfs_star, target='collocation', Project=True):
+def shared_zeros(shape, shared=False):
+    """
+    Returns an array of zeros of ``shape``. If ``shared``, the array is allocated in anonymous shared memory, such
+    that it can be written by the processes forked in ``run_blocks``.
+    """
+    if not shared:
+        return np.zeros(shape)
+    size = int(np.prod(shape))
+    buffer = mmap.mmap(-1, max(size, 1) * np.dtype(np.float64).itemsize)
+    return np.frombuffer(buffer, dtype=np.float64, count=size).reshape(shape)
+
+
+def _prepare_target_surfaces(Surfs):
+    # geometry generated on demand by the forked processes would not be kept in the parent
+    for Surf in Surfs:
+        if not hasattr(Surf, 'zetac'):
+            Surf.generate_collocations()
+        if not hasattr(Surf, 'normals'):
+            Surf.generate_normals()
+
+
+def AICs(Surfs, Surfs_star, target='collocation', Project=True, num_processes=1):
     """
     Given a list of bound (Surfs) and wake (Surfs_star) instances of
     surface.AeroGridSurface, returns the list of AIC matrices in the format:
@@ -41,6 +108,8 @@ def AICs(Surfs, Surfs_star, target='collocation', Project=True):
         Surfs[ii].
         - AIC_star_list[ii][jj] contains the AIC from the wake surface Surfs[jj]
         to Surfs[ii].
+
+    If ``num_processes > 1``, the blocks of each pair of surfaces are computed in parallel.
     """
 
     AIC_list = []
@@ -50,6 +119,21 @@ def AICs(Surfs, Surfs_star, target='collocation', Project=True):
     assert len(Surfs_star) == n_surf, \
         'Number of bound and wake surfaces much be equal'
 
+    if num_processes > 1:
+        _prepare_target_surfaces(Surfs)
+        tasks = []
+        for ss_out in range(n_surf):
+            AIC_list.append([])
+            AIC_star_list.append([])
+            for ss_in in range(n_surf):
+                for Surf_in, AIC_list_here in zip((Surfs[ss_in], Surfs_star[ss_in]),
+                                                  (AIC_list[ss_out], AIC_star_list[ss_out])):
+                    AIC = shared_zeros(aic_shape(Surf_in, Surfs[ss_out], target, Project), shared=True)
+                    AIC_list_here.append(AIC)
+                    tasks.append(functools.partial(_aic_block, AIC, Surf_in, Surfs[ss_out], target, Project))
+        run_blocks(tasks, num_processes)
+        return AIC_list, AIC_star_list
+
     for ss_out in range(n_surf):
         AIC_list_here = []
         AIC_star_list_here = []
@@ -70,6 +154,92 @@ def AICs(Surfs, Surfs_star, target='collocation', Project=True):
     return AIC_list, AIC_star_list
 
 
+def aic_shape(Surf_in, Surf_out, target='collocation', Project=True):
+    """
+    Shape of the AIC matrix returned by ``Surf_in.get_aic_over_surface(Surf_out, target, Project)``.
+    """
+    K_in = Surf_in.maps.K
+    if target == 'segments':
+        return 3, K_in, 4, Surf_out.maps.M, Surf_out.maps.N
+    if Project:
+        return Surf_out.maps.K, K_in
+    return 3, Surf_out.maps.K, K_in
+
+
+def _aic_block(AIC, Surf_in, Surf_out, target, Project):
+    AIC[...] = Surf_in.get_aic_over_surface(Surf_out, target=target, Project=Project)
+
+
+def wake_chunks(M_star, near_field_rows):
+    """
+    Returns the chordwise ranges of wake panel rows ``(m_start, m_end)`` in which the wake is split for compression.
+
+    The first ``near_field_rows`` rows are the near field. The following chunks double in length, such that each is as
+    long as its distance from the trailing edge.
+    """
+    chunks = []
+    if near_field_rows > 0:
+        chunks.append((0, min(near_field_rows, M_star)))
+    m_start = chunks[-1][1] if chunks else 0
+    length = max(near_field_rows, 1)
+    while m_start < M_star:
+        m_end = min(m_start + length, M_star)
+        chunks.append((m_start, m_end))
+        m_start = m_end
+        length *= 2
+    return chunks
+
+
+def wake_sub_surface(Surf_star, m_start, m_end):
+    """
+    Returns the rows ``m_start:m_end`` of the wake ``Surf_star`` as a surface. Its panels are the columns
+    ``m_start * N:m_end * N`` of the influence coefficient matrices of ``Surf_star``.
+    """
+    return surface.AeroGridSurface(gridmapping.AeroGridMap(m_end - m_start, Surf_star.maps.N),
+                                   np.ascontiguousarray(Surf_star.zeta[:, m_start:m_end + 1, :]),
+                                   Surf_star.gamma[m_start:m_end, :],
+                                   rho=Surf_star.rho)
+
+
+def AICs_compressed(Surfs, Surfs_star, tol=1e-6, near_field_rows=4):
+    """
+    As ``AICs`` (at the collocation points, projected), but the wake AICs are returned as a single
+    ``lowrank.BlockLowRankMatrix`` equal to ``np.block(AIC_star_list)``.
+
+    The wakes are split as per ``wake_chunks``: the near field blocks are dense, while the far field ones are stored
+    in low-rank form if accurate to the relative tolerance ``tol``. The dense AICs are only computed one chunk at a
+    time.
+
+    Returns:
+        tuple: ``AIC_list``, as per ``AICs``, and the compressed wake AIC matrix.
+    """
+
+    n_surf = len(Surfs)
+    assert len(Surfs_star) == n_surf, \
+        'Number of bound and wake surfaces much be equal'
+
+    K = sum([Surf.maps.K for Surf in Surfs])
+    K_star = sum([Surf.maps.K for Surf in Surfs_star])
+
+    AIC_list = []
+    AIC_star = lowrank.BlockLowRankMatrix((K, K_star))
+    row = 0
+    for Surf_out in Surfs:
+        AIC_list.append([Surf_in.get_aic_over_surface(Surf_out) for Surf_in in Surfs])
+
+        col = 0
+        for Surf_star in Surfs_star:
+            N_star = Surf_star.maps.N
+            for m_start, m_end in wake_chunks(Surf_star.maps.M, near_field_rows):
+                AIC = wake_sub_surface(Surf_star, m_start, m_end).get_aic_over_surface(Surf_out)
+                AIC_star.add_block(row, col + m_start * N_star, AIC,
+                                   tol=tol if m_start >= near_field_rows else None)
+            col += Surf_star.maps.K
+        row += Surf_out.maps.K
+
+    return AIC_list, AIC_star
+
+
 def nc_dqcdzeta_Sin_to_Sout(Surf_in, Surf_out, Der_coll, Der_vert, Surf_in_bound):
     """
     Computes derivative matrix of
@@ -154,7 +324,7 @@ def nc_dqcdzeta_Sin_to_Sout(Surf_in, Surf_out, Der_coll, Der_vert, Surf_in_bound
     return Der_coll, Der_vert
 
 
-def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
+def nc_dqcdzeta(Surfs, Surfs_star, Merge=False, num_processes=1):
     r"""
     Produces a list of derivative matrix
 
@@ -175,6 +345,8 @@ def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
     If ``Merge`` is ``True``, the derivatives due to collocation points movement are added
     to ``Dvert`` to minimise storage space.
 
+    If ``num_processes > 1``, the derivatives of each output surface are computed in parallel.
+
     To do:
 
         - Dcoll is highly sparse, exploit?
@@ -184,8 +356,13 @@ def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
     assert len(Surfs_star) == n_surf, \
         'Number of bound and wake surfaces much be equal'
 
+    shared = num_processes > 1
+    if shared:
+        _prepare_target_surfaces(Surfs)
+
     DAICcoll = []
     DAICvert = []
+    tasks = []
 
     ### loop output (bound) surfaces
     for ss_out in range(n_surf):
@@ -197,41 +374,43 @@ def nc_dqcdzeta(Surfs, Surfs_star, Merge=False):
 
         # derivatives w.r.t collocation points: all the in surface scanned will
         # manipulate this matrix, as the collocation points are on Surf_out
-        Dcoll = np.zeros((K_out, 3 * Kzeta_out))
+        DAICcoll.append(shared_zeros((K_out, 3 * Kzeta_out), shared))
         # derivatives w.r.t. panel coordinates will affect dof on bound Surf_in
         # (not wakes)
-        DAICvert_sub = []
-
-        # loop input surfaces:
-        for ss_in in range(n_surf):
-            ##### bound
-            Surf_in = Surfs[ss_in]
-            Kzeta_in = Surf_in.maps.Kzeta
+        DAICvert.append([shared_zeros((K_out, 3 * Surfs[ss_in].maps.Kzeta), shared) for ss_in in range(n_surf)])
 
-            # compute terms
-            Dvert = np.zeros((K_out, 3 * Kzeta_in))
-            Dcoll, Dvert = nc_dqcdzeta_Sin_to_Sout(
-                Surf_in, Surf_out, Dcoll, Dvert, Surf_in_bound=True)
-
-            ##### wake:
-            Surf_in = Surfs_star[ss_in]
-            Dcoll, Dvert = nc_dqcdzeta_Sin_to_Sout(
-                Surf_in, Surf_out, Dcoll, Dvert, Surf_in_bound=False)
-            DAICvert_sub.append(Dvert)
-
-        if Merge:
-            DAICvert_sub[ss_out] += Dcoll
-            DAICvert.append(DAICvert_sub)
-        else:
-            DAICcoll.append(Dcoll)
-            DAICvert.append(DAICvert_sub)
+        tasks.append(functools.partial(_nc_dqcdzeta_Sout, Surfs, Surfs_star, ss_out,
+                                       DAICcoll[ss_out], DAICvert[ss_out]))
+    run_blocks(tasks, num_processes)
 
     if Merge:
+        for ss_out in range(n_surf):
+            DAICvert[ss_out][ss_out] += DAICcoll[ss_out]
         return DAICvert
     else:
         return DAICcoll, DAICvert
 
 
+def _nc_dqcdzeta_Sout(Surfs, Surfs_star, ss_out, Dcoll, DAICvert_sub):
+    """
+    Fills the derivatives ``Dcoll`` and ``DAICvert_sub`` of ``nc_dqcdzeta`` over the output surface ``ss_out``.
+    """
+    Surf_out = Surfs[ss_out]
+
+    # loop input surfaces:
+    for ss_in in range(len(Surfs)):
+        ##### bound
+        Surf_in = Surfs[ss_in]
+        Dvert = DAICvert_sub[ss_in]
+
+        # compute terms
+        nc_dqcdzeta_Sin_to_Sout(Surf_in, Surf_out, Dcoll, Dvert, Surf_in_bound=True)
+
+        ##### wake:
+        Surf_in = Surfs_star[ss_in]
+        nc_dqcdzeta_Sin_to_Sout(Surf_in, Surf_out, Dcoll, Dvert, Surf_in_bound=False)
+
+
 # end
 
 def nc_domegazetadzeta(Surfs, Surfs_star):
@@ -368,12 +547,16 @@ def uc_dncdzeta(Surf):
     return Der
 
 
-def dfqsdgamma_vrel0(Surfs, Surfs_star):
+def dfqsdgamma_vrel0(Surfs, Surfs_star, wake_te_only=False):
     """
     Assemble derivative of quasi-steady force w.r.t. gamma with fixed relative
     velocity - the changes in induced velocities due to gamma are not accounted
     for. The routine exploits the get_joukovski_qs method insude the
     AeroGridSurface class
+
+    Only the first row of wake panels, at the trailing edge, contributes to the
+    derivatives w.r.t. the wake gamma. If ``wake_te_only``, these are returned
+    for the first row only, i.e. with ``N`` columns.
     """
 
     Der_list = []
@@ -439,7 +622,10 @@ def dfqsdgamma_vrel0(Surfs, Surfs_star):
         K_star = Surfs_star[ss].maps.K
         shape_in = Surfs_star[ss].maps.shape_pan_scal  # (M_star,N_star)
 
-        Der_star = np.zeros((3 * Kzeta, K_star))
+        if wake_te_only:
+            Der_star = np.zeros((3 * Kzeta, N_star))
+        else:
+            Der_star = np.zeros((3 * Kzeta, K_star))
 
         assert N == N_star, \
             'trying to associate wrong wake to current bound surface!'
@@ -720,11 +906,13 @@ def dfqsdzeta_omega(Surfs, Surfs_star):
     return Der_list
 
 
-def dfqsdvind_gamma(Surfs, Surfs_star):
+def dfqsdvind_gamma(Surfs, Surfs_star, num_processes=1):
     """
     Assemble derivative of quasi-steady force w.r.t. induced velocities changes
     due to gamma.
     Note: the routine is memory consuming but avoids unnecessary computations.
+
+    If ``num_processes > 1``, the derivatives of each output surface are computed in parallel.
     """
 
     n_surf = len(Surfs)
@@ -734,109 +922,154 @@ def dfqsdvind_gamma(Surfs, Surfs_star):
     ### compute all influence coeff matrices (high RAM, low CPU)
     # AIC_list,AIC_star_list=AICs(Surfs,Surfs_star,target='segments',Project=False)
 
+    shared = num_processes > 1
     Der_list = []
     Der_star_list = []
+    tasks = []
     for ss_out in range(n_surf):
-
-        Surf_out = Surfs[ss_out]
-        M_out, N_out = Surf_out.maps.M, Surf_out.maps.N
-        K_out = Surf_out.maps.K
-        Kzeta_out = Surf_out.maps.Kzeta
-        shape_fqs = Surf_out.maps.shape_vert_vect  # (3,M+1,N+1)
-
-        # get AICs over Surf_out
-        AICs = []
-        AICs_star = []
-        for ss_in in range(n_surf):
-            AICs.append(Surfs[ss_in].get_aic_over_surface(
-                Surf_out, target='segments', Project=False))
-            AICs_star.append(Surfs_star[ss_in].get_aic_over_surface(
-                Surf_out, target='segments', Project=False))
+        Kzeta_out = Surfs[ss_out].maps.Kzeta
 
         # allocate all derivative matrices
-        Der_list_sub = []
-        Der_star_list_sub = []
-        for ss_in in range(n_surf):
-            # bound
-            K_in = Surfs[ss_in].maps.K
-            Der_list_sub.append(np.zeros((3 * Kzeta_out, K_in)))
-            # wake
-            K_in = Surfs_star[ss_in].maps.K
-            Der_star_list_sub.append(np.zeros((3 * Kzeta_out, K_in)))
-
-        ### loop bound panels
-        for pp_out in range(K_out):
-            # get (m,n) indices of panel
-            mm_out = Surf_out.maps.ind_2d_pan_scal[0][pp_out]
-            nn_out = Surf_out.maps.ind_2d_pan_scal[1][pp_out]
-            # get panel vertices
-            # zetav_here=Surf_out.get_panel_vertices_coords(mm_out,nn_out)
-            zetav_here = Surf_out.zeta[:, [mm_out + 0, mm_out + 1, mm_out + 1, mm_out + 0],
-                         [nn_out + 0, nn_out + 0, nn_out + 1, nn_out + 1]].T
+        Der_list.append([shared_zeros((3 * Kzeta_out, Surfs[ss_in].maps.K), shared) for ss_in in range(n_surf)])
+        Der_star_list.append([shared_zeros((3 * Kzeta_out, Surfs_star[ss_in].maps.K), shared)
+                              for ss_in in range(n_surf)])
 
-            for ll, aa, bb in zip(svec, avec, bvec):
+        tasks.append(functools.partial(_dfqsdvind_gamma_Sout, Surfs, Surfs_star, ss_out,
+                                       Der_list[ss_out], Der_star_list[ss_out]))
+    run_blocks(tasks, num_processes)
 
-                # get segment
-                lv = zetav_here[bb, :] - zetav_here[aa, :]
-                Lskew = algebra.skew((-0.5 * Surf_out.rho * Surf_out.gamma[mm_out, nn_out]) * lv)
+    return Der_list, Der_star_list
 
-                # get vertices m,n indices
-                mm_a, nn_a = mm_out + dmver[aa], nn_out + dnver[aa]
-                mm_b, nn_b = mm_out + dmver[bb], nn_out + dnver[bb]
 
-                # get vertices 1d index
-                ii_a = [np.ravel_multi_index(
-                    (cc, mm_a, nn_a), shape_fqs) for cc in range(3)]
-                ii_b = [np.ravel_multi_index(
-                    (cc, mm_b, nn_b), shape_fqs) for cc in range(3)]
+def _dfqsdvind_gamma_Sout(Surfs, Surfs_star, ss_out, Der_list_sub, Der_star_list_sub):
+    """
+    Fills the derivatives ``Der_list_sub`` and ``Der_star_list_sub`` of ``dfqsdvind_gamma`` over the output surface
+    ``ss_out``.
+    """
+    dfqsdvind_gamma_Sin_to_Sout(Surfs + Surfs_star, Surfs[ss_out], Surfs_star[ss_out].gamma[0, :],
+                                Der_list_sub + Der_star_list_sub)
 
-                # update all derivatives
-                for ss_in in range(n_surf):
-                    # derivatives: size (3,K_in)
-                    Dfs = np.dot(Lskew, AICs[ss_in][:, :, ll, mm_out, nn_out])
-                    Dfs_star = np.dot(Lskew, AICs_star[ss_in][:, :, ll, mm_out, nn_out])
-                    # allocate
-                    Der_list_sub[ss_in][ii_a, :] += Dfs
-                    Der_list_sub[ss_in][ii_b, :] += Dfs
-                    Der_star_list_sub[ss_in][ii_a, :] += Dfs_star
-                    Der_star_list_sub[ss_in][ii_b, :] += Dfs_star
-
-        ### loop again trailing edge
-        # here we add the Gammaw_0*rho*skew(lv)*dvind/dgamma contribution hence:
-        # - we use Gammaw_0 over the TE
-        # - we run along the positive direction as defined in the first row of
-        # wake panels
-        for nn_out in range(N_out):
 
-            # get TE bound vertices m,n indices
-            nn_a = nn_out + dnver[2]
-            nn_b = nn_out + dnver[1]
+def dfqsdvind_gamma_Sin_to_Sout(Surfs_in, Surf_out, gammaw_TE, Der_list):
+    """
+    Adds to the matrices in ``Der_list``, of size ``(3*Kzeta_out, K_in)``, the derivatives of the quasi-steady force
+    on ``Surf_out`` w.r.t. induced velocities changes due to the gamma of each (bound or wake) surface in
+    ``Surfs_in``. ``gammaw_TE`` is the circulation of the first row of panels of the wake of ``Surf_out``.
+    """
+
+    M_out, N_out = Surf_out.maps.M, Surf_out.maps.N
+    K_out = Surf_out.maps.K
+    shape_fqs = Surf_out.maps.shape_vert_vect  # (3,M+1,N+1)
+
+    # get AICs over Surf_out
+    AICs = []
+    for Surf_in in Surfs_in:
+        AICs.append(Surf_in.get_aic_over_surface(
+            Surf_out, target='segments', Project=False))
+
+    ### loop bound panels
+    for pp_out in range(K_out):
+        # get (m,n) indices of panel
+        mm_out = Surf_out.maps.ind_2d_pan_scal[0][pp_out]
+        nn_out = Surf_out.maps.ind_2d_pan_scal[1][pp_out]
+        # get panel vertices
+        # zetav_here=Surf_out.get_panel_vertices_coords(mm_out,nn_out)
+        zetav_here = Surf_out.zeta[:, [mm_out + 0, mm_out + 1, mm_out + 1, mm_out + 0],
+                     [nn_out + 0, nn_out + 0, nn_out + 1, nn_out + 1]].T
+
+        for ll, aa, bb in zip(svec, avec, bvec):
 
             # get segment
-            lv = Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]
-            Lskew = algebra.skew((-0.5 * Surf_out.rho * Surfs_star[ss_out].gamma[0, nn_out]) * lv)
+            lv = zetav_here[bb, :] - zetav_here[aa, :]
+            Lskew = algebra.skew((-0.5 * Surf_out.rho * Surf_out.gamma[mm_out, nn_out]) * lv)
 
-            # get vertices 1d index on bound
+            # get vertices m,n indices
+            mm_a, nn_a = mm_out + dmver[aa], nn_out + dnver[aa]
+            mm_b, nn_b = mm_out + dmver[bb], nn_out + dnver[bb]
+
+            # get vertices 1d index
             ii_a = [np.ravel_multi_index(
-                (cc, M_out, nn_a), shape_fqs) for cc in range(3)]
+                (cc, mm_a, nn_a), shape_fqs) for cc in range(3)]
             ii_b = [np.ravel_multi_index(
-                (cc, M_out, nn_b), shape_fqs) for cc in range(3)]
+                (cc, mm_b, nn_b), shape_fqs) for cc in range(3)]
 
             # update all derivatives
-            for ss_in in range(n_surf):
+            for AIC, Der in zip(AICs, Der_list):
                 # derivatives: size (3,K_in)
-                Dfs = np.dot(Lskew, AICs[ss_in][:, :, 1, M_out - 1, nn_out])
-                Dfs_star = np.dot(Lskew, AICs_star[ss_in][:, :, 1, M_out - 1, nn_out])
+                Dfs = np.dot(Lskew, AIC[:, :, ll, mm_out, nn_out])
                 # allocate
-                Der_list_sub[ss_in][ii_a, :] += Dfs
-                Der_list_sub[ss_in][ii_b, :] += Dfs
-                Der_star_list_sub[ss_in][ii_a, :] += Dfs_star
-                Der_star_list_sub[ss_in][ii_b, :] += Dfs_star
+                Der[ii_a, :] += Dfs
+                Der[ii_b, :] += Dfs
+
+    ### loop again trailing edge
+    # here we add the Gammaw_0*rho*skew(lv)*dvind/dgamma contribution hence:
+    # - we use Gammaw_0 over the TE
+    # - we run along the positive direction as defined in the first row of
+    # wake panels
+    for nn_out in range(N_out):
+
+        # get TE bound vertices m,n indices
+        nn_a = nn_out + dnver[2]
+        nn_b = nn_out + dnver[1]
+
+        # get segment
+        lv = Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]
+        Lskew = algebra.skew((-0.5 * Surf_out.rho * gammaw_TE[nn_out]) * lv)
+
+        # get vertices 1d index on bound
+        ii_a = [np.ravel_multi_index(
+            (cc, M_out, nn_a), shape_fqs) for cc in range(3)]
+        ii_b = [np.ravel_multi_index(
+            (cc, M_out, nn_b), shape_fqs) for cc in range(3)]
+
+        # update all derivatives
+        for AIC, Der in zip(AICs, Der_list):
+            # derivatives: size (3,K_in)
+            Dfs = np.dot(Lskew, AIC[:, :, 1, M_out - 1, nn_out])
+            # allocate
+            Der[ii_a, :] += Dfs
+            Der[ii_b, :] += Dfs
+
+
+def dfqsdvind_gamma_compressed(Surfs, Surfs_star, tol=1e-6, near_field_rows=4):
+    """
+    As ``dfqsdvind_gamma``, but the derivatives w.r.t. the wake circulation are returned as a single
+    ``lowrank.BlockLowRankMatrix`` equal to ``np.block(Der_star_list)``, split as in ``AICs_compressed``.
 
-        Der_list.append(Der_list_sub)
-        Der_star_list.append(Der_star_list_sub)
+    Returns:
+        tuple: ``Der_list``, as per ``dfqsdvind_gamma``, and the compressed wake derivatives.
+    """
 
-    return Der_list, Der_star_list
+    n_surf = len(Surfs)
+    assert len(Surfs_star) == n_surf, \
+        'Number of bound and wake surfaces much be equal'
+
+    Kzeta = sum([Surf.maps.Kzeta for Surf in Surfs])
+    K_star = sum([Surf.maps.K for Surf in Surfs_star])
+
+    Der_list = []
+    Der_star = lowrank.BlockLowRankMatrix((3 * Kzeta, K_star))
+    row = 0
+    for ss_out in range(n_surf):
+        Surf_out = Surfs[ss_out]
+        gammaw_TE = Surfs_star[ss_out].gamma[0, :]
+        Kzeta_out = Surf_out.maps.Kzeta
+
+        Der_list.append([np.zeros((3 * Kzeta_out, Surf_in.maps.K)) for Surf_in in Surfs])
+        dfqsdvind_gamma_Sin_to_Sout(Surfs, Surf_out, gammaw_TE, Der_list[ss_out])
+
+        col = 0
+        for Surf_star in Surfs_star:
+            N_star = Surf_star.maps.N
+            for m_start, m_end in wake_chunks(Surf_star.maps.M, near_field_rows):
+                Der = np.zeros((3 * Kzeta_out, (m_end - m_start) * N_star))
+                dfqsdvind_gamma_Sin_to_Sout([wake_sub_surface(Surf_star, m_start, m_end)], Surf_out, gammaw_TE, [Der])
+                Der_star.add_block(row, col + m_start * N_star, Der,
+                                   tol=tol if m_start >= near_field_rows else None)
+            col += Surf_star.maps.K
+        row += 3 * Kzeta_out
+
+    return Der_list, Der_star
 
 
 def dvinddzeta(zetac, Surf_in, IsBound, M_in_bound=None):
@@ -947,10 +1180,12 @@ def dvinddzeta(zetac, Surf_in, IsBound, M_in_bound=None):
     return Dercoll, Dervert
 
 
-def dfqsdvind_zeta(Surfs, Surfs_star):
+def dfqsdvind_zeta(Surfs, Surfs_star, num_processes=1):
     """
     Assemble derivative of quasi-steady force w.r.t. induced velocities changes
     due to zeta.
+
+    If ``num_processes > 1``, the derivatives of each output surface are computed in parallel.
     """
 
     n_surf = len(Surfs)
@@ -958,106 +1193,60 @@ def dfqsdvind_zeta(Surfs, Surfs_star):
         'Number of bound and wake surfaces much be equal'
 
     # allocate
+    shared = num_processes > 1
     Dercoll_list = []
     Dervert_list = []
     for ss_out in range(n_surf):
         Kzeta_out = Surfs[ss_out].maps.Kzeta
-        Dercoll_list.append(np.zeros((3 * Kzeta_out, 3 * Kzeta_out)))
+        Dercoll_list.append(shared_zeros((3 * Kzeta_out, 3 * Kzeta_out), shared))
         Dervert_list_sub = []
         for ss_in in range(n_surf):
             Kzeta_in = Surfs[ss_in].maps.Kzeta
-            Dervert_list_sub.append(np.zeros((3 * Kzeta_out, 3 * Kzeta_in)))
+            Dervert_list_sub.append(shared_zeros((3 * Kzeta_out, 3 * Kzeta_in), shared))
         Dervert_list.append(Dervert_list_sub)
 
-    for ss_out in range(n_surf):
+    tasks = [functools.partial(_dfqsdvind_zeta_Sout, Surfs, Surfs_star, ss_out,
+                               Dercoll_list[ss_out], Dervert_list[ss_out]) for ss_out in range(n_surf)]
+    run_blocks(tasks, num_processes)
 
-        Surf_out = Surfs[ss_out]
-        M_out, N_out = Surf_out.maps.M, Surf_out.maps.N
-        K_out = Surf_out.maps.K
-        Kzeta_out = Surf_out.maps.Kzeta
-        shape_fqs = Surf_out.maps.shape_vert_vect  # (3,M+1,N+1)
-        Dercoll = Dercoll_list[ss_out]  # <--link
+    return Dercoll_list, Dervert_list
 
-        ### Loop out (bound) surface panels
-        for pp_out in itertools.product(range(0, M_out), range(0, N_out)):
-            mm_out, nn_out = pp_out
-            # zeta_panel_out=Surf_out.get_panel_vertices_coords(mm_out,nn_out)
-            zeta_panel_out = Surf_out.zeta[:, [mm_out + 0, mm_out + 1, mm_out + 1, mm_out + 0],
-                             [nn_out + 0, nn_out + 0, nn_out + 1, nn_out + 1]].T
 
-            # Loop segments
-            for ll, aa, bb in zip(svec, avec, bvec):
-                zeta_mid = 0.5 * (zeta_panel_out[bb, :] + zeta_panel_out[aa, :])
-                lv = zeta_panel_out[bb, :] - zeta_panel_out[aa, :]
-                Lskew = algebra.skew((-Surf_out.rho * Surf_out.gamma[mm_out, nn_out]) * lv)
+def _dfqsdvind_zeta_Sout(Surfs, Surfs_star, ss_out, Dercoll, Dervert_list_sub):
+    """
+    Fills the derivatives ``Dercoll`` and ``Dervert_list_sub`` of ``dfqsdvind_zeta`` over the output surface
+    ``ss_out``.
+    """
+    n_surf = len(Surfs)
 
-                # get vertices m,n indices
-                mm_a, nn_a = mm_out + dmver[aa], nn_out + dnver[aa]
-                mm_b, nn_b = mm_out + dmver[bb], nn_out + dnver[bb]
-                # get vertices 1d index
-                ii_a = [np.ravel_multi_index(
-                    (cc, mm_a, nn_a), shape_fqs) for cc in range(3)]
-                ii_b = [np.ravel_multi_index(
-                    (cc, mm_b, nn_b), shape_fqs) for cc in range(3)]
-                del mm_a, mm_b, nn_a, nn_b
-
-                ### loop input surfaces coordinates
-                for ss_in in range(n_surf):
-                    ### Bound
-                    Surf_in = Surfs[ss_in]
-                    M_in_bound, N_in_bound = Surf_in.maps.M, Surf_in.maps.N
-                    shape_zeta_in_bound = (3, M_in_bound + 1, N_in_bound + 1)
-                    Dervert = Dervert_list[ss_out][ss_in]  # <- link
-                    # deriv wrt induced velocity
-                    dvind_mid, dvind_vert = dvinddzeta_cpp(
-                        zeta_mid, Surf_in, is_bound=True)
-                    # allocate coll
-                    Df = np.dot(0.25 * Lskew, dvind_mid)
-                    Dercoll[np.ix_(ii_a, ii_a)] += Df
-                    Dercoll[np.ix_(ii_b, ii_a)] += Df
-                    Dercoll[np.ix_(ii_a, ii_b)] += Df
-                    Dercoll[np.ix_(ii_b, ii_b)] += Df
-                    # allocate vert
-                    Df = np.dot(0.5 * Lskew, dvind_vert)
-                    Dervert[ii_a, :] += Df
-                    Dervert[ii_b, :] += Df
-
-                    ### wake
-                    # deriv wrt induced velocity
-                    dvind_mid, dvind_vert = dvinddzeta_cpp(
-                        zeta_mid, Surfs_star[ss_in],
-                        is_bound=False, M_in_bound=Surf_in.maps.M)
-                    # allocate coll
-                    Df = np.dot(0.25 * Lskew, dvind_mid)
-                    Dercoll[np.ix_(ii_a, ii_a)] += Df
-                    Dercoll[np.ix_(ii_b, ii_a)] += Df
-                    Dercoll[np.ix_(ii_a, ii_b)] += Df
-                    Dercoll[np.ix_(ii_b, ii_b)] += Df
-
-                    Df = np.dot(0.5 * Lskew, dvind_vert)
-                    Dervert[ii_a, :] += Df
-                    Dervert[ii_b, :] += Df
-
-        # Loop output surf. TE
-        # - we use Gammaw_0 over the TE
-        # - we run along the positive direction as defined in the first row of
-        # wake panels
-        for nn_out in range(N_out):
+    Surf_out = Surfs[ss_out]
+    M_out, N_out = Surf_out.maps.M, Surf_out.maps.N
+    K_out = Surf_out.maps.K
+    Kzeta_out = Surf_out.maps.Kzeta
+    shape_fqs = Surf_out.maps.shape_vert_vect  # (3,M+1,N+1)
 
-            # get TE bound vertices m,n indices
-            nn_a = nn_out + 1
-            nn_b = nn_out
+    ### Loop out (bound) surface panels
+    for pp_out in itertools.product(range(0, M_out), range(0, N_out)):
+        mm_out, nn_out = pp_out
+        # zeta_panel_out=Surf_out.get_panel_vertices_coords(mm_out,nn_out)
+        zeta_panel_out = Surf_out.zeta[:, [mm_out + 0, mm_out + 1, mm_out + 1, mm_out + 0],
+                         [nn_out + 0, nn_out + 0, nn_out + 1, nn_out + 1]].T
 
-            # get segment and mid-point
-            zeta_mid = 0.5 * (Surf_out.zeta[:, M_out, nn_b] + Surf_out.zeta[:, M_out, nn_a])
-            lv = Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]
-            Lskew = algebra.skew((-Surf_out.rho * Surfs_star[ss_out].gamma[0, nn_out]) * lv)
+        # Loop segments
+        for ll, aa, bb in zip(svec, avec, bvec):
+            zeta_mid = 0.5 * (zeta_panel_out[bb, :] + zeta_panel_out[aa, :])
+            lv = zeta_panel_out[bb, :] - zeta_panel_out[aa, :]
+            Lskew = algebra.skew((-Surf_out.rho * Surf_out.gamma[mm_out, nn_out]) * lv)
 
-            # get vertices 1d index on bound
+            # get vertices m,n indices
+            mm_a, nn_a = mm_out + dmver[aa], nn_out + dnver[aa]
+            mm_b, nn_b = mm_out + dmver[bb], nn_out + dnver[bb]
+            # get vertices 1d index
             ii_a = [np.ravel_multi_index(
-                (cc, M_out, nn_a), shape_fqs) for cc in range(3)]
+                (cc, mm_a, nn_a), shape_fqs) for cc in range(3)]
             ii_b = [np.ravel_multi_index(
-                (cc, M_out, nn_b), shape_fqs) for cc in range(3)]
+                (cc, mm_b, nn_b), shape_fqs) for cc in range(3)]
+            del mm_a, mm_b, nn_a, nn_b
 
             ### loop input surfaces coordinates
             for ss_in in range(n_surf):
@@ -1065,9 +1254,10 @@ def dfqsdvind_zeta(Surfs, Surfs_star):
                 Surf_in = Surfs[ss_in]
                 M_in_bound, N_in_bound = Surf_in.maps.M, Surf_in.maps.N
                 shape_zeta_in_bound = (3, M_in_bound + 1, N_in_bound + 1)
-                Dervert = Dervert_list[ss_out][ss_in]  # <- link
+                Dervert = Dervert_list_sub[ss_in]  # <- link
                 # deriv wrt induced velocity
-                dvind_mid, dvind_vert = dvinddzeta_cpp(zeta_mid, Surf_in, is_bound=True)
+                dvind_mid, dvind_vert = dvinddzeta_cpp(
+                    zeta_mid, Surf_in, is_bound=True)
                 # allocate coll
                 Df = np.dot(0.25 * Lskew, dvind_mid)
                 Dercoll[np.ix_(ii_a, ii_a)] += Df
@@ -1091,12 +1281,67 @@ def dfqsdvind_zeta(Surfs, Surfs_star):
                 Dercoll[np.ix_(ii_a, ii_b)] += Df
                 Dercoll[np.ix_(ii_b, ii_b)] += Df
 
-                # allocate vert
                 Df = np.dot(0.5 * Lskew, dvind_vert)
                 Dervert[ii_a, :] += Df
                 Dervert[ii_b, :] += Df
 
-    return Dercoll_list, Dervert_list
+    # Loop output surf. TE
+    # - we use Gammaw_0 over the TE
+    # - we run along the positive direction as defined in the first row of
+    # wake panels
+    for nn_out in range(N_out):
+
+        # get TE bound vertices m,n indices
+        nn_a = nn_out + 1
+        nn_b = nn_out
+
+        # get segment and mid-point
+        zeta_mid = 0.5 * (Surf_out.zeta[:, M_out, nn_b] + Surf_out.zeta[:, M_out, nn_a])
+        lv = Surf_out.zeta[:, M_out, nn_b] - Surf_out.zeta[:, M_out, nn_a]
+        Lskew = algebra.skew((-Surf_out.rho * Surfs_star[ss_out].gamma[0, nn_out]) * lv)
+
+        # get vertices 1d index on bound
+        ii_a = [np.ravel_multi_index(
+            (cc, M_out, nn_a), shape_fqs) for cc in range(3)]
+        ii_b = [np.ravel_multi_index(
+            (cc, M_out, nn_b), shape_fqs) for cc in range(3)]
+
+        ### loop input surfaces coordinates
+        for ss_in in range(n_surf):
+            ### Bound
+            Surf_in = Surfs[ss_in]
+            M_in_bound, N_in_bound = Surf_in.maps.M, Surf_in.maps.N
+            shape_zeta_in_bound = (3, M_in_bound + 1, N_in_bound + 1)
+            Dervert = Dervert_list_sub[ss_in]  # <- link
+            # deriv wrt induced velocity
+            dvind_mid, dvind_vert = dvinddzeta_cpp(zeta_mid, Surf_in, is_bound=True)
+            # allocate coll
+            Df = np.dot(0.25 * Lskew, dvind_mid)
+            Dercoll[np.ix_(ii_a, ii_a)] += Df
+            Dercoll[np.ix_(ii_b, ii_a)] += Df
+            Dercoll[np.ix_(ii_a, ii_b)] += Df
+            Dercoll[np.ix_(ii_b, ii_b)] += Df
+            # allocate vert
+            Df = np.dot(0.5 * Lskew, dvind_vert)
+            Dervert[ii_a, :] += Df
+            Dervert[ii_b, :] += Df
+
+            ### wake
+            # deriv wrt induced velocity
+            dvind_mid, dvind_vert = dvinddzeta_cpp(
+                zeta_mid, Surfs_star[ss_in],
+                is_bound=False, M_in_bound=Surf_in.maps.M)
+            # allocate coll
+            Df = np.dot(0.25 * Lskew, dvind_mid)
+            Dercoll[np.ix_(ii_a, ii_a)] += Df
+            Dercoll[np.ix_(ii_b, ii_a)] += Df
+            Dercoll[np.ix_(ii_a, ii_b)] += Df
+            Dercoll[np.ix_(ii_b, ii_b)] += Df
+
+            # allocate vert
+            Df = np.dot(0.5 * Lskew, dvind_vert)
+            Dervert[ii_a, :] += Df
+            Dervert[ii_b, :] += Df
 
 
 def dfunstdgamma_dot(Surfs):
@@ -24,6 +24,10 @@ Methods:
 - dot: handles matrix dot products across different types.
 - solve: solves linear systems Ax=b with A and b dense, sparse or mixed.
 - dense: convert matrix to numpy array
+- block_merge: merge a block matrix into a single matrix
+
+Block low-rank matrices (lowrank.BlockLowRankMatrix) are also accepted by dot and
+dense, and return dense products.
 
 Warning:
 - only sparse types into SupportedTypes are supported!
@@ -38,6 +42,8 @@ import scipy.sparse as sparse
 import scipy.sparse.linalg as spalg
 import scipy.sparse.sputils as sputils
 
+from sharpy.linear.src.lowrank import BlockLowRankMatrix
+
 # --------------------------------------------------------------------- Classes
 
 class csc_matrix(sparse.csc_matrix):
@@ -175,6 +181,48 @@ def block_sum(A, B, factA = None, factB = None):
 	return P
 
 
+def block_merge(A, rows, cols):
+	'''
+	Merges a block matrix into a single matrix.
+
+	Inputs:
+	A: nested list of dense/sparse/block low-rank matrices. Empty blocks are
+	defined with None.
+	rows, cols: number of rows of each row of blocks and columns of each column
+	of blocks (see libss.ss_block S_x, S_u, S_y).
+
+	Returns a csc_matrix if any of the blocks is sparse, a numpy.ndarray
+	otherwise. Block low-rank matrices are converted to dense.
+	'''
+
+	is_sparse = any([type(block) == csc_matrix for arow in A for block in arow])
+
+	if is_sparse:
+		blocks = [[None if block is None else sparse.coo_matrix(dense(block))
+				  if type(block) == BlockLowRankMatrix else block for block in arow]
+				  for arow in A]
+		for ii in range(len(rows)):
+			if all([block is None for block in blocks[ii]]):
+				blocks[ii][0] = sparse.coo_matrix((rows[ii], cols[0]))
+		for jj in range(len(cols)):
+			if all([arow[jj] is None for arow in blocks]):
+				blocks[0][jj] = sparse.coo_matrix((rows[0], cols[jj]))
+		return csc_matrix(sparse.bmat(blocks, format='csc'))
+
+	dtype = np.result_type(*[block.dtype for arow in A for block in arow if block is not None])
+	M = np.zeros((sum(rows), sum(cols)), dtype=dtype)
+	II0 = 0
+	for ii in range(len(rows)):
+		JJ0 = 0
+		for jj in range(len(cols)):
+			if A[ii][jj] is not None:
+				M[II0:II0+rows[ii], JJ0:JJ0+cols[jj]] = dense(A[ii][jj])
+			JJ0 += cols[jj]
+		II0 += rows[ii]
+
+	return M
+
+
 def dot(A,B,type_out=None):
 	'''
 	Method to compute
@@ -190,6 +238,16 @@ def dot(A,B,type_out=None):
 	- scipy.csc_matrix
 	'''
 
+	# block low-rank matrices: dense output
+	if type(A)==BlockLowRankMatrix or type(B)==BlockLowRankMatrix:
+		if type(A)==BlockLowRankMatrix:
+			C=A.dot(B)
+		else:
+			C=B.T.dot(A.T).T
+		if type_out==csc_matrix:
+			return csc_matrix(C)
+		return C
+
 	# determine types:
 	tA=type(A)
 	tB=type(B)
@@ -259,6 +317,8 @@ def dense(M):
 		return np.array(M.toarray())
 	elif type(M) == csc_matrix:
 		return M.toarray()
+	elif type(M) == BlockLowRankMatrix:
+		return M.todense()
 	return M
 
 
@@ -369,6 +429,18 @@ if __name__=='__main__':
 			assert np.max(np.abs(X0-X3))<1e-12, 'Error in libsparse.solve'
 			assert np.max(np.abs(X0-X4))<1e-12, 'Error in libsparse.solve'
 
+		def test_block_merge(self):
+			A,B=self.A,self.B
+			M0=np.zeros((7,6))	# reference
+			M0[:3,:4]=A
+			M0[3:,4:]=B
+			Mblock=[[A,None],[None,B]]
+			M1=block_merge(Mblock,[3,4],[4,2])
+			M2=block_merge([[A,None],[None,csc_matrix(B)]],[3,4],[4,2])
+			assert type(M2)==csc_matrix, 'Error in libsparse.block_merge'
+			assert np.max(np.abs(M0-M1))<1e-16, 'Error in libsparse.block_merge'
+			assert np.max(np.abs(M0-M2.todense()))<1e-16, 'Error in libsparse.block_merge'
+
 
 	outprint='Testing libsparse'
 	print('\n' + 70*'-')
@@ -14,6 +14,8 @@ Classes:
 	- freqresp: wraps the freqresp function
 	- addGain: adds gains in input/output. This is not a wrapper of addGain, as
 	the system matrices are overwritten
+- DiscreteTimeSimulator: time marching of DLTI systems, for one or many input
+	realisations, with dense, sparse, diagonal or Schur forms of A
 
 Methods for state-space manipulation:
 - couple: feedback coupling. Does not support sparsity
@@ -26,7 +28,7 @@ Methods for state-space manipulation:
 - join: merge a list of state-space models into one.
 - sum state-space models and/or gains
 - scale_SS: scale state-space model
-- simulate: simulates discrete time solution
+- simulate: simulates discrete time solution (wraps DiscreteTimeSimulator)
 - Hnorm_from_freq_resp: compute H norm of a frequency response
 - adjust_phase: remove discontinuities from a frequency response
 
@@ -54,10 +56,13 @@ to do:
 
 import copy
 import warnings
+import concurrent.futures
 import numpy as np
 import scipy.signal as scsig
 import scipy.linalg as scalg
 import scipy.interpolate as scint
+import scipy.sparse as sparse
+import scipy.sparse.linalg as spalg
 
 # dependency
 import sharpy.linear.src.libsparse as libsp
@@ -163,15 +168,17 @@ class ss():
     def get_mats(self):
         return self.A, self.B, self.C, self.D
 
-    def freqresp(self, wv):
+    def freqresp(self, wv, **kwargs):
         """
         Calculate frequency response over frequencies wv
 
-        Note: this wraps frequency response function.
+        Note: this wraps frequency response function. The keyword arguments
+        (``method``, ``num_processes``, ``inputs`` and ``outputs``) are passed
+        on to it.
         """
         dlti = True
         if self.dt == None: dlti = False
-        return freqresp(self, wv, dlti=dlti)
+        return freqresp(self, wv, dlti=dlti, **kwargs)
 
     def addGain(self, K, where):
         """
@@ -690,7 +697,7 @@ def couple(ss01, ss02, K12, K21, out_sparse=False):
 
 
 
-def freqresp(SS, wv, dlti=True):
+def freqresp(SS, wv, dlti=True, method=None, num_processes=1, inputs=None, outputs=None, schur_min_frequencies=50):
     """
     In-house frequency response function supporting dense/sparse types
 
@@ -698,14 +705,26 @@ def freqresp(SS, wv, dlti=True):
     - SS: instance of ss class, or scipy.signal.StateSpace*
     - wv: frequency range
     - dlti: True if discrete-time system is considered.
+    - method: solution of (zI - A) X = B at every frequency
+        - 'schur' (default for dense A and at least ``schur_min_frequencies``
+        frequencies): A is reduced once to complex (triangular) Schur form, so
+        that every frequency only requires a triangular solve. The reduction
+        costs as much as several tens of LU factorisations, hence it only pays
+        off over many frequencies.
+        - 'shifted_lu' (default for sparse A): the LU factorisation of
+        (zI - A) is reused for the following frequencies through iterative
+        refinement, and only recomputed when this does not converge.
+        - 'direct' (default for dense A and fewer frequencies): a full solve
+        at every frequency.
+    - num_processes: if > 1, chunks of frequencies are evaluated in a pool of
+    processes.
+    - inputs/outputs: indices of the input/output channels to compute. All
+    of them if None.
+    - schur_min_frequencies: minimum number of frequencies for which the
+    'schur' method is chosen by default on dense A.
 
     Outputs:
     - Yfreq[outputs,inputs,len(wv)]: frequency response over wv
-
-    Warnings:
-    -  This function may not be very efficient for dense matrices (as A is not
-    reduced to upper Hessenberg form), but can exploit sparsity in the state-space
-    matrices.
     """
 
     assert type(SS) == ss, \
@@ -720,24 +739,139 @@ def freqresp(SS, wv, dlti=True):
         print('Assuming a continuous time system')
         zv = 1.j * wv
 
-    Nx = SS.A.shape[0]
-    Ny = SS.D.shape[0]
-    try:
-        Nu = SS.B.shape[1]
-    except IndexError:
-        Nu = 1
-
+    A, B, C, D = freqresp_channels(SS, inputs, outputs)
+    Ny, Nu = D.shape
     Nw = len(wv)
 
+    if method is None:
+        if type(A) == np.ndarray:
+            if Nw >= schur_min_frequencies:
+                method = 'schur'
+            else:
+                method = 'direct'
+        else:
+            method = 'shifted_lu'
+    assert method in ['schur', 'shifted_lu', 'direct'], 'Method %s not supported' % method
+
+    if method == 'schur':
+        # A = Z T Z^H
+        if type(A) != np.ndarray:
+            A = A.toarray()
+        A, Z = scalg.schur(A, output='complex')
+        B = np.dot(Z.conj().T, dense(B))
+        C = np.dot(dense(C), Z)
+
     Yfreq = np.empty((Ny, Nu, Nw,), dtype=np.complex_)
-    Eye = libsp.eye_as(SS.A)
-    for ii in range(Nw):
-        sol_cplx = libsp.solve(zv[ii] * Eye - SS.A, SS.B)
-        Yfreq[:, :, ii] = libsp.dot(SS.C, sol_cplx, type_out=np.ndarray) + SS.D
+    chunks = [chunk for chunk in np.array_split(np.arange(Nw), max(min(num_processes, Nw), 1)) if len(chunk)]
+    if len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_processes) as executor:
+            futures = [executor.submit(freqresp_chunk, A, B, C, D, zv[chunk], method) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                Yfreq[:, :, chunk] = future.result()
+    else:
+        Yfreq[:, :, :] = freqresp_chunk(A, B, C, D, zv, method)
 
     return Yfreq
 
 
+def freqresp_channels(SS, inputs=None, outputs=None):
+    """
+    Returns the state-space matrices of ``SS`` restricted to the selected input and output channels (all of them if
+    ``None``), with 2D ``B``, ``C`` and dense ``D``, as used in ``freqresp``.
+    """
+    A, B, C, D = SS.A, SS.B, SS.C, SS.D
+
+    if len(B.shape) == 1:
+        B = B.reshape((-1, 1))
+    if len(C.shape) == 1:
+        C = C.reshape((1, -1))
+    D = dense(D).reshape((C.shape[0], B.shape[1]))
+
+    if inputs is not None:
+        B = B[:, inputs]
+        D = D[:, inputs]
+    if outputs is not None:
+        C = C[outputs, :]
+        D = D[outputs, :]
+
+    return A, B, C, D
+
+
+def freqresp_chunk(A, B, C, D, zv, method, refinement_iter=10, refinement_tol=1e-14):
+    """
+    Frequency response of (A, B, C, D) at the complex frequencies ``zv``. ``A`` is the upper triangular Schur factor
+    with ``method='schur'`` (see ``freqresp``).
+
+    With ``method='shifted_lu'``, the solution at a new frequency is obtained by iterative refinement with the LU
+    factorisation of a previous one. If the relative residual is not below ``refinement_tol`` after
+    ``refinement_iter`` corrections, the matrix is factorised again at the current frequency.
+
+    Returns:
+        np.ndarray: Yfreq[outputs,inputs,len(zv)]
+    """
+    Ny, Nu = D.shape
+    Yfreq = np.empty((Ny, Nu, len(zv)), dtype=np.complex_)
+
+    if method == 'schur':
+        Eye = np.eye(A.shape[0])
+        for ii in range(len(zv)):
+            sol_cplx = scalg.solve_triangular(zv[ii] * Eye - A, B, check_finite=False)
+            Yfreq[:, :, ii] = np.dot(C, sol_cplx) + D
+
+    elif method == 'shifted_lu':
+        is_sparse = type(A) != np.ndarray
+        if is_sparse:
+            Eye = sparse.eye(A.shape[0], format='csc')
+        else:
+            Eye = np.eye(A.shape[0])
+        B = dense(B)
+        norm_B = np.linalg.norm(B)
+
+        factor = None
+        for ii in range(len(zv)):
+            Amat = zv[ii] * Eye - A
+            sol_cplx = None
+            if factor is not None:
+                sol_cplx = factor(B)
+                norm_res_old = np.inf
+                for i_iter in range(refinement_iter + 1):
+                    residual = B - Amat.dot(sol_cplx)
+                    norm_res = np.linalg.norm(residual)
+                    if norm_res <= refinement_tol * norm_B:
+                        break
+                    if i_iter == refinement_iter or norm_res > 0.5 * norm_res_old:
+                        # too far from the factorised frequency
+                        sol_cplx = None
+                        break
+                    sol_cplx += factor(residual)
+                    norm_res_old = norm_res
+            if sol_cplx is None:
+                if is_sparse:
+                    factor = spalg.splu(sparse.csc_matrix(Amat)).solve
+                else:
+                    lu_piv = scalg.lu_factor(Amat, check_finite=False)
+                    factor = lambda rhs, lu_piv=lu_piv: scalg.lu_solve(lu_piv, rhs, check_finite=False)
+                sol_cplx = factor(B)
+            Yfreq[:, :, ii] = C.dot(sol_cplx) + D
+
+    else:
+        Eye = libsp.eye_as(A)
+        for ii in range(len(zv)):
+            sol_cplx = libsp.solve(zv[ii] * Eye - A, B)
+            Yfreq[:, :, ii] = libsp.dot(C, sol_cplx, type_out=np.ndarray) + D
+
+    return Yfreq
+
+
+def dense(M):
+    """
+    Returns ``M`` as a dense ``np.ndarray``.
+    """
+    if sparse.issparse(M):
+        return M.toarray()
+    return np.asarray(M)
+
+
 def series(SS01, SS02):
     r"""
     Connects two state-space blocks in series. If these are instances of DLTI
@@ -1238,33 +1372,157 @@ def scale_SS(SSin, input_scal=1., output_scal=1., state_scal=1., byref=True):
     return SS
 
 
-def simulate(SShere, U, x0=None):
+def simulate(SShere, U, x0=None, method='direct', dtype=np.float64, return_states=True):
     """
-    Routine to simulate response to generic input.
-    @warning: this routine is for testing and may lack of robustness. Use
-        scipy.signal instead.
+    Simulates the response of the discrete time system ``SShere`` to the input time history ``U``.
+
+    ``U`` can be a ``(NT, Nu)`` array or a ``(NT, Nu, Nr)`` array of ``Nr`` input realisations, which are marched
+    simultaneously. See :class:`DiscreteTimeSimulator` for the available ``method`` values.
+
+    Args:
+        SShere (ss): discrete time system
+        U (np.ndarray): input time history
+        x0 (np.ndarray): initial state, ``(Nx,)`` or ``(Nx, Nr)``
+        method (str): ``direct``, ``diagonal`` or ``schur``
+        dtype (np.dtype): floating point type of the computation and of the outputs (``np.float32`` halves the
+            memory)
+        return_states (bool): return the state time history. Otherwise, ``None`` is returned in its place
+
+    Returns:
+        tuple: ``(Y, X)`` output ``(NT, Ny[, Nr])`` and state ``(NT, Nx[, Nr])`` time histories
     """
+    return DiscreteTimeSimulator(SShere, method=method, dtype=dtype).simulate(U, x0, return_states=return_states)
+
 
-    A, B, C, D = SShere.A, SShere.B, SShere.C, SShere.D
+class DiscreteTimeSimulator():
+    r"""
+    Time marching of the discrete time system
 
-    NT = U.shape[0]
-    Nx = A.shape[0]
-    Ny = C.shape[0]
+    .. math:: \mathbf{x}_{n+1} = \mathbf{A}\mathbf{x}_n + \mathbf{B}\mathbf{u}_n, \quad
+        \mathbf{y}_n = \mathbf{C}\mathbf{x}_n + \mathbf{D}\mathbf{u}_n
 
-    X = np.zeros((NT, Nx))
-    Y = np.zeros((NT, Ny))
+    The state is marched for all the input realisations at once, as a matrix, so that each time step is a matrix-matrix
+    product. The ``method`` selects the form of :math:`\mathbf{A}` used in the recursion:
 
-    if x0 is not None: X[0] = x0
-    if len(U.shape) == 1:
-        U = U.reshape((NT, 1))
+        * ``direct``: :math:`\mathbf{A}` as given, dense or sparse.
 
-    Y[0] = libsp.dot(C, X[0]) + libsp.dot(D, U[0])
+        * ``diagonal``: the system is transformed to the (complex) eigenvector basis of :math:`\mathbf{A}`, so that
+          the recursion is element-wise. Fastest for reduced order models, but only accurate if the eigenvector
+          basis is well conditioned.
 
-    for ii in range(1, NT):
-        X[ii] = libsp.dot(A, X[ii - 1]) + libsp.dot(B, U[ii - 1])
-        Y[ii] = libsp.dot(C, X[ii]) + libsp.dot(D, U[ii])
+        * ``schur``: the system is transformed with the orthogonal vectors of the real Schur decomposition of
+          :math:`\mathbf{A}`. The recursion costs as much as the ``direct`` one, but the transformation is always
+          well conditioned, which is useful in single precision.
 
-    return Y, X
+    The transformations are computed once, when the simulator is created. The state at the end of a simulation is
+    kept in ``x_final``, so that long simulations can be run in chunks with ``simulate(U_chunk, x0=sim.x_final)``.
+
+    Args:
+        SShere (ss): discrete time system
+        method (str): ``direct``, ``diagonal`` or ``schur``
+        dtype (np.dtype): floating point type of the computation
+    """
+
+    def __init__(self, SShere, method='direct', dtype=np.float64):
+        self.method = method
+        self.dtype = np.dtype(dtype)
+        self.x_final = None
+
+        A, B, C, D = SShere.A, SShere.B, SShere.C, SShere.D
+
+        if method == 'direct':
+            self.A = self.cast(A, self.dtype)
+            self.B = self.cast(B, self.dtype)
+            self.C = self.cast(C, self.dtype)
+            self.T_in = None
+            self.T_out = None
+        elif method == 'diagonal':
+            eigs, V = scalg.eig(dense(A))
+            complex_dtype = np.result_type(self.dtype, np.complex64)
+            Vinv = scalg.inv(V)
+            self.A = eigs.astype(complex_dtype)
+            self.B = self.cast(Vinv.dot(dense(B)), complex_dtype)
+            self.C = self.cast(dense(C).dot(V), complex_dtype)
+            self.T_in = Vinv.astype(complex_dtype)
+            self.T_out = V.astype(complex_dtype)
+        elif method == 'schur':
+            T, Q = scalg.schur(dense(A), output='real')
+            self.A = T.astype(self.dtype)
+            self.B = (Q.T.dot(dense(B))).astype(self.dtype)
+            self.C = (dense(C).dot(Q)).astype(self.dtype)
+            self.T_in = Q.T.astype(self.dtype)
+            self.T_out = Q.astype(self.dtype)
+        else:
+            raise NameError('Unknown simulation method %s' % method)
+
+        self.D = self.cast(D, self.dtype)
+
+    @staticmethod
+    def cast(M, dtype):
+        if sparse.issparse(M):
+            return sparse.csc_matrix(M, dtype=dtype)
+        return np.asarray(M, dtype=dtype)
+
+    def step(self, Z, U):
+        """
+        Advances the (transformed) state ``Z`` one time step with input ``U``
+        """
+        if self.method == 'diagonal':
+            return self.A[:, None] * Z + self.B.dot(U)
+        return self.A.dot(Z) + self.B.dot(U)
+
+    def simulate(self, U, x0=None, return_states=True):
+        """
+        Simulates the response to the input time history ``U``, ``(NT, Nu)`` or ``(NT, Nu, Nr)`` for ``Nr``
+        realisations, from the initial state ``x0``.
+
+        Returns:
+            tuple: ``(Y, X)`` output ``(NT, Ny[, Nr])`` and state ``(NT, Nx[, Nr])`` time histories. ``X`` is
+            ``None`` if ``return_states`` is ``False``.
+        """
+        NT = U.shape[0]
+        if U.ndim == 1:
+            U = U.reshape((NT, 1))
+        batched = U.ndim == 3
+        if not batched:
+            U = U[:, :, None]
+        U = U.astype(self.dtype, copy=False)
+        Nr = U.shape[2]
+        Ny = self.C.shape[0]
+        Nx = self.B.shape[0]
+
+        Z = np.zeros((Nx, Nr), dtype=np.result_type(self.A, self.dtype))
+        if x0 is not None:
+            x0 = np.asarray(x0).reshape((Nx, -1))
+            if self.T_in is not None:
+                x0 = self.T_in.dot(x0)
+            Z[:] = x0
+
+        Y = np.zeros((NT, Ny, Nr), dtype=self.dtype)
+        X = np.zeros((NT, Nx, Nr), dtype=self.dtype) if return_states else None
+
+        for ii in range(NT):
+            Y[ii] = (self.C.dot(Z) + self.D.dot(U[ii])).real
+            if return_states:
+                X[ii] = self.to_states(Z)
+            Z = self.step(Z, U[ii])
+        self.x_final = self.to_states(Z)
+
+        if not batched:
+            Y = Y[:, :, 0]
+            self.x_final = self.x_final[:, 0]
+            if return_states:
+                X = X[:, :, 0]
+
+        return Y, X
+
+    def to_states(self, Z):
+        """
+        Transforms the internal state ``Z`` back to the original state coordinates
+        """
+        if self.T_out is None:
+            return Z.real
+        return self.T_out.dot(Z).real
 
 
 def Hnorm_from_freq_resp(gv, method):
@@ -1613,6 +1871,51 @@ if __name__ == '__main__':
             er = np.max(np.abs(Y - Y1))
             assert er < 1e-10, 'Test on freqresp failed'
 
+            for method in ['direct', 'shifted_lu']:
+                Ymethod = SSsp.freqresp(kv, method=method)
+                er = np.max(np.abs(Y - Ymethod))
+                assert er < 1e-10, 'Test on freqresp with method %s failed' % method
+
+            Ychannels = SS.freqresp(kv, num_processes=2, inputs=[1], outputs=[0, 2])
+            er = np.max(np.abs(Y[[0, 2], 1:2, :] - Ychannels))
+            assert er < 1e-10, 'Test on freqresp with selected channels failed'
+
+        def test_simulate(self):
+            SS = random_ss(20, 3, 4, dt=0.1, stable=True)
+            NT, Nr = 30, 5
+            U = np.random.rand(NT, SS.inputs, Nr)
+            x0 = np.random.rand(SS.states, Nr)
+
+            # reference
+            X = np.zeros((NT, SS.states))
+            for ir in range(Nr):
+                X[0] = x0[:, ir]
+                for ii in range(1, NT):
+                    X[ii] = SS.A.dot(X[ii - 1]) + SS.B.dot(U[ii - 1, :, ir])
+                Yref = X.dot(SS.C.T) + U[:, :, ir].dot(SS.D.T)
+
+                for method in ['direct', 'diagonal', 'schur']:
+                    Y, Xsim = simulate(SS, U[:, :, ir], x0=x0[:, ir], method=method)
+                    er = np.max(np.abs(Y - Yref)) + np.max(np.abs(Xsim - X))
+                    assert er < 1e-8, 'Test on simulate with method %s failed' % method
+
+            for method in ['direct', 'diagonal', 'schur']:
+                # batched and chunked
+                sim = DiscreteTimeSimulator(SS, method=method)
+                Y0, X0 = sim.simulate(U[:NT // 2], x0=x0)
+                Y1, X1 = sim.simulate(U[NT // 2:], x0=sim.x_final, return_states=False)
+                assert X1 is None
+                Yb = np.concatenate((Y0, Y1))
+                for ir in range(Nr):
+                    Yr, _ = simulate(SS, U[:, :, ir], x0=x0[:, ir])
+                    er = np.max(np.abs(Yb[:, :, ir] - Yr))
+                    assert er < 1e-8, 'Test on batched simulate with method %s failed' % method
+
+            Y32, _ = simulate(SS, U, x0=x0, method='schur', dtype=np.float32)
+            assert Y32.dtype == np.float32
+            er = np.max(np.abs(Y32 - simulate(SS, U, x0=x0)[0]))
+            assert er < 1e-3, 'Test on single precision simulate failed'
+
         def test_couple(self):
             dt = .2
             Nx1, Nu1, Ny1 = 3, 4, 2
@@ -62,27 +62,40 @@ settings_default_dynamic['track_body'] = False
 settings_types_dynamic['track_body_number'] = 'int'
 settings_default_dynamic['track_body_number'] = -1
 
+settings_types_dynamic['num_cores'] = 'int'
+settings_default_dynamic['num_cores'] = 1
+
+settings_types_dynamic['compress_wake'] = 'bool'
+settings_default_dynamic['compress_wake'] = False
+
+settings_types_dynamic['wake_compression_tol'] = 'float'
+settings_default_dynamic['wake_compression_tol'] = 1e-6
+
+settings_types_dynamic['wake_near_field_rows'] = 'int'
+settings_default_dynamic['wake_near_field_rows'] = 4
+
 
 class Static():
     """	Static linear solver """
 
-    def __init__(self, tsdata, for_vel=np.zeros((6,))):
+    def __init__(self, tsdata, for_vel=np.zeros((6,)), get_velocities=True):
 
         print('Initialising Static linear UVLM solver class...')
         t0 = time.time()
 
         MS = multisurfaces.MultiAeroGridSurfaces(tsdata, for_vel=for_vel)
-        MS.get_ind_velocities_at_collocation_points()
-        MS.get_input_velocities_at_collocation_points()
-        MS.get_ind_velocities_at_segments()
-        MS.get_input_velocities_at_segments()
+        self.MS = MS
+        if get_velocities:
+            self.get_velocities()
 
         # define total sizes
         self.K = sum(MS.KK)
         self.K_star = sum(MS.KK_star)
         self.Kzeta = sum(MS.KKzeta)
         self.Kzeta_star = sum(MS.KKzeta_star)
-        self.MS = MS
+
+        # number of processes in the assembly of the surface blocks
+        self.num_processes = 1
 
         # define input perturbation
         self.zeta = np.zeros((3 * self.Kzeta))
@@ -95,6 +108,17 @@ class Static():
         self.time_init_sta = time.time() - t0
         print('\t\t\t...done in %.2f sec' % self.time_init_sta)
 
+    def get_velocities(self):
+        """
+        Computes the induced and input velocities at the collocation points and segments of the linearisation
+        reference, which are required to assemble the system. This is skipped at initialisation with
+        ``get_velocities=False`` when the assembled system is not needed (e.g. when it is loaded from a cache).
+        """
+        self.MS.get_ind_velocities_at_collocation_points()
+        self.MS.get_input_velocities_at_collocation_points()
+        self.MS.get_ind_velocities_at_segments()
+        self.MS.get_input_velocities_at_segments()
+
     def assemble_profiling(self):
         """
         Generate profiling report for assembly and save it in self.prof_out.
@@ -118,9 +142,10 @@ class Static():
         # ----------------------------------------------------------- state eq.
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_dqcdzeta_coll, List_nc_dqcdzeta_vert = \
-            ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star)
+            ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         List_AICs, List_AICs_star = ass.AICs(MS.Surfs, MS.Surfs_star,
-                                             target='collocation', Project=True)
+                                             target='collocation', Project=True,
+                                             num_processes=self.num_processes)
         List_Wnv = []
         for ss in range(MS.n_surf):
             List_Wnv.append(
@@ -166,7 +191,7 @@ class Static():
         self.Dfqsdzeta = scalg.block_diag(
             *ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star))
         # ... induced velocity contrib.
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         self.Dfqsdzeta += np.block(List_vert)
@@ -185,7 +210,7 @@ class Static():
         del List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0
         # ... induced velocity contrib.
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         self.Dfqsdgamma += np.block(List_dfqsdvind_gamma)
         self.Dfqsdgamma_star += np.block(List_dfqsdvind_gamma_star)
         del List_dfqsdvind_gamma, List_dfqsdvind_gamma_star
@@ -500,6 +525,9 @@ class Dynamic(Static):
 
         - UseSparse=False: builds the A and B matrices in sparse form. C and D
           are dense anyway so the sparse format cannot be applied to them.
+        - get_velocities=True: computes the induced velocities of the
+          linearisation reference, required by ``assemble_ss``. See
+          ``Static.get_velocities``.
 
     Methods:
         - nondimss: normalises a dimensional state-space model based on the
@@ -532,9 +560,10 @@ class Dynamic(Static):
     """
 
     def __init__(self, tsdata, dt=None, dynamic_settings=None, integr_order=2,
-                       RemovePredictor=True, ScalingDict=None, UseSparse=True, for_vel=np.zeros((6,))):
+                       RemovePredictor=True, ScalingDict=None, UseSparse=True, for_vel=np.zeros((6,)),
+                       get_velocities=True):
 
-        super().__init__(tsdata, for_vel=for_vel)
+        super().__init__(tsdata, for_vel=for_vel, get_velocities=get_velocities)
 
         # Transform settings dictionary - in the future remove remaining inputs
         self.settings = dict()
@@ -550,8 +579,18 @@ class Dynamic(Static):
             self.settings['remove_predictor'] = RemovePredictor
             self.settings['use_sparse'] = UseSparse
             self.settings['ScalingDict'] = ScalingDict
+            self.settings['num_cores'] = 1
+            self.settings['compress_wake'] = False
 
         self.dt = self.settings['dt']
+        self.num_processes = self.settings.get('num_cores', 1)
+
+        # compression of the far wake (only in block form, see DynamicBlock)
+        self.compress_wake = self.settings.get('compress_wake', False)
+        self.wake_compression_tol = self.settings.get('wake_compression_tol',
+                                                      settings_default_dynamic['wake_compression_tol'])
+        self.wake_near_field_rows = self.settings.get('wake_near_field_rows',
+                                                      settings_default_dynamic['wake_near_field_rows'])
         self.integr_order = self.settings['integr_order']
 
         if self.integr_order == 1:
@@ -727,6 +766,9 @@ class Dynamic(Static):
 
         print('State-space realisation of UVLM equations started...')
         t0 = time.time()
+        if self.compress_wake:
+            warnings.warn('Wake compression is only available in the block form of the UVLM (DynamicBlock). '
+                          'The state-space model is assembled with dense wake blocks.')
         MS = self.MS
         K, K_star = self.K, self.K_star
         Kzeta = self.Kzeta
@@ -747,7 +789,8 @@ class Dynamic(Static):
 
         # Aero influence coeffs
         List_AICs, List_AICs_star = ass.AICs(MS.Surfs, MS.Surfs_star,
-                                             target='collocation', Project=True)
+                                             target='collocation', Project=True,
+                                             num_processes=self.num_processes)
         A0 = np.block(List_AICs)
         A0W = np.block(List_AICs_star)
         List_AICs, List_AICs_star = None, None
@@ -806,7 +849,8 @@ class Dynamic(Static):
             Ass = libsp.csc_matrix(Ass)
 
         # zeta derivs
-        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True)
+        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True,
+                                           num_processes=self.num_processes)
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_domegazetadzeta_vert = ass.nc_domegazetadzeta(MS.Surfs, MS.Surfs_star)
         for ss in range(MS.n_surf):
@@ -850,7 +894,7 @@ class Dynamic(Static):
 
         # gamma (induced velocity contrib.)
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
 
         # gamma (at constant relative velocity)
         List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
@@ -880,7 +924,7 @@ class Dynamic(Static):
         Dss[:, :3 * Kzeta] = scalg.block_diag(
             *ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star))
         # zeta (induced velocity contrib)
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         Dss[:, :3 * Kzeta] += np.block(List_vert)
@@ -1685,6 +1729,13 @@ class DynamicBlock(Dynamic):
         - UseSparse=False: builds the A and B matrices in sparse form. C and D
           are dense, hence the sparce format is not used.
 
+    If the ``compress_wake`` setting is ``True``, the blocks of the A and C
+    matrices associated to the wake circulation are allocated in block
+    low-rank form (see ``sharpy.linear.src.lowrank``): the far wake panels
+    (beyond the first ``wake_near_field_rows`` rows) are compressed to the
+    relative tolerance ``wake_compression_tol``. The memory of these blocks
+    then grows with the logarithm, rather than linearly, of the wake length.
+
 
     Methods:
         - nondimss: normalises a dimensional state-space model based on the
@@ -1879,13 +1930,23 @@ class DynamicBlock(Dynamic):
         # - choice of sparse matrices format is optimised to reduce memory load
 
         # Aero influence coeffs
-        List_AICs, List_AICs_star = ass.AICs(MS.Surfs, MS.Surfs_star,
-                                             target='collocation', Project=True)
+        if self.compress_wake:
+            List_AICs, A0W = ass.AICs_compressed(MS.Surfs, MS.Surfs_star,
+                                                 tol=self.wake_compression_tol,
+                                                 near_field_rows=self.wake_near_field_rows)
+        else:
+            List_AICs, List_AICs_star = ass.AICs(MS.Surfs, MS.Surfs_star,
+                                                 target='collocation', Project=True,
+                                                 num_processes=self.num_processes)
+            A0W = np.block(List_AICs_star)
+            List_AICs_star = None
         A0 = np.block(List_AICs)
-        A0W = np.block(List_AICs_star)
-        List_AICs, List_AICs_star = None, None
+        List_AICs = None
         LU, P = scalg.lu_factor(A0)
-        AinvAW = scalg.lu_solve((LU, P), A0W)
+        if self.compress_wake:
+            AinvAW = A0W.lu_solve((LU, P), tol=self.wake_compression_tol)
+        else:
+            AinvAW = scalg.lu_solve((LU, P), A0W)
         A0, A0W = None, None
 
         ### propagation of circ
@@ -1900,9 +1961,14 @@ class DynamicBlock(Dynamic):
             CgammaW = scalg.block_diag(*List_Cstar)
         List_C, List_Cstar = None, None
 
-        # recurrent dense terms stored as numpy.ndarrays
+        # recurrent dense terms stored as numpy.ndarrays (the wake term in
+        # block low-rank form if compressed)
         AinvAWCgamma = -libsp.dot(AinvAW, Cgamma)
-        AinvAWCgammaW = -libsp.dot(AinvAW, CgammaW)
+        if self.compress_wake:
+            AinvAWCgammaW = -AinvAW.dot_sparse(CgammaW)
+        else:
+            AinvAWCgammaW = -libsp.dot(AinvAW, CgammaW)
+        AinvAW = None
 
         ### A matrix assembly
         Ass = []
@@ -1935,7 +2001,8 @@ class DynamicBlock(Dynamic):
         AinvAWCgammaW = None
 
         # zeta derivs
-        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True)
+        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True,
+                                           num_processes=self.num_processes)
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_domegazetadzeta_vert = ass.nc_domegazetadzeta(MS.Surfs, MS.Surfs_star)
         for ss in range(MS.n_surf):
@@ -1981,18 +2048,35 @@ class DynamicBlock(Dynamic):
 
         ### state terms (C matrix)
 
-        # gamma (induced velocity contrib.)
-        List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+        if self.compress_wake:
+            # gamma (induced velocity contrib.)
+            List_dfqsdvind_gamma, Dfqsdgamma_star = \
+                ass.dfqsdvind_gamma_compressed(MS.Surfs, MS.Surfs_star,
+                                               tol=self.wake_compression_tol,
+                                               near_field_rows=self.wake_near_field_rows)
+
+            # gamma (at constant relative velocity)
+            List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
+                ass.dfqsdgamma_vrel0(MS.Surfs, MS.Surfs_star, wake_te_only=True)
+            row, col = 0, 0
+            for ss in range(MS.n_surf):
+                List_dfqsdvind_gamma[ss][ss] += List_dfqsdgamma_vrel0[ss]
+                Dfqsdgamma_star.add_block(row, col, List_dfqsdgamma_star_vrel0[ss])
+                row += 3 * MS.KKzeta[ss]
+                col += MS.KK_star[ss]
+        else:
+            # gamma (induced velocity contrib.)
+            List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
+                ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
 
-        # gamma (at constant relative velocity)
-        List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
-            ass.dfqsdgamma_vrel0(MS.Surfs, MS.Surfs_star)
-        for ss in range(MS.n_surf):
-            List_dfqsdvind_gamma[ss][ss]+=List_dfqsdgamma_vrel0[ss]
-            List_dfqsdvind_gamma_star[ss][ss]+=List_dfqsdgamma_star_vrel0[ss]
+            # gamma (at constant relative velocity)
+            List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
+                ass.dfqsdgamma_vrel0(MS.Surfs, MS.Surfs_star)
+            for ss in range(MS.n_surf):
+                List_dfqsdvind_gamma[ss][ss]+=List_dfqsdgamma_vrel0[ss]
+                List_dfqsdvind_gamma_star[ss][ss]+=List_dfqsdgamma_star_vrel0[ss]
+            Dfqsdgamma_star = np.block(List_dfqsdvind_gamma_star)
         Dfqsdgamma = np.block(List_dfqsdvind_gamma)
-        Dfqsdgamma_star = np.block(List_dfqsdvind_gamma_star)
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = None, None
         List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = None, None
 
@@ -2011,7 +2095,7 @@ class DynamicBlock(Dynamic):
             [ scalg.block_diag(*ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star)) ])
 
         # zeta (induced velocity contrib)
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         Dss[0][0] += np.block(List_vert)
@@ -2082,7 +2166,7 @@ class DynamicBlock(Dynamic):
 
             # calculate solution
             Yfreq[:, :, kk] = np.dot(self.SS.C[0][0], Ygamma) + \
-                              np.dot(self.SS.C[0][1], Ygamma_star) + \
+                              libsp.dot(self.SS.C[0][1], Ygamma_star) + \
                               np.dot(self.SS.C[0][2], dfact * Ygamma) + \
                               np.hstack(self.SS.D[0])
 
@@ -2252,6 +2336,8 @@ class DynamicBlock(Dynamic):
 
         P = self.SS.A[0][0]
         Pw = self.SS.A[0][1]
+        # the observability Gramian is dense over the wake states
+        Cstar_T = libsp.dense(self.SS.C[0][1]).T
 
         # indices to manipulate obs solution
         ii00 = range(0, self.K)
@@ -2289,7 +2375,7 @@ class DynamicBlock(Dynamic):
 
             #  build terms that will be recycled
             Cw_cpx=self.get_Cw_cpx(zval)
-            P_PwCw = P + Cw_cpx.T.dot(Pw.T).T
+            P_PwCw = P + libsp.dot(Pw, Cw_cpx)
             Kernel = np.linalg.inv( zval*Eye - P_PwCw )
 
             ### ----- controllability
@@ -2316,7 +2402,7 @@ class DynamicBlock(Dynamic):
             if DictBalFreq['get_frequency_response'] and kk < Nk_low:
                 self.Yfreq[:, :, kk] = (1. / Intfact) * \
                                        (np.dot(self.SS.C[0][0], Ygamma) + \
-                                        np.dot(self.SS.C[0][1], Ygamma_star) + \
+                                        libsp.dot(self.SS.C[0][1], Ygamma_star) + \
                                         dfact * np.dot(self.SS.C[0][2], Ygamma)) + \
                                        np.hstack(self.SS.D[0])
 
@@ -2324,7 +2410,7 @@ class DynamicBlock(Dynamic):
             if DictBalFreq['get_frequency_response'] and kk<Nk_low:
                 self.Yfreq[:,:,kk]= (1./Intfact)*\
                                     (np.dot( self.SS.C[0][0], Ygamma) +\
-                                     np.dot( self.SS.C[0][1], Ygamma_star) +\
+                                     libsp.dot( self.SS.C[0][1], Ygamma_star) +\
                                      dfact*np.dot( self.SS.C[0][2], Ygamma)) +\
                                      np.hstack(self.SS.D[0])
 
@@ -2341,7 +2427,7 @@ class DynamicBlock(Dynamic):
                 Qobs[ii03,:] = (bm1*zinv) * Qobs[ii02,:]
 
             # solve bound circulation
-            rhs = Cw_cpx.T.dot(self.SS.C[0][1].T) + self.SS.C[0][0].T + \
+            rhs = libsp.dot(self.SS.C[0][1], Cw_cpx).T + self.SS.C[0][0].T + \
                   Qobs[ii02,:]*( b0 + zinv*bm1 ) + \
                   np.dot( P_PwCw.T, bp1*Qobs[ii02,:] )
             Qobs[ii00,:] = np.dot( Kernel.T, rhs )
@@ -2352,7 +2438,7 @@ class DynamicBlock(Dynamic):
                                     shape=(K_star,K_star), dtype=np.complex_)
             Qobs[ii01,:] = libsp.solve(
                         Eye_star-self.SS.A[1][1].T,
-                        self.SS.C[0][1].T + np.dot(Pw.T, Qobs[ii00,:] + bp1*Qobs[ii02,:]) )
+                        Cstar_T + libsp.dot(Pw.T, Qobs[ii00,:] + bp1*Qobs[ii02,:]) )
 
             kkvec=range( 2*kk*self.SS.outputs, 2*(kk+1)*self.SS.outputs )
             Zo[:,kkvec[:self.SS.outputs]]= Intfact * Qobs.real
@@ -2403,6 +2489,26 @@ class DynamicBlock(Dynamic):
             self.Zo=Zo
             self.svd_res={ 'U': U, 'hsv': hsv, 'Vh': Vh }
 
+    def assemble_step_operators(self):
+        r"""
+        Merges the block matrices of ``self.SS`` used by :func:`DynamicBlock.solve_step` into single matrices, stored
+        in ``self.step_operators``. The step is then solved with one matrix-vector product per operator, at the
+        expense of the memory saved by the block format. Block low-rank matrices are converted to dense.
+
+        The operators need to be assembled again if the state-space system is modified (e.g. by ``nondimss``).
+        """
+
+        S_x, S_u, S_y = self.SS.S_x, self.SS.S_u, self.SS.S_y
+
+        self.step_operators = dict()
+        self.step_operators['A'] = libsp.block_merge(self.SS.A, S_x, S_x)
+        self.step_operators['B'] = libsp.block_merge(self.SS.B, S_x, S_u)
+        self.step_operators['C'] = libsp.block_merge(self.SS.C, S_y, S_x)
+        self.step_operators['D'] = libsp.block_merge(self.SS.D, S_y, S_u)
+        if self.remove_predictor:
+            CBplusD = libsp.block_sum(libsp.block_dot(self.SS.C, self.SS.B), self.SS.D)
+            self.step_operators['CBplusD'] = libsp.block_merge(CBplusD, S_y, S_u)
+
     def solve_step(self, x_n, u_n, u_n1=None, transform_state=False):
         r"""
         Solve step.
@@ -2455,6 +2561,9 @@ class DynamicBlock(Dynamic):
         if u_n1 is None:
             u_n1 = u_n.copy()
 
+        if getattr(self, 'step_operators', None) is not None:
+            return self.solve_step_merged(x_n, u_n, u_n1, transform_state)
+
         if self.remove_predictor and not hasattr(self, 'CBplusD'):
             self.CBplusD = libsp.block_sum(libsp.block_dot(self.SS.C, self.SS.B), self.SS.D)
 
@@ -2475,6 +2584,7 @@ class DynamicBlock(Dynamic):
 
         if u_n is not None:
             U_n = []
+            II0 = 0
             for ii in range(self.SS.blocks_u):
                 IIend = II0 + self.SS.S_u[ii]
                 U_n.append([u_n[II0:IIend]])
@@ -2513,6 +2623,35 @@ class DynamicBlock(Dynamic):
 
         return x_n1, np.block(Y_n1).reshape(-1)
 
+    def solve_step_merged(self, x_n, u_n, u_n1, transform_state=False):
+        """
+        Solve step of :func:`DynamicBlock.solve_step` with the operators merged by
+        :func:`DynamicBlock.assemble_step_operators`.
+        """
+
+        A = self.step_operators['A']
+        B = self.step_operators['B']
+        C = self.step_operators['C']
+
+        if self.remove_predictor:
+            if transform_state:
+                h_n1 = A.dot(x_n)
+            else:
+                h_n1 = A.dot(x_n + B.dot(u_n))
+
+            y_n1 = C.dot(h_n1) + self.step_operators['CBplusD'].dot(u_n1)
+
+            if transform_state:
+                x_n1 = h_n1 + B.dot(u_n1)
+            else:
+                x_n1 = h_n1
+
+        else:
+            x_n1 = A.dot(x_n) + B.dot(u_n1)
+            y_n1 = C.dot(x_n1) + self.step_operators['D'].dot(u_n1)
+
+        return x_n1, y_n1
+
 
 ################################################################################
 
@@ -2701,13 +2840,15 @@ class Frequency(Static):
 
         # Aero influence coeffs
         List_AICs, List_AICs_star = ass.AICs(MS.Surfs, MS.Surfs_star,
-                                             target='collocation', Project=True)
+                                             target='collocation', Project=True,
+                                             num_processes=self.num_processes)
         A0 = np.block(List_AICs)
         A0W = np.block(List_AICs_star)
         List_AICs, List_AICs_star = None, None
 
         # zeta derivs
-        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True)
+        List_nc_dqcdzeta = ass.nc_dqcdzeta(MS.Surfs, MS.Surfs_star, Merge=True,
+                                           num_processes=self.num_processes)
         List_uc_dncdzeta = ass.uc_dncdzeta(MS.Surfs)
         List_nc_domegazetadzeta_vert = ass.nc_domegazetadzeta(MS.Surfs, MS.Surfs_star)
         for ss in range(MS.n_surf):
@@ -2737,7 +2878,7 @@ class Frequency(Static):
 
         # gamma (induced velocity contrib.)
         List_dfqsdvind_gamma, List_dfqsdvind_gamma_star = \
-            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star)
+            ass.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
 
         # gamma (at constant relative velocity)
         List_dfqsdgamma_vrel0, List_dfqsdgamma_star_vrel0 = \
@@ -2767,7 +2908,7 @@ class Frequency(Static):
         Dss[:, :3 * Kzeta] = scalg.block_diag(
             *ass.dfqsdzeta_vrel0(MS.Surfs, MS.Surfs_star))
         # zeta (induced velocity contrib)
-        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star)
+        List_coll, List_vert = ass.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star, num_processes=self.num_processes)
         for ss in range(MS.n_surf):
             List_vert[ss][ss] += List_coll[ss]
         Dss[:, :3 * Kzeta] += np.block(List_vert)
@@ -0,0 +1,348 @@
+"""Block low-rank matrices
+
+Compressed storage of matrices made of (possibly overlapping) dense and low-rank blocks. The influence of well
+separated panels, e.g. of the far wake over the bound surfaces, is smooth and the associated blocks of the
+influence coefficient matrices are approximated by a product :math:`\\mathbf{U}\\mathbf{V}` of low rank through
+adaptive cross approximation (ACA).
+
+Classes:
+    - LowRankBlock: block in low-rank form :math:`\\mathbf{U}\\mathbf{V}`
+    - BlockLowRankMatrix: sum of dense and low-rank blocks placed in a matrix
+
+Methods:
+    - aca: adaptive cross approximation of a dense block
+"""
+
+import numpy as np
+import scipy.linalg as scalg
+import scipy.sparse as sparse
+
+
+class LowRankBlock(object):
+    """
+    Block in low-rank form ``U.dot(V)``, with ``U`` of shape ``(m, r)`` and ``V`` of shape ``(r, n)``.
+    """
+
+    def __init__(self, U, V):
+        self.U = U
+        self.V = V
+
+    @property
+    def shape(self):
+        return self.U.shape[0], self.V.shape[1]
+
+    @property
+    def rank(self):
+        return self.U.shape[1]
+
+    @property
+    def dtype(self):
+        return np.result_type(self.U, self.V)
+
+    @property
+    def nbytes(self):
+        return self.U.nbytes + self.V.nbytes
+
+    @property
+    def T(self):
+        return LowRankBlock(self.V.T, self.U.T)
+
+    def dot(self, X):
+        if sparse.issparse(X):
+            return self.U.dot(X.T.dot(self.V.T).T)
+        return self.U.dot(self.V.dot(X))
+
+    def todense(self):
+        return self.U.dot(self.V)
+
+    def copy(self):
+        return LowRankBlock(self.U.copy(), self.V.copy())
+
+    def __mul__(self, alpha):
+        return LowRankBlock(alpha * self.U, self.V)
+
+    def truncate(self, tol):
+        """
+        Recompresses the block to the singular values above ``tol`` times the largest.
+        """
+        if self.rank == 0:
+            return self
+        Qu, Ru = scalg.qr(self.U, mode='economic')
+        Qv, Rv = scalg.qr(self.V.T, mode='economic')
+        W, sv, Zh = scalg.svd(Ru.dot(Rv.T), full_matrices=False)
+        rank = max(np.sum(sv > tol * sv[0]), 1)
+        return LowRankBlock(Qu.dot(W[:, :rank] * sv[:rank]), Zh[:rank, :].dot(Qv.T))
+
+
+def aca(block, tol, max_rank=None):
+    """
+    Adaptive cross approximation with partial pivoting of the dense ``block``.
+
+    Args:
+        block (np.ndarray): matrix to approximate
+        tol (float): relative tolerance in Frobenius norm
+        max_rank (int): maximum rank. By default, the largest rank for which the low-rank form requires less storage
+
+    Returns:
+        LowRankBlock: low-rank approximation, or ``None`` if the tolerance is not met with up to ``max_rank`` terms.
+    """
+    m, n = block.shape
+    if max_rank is None:
+        max_rank = (m * n) // (m + n)
+    if max_rank < 1:
+        return None
+
+    U = np.zeros((m, max_rank), dtype=block.dtype)
+    V = np.zeros((max_rank, n), dtype=block.dtype)
+    used_rows = np.zeros((m,), dtype=bool)
+    norm2 = 0.
+    rank = 0
+    row = 0
+    converged = False
+    while rank < max_rank:
+        used_rows[row] = True
+        residual_row = block[row, :] - U[row, :rank].dot(V[:rank, :])
+        col = np.argmax(np.abs(residual_row))
+        if residual_row[col] == 0.:
+            if used_rows.all():
+                converged = True
+                break
+            row = np.argmin(used_rows)
+            continue
+
+        v = residual_row / residual_row[col]
+        u = block[:, col] - U[:, :rank].dot(V[:rank, col])
+
+        # estimate of the norm of the approximation
+        u_norm2 = np.vdot(u, u).real
+        v_norm2 = np.vdot(v, v).real
+        norm2 += u_norm2 * v_norm2 + 2. * np.real(np.vdot(V[:rank, :].conj().dot(v), U[:, :rank].conj().T.dot(u)))
+        U[:, rank] = u
+        V[rank, :] = v
+        rank += 1
+
+        if u_norm2 * v_norm2 <= tol ** 2 * norm2:
+            converged = True
+            break
+
+        u_abs = np.abs(u)
+        u_abs[used_rows] = -1.
+        row = np.argmax(u_abs)
+        if used_rows[row]:
+            converged = True
+            break
+
+    if not converged:
+        return None
+
+    approx = LowRankBlock(U[:, :rank], V[:rank, :]).truncate(0.1 * tol)
+    # the partially pivoted algorithm relies on an estimate of the error
+    if np.linalg.norm(block - approx.todense()) > tol * np.linalg.norm(block):
+        return None
+    return approx
+
+
+class BlockLowRankMatrix(object):
+    """
+    Matrix of ``shape`` given by the sum of dense (``np.ndarray``) and low-rank (``LowRankBlock``) blocks.
+
+    The blocks are stored as tuples ``(row, col, block)``, where ``row`` and ``col`` are the indices of the first
+    element of the block in the matrix. Blocks may overlap, in which case they are summed.
+
+    The matrix supports products with dense/sparse matrices and vectors (``dot``), transposition and scaling, so that
+    it can be used in place of dense matrices in the block state-space models of :mod:`sharpy.linear.src.libss`.
+    """
+
+    def __init__(self, shape, blocks=None):
+        self.shape = tuple(shape)
+        if blocks is None:
+            blocks = []
+        self.blocks = blocks
+
+    @property
+    def dtype(self):
+        if not self.blocks:
+            return np.dtype(np.float64)
+        return np.result_type(*[block.dtype for _, _, block in self.blocks])
+
+    @property
+    def nbytes(self):
+        return sum([block.nbytes for _, _, block in self.blocks])
+
+    @property
+    def compression(self):
+        """Ratio between the storage of the compressed matrix and of the dense one"""
+        return self.nbytes / (np.prod(self.shape) * self.dtype.itemsize)
+
+    @property
+    def T(self):
+        return BlockLowRankMatrix(self.shape[::-1], [(col, row, block.T) for row, col, block in self.blocks])
+
+    def add_block(self, row, col, block, tol=None):
+        """
+        Adds the dense ``block`` at position ``(row, col)``. If the tolerance ``tol`` is given, the block is stored in
+        low-rank form whenever this saves memory (see :func:`aca`).
+        """
+        assert row + block.shape[0] <= self.shape[0] and col + block.shape[1] <= self.shape[1], \
+            'Block exceeds the size of the matrix'
+        if tol is not None:
+            approx = aca(block, tol)
+            if approx is not None:
+                block = approx
+        self.blocks.append((row, col, block))
+
+    def dot(self, X):
+        """
+        Returns the dense product with the (dense or sparse) matrix or vector ``X``.
+        """
+        out = np.zeros((self.shape[0],) + X.shape[1:], dtype=np.result_type(self.dtype, X.dtype))
+        if sparse.issparse(X):
+            X = sparse.csr_matrix(X)
+        for row, col, block in self.blocks:
+            m, n = block.shape
+            X_block = X[col:col + n]
+            if sparse.issparse(X):
+                if isinstance(block, LowRankBlock):
+                    out[row:row + m] += block.dot(X_block)
+                else:
+                    out[row:row + m] += X_block.T.dot(block.T).T
+            else:
+                out[row:row + m] += block.dot(X_block)
+        return out
+
+    def dot_sparse(self, S):
+        """
+        Returns the product with the sparse matrix ``S`` in block low-rank form.
+
+        Every block is multiplied by the rows of ``S`` it spans and placed over the range of columns of the product
+        in which it is non-zero. This preserves the compression when ``S`` maps a block of columns into a block of
+        similar size, as the propagation of the wake circulation.
+        """
+        S = sparse.csr_matrix(S)
+        blocks = []
+        for row, col, block in self.blocks:
+            S_block = S[col:col + block.shape[1]]
+            if S_block.nnz == 0:
+                continue
+            col_min, col_max = S_block.indices.min(), S_block.indices.max()
+            S_block = S_block[:, col_min:col_max + 1]
+            if isinstance(block, LowRankBlock):
+                new_block = LowRankBlock(block.U, S_block.T.dot(block.V.T).T)
+            else:
+                new_block = S_block.T.dot(block.T).T
+            blocks.append((row, col_min, new_block))
+        return BlockLowRankMatrix((self.shape[0], S.shape[1]), blocks)
+
+    def lu_solve(self, lu_and_piv, tol=None):
+        """
+        Returns the solution ``X`` of ``A X = self``, where ``lu_and_piv`` is the LU factorisation of ``A`` (see
+        ``scipy.linalg.lu_factor``). The factors of the low-rank blocks are solved for, such that the compression is
+        preserved. Blocks spanning the same columns are merged and, if ``tol`` is given, the low-rank ones are
+        recompressed.
+        """
+        nrows = self.shape[0]
+        merged = dict()
+        for row, col, block in self.blocks:
+            if isinstance(block, LowRankBlock):
+                rhs = np.zeros((nrows, block.rank), dtype=block.dtype)
+                rhs[row:row + block.shape[0]] = block.U
+                new_block = LowRankBlock(scalg.lu_solve(lu_and_piv, rhs), block.V)
+            else:
+                rhs = np.zeros((nrows, block.shape[1]), dtype=block.dtype)
+                rhs[row:row + block.shape[0]] = block
+                new_block = scalg.lu_solve(lu_and_piv, rhs)
+
+            key = (col, new_block.shape[1], isinstance(new_block, LowRankBlock))
+            if key not in merged:
+                merged[key] = new_block
+            elif isinstance(new_block, LowRankBlock):
+                merged[key] = LowRankBlock(np.hstack((merged[key].U, new_block.U)),
+                                           np.vstack((merged[key].V, new_block.V)))
+            else:
+                merged[key] = merged[key] + new_block
+
+        blocks = []
+        for (col, _, _), block in merged.items():
+            if isinstance(block, LowRankBlock):
+                if tol is not None:
+                    block = block.truncate(tol)
+                if block.rank * sum(block.shape) >= np.prod(block.shape):
+                    block = block.todense()
+            blocks.append((0, col, block))
+        return BlockLowRankMatrix(self.shape, blocks)
+
+    def todense(self):
+        out = np.zeros(self.shape, dtype=self.dtype)
+        for row, col, block in self.blocks:
+            m, n = block.shape
+            if isinstance(block, LowRankBlock):
+                out[row:row + m, col:col + n] += block.todense()
+            else:
+                out[row:row + m, col:col + n] += block
+        return out
+
+    def copy(self):
+        return BlockLowRankMatrix(self.shape, [(row, col, block.copy()) for row, col, block in self.blocks])
+
+    def __mul__(self, alpha):
+        return BlockLowRankMatrix(self.shape, [(row, col, block * alpha) for row, col, block in self.blocks])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, alpha):
+        return self * (1. / alpha)
+
+    def __imul__(self, alpha):
+        self.blocks = (self * alpha).blocks
+        return self
+
+    def __itruediv__(self, alpha):
+        return self.__imul__(1. / alpha)
+
+    def __neg__(self):
+        return self * -1.
+
+
+if __name__ == '__main__':
+
+    import unittest
+
+    class Test_lowrank(unittest.TestCase):
+        """ Test methods into this module """
+
+        def setUp(self):
+            # smooth kernel between well separated sets of points
+            x_out = np.random.rand(30)
+            x_in = 5. + np.random.rand(80)
+            self.kernel = 1. / np.abs(x_out[:, None] - x_in[None, :])
+
+        def test_aca(self):
+            approx = aca(self.kernel, 1e-8)
+            assert approx is not None, 'Kernel not compressed'
+            assert approx.rank < 15, 'Unexpected rank %d' % approx.rank
+            error = np.linalg.norm(approx.todense() - self.kernel) / np.linalg.norm(self.kernel)
+            assert error < 1e-8, 'Error in aca (%.2e)' % error
+
+        def test_block_low_rank(self):
+            near = np.random.rand(30, 20)
+            M = BlockLowRankMatrix((30, 100))
+            M.add_block(0, 0, near)
+            M.add_block(0, 20, self.kernel, tol=1e-10)
+            Mdense = np.block([near, self.kernel])
+            assert M.compression < 1., 'Matrix not compressed'
+
+            X = np.random.rand(100, 3)
+            S = sparse.random(100, 40, density=0.1, format='csc')
+            A = np.random.rand(30, 30) + 30. * np.eye(30)
+            lu_and_piv = scalg.lu_factor(A)
+
+            assert np.max(np.abs(M.dot(X) - Mdense.dot(X))) < 1e-8, 'Error in dot'
+            assert np.max(np.abs(M.dot(S) - Mdense.dot(S.toarray()))) < 1e-8, 'Error in dot with sparse'
+            assert np.max(np.abs(M.T.dot(X[:30]) - Mdense.T.dot(X[:30]))) < 1e-8, 'Error in transpose'
+            assert np.max(np.abs(M.dot_sparse(S).todense() - Mdense.dot(S.toarray()))) < 1e-8, \
+                'Error in dot_sparse'
+            assert np.max(np.abs(M.lu_solve(lu_and_piv).todense() - scalg.lu_solve(lu_and_piv, Mdense))) < 1e-8, \
+                'Error in lu_solve'
+            assert np.max(np.abs((-2. * M).todense() + 2. * Mdense)) < 1e-8, 'Error in scaling'
+
+    unittest.main()
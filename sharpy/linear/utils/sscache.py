@@ -0,0 +1,217 @@
+"""Linearised System Cache
+
+On-disk cache of assembled (and reduced) linear systems, addressed by the linearisation reference.
+
+The key of a linearisation is the hash of the structural and aerodynamic time steps about which the system is
+linearised (including the modes and structural matrices of the reference), the settings of the linear system and the
+version of the code, which accounts for uncommitted changes to the sources. Each key has its own HDF5 file in the cache
+folder, in which the linear systems (:class:`sharpy.linear.src.libss.ss`) and gain matrices are stored by name. Sparse
+matrices are stored in compressed sparse column format and dense ones are compressed. Every entry is only read from
+disk when it is requested.
+"""
+import ctypes as ct
+import hashlib
+import json
+import os
+import subprocess
+
+import h5py as h5
+import numpy as np
+import scipy.sparse as sp
+
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.sharpydir as sharpydir
+
+struct_key_variables = ['pos', 'psi', 'quat', 'for_pos', 'for_vel', 'steady_applied_forces', 'gravity_forces',
+                        'q', 'dqdt']
+aero_key_variables = ['zeta', 'zeta_dot', 'zeta_star', 'gamma', 'gamma_star', 'gamma_dot', 'u_ext', 'forces']
+modal_key_variables = ['eigenvalues', 'eigenvectors', 'eigenvectors_left', 'Kin_damp', 'Ccut', 'M', 'C', 'K']
+
+
+def code_version():
+    """
+    Returns the git revision of the code (``'unknown'`` if it is not available) followed by the hash of the python
+    sources of the ``sharpy`` package, so that uncommitted changes also give a new version.
+    """
+    try:
+        revision = cout.get_git_revision_hash()
+    except (subprocess.CalledProcessError, OSError):
+        revision = 'unknown'
+
+    digest = hashlib.sha256()
+    package_dir = os.path.join(sharpydir.SharpyDir, 'sharpy')
+    for root, _, files in sorted(os.walk(package_dir)):
+        for file_name in sorted(files):
+            if not file_name.endswith('.py'):
+                continue
+            file_path = os.path.join(root, file_name)
+            digest.update(os.path.relpath(file_path, package_dir).encode('utf-8'))
+            with open(file_path, 'rb') as source:
+                digest.update(source.read())
+
+    return revision + '-' + digest.hexdigest()
+
+
+def _settings_to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, ct._SimpleCData):
+        return value.value
+    return str(value)
+
+
+def _update_digest(digest, name, value):
+    if value is None:
+        return
+    if not isinstance(value, list):
+        value = [value]
+    digest.update(name.encode('utf-8'))
+    for array in value:
+        if sp.issparse(array):
+            array = array.toarray()
+        array = np.ascontiguousarray(array)
+        if not np.iscomplexobj(array):
+            array = array.astype(float)
+        digest.update(str(array.shape).encode('utf-8'))
+        digest.update(array.tobytes())
+
+
+def linearisation_key(tsstruct0, tsaero0, linear_settings, version=None):
+    """
+    Hash of the linearisation reference.
+
+    Args:
+        tsstruct0 (sharpy.utils.datastructures.StructTimeStepInfo): linearisation structural time step
+        tsaero0 (sharpy.utils.datastructures.AeroTimeStepInfo): linearisation aerodynamic time step
+        linear_settings (dict): settings that define the linear system
+        version (str): version of the code. By default, given by :func:`code_version`
+
+    Returns:
+        str: hexadecimal ``sha256`` digest
+    """
+    if version is None:
+        version = code_version()
+
+    digest = hashlib.sha256()
+    digest.update(version.encode('utf-8'))
+    digest.update(json.dumps(linear_settings, sort_keys=True, default=_settings_to_json).encode('utf-8'))
+
+    for tstep, variables in ((tsstruct0, struct_key_variables), (tsaero0, aero_key_variables)):
+        for name in variables:
+            _update_digest(digest, name, getattr(tstep, name, None))
+
+    # the modes and structural matrices (if kept by the modal solver) from which the linear beam is built
+    modal = getattr(tsstruct0, 'modal', None)
+    if modal is not None:
+        for name in modal_key_variables:
+            _update_digest(digest, 'modal/' + name, modal.get(name, None))
+
+    return digest.hexdigest()
+
+
+class LinearSystemCache(object):
+    """
+    Cache entry of one linearisation reference, stored in ``<folder>/<key>.h5``.
+
+    Args:
+        folder (str): cache folder
+        key (str): linearisation key (see :func:`linearisation_key`)
+    """
+    def __init__(self, folder, key):
+        self.folder = folder
+        self.key = key
+        self.filename = os.path.join(folder, key + '.h5')
+
+    def __contains__(self, name):
+        if not os.path.isfile(self.filename):
+            return False
+        with h5.File(self.filename, 'r') as hdfile:
+            return name in hdfile
+
+    def save_ss(self, name, ss):
+        """
+        Stores the state-space system ``ss`` under ``name``.
+        """
+        with self.open_group(name) as grp:
+            for matrix_name in ['A', 'B', 'C', 'D']:
+                self.write_matrix(grp, matrix_name, getattr(ss, matrix_name))
+            if ss.dt is not None:
+                grp.attrs['dt'] = ss.dt
+
+    def load_ss(self, name):
+        """
+        Returns the state-space system stored under ``name``.
+
+        Returns:
+            sharpy.linear.src.libss.ss: state-space system
+        """
+        with h5.File(self.filename, 'r') as hdfile:
+            grp = hdfile[name]
+            matrices = [self.read_matrix(grp[matrix_name]) for matrix_name in ['A', 'B', 'C', 'D']]
+            dt = grp.attrs.get('dt', None)
+        if dt is not None:
+            dt = float(dt)
+        return libss.ss(*matrices, dt=dt)
+
+    def save_matrix(self, name, matrix):
+        """
+        Stores the dense or sparse ``matrix`` under ``name``.
+        """
+        with self.open_group('matrices') as grp:
+            self.write_matrix(grp, name, matrix)
+
+    def load_matrix(self, name):
+        """
+        Returns the matrix stored under ``name``.
+        """
+        with h5.File(self.filename, 'r') as hdfile:
+            return self.read_matrix(hdfile['matrices'][name])
+
+    def has_matrix(self, name):
+        return ('matrices/' + name) in self
+
+    def open_group(self, name):
+        return _CacheGroup(self.filename, name)
+
+    @staticmethod
+    def write_matrix(grp, name, matrix):
+        if name in grp:
+            del grp[name]
+        if sp.issparse(matrix):
+            matrix = sp.csc_matrix(matrix)
+            sub_grp = grp.create_group(name)
+            sub_grp.attrs['shape'] = matrix.shape
+            for array_name in ['data', 'indices', 'indptr']:
+                sub_grp.create_dataset(array_name, data=getattr(matrix, array_name), compression='gzip')
+        else:
+            matrix = np.asarray(matrix)
+            grp.create_dataset(name, data=matrix, compression='gzip' if matrix.size else None)
+
+    @staticmethod
+    def read_matrix(item):
+        if isinstance(item, h5.Group):
+            return libsp.csc_matrix((item['data'][()], item['indices'][()], item['indptr'][()]),
+                                    shape=tuple(item.attrs['shape']))
+        return item[()]
+
+
+class _CacheGroup(object):
+    """
+    Context manager that opens the cache file for writing and returns the (new) group ``name``.
+    """
+    def __init__(self, filename, name):
+        self.filename = filename
+        self.name = name
+        self.hdfile = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        self.hdfile = h5.File(self.filename, 'a')
+        if self.name in self.hdfile and self.name != 'matrices':
+            del self.hdfile[self.name]
+        return self.hdfile.require_group(self.name)
+
+    def __exit__(self, *args):
+        self.hdfile.close()
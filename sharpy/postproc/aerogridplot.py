@@ -1,7 +1,9 @@
+import ctypes as ct
 import os
 
 import numpy as np
 from tvtk.api import tvtk, write_data
+from tvtk.common import configure_input
 
 import sharpy.utils.algebra as algebra
 import sharpy.utils.cout_utils as cout
@@ -16,6 +18,11 @@ class AerogridPlot(BaseSolver):
     """
     Aerodynamic Grid Plotter
 
+    Writes the lattice of every surface and its wake, with the panel and vertex variables, to one file per surface and
+    time step in the ``aero`` folder of the case. By default these are legacy ``.vtk`` files. With ``format = 'vtu'``
+    they are compressed binary XML ``.vtu`` files, which can also be gathered into one ``.pvd`` time series for the
+    body and another for the wake.
+
     """
     solver_id = 'AerogridPlot'
     solver_classification = 'post-processor'
@@ -23,6 +30,7 @@ class AerogridPlot(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['folder'] = 'str'
     settings_default['folder'] = './output'
@@ -59,8 +67,18 @@ class AerogridPlot(BaseSolver):
     settings_types['num_cores'] = 'int'
     settings_default['num_cores'] = 1
 
+    settings_types['format'] = 'str'
+    settings_default['format'] = 'vtk'
+    settings_description['format'] = 'Write legacy ``.vtk`` files or compressed binary XML ``.vtu`` files'
+    settings_options['format'] = ['vtk', 'vtu']
+
+    settings_types['write_pvd'] = 'bool'
+    settings_default['write_pvd'] = False
+    settings_description['write_pvd'] = 'Gather the ``.vtu`` files of the body and wake into ``.pvd`` time series'
+
     table = settings.SettingsTable()
-    __doc__ += table.generate(settings_types, settings_default, settings_description)
+    __doc__ += table.generate(settings_types, settings_default, settings_description,
+                              settings_options=settings_options)
 
     def __init__(self):
         self.settings = None
@@ -71,13 +89,20 @@ class AerogridPlot(BaseSolver):
         self.wake_filename = ''
         self.ts_max = 0
 
+        # panel connectivities, by lattice dimensions
+        self.connectivities = dict()
+        # (time, surface, file) entries of the .pvd series
+        self.body_series = []
+        self.wake_series = []
+
     def initialise(self, data, custom_settings=None):
         self.data = data
         if custom_settings is None:
             self.settings = data.settings[self.solver_id]
         else:
             self.settings = custom_settings
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default,
+                                 options=self.settings_options)
         self.ts_max = self.data.ts + 1
         # create folder for containing files if necessary
         if not os.path.exists(self.settings['folder']):
@@ -107,99 +132,139 @@ class AerogridPlot(BaseSolver):
             self.ts = np.max((aero_tsteps, struct_tsteps))
             self.plot_body()
             self.plot_wake()
+        if self.settings['write_pvd'] and self.settings['format'] == 'vtu':
+            self.write_series(self.body_filename + '.pvd', self.body_series)
+            self.write_series(self.wake_filename + '.pvd', self.wake_series)
         return self.data
 
+    def get_connectivities(self, dims):
+        """
+        Returns the vertices of the quadrilateral panels of a lattice of ``dims`` panels.
+
+        Vertices and panels are numbered with the chordwise index running fastest.
+        """
+        dims = (int(dims[0]), int(dims[1]))
+        try:
+            return self.connectivities[dims]
+        except KeyError:
+            pass
+
+        m, n = dims
+        i_n, i_m = np.meshgrid(np.arange(n), np.arange(m), indexing='ij')
+        node = (i_n*(m + 1) + i_m).reshape(-1)
+        conn = np.column_stack((node, node + 1, node + m + 2, node + m + 1))
+        self.connectivities[dims] = conn
+        return conn
+
+    @staticmethod
+    def vector_array(array, m, n):
+        """
+        Returns the first ``m`` by ``n`` entries of the ``[3, M, N]`` ``array`` of a surface as an ``[m*n, 3]`` array.
+        """
+        return np.array(array[0:3, 0:m, 0:n].transpose(2, 1, 0).reshape(-1, 3))
+
+    @staticmethod
+    def scalar_array(array, m, n):
+        """
+        Returns the first ``m`` by ``n`` entries of the ``[M, N]`` ``array`` of a surface as an ``[m*n]`` array.
+        """
+        return np.array(array[0:m, 0:n].T.reshape(-1))
+
+    def get_coordinates(self, zeta, m, n):
+        coords = self.vector_array(zeta, m + 1, n + 1)
+        if self.settings['include_rbm']:
+            coords += self.data.structure.timestep_info[self.ts].for_pos[0:3]
+        if self.settings['include_forward_motion']:
+            coords[:, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
+        return coords
+
+    def write_grid(self, ug, filename, series, i_surf):
+        if self.settings['format'] == 'vtk':
+            write_data(ug, filename)
+            return
+
+        filename += '.vtu'
+        writer = tvtk.XMLUnstructuredGridWriter(file_name=filename)
+        writer.set_data_mode_to_appended()
+        writer.encode_appended_data = False
+        writer.set_compressor_type_to_z_lib()
+        configure_input(writer, ug)
+        writer.write()
+
+        if self.settings['write_pvd']:
+            if self.settings['dt'].value > 0.:
+                time = self.ts*self.settings['dt'].value
+            else:
+                time = self.ts
+            series.append((time, i_surf, os.path.basename(filename)))
+
+    @staticmethod
+    def write_series(filename, series):
+        """
+        Writes the ``.pvd`` collection of the ``(time, surface, file)`` entries of ``series``.
+        """
+        with open(filename, 'w') as pvd:
+            pvd.write('<?xml version="1.0"?>\n')
+            pvd.write('<VTKFile type="Collection" version="0.1" byte_order="LittleEndian">\n')
+            pvd.write('  <Collection>\n')
+            for time, i_surf, dataset in series:
+                pvd.write('    <DataSet timestep="%.12g" part="%u" file="%s"/>\n' % (time, i_surf, dataset))
+            pvd.write('  </Collection>\n')
+            pvd.write('</VTKFile>\n')
+
     def plot_body(self):
-        for i_surf in range(self.data.aero.timestep_info[self.ts].n_surf):
+        aero_tstep = self.data.aero.timestep_info[self.ts]
+        for i_surf in range(aero_tstep.n_surf):
             filename = (self.body_filename +
                         '_' +
                         '%02u_' % i_surf +
                         '%06u' % self.ts)
 
-            dims = self.data.aero.timestep_info[self.ts].dimensions[i_surf, :]
-            point_data_dim = (dims[0]+1)*(dims[1]+1)  # + (dims_star[0]+1)*(dims_star[1]+1)
-            panel_data_dim = (dims[0])*(dims[1])  # + (dims_star[0])*(dims_star[1])
-
-            coords = np.zeros((point_data_dim, 3))
-            conn = []
-            panel_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_surf_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_gamma = np.zeros((panel_data_dim,))
-            panel_gamma_dot = np.zeros((panel_data_dim,))
-            normal = np.zeros((panel_data_dim, 3))
-            point_struct_id = np.zeros((point_data_dim,), dtype=int)
-            point_cf = np.zeros((point_data_dim, 3))
+            m, n = aero_tstep.dimensions[i_surf, :]
+            point_data_dim = (m + 1)*(n + 1)
+            panel_data_dim = m*n
+
+            # coordinates of corners
+            coords = self.get_coordinates(aero_tstep.zeta[i_surf], m, n)
+            conn = self.get_connectivities((m, n))
+
+            # point data
+            point_struct_id = np.repeat(np.array(self.data.aero.aero2struct_mapping[i_surf], dtype=int), m + 1)
+            point_cf = self.vector_array(aero_tstep.forces[i_surf], m + 1, n + 1)
             point_unsteady_cf = np.zeros((point_data_dim, 3))
             zeta_dot = np.zeros((point_data_dim, 3))
             u_inf = np.zeros((point_data_dim, 3))
-            if self.settings['include_velocities']:
-                vel = np.zeros((point_data_dim, 3))
-            counter = -1
+            try:
+                point_unsteady_cf = self.vector_array(aero_tstep.dynamic_forces[i_surf], m + 1, n + 1)
+            except AttributeError:
+                pass
+            try:
+                zeta_dot = self.vector_array(aero_tstep.zeta_dot[i_surf], m + 1, n + 1)
+            except AttributeError:
+                pass
+            try:
+                u_inf = self.vector_array(aero_tstep.u_ext[i_surf], m + 1, n + 1)
+            except AttributeError:
+                pass
 
-            # coordinates of corners
-            for i_n in range(dims[1]+1):
-                for i_m in range(dims[0]+1):
-                    counter += 1
-                    coords[counter, :] = self.data.aero.timestep_info[self.ts].zeta[i_surf][:, i_m, i_n]
-                    if self.settings['include_rbm']:
-                        coords[counter, :] += self.data.structure.timestep_info[self.ts].for_pos[0:3]
-                    if self.settings['include_forward_motion']:
-                        coords[counter, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
+            # cell data
+            panel_id = np.arange(panel_data_dim)
+            panel_surf_id = np.full((panel_data_dim,), i_surf, dtype=int)
+            panel_gamma = self.scalar_array(aero_tstep.gamma[i_surf], m, n)
+            panel_gamma_dot = self.scalar_array(aero_tstep.gamma_dot[i_surf], m, n)
+            normal = self.vector_array(aero_tstep.normals[i_surf], m, n)
 
             with_incidence_angle = True
             try:
-                self.data.aero.timestep_info[self.ts].postproc_cell['incidence_angle']
+                incidence_angle = self.scalar_array(aero_tstep.postproc_cell['incidence_angle'][i_surf], m, n)
             except KeyError:
                 with_incidence_angle = False
-            else:
-                incidence_angle = np.zeros_like(panel_gamma)
-
-            counter = -1
-            node_counter = -1
-            for i_n in range(dims[1] + 1):
-                global_counter = self.data.aero.aero2struct_mapping[i_surf][i_n]
-                for i_m in range(dims[0] + 1):
-                    node_counter += 1
-                    # point data
-                    point_struct_id[node_counter] = global_counter
-                    point_cf[node_counter, :] = self.data.aero.timestep_info[self.ts].forces[i_surf][0:3, i_m, i_n]
-                    try:
-                        point_unsteady_cf[node_counter, :] = self.data.aero.timestep_info[self.ts].dynamic_forces[i_surf][0:3, i_m, i_n]
-                    except AttributeError:
-                        pass
-                    try:
-                        zeta_dot[node_counter, :] = self.data.aero.timestep_info[self.ts].zeta_dot[i_surf][0:3, i_m, i_n]
-                    except AttributeError:
-                        pass
-                    try:
-                        u_inf[node_counter, :] = self.data.aero.timestep_info[self.ts].u_ext[i_surf][0:3, i_m, i_n]
-                    except AttributeError:
-                        pass
-                    if i_n < dims[1] and i_m < dims[0]:
-                        counter += 1
-                    else:
-                        continue
-
-                    conn.append([node_counter + 0,
-                                 node_counter + 1,
-                                 node_counter + dims[0]+2,
-                                 node_counter + dims[0]+1])
-                    # cell data
-                    normal[counter, :] = self.data.aero.timestep_info[self.ts].normals[i_surf][:, i_m, i_n]
-                    panel_id[counter] = counter
-                    panel_surf_id[counter] = i_surf
-                    panel_gamma[counter] = self.data.aero.timestep_info[self.ts].gamma[i_surf][i_m, i_n]
-                    panel_gamma_dot[counter] = self.data.aero.timestep_info[self.ts].gamma_dot[i_surf][i_m, i_n]
-
-                    if with_incidence_angle:
-                        incidence_angle[counter] = \
-                            self.data.aero.timestep_info[self.ts].postproc_cell['incidence_angle'][i_surf][i_m, i_n]
 
             if self.settings['include_velocities']:
-                vel = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(self.data.aero.timestep_info[self.ts],
-                                                                                              coords,
-                                                                                              self.data.aero.timestep_info[self.ts].for_pos,
-                                                                                              self.settings['numcores'])
+                vel = uvlmlib.uvlm_calculate_total_induced_velocity_at_points(aero_tstep,
+                                                                              coords,
+                                                                              aero_tstep.for_pos,
+                                                                              ct.c_uint(self.settings['num_cores'].value))
 
             ug = tvtk.UnstructuredGrid(points=coords)
             ug.set_cells(tvtk.Quad().cell_type, conn)
@@ -231,57 +296,28 @@ class AerogridPlot(BaseSolver):
             if self.settings['include_velocities']:
                 ug.point_data.add_array(vel)
                 ug.point_data.get_array(6).name = 'velocity'
-            write_data(ug, filename)
+            self.write_grid(ug, filename, self.body_series, i_surf)
 
     def plot_wake(self):
-        for i_surf in range(self.data.aero.timestep_info[self.ts].n_surf):
+        aero_tstep = self.data.aero.timestep_info[self.ts]
+        for i_surf in range(aero_tstep.n_surf):
             filename = (self.wake_filename +
                         '_' +
                         '%02u_' % i_surf +
                         '%06u' % self.ts)
 
-            dims_star = self.data.aero.timestep_info[self.ts].dimensions_star[i_surf, :]
-            dims_star[0] -= self.settings['minus_m_star']
-
-            point_data_dim = (dims_star[0]+1)*(dims_star[1]+1)
-            panel_data_dim = (dims_star[0])*(dims_star[1])
+            m_star, n_star = aero_tstep.dimensions_star[i_surf, :]
+            m_star -= self.settings['minus_m_star'].value
+            panel_data_dim = m_star*n_star
 
-            coords = np.zeros((point_data_dim, 3))
-            conn = []
-            panel_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_surf_id = np.zeros((panel_data_dim,), dtype=int)
-            panel_gamma = np.zeros((panel_data_dim,))
-            counter = -1
-            # rotation_mat = self.data.structure.timestep_info[self.ts].cga().T
             # coordinates of corners
-            for i_n in range(dims_star[1]+1):
-                for i_m in range(dims_star[0]+1):
-                    counter += 1
-                    coords[counter, :] = self.data.aero.timestep_info[self.ts].zeta_star[i_surf][:, i_m, i_n]
-                    if self.settings['include_rbm']:
-                        coords[counter, :] += self.data.structure.timestep_info[self.ts].for_pos[0:3]
-                    if self.settings['include_forward_motion']:
-                        coords[counter, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
-
-            counter = -1
-            node_counter = -1
-            # wake
-            for i_n in range(dims_star[1]+1):
-                for i_m in range(dims_star[0]+1):
-                    node_counter += 1
-                    # cell data
-                    if i_n < dims_star[1] and i_m < dims_star[0]:
-                        counter += 1
-                    else:
-                        continue
-
-                    conn.append([node_counter + 0,
-                                 node_counter + 1,
-                                 node_counter + dims_star[0]+2,
-                                 node_counter + dims_star[0]+1])
-                    panel_id[counter] = counter
-                    panel_surf_id[counter] = i_surf
-                    panel_gamma[counter] = self.data.aero.timestep_info[self.ts].gamma_star[i_surf][i_m, i_n]
+            coords = self.get_coordinates(aero_tstep.zeta_star[i_surf], m_star, n_star)
+            conn = self.get_connectivities((m_star, n_star))
+
+            # cell data
+            panel_id = np.arange(panel_data_dim)
+            panel_surf_id = np.full((panel_data_dim,), i_surf, dtype=int)
+            panel_gamma = self.scalar_array(aero_tstep.gamma_star[i_surf], m_star, n_star)
 
             ug = tvtk.UnstructuredGrid(points=coords)
             ug.set_cells(tvtk.Quad().cell_type, conn)
@@ -293,4 +329,4 @@ class AerogridPlot(BaseSolver):
             ug.cell_data.get_array(2).name = 'panel_gamma'
             ug.point_data.scalars = np.arange(0, coords.shape[0])
             ug.point_data.scalars.name = 'n_id'
-            write_data(ug, filename)
+            self.write_grid(ug, filename, self.wake_series, i_surf)
@@ -1,7 +1,10 @@
 import os
+import collections
+import concurrent.futures
 import warnings as warn
 import numpy as np
 import scipy.linalg as sclalg
+import scipy.optimize as scopt
 import sharpy.utils.settings as settings
 from sharpy.utils.solver_interface import solver, BaseSolver, initialise_solver
 import sharpy.utils.cout_utils as cout
@@ -9,6 +12,7 @@ import sharpy.utils.algebra as algebra
 import sharpy.solvers.lindynamicsim as lindynamicsim
 import sharpy.structure.utils.modalutils as modalutils
 import scipy.sparse as scsp
+import scipy.sparse.linalg as scsplalg
 
 
 @solver
@@ -63,7 +67,26 @@ class AsymptoticStability(BaseSolver):
 
     settings_types['iterative_eigvals'] = 'bool'
     settings_default['iterative_eigvals'] = False
-    settings_description['iterative_eigvals'] = 'Calculate the first ``num_evals`` using an iterative solver.'
+    settings_description['iterative_eigvals'] = 'Calculate the first ``num_evals`` using an iterative solver. In the ' \
+                                                '``velocity_analysis``, shift-invert Arnoldi is used to find the ' \
+                                                '``num_evals`` eigenvalues closest to the unit circle point ``z=1``'
+
+    settings_types['num_cores'] = 'int'
+    settings_default['num_cores'] = 1
+    settings_description['num_cores'] = 'Number of threads among which the eigenvalue problems of the ' \
+                                        '``velocity_analysis`` are distributed'
+
+    settings_types['track_modes'] = 'bool'
+    settings_default['track_modes'] = False
+    settings_description['track_modes'] = 'Track the ``num_evals`` least stable modes between consecutive velocities ' \
+                                          'of the ``velocity_analysis``'
+
+    settings_types['velocity_refinement_tolerance'] = 'float'
+    settings_default['velocity_refinement_tolerance'] = 0.
+    settings_description['velocity_refinement_tolerance'] = 'Refine the ``velocity_analysis`` grid where the ' \
+                                                            'number of unstable eigenvalues changes, until the ' \
+                                                            'interval is smaller than this value. ``0`` for no ' \
+                                                            'refinement'
 
     settings_types['num_evals'] = 'int'
     settings_default['num_evals'] = 200
@@ -231,6 +254,15 @@ class AsymptoticStability(BaseSolver):
         self.eigenvalue_table.print_evals(self.eigenvalues[:self.settings['num_evals']])
 
     def velocity_analysis(self):
+        """
+        Computes the continuous time eigenvalues of the aeroelastic system for the range of free stream velocities
+        given in ``velocity_analysis``.
+
+        The eigenvalue problems are solved in ``num_cores`` threads while the system is updated for the following
+        velocities. If ``velocity_refinement_tolerance`` is set, the velocity grid is bisected where the number of
+        unstable eigenvalues changes. If ``track_modes`` is on, the ``num_evals`` least stable modes are followed
+        between consecutive velocities.
+        """
 
         ulb, uub, num_u = self.settings['velocity_analysis']
 
@@ -242,22 +274,17 @@ class AsymptoticStability(BaseSolver):
 
         u_inf_vec = np.linspace(ulb, uub, int(num_u))
 
+        eigenvalues = self.sweep_eigenvalues(u_inf_vec)
+        if self.settings['velocity_refinement_tolerance'] > 0:
+            self.refine_velocity_grid(eigenvalues, self.settings['velocity_refinement_tolerance'])
+        u_inf_vec = np.array(sorted(eigenvalues.keys()))
+
         real_part_plot = []
         imag_part_plot = []
         uinf_part_plot = []
 
         for i in range(len(u_inf_vec)):
-            ss_aeroelastic = self.data.linear.linear_system.update(u_inf_vec[i])
-
-            eigs, eigenvectors = sclalg.eig(ss_aeroelastic.A)
-
-            eigs, eigenvectors = self.sort_eigenvalues(eigs, eigenvectors)
-
-            # Obtain dimensional time
-            dt_dimensional = self.data.linear.linear_system.uvlm.sys.ScalingFacts['length'] / u_inf_vec[i] \
-                             * ss_aeroelastic.dt
-
-            eigs_cont = np.log(eigs) / dt_dimensional
+            eigs_cont = eigenvalues[u_inf_vec[i]]
             Nunst = np.sum(eigs_cont.real > 0)
             fn = np.abs(eigs_cont)
 
@@ -278,7 +305,6 @@ class AsymptoticStability(BaseSolver):
         cout.cout_wrap('Saving velocity analysis results...')
         np.savetxt(self.folder + '/velocity_analysis_min%04d_max%04d_nvel%04d.dat' %(ulb*10, uub*10, num_u),
                    np.concatenate((uinf_part_plot, real_part_plot, imag_part_plot)).reshape((-1, 3), order='F'))
-        cout.cout_wrap('\tSuccessful', 1)
 
         self.velocity_results = dict()
         self.data.linear.stability['velocity_results'] = dict()
@@ -286,6 +312,131 @@ class AsymptoticStability(BaseSolver):
         self.data.linear.stability['velocity_results']['evals_real'] = real_part_plot
         self.data.linear.stability['velocity_results']['evals_imag'] = imag_part_plot
 
+        if self.settings['track_modes']:
+            tracked_modes = self.track_modes([eigenvalues[u_inf] for u_inf in u_inf_vec], self.num_evals)
+            np.savetxt(self.folder + '/velocity_analysis_tracked_min%04d_max%04d_nvel%04d.dat' % (ulb*10, uub*10, num_u),
+                       np.column_stack((u_inf_vec, tracked_modes.view(float))))
+            self.data.linear.stability['velocity_results']['u_inf_tracked'] = u_inf_vec
+            self.data.linear.stability['velocity_results']['tracked_modes'] = tracked_modes
+        cout.cout_wrap('\tSuccessful', 1)
+
+    def sweep_eigenvalues(self, u_inf_vec, eigenvalues=None):
+        """
+        Computes the continuous time eigenvalues of the aeroelastic system at the free stream velocities
+        ``u_inf_vec``.
+
+        The system is updated for every velocity in this thread, while the eigenvalue problems are solved in a pool
+        of ``num_cores`` threads. At most ``num_cores`` systems are waiting to be solved at any time.
+
+        Args:
+            u_inf_vec (np.ndarray): free stream velocities
+            eigenvalues (dict): dictionary to which the results are added
+
+        Returns:
+            dict: continuous time eigenvalues for every velocity
+        """
+        if eigenvalues is None:
+            eigenvalues = dict()
+
+        num_cores = max(self.settings['num_cores'], 1)
+        pending = collections.deque()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_cores) as executor:
+            for u_inf in u_inf_vec:
+                ss_aeroelastic = self.data.linear.linear_system.update(u_inf)
+
+                # Obtain dimensional time
+                dt_dimensional = self.data.linear.linear_system.uvlm.sys.ScalingFacts['length'] / u_inf \
+                                 * ss_aeroelastic.dt
+
+                while len(pending) >= num_cores:
+                    u_done, future = pending.popleft()
+                    eigenvalues[u_done] = future.result()
+                pending.append((u_inf, executor.submit(self.continuous_time_eigenvalues,
+                                                       ss_aeroelastic.A,
+                                                       dt_dimensional,
+                                                       self.settings['iterative_eigvals'],
+                                                       self.num_evals)))
+            for u_done, future in pending:
+                eigenvalues[u_done] = future.result()
+
+        return eigenvalues
+
+    def refine_velocity_grid(self, eigenvalues, tolerance, max_iter=20):
+        """
+        Bisects the velocity intervals in which the number of unstable eigenvalues changes until they are smaller
+        than ``tolerance``.
+
+        Args:
+            eigenvalues (dict): continuous time eigenvalues for every velocity, updated with the new velocities
+            tolerance (float): velocity interval below which the intervals are not bisected
+            max_iter (int): maximum number of bisections
+        """
+        for i_iter in range(max_iter):
+            u_inf_vec = np.array(sorted(eigenvalues.keys()))
+            num_unstable = np.array([np.sum(eigenvalues[u_inf].real > 0) for u_inf in u_inf_vec])
+            crossings = np.where((num_unstable[1:] != num_unstable[:-1]) &
+                                 (np.diff(u_inf_vec) > tolerance))[0]
+            if len(crossings) == 0:
+                break
+
+            u_inf_new = 0.5*(u_inf_vec[crossings] + u_inf_vec[crossings + 1])
+            if self.settings['print_info']:
+                cout.cout_wrap('Refining the velocity analysis at: ' + len(u_inf_new)*'%.4f ' % tuple(u_inf_new), 1)
+            self.sweep_eigenvalues(u_inf_new, eigenvalues)
+
+    @staticmethod
+    def continuous_time_eigenvalues(A, dt, iterative=False, num_evals=None):
+        """
+        Returns the continuous time eigenvalues of the discrete time system matrix ``A``, sorted by decreasing real
+        part of the discrete time eigenvalues.
+
+        Args:
+            A (np.ndarray): discrete time state matrix
+            dt (float): dimensional time step
+            iterative (bool): use shift-invert Arnoldi to find the ``num_evals`` eigenvalues closest to ``z=1``
+                (the least damped, low frequency modes) instead of the whole spectrum
+            num_evals (int): number of eigenvalues for the iterative solver
+
+        Returns:
+            np.ndarray: continuous time eigenvalues
+        """
+        if iterative and num_evals is not None and num_evals < A.shape[0] - 1:
+            eigs = scsplalg.eigs(A, k=num_evals, sigma=1., which='LM', return_eigenvectors=False)
+        else:
+            if scsp.issparse(A):
+                A = A.toarray()
+            eigs = sclalg.eigvals(A)
+
+        eigs = eigs[np.argsort(eigs.real)[::-1]]
+        return np.log(eigs) / dt
+
+    @staticmethod
+    def track_modes(eigenvalue_list, num_modes):
+        """
+        Follows the ``num_modes`` least stable modes of the first element of ``eigenvalue_list`` along the rest.
+
+        Every eigenvalue is matched to one of the eigenvalues of the following element by solving the assignment
+        problem that minimises the total distance between them in the complex plane.
+
+        Args:
+            eigenvalue_list (list(np.ndarray)): continuous time eigenvalues for every parameter value
+            num_modes (int): number of modes tracked
+
+        Returns:
+            np.ndarray: ``(len(eigenvalue_list), num_modes)`` tracked eigenvalues
+        """
+        num_modes = min([num_modes] + [len(eigs) for eigs in eigenvalue_list])
+        tracked = np.zeros((len(eigenvalue_list), num_modes), dtype=complex)
+        eigenvalue_list = [eigs[np.argsort(eigs.real)[::-1]] for eigs in eigenvalue_list]
+        tracked[0, :] = eigenvalue_list[0][:num_modes]
+        for i in range(1, len(eigenvalue_list)):
+            candidates = eigenvalue_list[i][:2*num_modes]
+            distance = np.abs(tracked[i - 1, :, None] - candidates[None, :])
+            rows, cols = scopt.linear_sum_assignment(distance)
+            tracked[i, rows] = candidates[cols]
+
+        return tracked
+
     def display_root_locus(self):
         """
         Displays root locus diagrams.
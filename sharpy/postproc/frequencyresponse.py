@@ -53,6 +53,18 @@ class FrequencyResponse(solver_interface.BaseSolver):
     settings_default['num_freqs'] = 50
     settings_description['num_freqs'] = 'Number of frequencies to evaluate'
 
+    settings_types['num_processes'] = 'int'
+    settings_default['num_processes'] = 1
+    settings_description['num_processes'] = 'Number of processes among which the frequencies are distributed'
+
+    settings_types['input_channels'] = 'list(int)'
+    settings_default['input_channels'] = []
+    settings_description['input_channels'] = 'Indices of the inputs for which the response is computed. All if empty'
+
+    settings_types['output_channels'] = 'list(int)'
+    settings_default['output_channels'] = []
+    settings_description['output_channels'] = 'Indices of the outputs for which the response is computed. All if empty'
+
     settings_types['quick_plot'] = 'bool'
     settings_default['quick_plot'] = False
     settings_description['quick_plot'] = 'Produce array of ``.png`` plots showing response. Requires matplotlib'
@@ -131,7 +143,7 @@ class FrequencyResponse(solver_interface.BaseSolver):
                 cout.cout_wrap('Computing frequency response...')
                 cout.cout_wrap('Full order system:', 1)
             t0fom = time.time()
-            Y_freq_fom = self.ss.freqresp(self.wv)
+            Y_freq_fom = self.ss.freqresp(self.wv, **self.freqresp_kwargs())
             tfom = time.time() - t0fom
             self.save_freq_resp(self.wv, Y_freq_fom, 'fom')
             if self.settings['print_info']:
@@ -142,7 +154,7 @@ class FrequencyResponse(solver_interface.BaseSolver):
                 cout.cout_wrap('Computing frequency response...')
                 cout.cout_wrap('Reduced order system:', 1)
             t0rom = time.time()
-            Y_freq_rom = self.ssrom.freqresp(self.wv)
+            Y_freq_rom = self.ssrom.freqresp(self.wv, **self.freqresp_kwargs())
             trom = time.time() - t0rom
             if self.settings['print_info']:
                 cout.cout_wrap('\tComputed the frequency response of the reduced order system in %f s' % trom, 2)
@@ -156,6 +168,17 @@ class FrequencyResponse(solver_interface.BaseSolver):
 
         return self.data
 
+    def freqresp_kwargs(self):
+        """
+        Returns the keyword arguments of :func:`sharpy.linear.src.libss.freqresp` given by the settings
+        """
+        kwargs = {'num_processes': self.settings['num_processes'].value}
+        if len(self.settings['input_channels']):
+            kwargs['inputs'] = list(self.settings['input_channels'])
+        if len(self.settings['output_channels']):
+            kwargs['outputs'] = list(self.settings['output_channels'])
+        return kwargs
+
     def save_freq_resp(self, wv, Yfreq, filename):
 
         with open(self.folder + '/freqdata_readme.txt', 'w') as outfile:
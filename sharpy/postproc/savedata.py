@@ -75,6 +75,7 @@ class SaveData(BaseSolver):
                                      'ct_zeta_dot_list',
                                      'ct_zeta_list',
                                      'ct_zeta_star_list',
+                                     'ct_pointer_tables',
                                      'dynamic_input']
     settings_description['skip_attr'] = 'List of attributes to skip when writing file'
 
@@ -87,6 +88,32 @@ class SaveData(BaseSolver):
     settings_description['format'] = 'Save linear state space to hdf5 ``.h5`` or Matlab ``.mat`` format.'
     settings_options['format'] = ['h5', 'mat']
 
+    settings_types['stream'] = 'bool'
+    settings_default['stream'] = False
+    settings_description['stream'] = 'When run online, append the time step variables to chunked, extendible ' \
+                                     'datasets in the ``stream`` group of the ``.data.h5`` file, which is kept open ' \
+                                     'until the end of the simulation, instead of creating a new group per time step'
+
+    settings_types['stream_struct_variables'] = 'list(str)'
+    settings_default['stream_struct_variables'] = ['pos', 'psi', 'for_pos', 'for_vel', 'quat',
+                                                   'steady_applied_forces', 'unsteady_applied_forces']
+    settings_description['stream_struct_variables'] = 'Variables of the structural time step info written to ' \
+                                                      '``stream/structure``'
+
+    settings_types['stream_aero_variables'] = 'list(str)'
+    settings_default['stream_aero_variables'] = ['zeta', 'gamma', 'gamma_star', 'forces', 'dynamic_forces']
+    settings_description['stream_aero_variables'] = 'Variables of the aerodynamic time step info written to ' \
+                                                    '``stream/aero``, with one dataset per surface'
+
+    settings_types['stream_compression'] = 'str'
+    settings_default['stream_compression'] = ''
+    settings_description['stream_compression'] = 'Compression filter of the streamed datasets. Empty for none'
+    settings_options['stream_compression'] = ['', 'gzip', 'lzf']
+
+    settings_types['stream_flush_interval'] = 'int'
+    settings_default['stream_flush_interval'] = 1
+    settings_description['stream_flush_interval'] = 'Number of time steps between flushes of the streamed file to disk'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description,
                                        settings_options=settings_options)
@@ -101,6 +128,10 @@ class SaveData(BaseSolver):
         self.filename = ''
         self.ts_max = 0
 
+        self.hdfile = None
+        self.stream_writer = None
+        self.n_streamed = 0
+
         ### specify which classes are saved as hdf5 group
         # see initialise and add_as_grp
         self.ClassesToSave = (sharpy.presharpy.presharpy.PreSharpy,)
@@ -123,6 +154,7 @@ class SaveData(BaseSolver):
                                                    'ct_zeta_dot_list',
                                                    'ct_zeta_list',
                                                    'ct_zeta_star_list',
+                                                   'ct_pointer_tables',
                                                    'dynamic_input'])
         self.data = data
         if custom_settings is None:
@@ -184,30 +216,34 @@ class SaveData(BaseSolver):
         # self.data.aero.timestep_info[-1].generate_ctypes_pointers()
 
         if self.settings['format'] == 'h5':
-            file_exists = os.path.isfile(self.filename)
-            hdfile = h5py.File(self.filename, 'a')
-
-            if (online and file_exists):
-                if self.settings['save_aero']:
-                    h5utils.add_as_grp(self.data.aero.timestep_info[self.data.ts],
-                                       hdfile['data']['aero']['timestep_info'],
-                                       grpname=("%05d" % self.data.ts),
-                                       ClassesToSave=(sharpy.utils.datastructures.AeroTimeStepInfo,),
-                                       SkipAttr=self.settings['skip_attr'],
-                                       compress_float=self.settings['compress_float'])
-                if self.settings['save_struct']:
-                    h5utils.add_as_grp(self.data.structure.timestep_info[self.data.ts],
-                                       hdfile['data']['structure']['timestep_info'],
-                                       grpname=("%05d" % self.data.ts),
-                                       ClassesToSave=(sharpy.utils.datastructures.StructTimeStepInfo,),
-                                       SkipAttr=self.settings['skip_attr'],
-                                       compress_float=self.settings['compress_float'])
+            if online and self.settings['stream']:
+                self.stream_timestep()
             else:
-                h5utils.add_as_grp(self.data, hdfile, grpname='data',
-                                   ClassesToSave=self.ClassesToSave, SkipAttr=self.settings['skip_attr'],
-                                   compress_float=self.settings['compress_float'])
+                self.close_stream()
+                file_exists = os.path.isfile(self.filename)
+                hdfile = h5py.File(self.filename, 'a')
+
+                if (online and file_exists):
+                    if self.settings['save_aero']:
+                        h5utils.add_as_grp(self.data.aero.timestep_info[self.data.ts],
+                                           hdfile['data']['aero']['timestep_info'],
+                                           grpname=("%05d" % self.data.ts),
+                                           ClassesToSave=(sharpy.utils.datastructures.AeroTimeStepInfo,),
+                                           SkipAttr=self.settings['skip_attr'],
+                                           compress_float=self.settings['compress_float'])
+                    if self.settings['save_struct']:
+                        h5utils.add_as_grp(self.data.structure.timestep_info[self.data.ts],
+                                           hdfile['data']['structure']['timestep_info'],
+                                           grpname=("%05d" % self.data.ts),
+                                           ClassesToSave=(sharpy.utils.datastructures.StructTimeStepInfo,),
+                                           SkipAttr=self.settings['skip_attr'],
+                                           compress_float=self.settings['compress_float'])
+                else:
+                    h5utils.add_as_grp(self.data, hdfile, grpname='data',
+                                       ClassesToSave=self.ClassesToSave, SkipAttr=self.settings['skip_attr'],
+                                       compress_float=self.settings['compress_float'])
 
-            hdfile.close()
+                hdfile.close()
 
             if self.settings['save_linear_uvlm']:
                 linhdffile = h5py.File(self.filename.replace('.data.h5', '.uvlmss.h5'), 'a')
@@ -259,3 +295,55 @@ class SaveData(BaseSolver):
                 savemat(matfilename, savedict)
 
         return self.data
+
+    def stream_timestep(self):
+        """
+        Appends the current time step to the ``stream`` group of the ``.data.h5`` file.
+
+        The first call writes the whole ``data`` group, as in the non-streaming case, and leaves the file open.
+        Structural variables are stored in ``stream/structure/<variable>[ts, ...]`` and aerodynamic ones in
+        ``stream/aero/<variable>/surf<i_surf>[ts, ...]``. The time step numbers are stored in ``stream/ts``.
+        """
+        if self.hdfile is None:
+            self.hdfile = h5py.File(self.filename, 'a')
+            if 'data' not in self.hdfile:
+                h5utils.add_as_grp(self.data, self.hdfile, grpname='data',
+                                   ClassesToSave=self.ClassesToSave, SkipAttr=self.settings['skip_attr'],
+                                   compress_float=self.settings['compress_float'])
+            compression = self.settings['stream_compression']
+            if compression == '':
+                compression = None
+            self.stream_writer = h5utils.StreamWriter(self.hdfile.require_group('stream'),
+                                                      compression=compression,
+                                                      compress_float=self.settings['compress_float'])
+
+        self.stream_writer.append('ts', self.data.ts)
+        if self.settings['save_struct']:
+            tstep = self.data.structure.timestep_info[self.data.ts]
+            for variable in self.settings['stream_struct_variables']:
+                value = getattr(tstep, variable, None)
+                if value is not None:
+                    self.stream_writer.append('structure/' + variable, value)
+        if self.settings['save_aero']:
+            tstep = self.data.aero.timestep_info[self.data.ts]
+            for variable in self.settings['stream_aero_variables']:
+                value = getattr(tstep, variable, None)
+                if value is None:
+                    continue
+                for i_surf in range(len(value)):
+                    self.stream_writer.append('aero/%s/surf%u' % (variable, i_surf), value[i_surf])
+
+        self.n_streamed += 1
+        if self.n_streamed % self.settings['stream_flush_interval'].value == 0:
+            self.hdfile.flush()
+
+    def close_stream(self):
+        """Closes the file kept open by :meth:`stream_timestep`, if any"""
+        if self.hdfile is not None:
+            self.hdfile.close()
+            self.hdfile = None
+            self.stream_writer = None
+
+    def finalise(self):
+        """Closes the streamed file at the end of the simulation"""
+        self.close_stream()
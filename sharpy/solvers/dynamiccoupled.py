@@ -1,6 +1,8 @@
 import ctypes as ct
 import time
 import copy
+import collections
+import concurrent.futures
 
 import numpy as np
 
@@ -13,6 +15,8 @@ import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
 import sharpy.structure.utils.xbeamlib as xbeam
 import sharpy.utils.exceptions as exc
+import sharpy.utils.coupling_accelerators as coupling_accelerators
+from sharpy.utils.datastructures import TimeStepHistory
 
 
 @solver
@@ -92,6 +96,16 @@ class DynamicCoupled(BaseSolver):
     settings_default['dynamic_relaxation'] = False
     settings_description['dynamic_relaxation'] = 'Controls if relaxation factor is modified during the FSI iteration process'
 
+    settings_types['coupling_accelerator'] = 'str'
+    settings_default['coupling_accelerator'] = ''
+    settings_description['coupling_accelerator'] = 'Accelerator of the FSI iterations (``Aitken`` or ``IQNILS``, see ' \
+                                                   ':mod:`sharpy.utils.coupling_accelerators`). It replaces the ' \
+                                                   'relaxation given by ``relaxation_factor``. Empty for none'
+
+    settings_types['coupling_accelerator_settings'] = 'dict'
+    settings_default['coupling_accelerator_settings'] = dict()
+    settings_description['coupling_accelerator_settings'] = 'Dictionary of settings for the ``coupling_accelerator``'
+
     settings_types['postprocessors'] = 'list(str)'
     settings_default['postprocessors'] = list()
     settings_description['postprocessors'] = 'List of the postprocessors to run at the end of every time step'
@@ -100,6 +114,24 @@ class DynamicCoupled(BaseSolver):
     settings_default['postprocessors_settings'] = dict()
     settings_description['postprocessors_settings'] = 'Dictionary with the applicable settings for every ``psotprocessor``. Every ``postprocessor`` needs its entry, even if empty'
 
+    settings_types['async_postprocessors'] = 'list(str)'
+    settings_default['async_postprocessors'] = list()
+    settings_description['async_postprocessors'] = 'Postprocessors, among those in ``postprocessors``, that are run in a ' \
+                                                   'background thread on a copy of every finished time step. The ' \
+                                                   'results they store in its ``postproc_cell`` are copied back to ' \
+                                                   'the simulation data, any other modification (such as ' \
+                                                   '``Cleanup``) is lost'
+
+    settings_types['async_snapshot_depth'] = 'int'
+    settings_default['async_snapshot_depth'] = TimeStepHistory.MIN_DEPTH
+    settings_description['async_snapshot_depth'] = 'Number of latest time steps copied for the ' \
+                                                   '``async_postprocessors``. Older ones are ``None``'
+
+    settings_types['async_queue_size'] = 'int'
+    settings_default['async_queue_size'] = 4
+    settings_description['async_queue_size'] = 'Maximum number of time steps waiting to be postprocessed in the ' \
+                                               'background. The solver waits when the queue is full'
+
     settings_types['controller_id'] = 'dict'
     settings_default['controller_id'] = dict()
     settings_description['controller_id'] = 'Dictionary of id of every controller (key) and its type (value)'
@@ -112,6 +144,17 @@ class DynamicCoupled(BaseSolver):
     settings_default['cleanup_previous_solution'] = False
     settings_description['cleanup_previous_solution'] = 'Controls if previous ``timestep_info`` arrays are reset before running the solver'
 
+    settings_types['history_depth'] = 'int'
+    settings_default['history_depth'] = 0
+    settings_description['history_depth'] = 'Number of time steps of ``timestep_info`` kept in memory. Older steps ' \
+                                            'are stored in ``history_spill_folder`` or dropped. ``0`` keeps the ' \
+                                            'whole history in memory'
+
+    settings_types['history_spill_folder'] = 'str'
+    settings_default['history_spill_folder'] = ''
+    settings_description['history_spill_folder'] = 'Folder where the time steps evicted from memory are saved when ' \
+                                                   '``history_depth`` is used. If empty, they are dropped'
+
     settings_types['include_unsteady_force_contribution'] = 'bool'
     settings_default['include_unsteady_force_contribution'] = False
     settings_description['include_unsteady_force_contribution'] = 'If on, added mass contribution is added to the forces. This depends on the time derivative of the bound circulation. Check ``filter_gamma_dot`` in the aero solver'
@@ -146,13 +189,18 @@ class DynamicCoupled(BaseSolver):
 
         self.predictor = False
         self.residual_table = None
+        self.accelerator = None
         self.postprocessors = dict()
         self.with_postprocessors = False
+        self.postproc_executor = None
+        self.postproc_queue = collections.deque()
         self.controllers = None
 
         self.time_aero = 0.
         self.time_struc = 0.
 
+        self.kstep_buffers = dict()
+
     def get_g(self):
         """
         Getter for ``g``, the gravity value
@@ -194,6 +242,9 @@ class DynamicCoupled(BaseSolver):
 
         self.original_settings = copy.deepcopy(self.settings)
 
+        self.accelerator = coupling_accelerators.initialise_accelerator(self.settings['coupling_accelerator'],
+                                                                        self.settings['coupling_accelerator_settings'])
+
         self.dt = self.settings['dt']
         self.substep_dt = (
             self.dt.value/(self.settings['structural_substeps'].value + 1))
@@ -205,6 +256,9 @@ class DynamicCoupled(BaseSolver):
             # timestep_info[0] and remove the rest
             self.cleanup_timestep_info()
 
+        if self.settings['history_depth'].value > 0:
+            self.bound_timestep_info()
+
         self.structural_solver = solver_interface.initialise_solver(
             self.settings['structural_solver'])
         self.structural_solver.initialise(
@@ -224,6 +278,12 @@ class DynamicCoupled(BaseSolver):
                 postproc)
             self.postprocessors[postproc].initialise(
                 self.data, self.settings['postprocessors_settings'][postproc])
+        for postproc in self.settings['async_postprocessors']:
+            if postproc not in self.postprocessors:
+                raise exc.NotValidSetting('async_postprocessors', postproc, self.settings['postprocessors'])
+        if self.settings['async_postprocessors'] and self.postproc_executor is None:
+            # a single worker runs the postprocessors in time step order
+            self.postproc_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
 
         # initialise controllers
         self.controllers = dict()
@@ -249,17 +309,36 @@ class DynamicCoupled(BaseSolver):
 
     def cleanup_timestep_info(self):
         if max(len(self.data.aero.timestep_info), len(self.data.structure.timestep_info)) > 1:
-            # copy last info to first
-            self.data.aero.timestep_info[0] = self.data.aero.timestep_info[-1]
-            self.data.structure.timestep_info[0] = self.data.structure.timestep_info[-1]
-            # delete all the rest
-            while len(self.data.aero.timestep_info) - 1:
-                del self.data.aero.timestep_info[-1]
-            while len(self.data.structure.timestep_info) - 1:
-                del self.data.structure.timestep_info[-1]
+            # copy last info to first and delete all the rest
+            for timestep_info in [self.data.aero.timestep_info, self.data.structure.timestep_info]:
+                last_tstep = timestep_info[-1]
+                del timestep_info[1:]
+                timestep_info[0] = last_tstep
 
         self.data.ts = 0
 
+    def bound_timestep_info(self):
+        """
+        Replaces the aero and structural ``timestep_info`` lists by
+        :class:`~sharpy.utils.datastructures.TimeStepHistory` containers, so that
+        only the last ``history_depth`` time steps are kept in memory.
+        """
+        depth = self.settings['history_depth'].value
+        spill_folder = self.settings['history_spill_folder']
+        if not spill_folder:
+            spill_folder = None
+
+        if not isinstance(self.data.structure.timestep_info, TimeStepHistory):
+            self.data.structure.timestep_info = TimeStepHistory.from_list(self.data.structure.timestep_info,
+                                                                          depth,
+                                                                          spill_folder,
+                                                                          name='structure')
+        if not isinstance(self.data.aero.timestep_info, TimeStepHistory):
+            self.data.aero.timestep_info = TimeStepHistory.from_list(self.data.aero.timestep_info,
+                                                                     depth,
+                                                                     spill_folder,
+                                                                     name='aero')
+
     def process_controller_output(self, controlled_state):
         """
         This function modified the solver properties and parameters as
@@ -323,8 +402,8 @@ class DynamicCoupled(BaseSolver):
                 len(self.data.structure.timestep_info),
                 self.settings['n_time_steps'].value + len(self.data.structure.timestep_info)):
             initial_time = time.perf_counter()
-            structural_kstep = self.data.structure.timestep_info[-1].copy()
-            aero_kstep = self.data.aero.timestep_info[-1].copy()
+            structural_kstep = self.copy_to_buffer(self.data.structure.timestep_info[-1], 'structural_kstep')
+            aero_kstep = self.copy_to_buffer(self.data.aero.timestep_info[-1], 'aero_kstep')
 
             # Add the controller here
             if self.with_controllers:
@@ -341,8 +420,11 @@ class DynamicCoupled(BaseSolver):
 
             # Copy the controlled states so that the interpolation does not
             # destroy the previous information
-            controlled_structural_kstep = structural_kstep.copy()
-            controlled_aero_kstep = aero_kstep.copy()
+            controlled_structural_kstep = self.copy_to_buffer(structural_kstep, 'controlled_structural_kstep')
+            controlled_aero_kstep = self.copy_to_buffer(aero_kstep, 'controlled_aero_kstep')
+
+            if self.accelerator is not None:
+                self.accelerator.new_step()
 
             k = 0
             for k in range(self.settings['fsi_substeps'].value + 1):
@@ -352,7 +434,7 @@ class DynamicCoupled(BaseSolver):
                     break
 
                 # generate new grid (already rotated)
-                aero_kstep = controlled_aero_kstep.copy()
+                aero_kstep = self.copy_to_buffer(controlled_aero_kstep, 'aero_kstep')
                 self.aero_solver.update_custom_grid(
                     structural_kstep,
                     aero_kstep)
@@ -376,8 +458,8 @@ class DynamicCoupled(BaseSolver):
                                                  unsteady_contribution=unsteady_contribution)
                 self.time_aero += time.perf_counter() - ini_time_aero
 
-                previous_kstep = structural_kstep.copy()
-                structural_kstep = controlled_structural_kstep.copy()
+                previous_kstep = self.copy_to_buffer(structural_kstep, 'previous_structural_kstep')
+                structural_kstep = self.copy_to_buffer(controlled_structural_kstep, 'structural_kstep')
 
                 # move the aerodynamic surface according the the structural one
                 self.aero_solver.update_custom_grid(structural_kstep,
@@ -387,11 +469,16 @@ class DynamicCoupled(BaseSolver):
                                 force_coeff)
 
                 # relaxation
-                relax_factor = self.relaxation_factor(k)
-                relax(self.data.structure,
-                      structural_kstep,
-                      previous_kstep,
-                      relax_factor)
+                if self.accelerator is None:
+                    relax_factor = self.relaxation_factor(k)
+                    relax(self.data.structure,
+                          structural_kstep,
+                          previous_kstep,
+                          relax_factor)
+                else:
+                    accelerate(self.accelerator,
+                               structural_kstep,
+                               previous_kstep)
 
                 # check if nan anywhere.
                 # if yes, raise exception
@@ -400,7 +487,7 @@ class DynamicCoupled(BaseSolver):
                 if np.isnan(structural_kstep.unsteady_applied_forces).any():
                     raise exc.NotConvergedSolver('NaN found in unsteady_applied_forces!')
 
-                copy_structural_kstep = structural_kstep.copy()
+                copy_structural_kstep = self.copy_to_buffer(structural_kstep, 'copy_structural_kstep')
                 ini_time_struc = time.perf_counter()
                 for i_substep in range(
                         self.settings['structural_substeps'].value + 1):
@@ -433,10 +520,9 @@ class DynamicCoupled(BaseSolver):
             # move the aerodynamic surface according the the structural one
             self.aero_solver.update_custom_grid(structural_kstep, aero_kstep)
 
-            self.aero_solver.add_step()
-            self.data.aero.timestep_info[-1] = aero_kstep.copy()
-            self.structural_solver.add_step()
-            self.data.structure.timestep_info[-1] = structural_kstep.copy()
+            # append copies of the converged steps (into the arrays of the evicted steps of a bounded history)
+            self.aero_solver.add_step(aero_kstep)
+            self.structural_solver.add_step(structural_kstep)
 
             final_time = time.perf_counter()
 
@@ -454,13 +540,138 @@ class DynamicCoupled(BaseSolver):
             self.structural_solver.extract_resultants()
             # run postprocessors
             if self.with_postprocessors:
-                for postproc in self.postprocessors:
-                    self.data = self.postprocessors[postproc].run(online=True)
+                self.run_postprocessors()
 
+        self.finalise()
         if self.print_info:
             cout.cout_wrap('...Finished', 1)
         return self.data
 
+    def finalise(self):
+        """
+        Waits for the pending asynchronous postprocessors and releases the resources (such as open files or background
+        threads) held by the postprocessors and the velocity field generator of the aerodynamic solver.
+        """
+        self.flush_postprocessors()
+        for postproc in self.postprocessors:
+            self.postprocessors[postproc].finalise()
+        velocity_generator = getattr(self.aero_solver, 'velocity_generator', None)
+        if velocity_generator is not None:
+            velocity_generator.finalise()
+
+    def run_postprocessors(self):
+        """
+        Runs the postprocessors at the end of a time step.
+
+        The synchronous ones are run first. The ``async_postprocessors`` are submitted to the background worker with
+        a snapshot of the data, waiting for the oldest pending time step if the queue is full.
+        """
+        async_postprocs = list()
+        for postproc in self.postprocessors:
+            if postproc in self.settings['async_postprocessors']:
+                async_postprocs.append(postproc)
+            else:
+                self.data = self.postprocessors[postproc].run(online=True)
+
+        if not async_postprocs:
+            return
+
+        while len(self.postproc_queue) >= max(self.settings['async_queue_size'].value, 1):
+            self.collect_async_postprocessors()
+        snapshot = self.data_snapshot()
+        self.postproc_queue.append((snapshot,
+                                    self.postproc_executor.submit(self.run_async_postprocessors,
+                                                                  snapshot,
+                                                                  async_postprocs)))
+
+    def run_async_postprocessors(self, snapshot, postprocs):
+        for postproc in postprocs:
+            self.postprocessors[postproc].data = snapshot
+            self.postprocessors[postproc].run(online=True)
+
+    def collect_async_postprocessors(self):
+        """
+        Waits for the oldest pending time step of the asynchronous postprocessors and copies the results they stored
+        in the ``postproc_cell`` of its snapshot (such as the ``BeamLoads``) to the time step of the simulation.
+
+        This is done by the main thread, so the worker never modifies the simulation data.
+        """
+        snapshot, future = self.postproc_queue.popleft()
+        future.result()
+        for timestep_info, snapshot_timestep_info in [
+                (self.data.structure.timestep_info, snapshot.structure.timestep_info),
+                (self.data.aero.timestep_info, snapshot.aero.timestep_info)]:
+            i_step = len(snapshot_timestep_info) - 1
+            tstep = timestep_info[i_step]
+            if tstep is None or not snapshot_timestep_info[i_step].postproc_cell:
+                continue
+            tstep.postproc_cell.update(snapshot_timestep_info[i_step].postproc_cell)
+            if isinstance(timestep_info, TimeStepHistory):
+                # written back in case it had been spilled to disk
+                timestep_info[i_step] = tstep
+
+    def flush_postprocessors(self):
+        """
+        Waits for the pending asynchronous postprocessors and points them back to the simulation data.
+        """
+        while self.postproc_queue:
+            self.collect_async_postprocessors()
+        for postproc in self.settings['async_postprocessors']:
+            self.postprocessors[postproc].data = self.data
+
+    def data_snapshot(self):
+        """
+        Returns a shallow copy of ``self.data`` fixed at the current time step, for the asynchronous postprocessors.
+
+        The latest ``async_snapshot_depth`` time steps of the ``timestep_info`` lists are copied, so that the worker
+        and the solver never share a time step. Older steps are ``None`` (as after ``Cleanup``), so that the snapshot
+        is cheap regardless of the length of the simulation.
+        """
+        snapshot = copy.copy(self.data)
+        snapshot.structure = copy.copy(self.data.structure)
+        snapshot.structure.timestep_info = self.timestep_info_snapshot(self.data.structure.timestep_info,
+                                                                       self.settings['async_snapshot_depth'].value)
+        snapshot.aero = copy.copy(self.data.aero)
+        snapshot.aero.timestep_info = self.timestep_info_snapshot(self.data.aero.timestep_info,
+                                                                  self.settings['async_snapshot_depth'].value)
+        return snapshot
+
+    @staticmethod
+    def timestep_info_snapshot(timestep_info, n_steps):
+        n_tsteps = len(timestep_info)
+        n_steps = min(max(n_steps, 1), n_tsteps)
+        snapshot = [None]*n_tsteps
+        for i_step in range(n_tsteps - n_steps, n_tsteps):
+            tstep = timestep_info[i_step]
+            if tstep is not None:
+                snapshot[i_step] = tstep.copy()
+        return snapshot
+
+    def copy_to_buffer(self, tstep, name):
+        """
+        Copies ``tstep`` into the scratch time step ``name`` and returns the latter.
+
+        The scratch time steps are allocated the first time they are requested and reused from then on, so that the
+        FSI iterations do not allocate new time step arrays.
+
+        Args:
+            tstep (AeroTimeStepInfo or StructTimeStepInfo): time step to be copied
+            name (str): name of the scratch time step
+
+        Returns:
+            AeroTimeStepInfo or StructTimeStepInfo: scratch time step with the contents of ``tstep``
+        """
+        try:
+            buffer = self.kstep_buffers[name]
+        except KeyError:
+            buffer = tstep.copy()
+            self.kstep_buffers[name] = buffer
+            return buffer
+
+        if buffer is not tstep:
+            tstep.copy_into(buffer)
+        return buffer
+
     def convergence(self, k, tstep, previous_tstep):
         r"""
         Check convergence in the FSI loop.
@@ -515,40 +726,30 @@ class DynamicCoupled(BaseSolver):
         structural_kstep.unsteady_applied_forces.fill(0.0)
 
         # aero forces to structural forces
-        struct_forces = mapping.aero2struct_force_mapping(
+        cag = structural_kstep.cag()
+        struct_forces = self.data.aero.force_mapping.map_forces(
             aero_kstep.forces,
-            self.data.aero.struct2aero_mapping,
             aero_kstep.zeta,
             structural_kstep.pos,
             structural_kstep.psi,
-            self.data.structure.node_master_elem,
-            self.data.structure.connectivities,
-            structural_kstep.cag(),
+            cag,
             self.data.aero.aero_dict)
-        dynamic_struct_forces = unsteady_forces_coeff*mapping.aero2struct_force_mapping(
+        dynamic_struct_forces = unsteady_forces_coeff*self.data.aero.force_mapping.map_forces(
             aero_kstep.dynamic_forces,
-            self.data.aero.struct2aero_mapping,
             aero_kstep.zeta,
             structural_kstep.pos,
             structural_kstep.psi,
-            self.data.structure.node_master_elem,
-            self.data.structure.connectivities,
-            structural_kstep.cag(),
+            cag,
             self.data.aero.aero_dict)
 
         # prescribed forces + aero forces
+        structural_kstep.steady_applied_forces[:] = (
+            struct_forces + self.data.structure.ini_info.steady_applied_forces)
         try:
-            structural_kstep.steady_applied_forces = (
-                (struct_forces + self.data.structure.ini_info.steady_applied_forces).
-                astype(dtype=ct.c_double, order='F', copy=True))
-            structural_kstep.unsteady_applied_forces = (
-                (dynamic_struct_forces + self.data.structure.dynamic_input[max(self.data.ts - 1, 0)]['dynamic_forces']).
-                astype(dtype=ct.c_double, order='F', copy=True))
+            structural_kstep.unsteady_applied_forces[:] = (
+                dynamic_struct_forces + self.data.structure.dynamic_input[max(self.data.ts - 1, 0)]['dynamic_forces'])
         except KeyError:
-            structural_kstep.steady_applied_forces = (
-                (struct_forces + self.data.structure.ini_info.steady_applied_forces).
-                astype(dtype=ct.c_double, order='F', copy=True))
-            structural_kstep.unsteady_applied_forces = dynamic_struct_forces
+            structural_kstep.unsteady_applied_forces[:] = dynamic_struct_forces
 
     def relaxation_factor(self, k):
         initial = self.settings['relaxation_factor'].value
@@ -601,10 +802,26 @@ class DynamicCoupled(BaseSolver):
 
 
 def relax(beam, timestep, previous_timestep, coeff):
-    timestep.steady_applied_forces[:] = ((1.0 - coeff)*timestep.steady_applied_forces +
-            coeff*previous_timestep.steady_applied_forces)
-    timestep.unsteady_applied_forces[:] = ((1.0 - coeff)*timestep.unsteady_applied_forces +
-            coeff*previous_timestep.unsteady_applied_forces)
+    # (1 - coeff)*forces + coeff*previous_forces, computed in place
+    for forces, previous_forces in ((timestep.steady_applied_forces, previous_timestep.steady_applied_forces),
+                                    (timestep.unsteady_applied_forces, previous_timestep.unsteady_applied_forces)):
+        forces -= previous_forces
+        forces *= 1.0 - coeff
+        forces += previous_forces
+
+
+def accelerate(accelerator, timestep, previous_timestep):
+    """
+    Replaces the applied forces in ``timestep``, mapped from the aerodynamic solution, by those given by the
+    coupling ``accelerator`` from them and the forces applied in ``previous_timestep``.
+    """
+    n_node = timestep.steady_applied_forces.shape[0]
+    forces = accelerator.update(np.concatenate((previous_timestep.steady_applied_forces,
+                                                previous_timestep.unsteady_applied_forces)),
+                                np.concatenate((timestep.steady_applied_forces,
+                                                timestep.unsteady_applied_forces)))
+    timestep.steady_applied_forces[:] = forces[:n_node, :]
+    timestep.unsteady_applied_forces[:] = forces[n_node:, :]
 
 
 def normalise_quaternion(tstep):
@@ -159,6 +159,9 @@ class DynamicUVLM(BaseSolver):
                 for postproc in self.postprocessors:
                     self.data = self.postprocessors[postproc].run(online=True)
 
+        for postproc in self.postprocessors:
+            self.postprocessors[postproc].finalise()
+
         if self.print_info:
             cout.cout_wrap('...Finished', 1)
 
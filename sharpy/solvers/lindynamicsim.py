@@ -15,6 +15,15 @@ import warnings
 class LinDynamicSim(BaseSolver):
     """Time-domain solution of Linear Time Invariant Systems
 
+    By default, the system is solved over the whole time horizon with ``scipy.signal``, and the state and output
+    histories are kept in memory.
+
+    With ``streaming``, discrete-time systems are marched with :class:`~sharpy.linear.src.libss.DiscreteTimeSimulator`,
+    on the dense, sparse, diagonal or Schur form of the system (``simulation_method``), processing ``chunk_size`` time
+    steps at a time. Only the current chunk of states is held in
+    memory: the variables in ``stream_variables`` are appended to ``lindynamicsim.h5`` in the output folder after
+    every chunk, and the linear and nonlinear time step information is only reconstructed every
+    ``reconstruct_interval`` steps, when there are postprocessors to run.
     """
     solver_id = 'LinDynamicSim'
     solver_classification = 'Coupled'
@@ -22,6 +31,7 @@ class LinDynamicSim(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['folder'] = 'str'
     settings_default['folder'] = './output/'
@@ -47,6 +57,32 @@ class LinDynamicSim(BaseSolver):
     settings_types['dt'] = 'float'
     settings_description['dt'] = 'Time increment for the solution of systems without a specified dt'
 
+    settings_types['streaming'] = 'bool'
+    settings_default['streaming'] = False
+    settings_description['streaming'] = 'March discrete-time systems in chunks of time steps without keeping the ' \
+                                        'whole state history'
+
+    settings_types['chunk_size'] = 'int'
+    settings_default['chunk_size'] = 100
+    settings_description['chunk_size'] = 'Number of time steps per chunk in ``streaming`` mode'
+
+    settings_types['simulation_method'] = 'str'
+    settings_default['simulation_method'] = 'direct'
+    settings_description['simulation_method'] = 'Form of the system used in ``streaming`` mode. See ' \
+                                                ':class:`~sharpy.linear.src.libss.DiscreteTimeSimulator`'
+    settings_options['simulation_method'] = ['direct', 'diagonal', 'schur']
+
+    settings_types['stream_variables'] = 'list(str)'
+    settings_default['stream_variables'] = ['y', 't']
+    settings_description['stream_variables'] = 'Vectors written to ``lindynamicsim.h5`` in ``streaming`` mode: ' \
+                                               '``x``, ``y``, ``u`` and/or ``t``'
+
+    settings_types['reconstruct_interval'] = 'int'
+    settings_default['reconstruct_interval'] = 1
+    settings_description['reconstruct_interval'] = 'In ``streaming`` mode, the time step information is ' \
+                                                   'reconstructed and the postprocessors are run every ' \
+                                                   '``reconstruct_interval`` time steps'
+
     settings_types['postprocessors'] = 'list(str)'
     settings_default['postprocessors'] = list()
 
@@ -54,7 +90,7 @@ class LinDynamicSim(BaseSolver):
     settings_default['postprocessors_settings'] = dict()
 
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
 
@@ -75,7 +111,8 @@ class LinDynamicSim(BaseSolver):
             self.settings = custom_settings
         else:
             self.settings = data.settings[self.solver_id]
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default,
+                                 options=self.settings_options)
 
         # Read initial state and input data and store in dictionary
         self.read_files()
@@ -130,13 +167,21 @@ class LinDynamicSim(BaseSolver):
             T_dimensional = n_steps * dt_dimensional
             T = T_dimensional / scaling_factors['time']
             ss = self.data.linear.linear_system.update(self.settings['reference_velocity'].value)
+
+        if self.settings['streaming'].value:
+            if ss.dt is not None:
+                # Time of each of the input samples, one per time step of the discrete-time system
+                self.run_streaming(ss, x0, u, np.arange(n_steps) * T / n_steps)
+                self.finalise()
+                return self.data
+            warnings.warn('Streaming is only available for discrete-time systems. Using scipy instead')
+
         t_dom = np.linspace(0, T, n_steps)
 
         # Use the scipy linear solver
         sys = libss.ss_to_scipy(ss)
         cout.cout_wrap('Solving linear system using scipy...')
         t0 = time.time()
-        # breakpoint()
         out = sys.output(u, t=t_dom, x0=x0)
         ts = time.time() - t0
         cout.cout_wrap('\tSolved in %.2fs' % ts, 1)
@@ -186,8 +231,91 @@ class LinDynamicSim(BaseSolver):
                 for postproc in self.postprocessors:
                     self.data = self.postprocessors[postproc].run(online=True)
 
+        self.finalise()
         return self.data
 
+    def finalise(self):
+        """Releases the resources (such as open files) held by the postprocessors"""
+        for postproc in self.postprocessors:
+            self.postprocessors[postproc].finalise()
+
+    def run_streaming(self, ss, x0, u, t_dom):
+        """
+        Marches the discrete-time system in chunks of ``chunk_size`` time steps, continuing each chunk from the final
+        state of the previous one.
+
+        Each input sample is applied at one time step of the system, so the outputs are those of
+        ``scipy.signal.dlsim`` without a time vector, i.e. without interpolating the input in time.
+
+        Args:
+            ss (sharpy.linear.src.libss.ss): discrete-time system
+            x0 (np.ndarray): initial state
+            u (np.ndarray): ``(n_steps, n_inputs)`` input time history
+            t_dom (np.ndarray): time of each of the input samples
+        """
+        n_steps = len(t_dom)
+        chunk_size = max(self.settings['chunk_size'].value, 1)
+        reconstruct_interval = max(self.settings['reconstruct_interval'].value, 1)
+        stream_variables = self.settings['stream_variables']
+
+        cout.cout_wrap('Marching linear system in chunks of %g time steps...' % chunk_size)
+        t0 = time.time()
+
+        dat_files = dict()
+        for var in self.settings['write_dat']:
+            dat_files[var] = open(self.folder + '/%s_out.dat' % var, 'w')
+
+        simulator = libss.DiscreteTimeSimulator(ss, method=self.settings['simulation_method'])
+        return_states = 'x' in stream_variables or 'x' in dat_files or self.with_postprocessors
+        x_n = np.array(x0, dtype=float)
+        with h5.File(self.folder + '/lindynamicsim.h5', 'w') as hdfile:
+            writer = h5utils.StreamWriter(hdfile)
+            for n_start in range(0, n_steps, chunk_size):
+                n_end = min(n_start + chunk_size, n_steps)
+                u_chunk = u[n_start:n_end, :]
+
+                y_chunk, x_chunk = simulator.simulate(u_chunk, x0=x_n, return_states=return_states)
+                x_n = simulator.x_final
+                t_chunk = t_dom[n_start:n_end]
+
+                chunk_vars = {'x': x_chunk, 'y': y_chunk, 'u': u_chunk, 't': t_chunk}
+                for var in stream_variables:
+                    writer.extend(var, chunk_vars[var])
+                for var, file_handle in dat_files.items():
+                    np.savetxt(file_handle, chunk_vars[var])
+
+                if self.with_postprocessors:
+                    for n in range(n_start, n_end):
+                        if n % reconstruct_interval:
+                            continue
+                        i = n - n_start
+                        self.reconstruct_timestep(x_chunk[i, :].copy(), y_chunk[i, :].copy(), u_chunk[i, :].copy(),
+                                                  t_chunk[i])
+
+        for file_handle in dat_files.values():
+            file_handle.close()
+
+        cout.cout_wrap('\tSolved in %.2fs' % (time.time() - t0), 1)
+
+    def reconstruct_timestep(self, x, y, u, t):
+        """
+        Appends the linear and nonlinear time step information of the given state, output and input and runs the
+        postprocessors
+        """
+        tstep = LinearTimeStepInfo()
+        tstep.x = x
+        tstep.y = y
+        tstep.t = t
+        tstep.u = u
+        self.data.linear.timestep_info.append(tstep)
+
+        aero_tstep, struct_tstep = state_to_timestep(self.data, tstep.x, tstep.u, tstep.y)
+        self.data.aero.timestep_info.append(aero_tstep)
+        self.data.structure.timestep_info.append(struct_tstep)
+
+        for postproc in self.postprocessors:
+            self.data = self.postprocessors[postproc].run(online=True)
+
     def read_files(self):
 
         self.input_file_name = self.data.settings['SHARPy']['route'] + '/' + self.data.settings['SHARPy']['case'] + '.lininput.h5'
@@ -5,6 +5,7 @@ Linear State Space Assembler
 from sharpy.utils.solver_interface import solver, BaseSolver
 
 import sharpy.linear.utils.ss_interface as ss_interface
+import sharpy.linear.utils.sscache as sscache
 import sharpy.utils.settings as settings
 import sharpy.utils.h5utils as h5
 import warnings
@@ -52,6 +53,11 @@ class LinearAssembler(BaseSolver):
     >>>        'Modal',
     >>>        'LinearAssembler']
 
+    With ``use_cache``, the assembled systems are stored in ``cache_folder``, in a file named after the hash of the
+    linearisation time steps, the linear system settings and the code version (see
+    :mod:`sharpy.linear.utils.sscache`). Subsequent runs about the same reference load them from there instead of
+    assembling them again. Currently, the cache is used by :class:`~sharpy.linear.assembler.LinearAeroelastic`.
+
     """
     solver_id = 'LinearAssembler'
     solver_classification = 'Linear'
@@ -72,6 +78,15 @@ class LinearAssembler(BaseSolver):
     settings_default['linearisation_tstep'] = -1
     settings_description['linearisation_tstep'] = 'Chosen linearisation time step number from available time steps'
 
+    settings_types['use_cache'] = 'bool'
+    settings_default['use_cache'] = False
+    settings_description['use_cache'] = 'Store the assembled systems in an on-disk cache and reuse them when the ' \
+                                        'linearisation reference and settings are unchanged'
+
+    settings_types['cache_folder'] = 'str'
+    settings_default['cache_folder'] = './output/linear_cache/'
+    settings_description['cache_folder'] = 'Folder of the linear system cache'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -103,6 +118,12 @@ class LinearAssembler(BaseSolver):
         # Create data.linear
         self.data.linear = Linear(tsaero0, tsstruct0)
 
+        if self.settings['use_cache'].value:
+            key = sscache.linearisation_key(tsstruct0, tsaero0,
+                                            {'linear_system': self.settings['linear_system'],
+                                             'linear_system_settings': self.settings['linear_system_settings']})
+            self.data.linear.cache = sscache.LinearSystemCache(self.settings['cache_folder'], key)
+
         # Load available systems
         import sharpy.linear.assembler
 
@@ -131,6 +152,7 @@ class Linear(object):
         tsaero0 (sharpy.utils.datastructures.AeroTimeStepInfo): Linearisation aerodynamic timestep
         tsstruct0 (sharpy.utils.datastructures.StructTimeStepInfo): Linearisation structural timestep
         timestep_info (list): Linear time steps
+        cache (sharpy.linear.utils.sscache.LinearSystemCache): Cache of the linearised systems, if used
     """
 
     def __init__(self, tsaero0, tsstruct0):
@@ -141,6 +163,7 @@ class Linear(object):
         self.timestep_info = []
         self.uvlm = None
         self.beam = None
+        self.cache = None
 
 
 if __name__ == "__main__":
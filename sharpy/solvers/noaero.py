@@ -52,8 +52,8 @@ class NoAero(BaseSolver):
             unsteady_contribution=False):
         return self.data
 
-    def add_step(self):
-        self.data.aero.add_timestep()
+    def add_step(self, aero_tstep=None):
+        self.data.aero.add_timestep(aero_tstep)
 
     def update_grid(self, beam):
         pass
@@ -90,8 +90,8 @@ class NonLinearDynamicCoupledStep(_BaseStructural):
 
         return self.data
 
-    def add_step(self):
-        self.data.structure.next_step()
+    def add_step(self, structural_step=None):
+        self.data.structure.next_step(structural_step)
 
     def next_step(self):
         pass
@@ -1,8 +1,12 @@
 import ctypes as ct
 import numpy as np
+import scipy.linalg as sclalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spalg
 
 from sharpy.utils.solver_interface import solver, BaseSolver, solver_from_string
 import sharpy.utils.settings as settings
+import sharpy.utils.cout_utils as cout
 
 import sharpy.structure.utils.xbeamlib as xbeamlib
 import sharpy.utils.multibody as mb
@@ -20,6 +24,13 @@ class NonLinearDynamicMultibody(_BaseStructural):
 
     Nonlinear dynamic step solver for multibody structures.
 
+    With ``newton_method = 'modified'``, the factorisation of the system matrix is kept across the Newmark iterations
+    and time steps. The system matrix is still assembled in every iteration, together with the residual, since the
+    structural library assembles both at once, but it is only factorised again when the ratio of the norms of
+    two consecutive corrections is larger than ``jacobian_refresh_ratio``, when the factorisation has been used in
+    ``max_jacobian_age`` iterations or when the time step changes. The number of factorisations of every step is stored
+    in ``num_factorisations`` and, for the ``modified`` method, printed if ``print_info`` is ``True``.
+
     """
     solver_id = 'NonLinearDynamicMultibody'
     solver_classification = 'structural'
@@ -28,8 +39,33 @@ class NonLinearDynamicMultibody(_BaseStructural):
     settings_default = _BaseStructural.settings_default.copy()
     settings_description = _BaseStructural.settings_description.copy()
 
+    settings_types['use_sparse'] = 'bool'
+    settings_default['use_sparse'] = False
+    settings_description['use_sparse'] = 'Assemble the multibody system in sparse format and solve it with a sparse ' \
+                                         'direct solver. The ordering of the factorisation is computed once and ' \
+                                         'reused in the following iterations and time steps'
+
+    settings_options = dict()
+
+    settings_types['newton_method'] = 'str'
+    settings_default['newton_method'] = 'full'
+    settings_description['newton_method'] = 'Update of the system matrix in the Newmark iterations. ``full`` ' \
+                                            'factorises it in every iteration and ``modified`` reuses the ' \
+                                            'factorisation until the convergence rate degrades'
+    settings_options['newton_method'] = ['full', 'modified']
+
+    settings_types['jacobian_refresh_ratio'] = 'float'
+    settings_default['jacobian_refresh_ratio'] = 0.5
+    settings_description['jacobian_refresh_ratio'] = 'Ratio of the norms of two consecutive corrections above which ' \
+                                                     'the system is factorised again in the ``modified`` method'
+
+    settings_types['max_jacobian_age'] = 'int'
+    settings_default['max_jacobian_age'] = 20
+    settings_description['max_jacobian_age'] = 'Maximum number of iterations in which a factorisation is reused in ' \
+                                               'the ``modified`` method'
+
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.data = None
@@ -45,6 +81,16 @@ class NonLinearDynamicMultibody(_BaseStructural):
         self.gamma = None
         self.beta = None
 
+        # Column permutation of the sparse factorisation of the system
+        self.perm_c = None
+
+        # Factorisation of the system reused by the modified Newton method
+        self.factorised_solve = None
+        self.factorised_size = None
+        self.factorised_dt = None
+        self.jacobian_age = 0
+        self.num_factorisations = 0
+
     def initialise(self, data, custom_settings=None):
 
         self.data = data
@@ -52,7 +98,7 @@ class NonLinearDynamicMultibody(_BaseStructural):
             self.settings = data.settings[self.solver_id]
         else:
             self.settings = custom_settings
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, self.settings_options)
 
         # load info from dyn dictionary
         self.data.structure.add_unsteady_information(
@@ -69,8 +115,8 @@ class NonLinearDynamicMultibody(_BaseStructural):
         # Define the number of dofs
         self.define_sys_size()
 
-    def add_step(self):
-        self.data.structure.next_step()
+    def add_step(self, structural_step=None):
+        self.data.structure.next_step(structural_step)
 
     def next_step(self):
         pass
@@ -88,6 +134,9 @@ class NonLinearDynamicMultibody(_BaseStructural):
         self.lc_list = lagrangeconstraints.initialize_constraints(MBdict)
         self.num_LM_eq = lagrangeconstraints.define_num_LM_eq(self.lc_list)
 
+        if self.settings['use_sparse'].value:
+            return self.assembly_MB_eq_system_sparse(MB_beam, MB_tstep, ts, dt, Lambda, Lambda_dot)
+
         MB_M = np.zeros((self.sys_size+self.num_LM_eq, self.sys_size+self.num_LM_eq), dtype=ct.c_double, order='F')
         MB_C = np.zeros((self.sys_size+self.num_LM_eq, self.sys_size+self.num_LM_eq), dtype=ct.c_double, order='F')
         MB_K = np.zeros((self.sys_size+self.num_LM_eq, self.sys_size+self.num_LM_eq), dtype=ct.c_double, order='F')
@@ -149,6 +198,126 @@ class NonLinearDynamicMultibody(_BaseStructural):
 
         return MB_Asys, MB_Q
 
+    def assembly_MB_eq_system_sparse(self, MB_beam, MB_tstep, ts, dt, Lambda, Lambda_dot):
+        """
+        Sparse version of :func:`assembly_MB_eq_system`.
+
+        The system matrix of each body is added as a block and the terms of the Lagrange multipliers equations as
+        coordinate entries, so that the dense matrices of the whole system are never allocated.
+
+        Returns:
+            tuple: system matrix in ``scipy.sparse.csc_matrix`` format and vector of independent terms
+        """
+        size = self.sys_size + self.num_LM_eq
+        rows = []
+        cols = []
+        data = []
+        MB_Q = np.zeros((size,), dtype=ct.c_double, order='F')
+
+        first_dof = 0
+        for ibody in range(len(MB_beam)):
+            if MB_beam[ibody].FoR_movement == 'prescribed':
+                last_dof = first_dof + MB_beam[ibody].num_dof.value
+                M, C, K, Q = xbeamlib.cbeam3_asbly_dynamic(MB_beam[ibody], MB_tstep[ibody], self.settings)
+
+            elif MB_beam[ibody].FoR_movement == 'free':
+                last_dof = first_dof + MB_beam[ibody].num_dof.value + 10
+                M, C, K, Q = xbeamlib.xbeam3_asbly_dynamic(MB_beam[ibody], MB_tstep[ibody], self.settings)
+
+            Asys = K + C*self.gamma/(self.beta*dt) + M/(self.beta*dt*dt)
+            irow, icol = np.nonzero(Asys)
+            rows.append(irow + first_dof)
+            cols.append(icol + first_dof)
+            data.append(Asys[irow, icol])
+
+            MB_Q[first_dof:last_dof] = Q
+
+            first_dof = last_dof
+
+        LM_C, LM_K, LM_Q = lagrangeconstraints.generate_lagrange_matrix(
+            self.lc_list,
+            MB_beam,
+            MB_tstep,
+            ts,
+            self.num_LM_eq,
+            self.sys_size,
+            dt,
+            Lambda,
+            Lambda_dot,
+            "dynamic",
+            sparse=True)
+
+        LM_Asys = (LM_K + LM_C*self.gamma/(self.beta*dt)).tocoo()
+        rows.append(LM_Asys.row)
+        cols.append(LM_Asys.col)
+        data.append(LM_Asys.data)
+        MB_Q += LM_Q
+
+        MB_Asys = sp.csc_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                                shape=(size, size))
+
+        return MB_Asys, MB_Q
+
+    def factorise(self, MB_Asys):
+        """
+        Factorises the system matrix.
+
+        In sparse format, the sparsity pattern of the system does not change between iterations and time steps. Hence,
+        the fill-reducing column permutation is computed in the first factorisation and reused in the following ones.
+
+        Args:
+            MB_Asys (np.ndarray or scipy.sparse.csc_matrix): system matrix
+
+        Returns:
+            function: solves ``MB_Asys Dq = -MB_Q`` for the vector of independent terms ``MB_Q``
+        """
+        if not self.settings['use_sparse'].value:
+            lu_and_piv = sclalg.lu_factor(MB_Asys)
+            return lambda MB_Q: sclalg.lu_solve(lu_and_piv, -MB_Q)
+
+        if self.perm_c is None or len(self.perm_c) != MB_Asys.shape[0]:
+            lu = spalg.splu(MB_Asys, permc_spec='COLAMD')
+            self.perm_c = lu.perm_c
+            return lambda MB_Q: lu.solve(-MB_Q)
+
+        # A Pc = Pr^T L U, where the columns of A are reordered as A[:, inv_perm_c]
+        perm_c = self.perm_c
+        lu = spalg.splu(MB_Asys[:, np.argsort(perm_c)], permc_spec='NATURAL')
+        return lambda MB_Q: lu.solve(-MB_Q)[perm_c]
+
+    def solve_sparse(self, MB_Asys, MB_Q):
+        """
+        Solves ``MB_Asys Dq = -MB_Q`` with the sparse LU decomposition of ``MB_Asys`` (see :func:`factorise`).
+
+        Args:
+            MB_Asys (scipy.sparse.csc_matrix): system matrix
+            MB_Q (np.ndarray): vector of independent terms
+
+        Returns:
+            np.ndarray: correction ``Dq``
+        """
+        return self.factorise(MB_Asys)(MB_Q)
+
+    def solve_modified_newton(self, MB_Asys, MB_Q, dt, refresh):
+        """
+        Solves ``MB_Asys Dq = -MB_Q`` with the stored factorisation of a previous system matrix. The system is
+        factorised again if ``refresh`` is ``True``, if there is no factorisation of a system of the same size and
+        time step or if it has been used ``max_jacobian_age`` times.
+
+        Returns:
+            np.ndarray: correction ``Dq``
+        """
+        if (refresh or self.factorised_solve is None or self.factorised_size != MB_Asys.shape[0] or
+                self.factorised_dt != dt or self.jacobian_age >= self.settings['max_jacobian_age'].value):
+            self.factorised_solve = self.factorise(MB_Asys)
+            self.factorised_size = MB_Asys.shape[0]
+            self.factorised_dt = dt
+            self.jacobian_age = 0
+            self.num_factorisations += 1
+
+        self.jacobian_age += 1
+        return self.factorised_solve(MB_Q)
+
     def integrate_position(self, MB_beam, MB_tstep, dt):
         vel = np.zeros((6,),)
         acc = np.zeros((6,),)
@@ -250,6 +419,10 @@ class NonLinearDynamicMultibody(_BaseStructural):
         # Newmark-beta iterations
         old_Dq = 1.0
         LM_old_Dq = 1.0
+        modified_newton = self.settings['newton_method'] == 'modified'
+        refresh_jacobian = False
+        previous_Dq_norm = None
+        self.num_factorisations = 0
 
         converged = False
         for iteration in range(self.settings['max_iterations'].value):
@@ -276,7 +449,20 @@ class NonLinearDynamicMultibody(_BaseStructural):
             # invT = np.matrix(T).I
             # MB_Q_balanced = np.dot(invT, MB_Q).T
 
-            Dq = np.linalg.solve(MB_Asys, -MB_Q)
+            if modified_newton:
+                Dq = self.solve_modified_newton(MB_Asys, MB_Q, dt, refresh_jacobian)
+
+                # Refresh the factorisation if the convergence rate degrades
+                Dq_norm = np.max(np.abs(Dq))
+                refresh_jacobian = previous_Dq_norm is not None and \
+                                   Dq_norm > self.settings['jacobian_refresh_ratio'].value*previous_Dq_norm
+                previous_Dq_norm = Dq_norm
+            elif self.settings['use_sparse'].value:
+                Dq = self.solve_sparse(MB_Asys, MB_Q)
+                self.num_factorisations += 1
+            else:
+                Dq = np.linalg.solve(MB_Asys, -MB_Q)
+                self.num_factorisations += 1
             # least squares solver
             # Dq = np.linalg.lstsq(np.dot(MB_Asys_balanced, invT), -MB_Q_balanced, rcond=None)[0]
 
@@ -326,6 +512,10 @@ class NonLinearDynamicMultibody(_BaseStructural):
         mb.state2disp(q, dqdt, dqddt, MB_beam, MB_tstep)
         # end: comment time stepping
 
+        if modified_newton and self.settings['print_info'].value:
+            cout.cout_wrap('NonLinearDynamicMultibody: %d iterations, %d factorisations' %
+                           (iteration + 1, self.num_factorisations), 2)
+
         # End of Newmark-beta iterations
         self.integrate_position(MB_beam, MB_tstep, dt)
         # lagrangeconstraints.postprocess(self.lc_list, MB_beam, MB_tstep, MBdict, "dynamic")
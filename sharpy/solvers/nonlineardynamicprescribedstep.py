@@ -73,8 +73,8 @@ class NonLinearDynamicPrescribedStep(_BaseStructural):
         self.data.structure.integrate_position(structural_step, dt)
         return self.data
 
-    def add_step(self):
-        self.data.structure.next_step()
+    def add_step(self, structural_step=None):
+        self.data.structure.next_step(structural_step)
 
     def next_step(self):
         pass
@@ -67,8 +67,8 @@ class NonLinearStaticMultibody(_BaseStructural):
         # Define the number of dofs
         self.define_sys_size()
 
-    def add_step(self):
-        self.data.structure.next_step()
+    def add_step(self, structural_step=None):
+        self.data.structure.next_step(structural_step)
 
     def next_step(self):
         pass
@@ -159,6 +159,9 @@ class PrescribedUvlm(BaseSolver):
                 for postproc in self.postprocessors:
                     self.data = self.postprocessors[postproc].run(online=True)
 
+        for postproc in self.postprocessors:
+            self.postprocessors[postproc].finalise()
+
         return self.data
 
 #
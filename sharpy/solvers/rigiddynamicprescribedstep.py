@@ -80,8 +80,8 @@ class RigidDynamicPrescribedStep(BaseSolver):
             self.data.structure.integrate_position(structural_step, self.settings['dt'].value)
         return self.data
 
-    def add_step(self):
-        self.data.structure.next_step()
+    def add_step(self, structural_step=None):
+        self.data.structure.next_step(structural_step)
 
     def next_step(self):
         pass
@@ -9,6 +9,7 @@ import sharpy.utils.settings as settings
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.generator_interface as gen_interface
 import sharpy.utils.cout_utils as cout
+from sharpy.utils.datastructures import TimeStepHistory
 import sys
 
 
@@ -178,8 +179,8 @@ class SHWUvlm(BaseSolver):
 
         return self.data
 
-    def add_step(self):
-        self.data.aero.add_timestep()
+    def add_step(self, aero_tstep=None):
+        self.data.aero.add_timestep(aero_tstep)
 
     def update_grid(self, beam):
         self.data.aero.generate_zeta(beam, self.data.aero.aero_settings, -1, beam_ts=-1)
@@ -194,6 +195,10 @@ class SHWUvlm(BaseSolver):
 
     @staticmethod
     def filter_gamma_dot(tstep, history, filter_param):
+        if isinstance(history, TimeStepHistory):
+            # only the steps held in memory, so that spilled steps are not read back from disk every iteration
+            history = history.in_memory()
+        history = [x for x in history if x is not None]
         series_length = len(history) + 1
         for i_surf in range(len(tstep.zeta)):
             n_rows, n_cols = tstep.gamma[i_surf].shape
@@ -8,6 +8,7 @@ import sharpy.utils.solver_interface as solver_interface
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
 import sharpy.utils.algebra as algebra
+import sharpy.utils.coupling_accelerators as coupling_accelerators
 
 
 @solver
@@ -15,6 +16,11 @@ class StaticCoupled(BaseSolver):
     """
     This class is the main FSI driver for static simulations.
     It requires a ``structural_solver`` and a ``aero_solver`` to be defined.
+
+    The coupled iteration can be started from the beam deformation of a previous solution with
+    :meth:`set_initial_state`. Solvers that run ``StaticCoupled`` repeatedly, such as the trim routines or parameter
+    sweeps, can store the converged states with :meth:`save_converged_state` and start every evaluation from the
+    closest one with :meth:`warm_start`. ``warm_start_cache_size`` converged states are kept.
     """
     solver_id = 'StaticCoupled'
     solver_classification = 'Coupled'
@@ -59,6 +65,20 @@ class StaticCoupled(BaseSolver):
     settings_default['relaxation_factor'] = 0.
     settings_description['relaxation_factor'] = 'Relaxation parameter in the FSI iteration. 0 is no relaxation and -> 1 is very relaxed'
 
+    settings_types['coupling_accelerator'] = 'str'
+    settings_default['coupling_accelerator'] = ''
+    settings_description['coupling_accelerator'] = 'Accelerator of the FSI iterations (``Aitken`` or ``IQNILS``, see ' \
+                                                   ':mod:`sharpy.utils.coupling_accelerators`). It replaces the ' \
+                                                   'relaxation given by ``relaxation_factor``. Empty for none'
+
+    settings_types['coupling_accelerator_settings'] = 'dict'
+    settings_default['coupling_accelerator_settings'] = dict()
+    settings_description['coupling_accelerator_settings'] = 'Dictionary of settings for the ``coupling_accelerator``'
+
+    settings_types['warm_start_cache_size'] = 'int'
+    settings_default['warm_start_cache_size'] = 10
+    settings_description['warm_start_cache_size'] = 'Number of converged states kept to warm start subsequent runs'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -70,6 +90,9 @@ class StaticCoupled(BaseSolver):
         self.aero_solver = None
 
         self.previous_force = None
+        self.accelerator = None
+
+        self.converged_states = []
 
         self.residual_table = None
 
@@ -83,6 +106,9 @@ class StaticCoupled(BaseSolver):
 
         self.print_info = self.settings['print_info']
 
+        self.accelerator = coupling_accelerators.initialise_accelerator(self.settings['coupling_accelerator'],
+                                                                        self.settings['coupling_accelerator_settings'])
+
         self.structural_solver = solver_interface.initialise_solver(self.settings['structural_solver'])
         self.structural_solver.initialise(self.data, self.settings['structural_solver_settings'])
         self.aero_solver = solver_interface.initialise_solver(self.settings['aero_solver'])
@@ -134,18 +160,21 @@ class StaticCoupled(BaseSolver):
                 self.data = self.aero_solver.run()
 
                 # map force
-                struct_forces = mapping.aero2struct_force_mapping(
+                struct_forces = self.data.aero.force_mapping.map_forces(
                     self.data.aero.timestep_info[self.data.ts].forces,
-                    self.data.aero.struct2aero_mapping,
                     self.data.aero.timestep_info[self.data.ts].zeta,
                     self.data.structure.timestep_info[self.data.ts].pos,
                     self.data.structure.timestep_info[self.data.ts].psi,
-                    self.data.structure.node_master_elem,
-                    self.data.structure.connectivities,
                     self.data.structure.timestep_info[self.data.ts].cag(),
                     self.data.aero.aero_dict)
 
-                if not self.settings['relaxation_factor'].value == 0.:
+                if self.accelerator is not None:
+                    if i_iter == 0:
+                        self.accelerator.new_step()
+                    else:
+                        struct_forces = self.accelerator.update(self.previous_force, struct_forces)
+                    self.previous_force = struct_forces.copy()
+                elif not self.settings['relaxation_factor'].value == 0.:
                     if i_iter == 0:
                         self.previous_force = struct_forces.copy()
 
@@ -281,5 +310,67 @@ class StaticCoupled(BaseSolver):
         # update grid
         self.aero_solver.update_step()
 
+    def set_initial_state(self, structure_tstep):
+        """
+        Sets the deformation of ``structure_tstep`` as the initial guess of the current step. The aerodynamic grid is
+        updated with the new deformation.
+
+        Only the deformation is copied: the orientation and applied forces of the current step are not modified. The
+        aerodynamic state is not an initial guess of the static UVLM, whose circulation is solved for directly on the
+        updated grid, so it is not copied either.
+
+        Args:
+            structure_tstep (sharpy.utils.datastructures.StructTimeStepInfo): structural state
+        """
+        tstep = self.data.structure.timestep_info[self.data.ts]
+        for name in ['pos', 'psi']:
+            if getattr(tstep, name).shape != getattr(structure_tstep, name).shape:
+                raise ValueError('The shape of %s in the initial state, %s, does not match that of the current step, '
+                                 '%s' % (name, getattr(structure_tstep, name).shape, getattr(tstep, name).shape))
+        tstep.pos[:] = structure_tstep.pos
+        tstep.psi[:] = structure_tstep.psi
+
+        self.aero_solver.update_step()
+
+    def save_converged_state(self, parameters):
+        """
+        Stores a copy of the converged structural state of the current step, identified by the vector of ``parameters`` that
+        defines the case (for example, the trim variables). Only the last ``warm_start_cache_size`` states are kept.
+
+        Args:
+            parameters (np.ndarray): parameters of the converged case
+        """
+        if self.settings['warm_start_cache_size'].value <= 0:
+            return
+        self.converged_states.append((np.array(parameters, dtype=float),
+                                      self.data.structure.timestep_info[self.data.ts].copy()))
+        while len(self.converged_states) > self.settings['warm_start_cache_size'].value:
+            del self.converged_states[0]
+
+    def warm_start(self, parameters):
+        """
+        Sets the stored converged state whose parameters are closest to ``parameters`` as the initial guess of the
+        current step.
+
+        The distance is the Euclidean norm of the parameter differences, with every component normalised by its range
+        among the stored states, so that parameters in different units (such as angles and thrust) weigh the same.
+
+        Args:
+            parameters (np.ndarray): parameters of the case about to be run
+
+        Returns:
+            bool: ``True`` if a converged state was available
+        """
+        if not self.converged_states:
+            return False
+        parameters = np.array(parameters, dtype=float)
+        stored_parameters = np.array([state[0] for state in self.converged_states])
+        scale = np.ptp(np.vstack((stored_parameters, parameters)), axis=0)
+        scale[scale == 0.] = 1.
+        distance = np.linalg.norm((stored_parameters - parameters)/scale, axis=1)
+        _, structure_tstep = self.converged_states[int(np.argmin(distance))]
+        self.set_initial_state(structure_tstep)
+        return True
+
     def extract_resultants(self, tstep=None):
         return self.structural_solver.extract_resultants(tstep)
@@ -134,14 +134,11 @@ class StaticCoupledRBM(BaseSolver):
                 self.data = self.aero_solver.run()
 
                 # map force
-                struct_forces = mapping.aero2struct_force_mapping(
+                struct_forces = self.data.aero.force_mapping.map_forces(
                     self.data.aero.timestep_info[self.data.ts].forces,
-                    self.data.aero.struct2aero_mapping,
                     self.data.aero.timestep_info[self.data.ts].zeta,
                     self.data.structure.timestep_info[self.data.ts].pos,
                     self.data.structure.timestep_info[self.data.ts].psi,
-                    self.data.structure.node_master_elem,
-                    self.data.structure.connectivities,
                     self.data.structure.timestep_info[self.data.ts].cag(),
                     self.data.aero.aero_dict)
 
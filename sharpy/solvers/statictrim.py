@@ -1,11 +1,21 @@
+import multiprocessing
+
 import numpy as np
 
 import sharpy.utils.cout_utils as cout
 import sharpy.utils.solver_interface as solver_interface
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
+import sharpy.utils.exceptions as exc
 import os
 
+# trim solver shared with the processes that compute the finite difference Jacobian
+_jacobian_trim = None
+
+
+def _evaluate_perturbation(x):
+    return _jacobian_trim.evaluate(*x, print_info=False, update_state=False)
+
 
 @solver
 class StaticTrim(BaseSolver):
@@ -18,6 +28,22 @@ class StaticTrim(BaseSolver):
     equilibrium. The output angles are shown in degrees.
 
     The results from the trimming iteration can be saved to a text file by using the `save_info` option.
+
+    Two algorithms are available through ``trim_method``:
+
+        * ``secant``: each input is updated with a secant estimate of the derivative of its own output, i.e. the
+          Jacobian is assumed to be diagonal.
+
+        * ``broyden``: quasi-Newton iteration on the full ``3x3`` Jacobian of ``[Fz, My, Fx]`` with respect to
+          ``[alpha, alpha + delta, thrust]``. The Jacobian is computed by finite differences (which can be evaluated
+          in ``num_cores`` parallel processes) or given in ``initial_jacobian``, and then updated with Broyden's rank
+          one formula. Steps that do not reduce the residual are halved and, if that is not enough, rejected and the
+          Jacobian recomputed. The final Jacobian is saved to ``trim_jacobian.txt`` so that it can be reused in
+          subsequent trims through ``initial_jacobian``.
+
+    With ``warm_start``, each evaluation of the coupled solver starts from the converged deformation of the closest
+    previous evaluation, instead of that of the last one (see
+    :meth:`~sharpy.solvers.staticcoupled.StaticCoupled.warm_start`).
     """
     solver_id = 'StaticTrim'
     solver_classification = 'Flight Dynamics'
@@ -25,6 +51,7 @@ class StaticTrim(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['print_info'] = 'bool'
     settings_default['print_info'] = True
@@ -86,6 +113,32 @@ class StaticTrim(BaseSolver):
     settings_default['relaxation_factor'] = 0.2
     settings_description['relaxation_factor'] = 'Relaxation factor'
 
+    settings_types['trim_method'] = 'str'
+    settings_default['trim_method'] = 'secant'
+    settings_description['trim_method'] = 'Trim algorithm'
+    settings_options['trim_method'] = ['secant', 'broyden']
+
+    settings_types['initial_jacobian'] = 'list(float)'
+    settings_default['initial_jacobian'] = []
+    settings_description['initial_jacobian'] = 'Row-major ``3x3`` Jacobian of ``[Fz, My, Fx]`` with respect to ' \
+                                               '``[alpha, alpha + delta, thrust]`` for the ``broyden`` method. If ' \
+                                               'empty, it is computed by finite differences'
+
+    settings_types['num_cores'] = 'int'
+    settings_default['num_cores'] = 1
+    settings_description['num_cores'] = 'Number of processes in which the finite difference evaluations of the ' \
+                                        'Jacobian are run for the ``broyden`` method'
+
+    settings_types['max_backtracking'] = 'int'
+    settings_default['max_backtracking'] = 3
+    settings_description['max_backtracking'] = 'Number of times the step of the ``broyden`` method is halved when it ' \
+                                               'does not reduce the residual, before rejecting it'
+
+    settings_types['warm_start'] = 'bool'
+    settings_default['warm_start'] = False
+    settings_description['warm_start'] = 'Start each evaluation from the converged state of the closest previous ' \
+                                         'evaluation. Requires the ``StaticCoupled`` solver'
+
     settings_types['save_info'] = 'bool'
     settings_default['save_info'] = False
     settings_description['save_info'] = 'Save trim results to text file'
@@ -95,7 +148,7 @@ class StaticTrim(BaseSolver):
     settings_description['folder'] = 'Output location for trim results'
 
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.data = None
@@ -115,19 +168,27 @@ class StaticTrim(BaseSolver):
         self.gradient_history = []
         self.trimmed_values = np.zeros((3,))
 
+        self.jacobian = None
+        self.folder = None
+
         self.table = None
 
     def initialise(self, data):
         self.data = data
         self.settings = data.settings[self.solver_id]
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default,
+                                 options=self.settings_options)
 
         self.solver = solver_interface.initialise_solver(self.settings['solver'])
         self.solver.initialise(self.data, self.settings['solver_settings'])
+        if self.settings['warm_start'].value and not hasattr(self.solver, 'warm_start'):
+            # the converged states are stored by the solver (see StaticCoupled.warm_start)
+            raise exc.NotValidSetting('solver', self.settings['solver'], ['StaticCoupled'])
 
         folder = self.settings['folder'] + '/' + self.data.settings['SHARPy']['case'] + '/statictrim/'
         if not os.path.exists(folder):
             os.makedirs(folder)
+        self.folder = folder
 
         self.table = cout.TablePrinter(10, 8, ['g', 'f', 'f', 'f', 'f', 'f', 'f', 'f', 'f', 'f'],
                                        filename=folder+'trim_iterations.txt')
@@ -152,7 +213,10 @@ class StaticTrim(BaseSolver):
         self.data.ts = 0
 
     def run(self):
-        self.trim_algorithm()
+        if self.settings['trim_method'] == 'broyden':
+            self.broyden_trim_algorithm()
+        else:
+            self.trim_algorithm()
         # TODO modify trimmed values for next solver
         return self.data
 
@@ -316,7 +380,129 @@ class StaticTrim(BaseSolver):
                 self.table.close_file()
                 return
 
-    def evaluate(self, alpha, deflection_gamma, thrust):
+    def broyden_trim_algorithm(self):
+        """
+        Quasi-Newton trim algorithm
+
+        The trim inputs are updated with the Newton step of the Jacobian of the outputs ``[Fz, My, Fx]`` with respect to
+        the inputs ``[alpha, alpha + delta, thrust]``. After every step, the Jacobian is corrected with Broyden's
+        update. If a step does not reduce the residual (scaled by the tolerances), it is halved up to ``max_backtracking``
+        times. If the residual still does not decrease, the step is rejected and the Jacobian is recomputed by finite
+        differences at the current point, as it is when the Jacobian is singular. With a freshly computed Jacobian,
+        the shortest step is taken instead.
+
+        Returns:
+            np.array: array of trim values for angle of attack, control surface deflection and thrust.
+        """
+        tolerances = np.array([self.settings['fz_tolerance'].value,
+                               self.settings['m_tolerance'].value,
+                               self.settings['fx_tolerance'].value])
+
+        x = np.array([self.settings['initial_alpha'].value,
+                      self.settings['initial_deflection'].value + self.settings['initial_alpha'].value,
+                      self.settings['initial_thrust'].value])
+
+        self.jacobian = None
+        fresh_jacobian = False
+        if len(self.settings['initial_jacobian']):
+            self.jacobian = np.array(self.settings['initial_jacobian'], dtype=float).reshape((self.n_input,
+                                                                                              self.n_input))
+
+        for self.i_iter in range(self.settings['max_iter'].value + 1):
+            if self.i_iter == self.settings['max_iter'].value:
+                raise Exception('The Trim routine reached max iterations without convergence!')
+
+            if not self.i_iter:
+                f = np.array(self.evaluate(*x))
+            else:
+                try:
+                    dx = -np.linalg.solve(self.jacobian, f)
+                except np.linalg.LinAlgError:
+                    cout.cout_wrap('Singular trim Jacobian, recomputing it by finite differences', 2)
+                    self.jacobian = self.finite_difference_jacobian(x, f)
+                    fresh_jacobian = True
+                    dx = -np.linalg.solve(self.jacobian, f)
+
+                # backtracking along the Newton direction until the residual decreases
+                residual = np.linalg.norm(f/tolerances)
+                decreased = False
+                for i_backtrack in range(self.settings['max_backtracking'].value + 1):
+                    if i_backtrack:
+                        dx *= 0.5
+                    x_new = x + dx
+                    f_new = np.array(self.evaluate(*x_new))
+                    decreased = np.linalg.norm(f_new/tolerances) < residual
+                    if decreased:
+                        break
+
+                if decreased or fresh_jacobian:
+                    # Broyden rank one update with the step taken. The shortest step is kept if the residual does
+                    # not decrease even with a finite difference Jacobian, so that the iteration is not stuck
+                    self.jacobian += np.outer(f_new - f - self.jacobian.dot(dx), dx)/dx.dot(dx)
+                    fresh_jacobian = False
+                    x = x_new
+                    f = f_new
+                else:
+                    # rejected step: the secant information is not good enough, start again from the current point
+                    cout.cout_wrap('Trim step rejected, recomputing the Jacobian by finite differences', 2)
+                    self.jacobian = None
+
+            self.input_history.append(list(x))
+            self.output_history.append(list(f))
+            self.gradient_history.append(None if self.jacobian is None else self.jacobian.copy())
+
+            if all(self.convergence(*f)):
+                self.trimmed_values = list(x)
+                if self.jacobian is not None:
+                    np.savetxt(self.folder + 'trim_jacobian.txt', self.jacobian)
+                self.table.close_file()
+                return
+
+            if self.jacobian is None:
+                self.jacobian = self.finite_difference_jacobian(x, f)
+                fresh_jacobian = True
+
+    def finite_difference_jacobian(self, x, f):
+        """
+        Forward finite difference Jacobian of the trim outputs ``[Fz, My, Fx]`` with respect to the inputs
+        ``[alpha, alpha + delta, thrust]``.
+
+        The perturbations are ``initial_angle_eps`` for the angles and ``initial_thrust_eps`` for the thrust. If
+        ``num_cores > 1``, the perturbed cases are solved in parallel in forked processes, each of them starting from
+        the current state of the solver.
+
+        Args:
+            x (np.ndarray): inputs at which the Jacobian is evaluated
+            f (np.ndarray): outputs at ``x``
+
+        Returns:
+            np.ndarray: ``3x3`` Jacobian
+        """
+        global _jacobian_trim
+
+        eps = np.array([self.settings['initial_angle_eps'].value,
+                        self.settings['initial_angle_eps'].value,
+                        self.settings['initial_thrust_eps'].value])
+        perturbations = [x + eps[i]*np.eye(self.n_input)[i] for i in range(self.n_input)]
+
+        num_cores = min(self.settings['num_cores'].value, self.n_input)
+        if num_cores > 1:
+            _jacobian_trim = self
+            try:
+                with multiprocessing.get_context('fork').Pool(num_cores) as pool:
+                    outputs = pool.map(_evaluate_perturbation, perturbations)
+            finally:
+                _jacobian_trim = None
+        else:
+            outputs = [self.evaluate(*x_perturbed) for x_perturbed in perturbations]
+
+        jacobian = np.zeros((self.n_input, self.n_input))
+        for i_input in range(self.n_input):
+            jacobian[:, i_input] = (np.array(outputs[i_input]) - f)/eps[i_input]
+
+        return jacobian
+
+    def evaluate(self, alpha, deflection_gamma, thrust, print_info=True, update_state=True):
         if not np.isfinite(alpha):
             import pdb; pdb.set_trace()
         if not np.isfinite(deflection_gamma):
@@ -335,8 +521,12 @@ class StaticTrim(BaseSolver):
                                 self.settings['thrust_nodes'],
                                 deflection_gamma - alpha,
                                 self.settings['tail_cs_index'].value)
+        if self.settings['warm_start'].value:
+            self.solver.warm_start(np.array([alpha, deflection_gamma, thrust]))
         # run the solver
         self.solver.run()
+        if self.settings['warm_start'].value and update_state:
+            self.solver.save_converged_state(np.array([alpha, deflection_gamma, thrust]))
         # extract resultants
         forces, moments = self.solver.extract_resultants()
 
@@ -348,15 +538,16 @@ class StaticTrim(BaseSolver):
         # cout.cout_wrap('fy = ' + str(forces[1]) + ' my = ' + str(moments[1]), 2)
         # cout.cout_wrap('fz = ' + str(forces[2]) + ' mz = ' + str(moments[2]), 2)
 
-        self.table.print_line([self.i_iter,
-                               alpha*180/np.pi,
-                               (deflection_gamma - alpha)*180/np.pi,
-                               thrust,
-                               forces[0],
-                               forces[1],
-                               forces[2],
-                               moments[0],
-                               moments[1],
-                               moments[2]])
+        if print_info:
+            self.table.print_line([self.i_iter,
+                                   alpha*180/np.pi,
+                                   (deflection_gamma - alpha)*180/np.pi,
+                                   thrust,
+                                   forces[0],
+                                   forces[1],
+                                   forces[2],
+                                   moments[0],
+                                   moments[1],
+                                   moments[2]])
 
         return forcez, moment, forcex
@@ -91,6 +91,12 @@ class StepLinearUVLM(BaseSolver):
     settings_default['track_body_number'] = -1
     settings_description['track_body_number'] = 'Frame of reference number to follow. If ``-1`` track ``A`` frame.'
 
+    settings_types['merge_step_operators'] = 'bool'
+    settings_default['merge_step_operators'] = False
+    settings_description['merge_step_operators'] = 'Merge the block state-space matrices into single operators once, ' \
+                                                   'so that every step is solved with matrix-vector products only. ' \
+                                                   'Faster, but requires more memory'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -121,6 +127,11 @@ class StepLinearUVLM(BaseSolver):
         self.lin_uvlm_system = None
         self.velocity_generator = None
 
+        # index maps between the aerodynamic grid and the input/output vectors
+        self.input_map = None
+        self.vertex_buffer = None
+        self.vertex_offsets = None
+
     def initialise(self, data, custom_settings=None):
         r"""
         Initialises the Linear UVLM aerodynamic solver and the chosen velocity generator.
@@ -153,6 +164,8 @@ class StepLinearUVLM(BaseSolver):
         settings.to_custom_types(self.settings['ScalingDict'], self.scaling_settings_types,
                                  self.scaling_settings_default, no_ctype=True)
 
+        self.get_packing_maps(self.data.aero.timestep_info[-1])
+
         # Check whether linear UVLM has been initialised
         try:
             self.data.aero.linear
@@ -221,6 +234,8 @@ class StepLinearUVLM(BaseSolver):
 
             # Assemble the state space system
             lin_uvlm_system.assemble_ss()
+            if self.settings['merge_step_operators']:
+                lin_uvlm_system.assemble_step_operators()
             self.data.aero.linear['System'] = lin_uvlm_system
             self.data.aero.linear['SS'] = lin_uvlm_system.SS
             self.data.aero.linear['x_0'] = x_0
@@ -339,8 +354,7 @@ class StepLinearUVLM(BaseSolver):
         du_n = u_n - self.data.aero.linear['u_0']
 
         if self.settings['remove_predictor']:
-            u_m1 = self.pack_input_vector()
-            du_m1 = u_m1 - self.data.aero.linear['u_0']
+            du_m1 = du_n
         else:
             du_m1 = None
 
@@ -368,8 +382,8 @@ class StepLinearUVLM(BaseSolver):
 
         return self.data
 
-    def add_step(self):
-        self.data.aero.add_timestep()
+    def add_step(self, aero_tstep=None):
+        self.data.aero.add_timestep(aero_tstep)
 
     def update_grid(self, beam):
         self.data.aero.generate_zeta(beam, self.data.aero.aero_settings, -1, beam_ts=-1)
@@ -428,10 +442,11 @@ class StepLinearUVLM(BaseSolver):
         """
 
         ### project forces from uvlm FoR to FoR G
+        # - forces are in UVLM linearisation frame. Hence, these  are projected
+        # into FoR (using rotation matrix Cag0 time 0) A and back to FoR G
+        f_aero = y_n[self.input_map[:, :self.vertex_offsets[-1]]]
         if self.settings['track_body']:
-            Cg_uvlm = np.dot( self.Cga, self.Cga0.T )
-
-        f_aero = y_n
+            f_aero = np.dot(np.dot(self.Cga, self.Cga0.T), f_aero)
 
         gamma_vec, gamma_star_vec, gamma_dot_vec = self.data.aero.linear['System'].unpack_state(x_n)
 
@@ -442,34 +457,21 @@ class StepLinearUVLM(BaseSolver):
         gamma_star = []
         gamma_dot = []
 
-        worked_points = 0
         worked_panels = 0
         worked_wake_panels = 0
 
         for i_surf in range(aero_tstep.n_surf):
-            # Tuple with dimensions of the aerogrid zeta, which is the same shape for forces
             dimensions = aero_tstep.zeta[i_surf].shape
             dimensions_gamma = self.data.aero.aero_dimensions[i_surf]
             dimensions_wake = self.data.aero.aero_dimensions_star[i_surf]
 
-            # Number of entries in zeta
-            points_in_surface = aero_tstep.zeta[i_surf].size
             panels_in_surface = aero_tstep.gamma[i_surf].size
             panels_in_wake = aero_tstep.gamma_star[i_surf].size
 
-            # Append reshaped forces to each entry in list (one for each surface)
-            forces.append(f_aero[worked_points:worked_points+points_in_surface].reshape(dimensions, order='C'))
-
-            ### project forces.
-            # - forces are in UVLM linearisation frame. Hence, these  are projected
-            # into FoR (using rotation matrix Cag0 time 0) A and back to FoR G
-            if self.settings['track_body']:
-                for mm in range(dimensions[1]):
-                    for nn in range(dimensions[2]):
-                        forces[i_surf][:,mm,nn] = np.dot(Cg_uvlm, forces[i_surf][:,mm,nn])
-
-            # Add the null bottom 3 rows to to the forces entry
-            forces[i_surf] = np.concatenate((forces[i_surf], np.zeros(dimensions)))
+            # Forces with the null bottom 3 rows
+            forces.append(np.zeros((6,) + dimensions[1:]))
+            forces[i_surf][:3] = f_aero[:, self.vertex_offsets[i_surf]:self.vertex_offsets[i_surf + 1]].reshape(
+                dimensions, order='C')
 
             # Reshape bound circulation terms
             gamma.append(gamma_vec[worked_panels:worked_panels+panels_in_surface].reshape(
@@ -481,13 +483,42 @@ class StepLinearUVLM(BaseSolver):
             gamma_star.append(gamma_star_vec[worked_wake_panels:worked_wake_panels+panels_in_wake].reshape(
                 dimensions_wake, order='C'))
 
-            worked_points += points_in_surface
             worked_panels += panels_in_surface
             worked_wake_panels += panels_in_wake
 
         return forces, gamma, gamma_dot, gamma_star
 
 
+    def get_packing_maps(self, aero_tstep):
+        r"""
+        Computes the index maps between the aerodynamic grid and the input and output vectors of the linear UVLM
+        system, so that these are packed and unpacked with a single indexing operation.
+
+        The grid vertices of :math:`\zeta`, :math:`\dot{\zeta}` and :math:`u_{ext}` of all surfaces are stacked
+        column-wise in ``self.vertex_buffer``, a ``(3, 3 K_\zeta)`` array. ``self.input_map`` is the array of the
+        same shape with the position of every entry in the input vector. The first ``K_\zeta`` columns also map the
+        output forces.
+
+        Args:
+            aero_tstep (AeroTimeStepInfo): aerodynamic timestep information class instance
+        """
+
+        vertices_in_surface = [aero_tstep.zeta[i_surf][0].size for i_surf in range(aero_tstep.n_surf)]
+        self.vertex_offsets = np.concatenate(([0], np.cumsum(vertices_in_surface))).astype(int)
+        n_vertices = self.vertex_offsets[-1]
+
+        # position in a (3, M+1, N+1) C-ordered surface array of each vertex and component
+        self.input_map = np.empty((3, 3 * n_vertices), dtype=int)
+        for i_surf in range(aero_tstep.n_surf):
+            n_here = vertices_in_surface[i_surf]
+            surface_map = 3 * self.vertex_offsets[i_surf] + np.arange(3 * n_here).reshape((3, n_here))
+            for i_var in range(3):
+                self.input_map[:, i_var * n_vertices + self.vertex_offsets[i_surf]:
+                                  i_var * n_vertices + self.vertex_offsets[i_surf + 1]] = \
+                    3 * n_vertices * i_var + surface_map
+
+        self.vertex_buffer = np.empty((3, 3 * n_vertices))
+
     def pack_input_vector(self):
         r"""
         Transform a SHARPy AeroTimestep instance into a column vector containing the input to the linear UVLM system.
@@ -506,48 +537,21 @@ class StepLinearUVLM(BaseSolver):
 
         aero_tstep = self.data.aero.timestep_info[-1]
 
+        # Grid vertices of zeta, zeta_dot and u_ext stacked column-wise
+        n_vertices = self.vertex_offsets[-1]
+        for i_var, variable in enumerate([aero_tstep.zeta, aero_tstep.zeta_dot, aero_tstep.u_ext]):
+            np.concatenate([variable[i_surf].reshape((3, -1), order='C') for i_surf in range(aero_tstep.n_surf)],
+                           axis=1, out=self.vertex_buffer[:, i_var * n_vertices:(i_var + 1) * n_vertices])
+
+        u = np.empty((3 * self.vertex_buffer.shape[1],))
+
         ### re-compute projection in G frame as if A was not rotating
         # - u_n is in FoR G. Hence, this is project in FoR A and back to FoR G
         # using rotation matrix aat time 0 (as if FoR A was not rotating).
         if self.settings['track_body']:
-
-            Cuvlm_g = np.dot( self.Cga0, self.Cga.T )
-            zeta_uvlm, zeta_dot_uvlm, u_ext_uvlm = [], [], []
-
-            for i_surf in range(aero_tstep.n_surf):
-
-                Mp1, Np1 = aero_tstep.dimensions[i_surf] + 1
-
-                zeta_uvlm.append( np.empty((3,Mp1,Np1)) )
-                zeta_dot_uvlm.append( np.empty((3,Mp1,Np1)) )
-                u_ext_uvlm.append( np.empty((3,Mp1,Np1)) )
-
-                for mm in range(Mp1):
-                    for nn in range(Np1):
-                        zeta_uvlm[i_surf][:,mm,nn] = \
-                            np.dot(Cuvlm_g, aero_tstep.zeta[i_surf][:,mm,nn])
-                        zeta_dot_uvlm[i_surf][:,mm,nn] = \
-                            np.dot(Cuvlm_g, aero_tstep.zeta_dot[i_surf][:,mm,nn])
-                        u_ext_uvlm[i_surf][:,mm,nn] = \
-                            np.dot(Cuvlm_g, aero_tstep.u_ext[i_surf][:,mm,nn])
-
-            zeta = np.concatenate([zeta_uvlm[i_surf].reshape(-1, order='C')
-                                   for i_surf in range(aero_tstep.n_surf)])
-            zeta_dot = np.concatenate([zeta_dot_uvlm[i_surf].reshape(-1, order='C')
-                                       for i_surf in range(aero_tstep.n_surf)])
-            u_ext = np.concatenate([u_ext_uvlm[i_surf].reshape(-1, order='C')
-                                    for i_surf in range(aero_tstep.n_surf)])
-
+            u[self.input_map] = np.dot(np.dot(self.Cga0, self.Cga.T), self.vertex_buffer)
         else:
-
-            zeta = np.concatenate([aero_tstep.zeta[i_surf].reshape(-1, order='C')
-                                   for i_surf in range(aero_tstep.n_surf)])
-            zeta_dot = np.concatenate([aero_tstep.zeta_dot[i_surf].reshape(-1, order='C')
-                                       for i_surf in range(aero_tstep.n_surf)])
-            u_ext = np.concatenate([aero_tstep.u_ext[i_surf].reshape(-1, order='C')
-                                   for i_surf in range(aero_tstep.n_surf)])
-
-        u = np.concatenate((zeta, zeta_dot, u_ext))
+            u[self.input_map] = self.vertex_buffer
 
         return u
 
@@ -9,6 +9,7 @@ import sharpy.utils.settings as settings
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.generator_interface as gen_interface
 import sharpy.utils.cout_utils as cout
+from sharpy.utils.datastructures import TimeStepHistory
 
 
 @solver
@@ -216,8 +217,8 @@ class StepUvlm(BaseSolver):
 
         return self.data
 
-    def add_step(self):
-        self.data.aero.add_timestep()
+    def add_step(self, aero_tstep=None):
+        self.data.aero.add_timestep(aero_tstep)
 
     def update_grid(self, beam):
         self.data.aero.generate_zeta(beam,
@@ -234,6 +235,9 @@ class StepUvlm(BaseSolver):
 
     @staticmethod
     def filter_gamma_dot(tstep, history, filter_param):
+        if isinstance(history, TimeStepHistory):
+            # only the steps held in memory, so that spilled steps are not read back from disk every iteration
+            history = history.in_memory()
         clean_history = [x for x in history if x is not None]
         series_length = len(clean_history) + 1
         for i_surf in range(len(tstep.zeta)):
@@ -8,6 +8,7 @@ import sharpy.utils.cout_utils as cout
 import sharpy.utils.solver_interface as solver_interface
 from sharpy.utils.solver_interface import solver, BaseSolver
 import sharpy.utils.settings as settings
+import sharpy.utils.exceptions as exc
 import sharpy.utils.algebra as algebra
 
 
@@ -86,6 +87,11 @@ class Trim(BaseSolver):
     settings_default['refine_solution'] = False
     settings_description['refine_solution'] = 'If ``True`` and the optimiser routine allows for it, the optimiser will try to improve the solution with hybrid methods'
 
+    settings_types['warm_start'] = 'bool'
+    settings_default['warm_start'] = False
+    settings_description['warm_start'] = 'Start each evaluation of the ``solver`` from the converged state of the ' \
+                                         'closest previous evaluation. Requires the ``StaticCoupled`` solver'
+
     settings_table = settings.SettingsTable()
     __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
 
@@ -106,6 +112,9 @@ class Trim(BaseSolver):
 
         self.solver = solver_interface.initialise_solver(self.settings['solver'])
         self.solver.initialise(self.data, self.settings['solver_settings'])
+        if self.settings['warm_start'].value and not hasattr(self.solver, 'warm_start'):
+            # the converged states are stored by the solver (see StaticCoupled.warm_start)
+            raise exc.NotValidSetting('solver', self.settings['solver'], ['StaticCoupled'])
 
         # generate x_info (which elements of the x array are what)
         counter = 0
@@ -316,8 +325,12 @@ def solver_wrapper(x, x_info, solver_data, i_dim=-1):
             for i_neg_diff_node in x_info['negative_thrust_nodes']:
                 solver_data.data.structure.ini_info.steady_applied_forces[i_neg_diff_node, 1] = neg_thrust
 
+    if solver_data.settings['warm_start'].value:
+        solver_data.solver.warm_start(x)
     # run the solver
     solver_data.solver.run()
+    if solver_data.settings['warm_start'].value:
+        solver_data.solver.save_converged_state(x)
     # extract resultants
     forces, moments = solver_data.solver.extract_resultants()
 
@@ -5,7 +5,7 @@ import copy
 from sharpy.structure.basestructure import BaseStructure
 import sharpy.structure.models.beamstructures as beamstructures
 import sharpy.utils.algebra as algebra
-from sharpy.utils.datastructures import StructTimeStepInfo
+from sharpy.utils.datastructures import StructTimeStepInfo, copy_to_history
 import sharpy.utils.multibody as mb
 
 
@@ -334,15 +334,17 @@ class Beam(BaseStructure):
         self.generate_node_master_elem()
         # a = 1
 
-    def add_timestep(self, timestep_info):
-        if len(timestep_info) == 0:
-            # copy from ini_info
-            timestep_info.append(self.ini_info.copy())
-        else:
-            timestep_info.append(self.timestep_info[-1].copy())
-
-    def next_step(self):
-        self.add_timestep(self.timestep_info)
+    def add_timestep(self, timestep_info, tstep=None):
+        if tstep is None:
+            if len(timestep_info) == 0:
+                # copy from ini_info
+                tstep = self.ini_info
+            else:
+                tstep = self.timestep_info[-1]
+        timestep_info.append(copy_to_history(tstep, timestep_info))
+
+    def next_step(self, tstep=None):
+        self.add_timestep(self.timestep_info, tstep)
 
     # def generate_node_master_elem(self):
     #     """
@@ -19,6 +19,7 @@ import sharpy.utils.cout_utils as cout
 import os
 import ctypes as ct
 import numpy as np
+import scipy.sparse as sp
 import sharpy.utils.algebra as algebra
 
 dict_of_lc = {}
@@ -1274,7 +1275,85 @@ def define_num_LM_eq(lc_list):
     return num_LM_eq
 
 
-def generate_lagrange_matrix(lc_list, MB_beam, MB_tstep, ts, num_LM_eq, sys_size, dt, Lambda, Lambda_dot, dynamic_or_static):
+class SparseLagrangeMatrix(object):
+    """
+    SparseLagrangeMatrix
+
+    Accumulates the contributions of the constraints to a matrix in coordinate format. The constraints add their
+    terms to blocks of the matrix, i.e. ``M[rows, cols] += value``, that are recorded without allocating the dense
+    matrix. The assignment of a block, ``M[rows, cols] = value``, replaces the terms previously added to it.
+
+    Args:
+        shape (tuple): shape of the matrix
+
+    Examples:
+        >>> LM_C = SparseLagrangeMatrix((10, 10))
+        >>> LM_C[6:, :3] += np.ones((4, 3))
+        >>> LM_C.tocsc()
+    """
+    def __init__(self, shape):
+        self.shape = shape
+        self.rows = []
+        self.cols = []
+        self.data = []
+
+    def __getitem__(self, key):
+        return SparseLagrangeBlock(self, key)
+
+    def __setitem__(self, key, value):
+        if isinstance(value, SparseLagrangeBlock) and value.matrix is self:
+            # Assignment of the block returned by __getitem__ after the in-place operation
+            return
+        block = SparseLagrangeBlock(self, key)
+        # Remove the terms previously added to the block
+        for i_add in range(len(self.data)):
+            keep = np.logical_not(np.isin(self.rows[i_add], block.rows) & np.isin(self.cols[i_add], block.cols))
+            self.rows[i_add] = self.rows[i_add][keep]
+            self.cols[i_add] = self.cols[i_add][keep]
+            self.data[i_add] = self.data[i_add][keep]
+        block += value
+
+    def add(self, rows, cols, value):
+        value = np.broadcast_to(value, (len(rows), len(cols)))
+        i_nonzero, j_nonzero = np.nonzero(value)
+        self.rows.append(rows[i_nonzero])
+        self.cols.append(cols[j_nonzero])
+        self.data.append(value[i_nonzero, j_nonzero])
+
+    def tocoo(self):
+        if not self.data:
+            return sp.coo_matrix(self.shape, dtype=ct.c_double)
+        return sp.coo_matrix((np.concatenate(self.data), (np.concatenate(self.rows), np.concatenate(self.cols))),
+                             shape=self.shape)
+
+    def tocsc(self):
+        return self.tocoo().tocsc()
+
+
+class SparseLagrangeBlock(object):
+    """
+    SparseLagrangeBlock
+
+    Block of a :class:`SparseLagrangeMatrix` to which terms are added with the ``+=`` and ``-=`` operators.
+    """
+    def __init__(self, matrix, key):
+        self.matrix = matrix
+        self.rows, self.cols = [np.atleast_1d(np.arange(size)[index]) for size, index in zip(matrix.shape, key)]
+
+    def __iadd__(self, value):
+        value = np.asarray(value)
+        if value.size == len(self.rows)*len(self.cols):
+            # integer indices drop the dimensions of the block
+            value = value.reshape((len(self.rows), len(self.cols)))
+        self.matrix.add(self.rows, self.cols, value)
+        return self
+
+    def __isub__(self, value):
+        return self.__iadd__(-np.asarray(value))
+
+
+def generate_lagrange_matrix(lc_list, MB_beam, MB_tstep, ts, num_LM_eq, sys_size, dt, Lambda, Lambda_dot, dynamic_or_static,
+                             sparse=False):
     """
     generate_lagrange_matrix
 
@@ -1291,6 +1370,7 @@ def generate_lagrange_matrix(lc_list, MB_beam, MB_tstep, ts, num_LM_eq, sys_size
         Lambda(numpy array): list of Lagrange multipliers values
         Lambda_dot(numpy array): list of the first derivative of the Lagrange multipliers values
         dynamic_or_static (str): string defining if the computation is dynamic or static
+        sparse (bool): if ``True``, ``LM_C`` and ``LM_K`` are returned as ``scipy.sparse.csc_matrix``
 
     Returns:
         LM_C (numpy array): Damping matrix associated to the Lagrange Multipliers equations
@@ -1308,8 +1388,12 @@ def generate_lagrange_matrix(lc_list, MB_beam, MB_tstep, ts, num_LM_eq, sys_size
     scalingFactor = 1.0
 
     # Initialize matrices
-    LM_C = np.zeros((sys_size + num_LM_eq,sys_size + num_LM_eq), dtype=ct.c_double, order = 'F')
-    LM_K = np.zeros((sys_size + num_LM_eq,sys_size + num_LM_eq), dtype=ct.c_double, order = 'F')
+    if sparse:
+        LM_C = SparseLagrangeMatrix((sys_size + num_LM_eq, sys_size + num_LM_eq))
+        LM_K = SparseLagrangeMatrix((sys_size + num_LM_eq, sys_size + num_LM_eq))
+    else:
+        LM_C = np.zeros((sys_size + num_LM_eq,sys_size + num_LM_eq), dtype=ct.c_double, order = 'F')
+        LM_K = np.zeros((sys_size + num_LM_eq,sys_size + num_LM_eq), dtype=ct.c_double, order = 'F')
     LM_Q = np.zeros((sys_size + num_LM_eq,),dtype=ct.c_double, order = 'F')
 
     # Define the matrices associated to the constratints
@@ -1350,6 +1434,10 @@ def generate_lagrange_matrix(lc_list, MB_beam, MB_tstep, ts, num_LM_eq, sys_size
                         scalingFactor=scalingFactor,
                         penaltyFactor=penaltyFactor)
 
+    if sparse:
+        LM_C = LM_C.tocsc()
+        LM_K = LM_K.tocsc()
+
     return LM_C, LM_K, LM_Q
 
 
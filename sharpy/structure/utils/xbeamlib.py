@@ -1,4 +1,5 @@
 import ctypes as ct
+import weakref
 import numpy as np
 import scipy as sc
 import scipy.integrate
@@ -68,6 +69,64 @@ doubleP = ct.POINTER(ct.c_double)
 intP = ct.POINTER(ct.c_int)
 charP = ct.POINTER(ct.c_char_p)
 
+# beam properties passed to the library, in the order of the arguments
+beam_int_properties = ['num_nodes', 'num_mem', 'connectivities', 'master']
+beam_mass_properties = ['mass', 'mass_indices']
+beam_stiffness_properties = ['stiffness', 'inv_stiffness', 'stiffness_indices', 'frame_of_reference_delta', 'rbmass',
+                             'node_master_elem', 'vdof', 'fdof']
+
+# ctypes arguments of the time-invariant properties of every beam
+_beam_pointers = weakref.WeakKeyDictionary()
+
+
+def _data_as(array):
+    if array.dtype == ct.c_int:
+        return array.ctypes.data_as(intP)
+    return array.ctypes.data_as(doubleP)
+
+
+def beam_pointers(beam):
+    """
+    Returns the ctypes arguments of the time-invariant properties of ``beam``, so that these are only built once per
+    beam and not every time the library is called. Only the time step dependent arguments are built in every call.
+
+    The arguments are stored for every beam and built again if the arrays of ``beam.fortran`` or ``beam.ini_info`` are
+    replaced (e.g. by ``beam.generate_fortran()``).
+
+    Args:
+        beam (sharpy.structure.models.beam.Beam): beam
+
+    Returns:
+        dict: ``n_elem``, ``n_nodes``, ``n_mass`` and ``n_stiff`` as ``ct.c_int``, the pointers to
+        ``pos_ini``, ``psi_ini`` (of ``beam.ini_info``), the dictionary ``fortran`` with the pointers to the
+        properties in ``beam.fortran`` and the tuple ``properties`` with these pointers together with ``n_mass`` and
+        ``n_stiff``, in the order of the arguments of the library functions
+    """
+    names = beam_int_properties + beam_mass_properties + beam_stiffness_properties
+    arrays = [beam.fortran[name] for name in names] + [beam.ini_info.pos, beam.ini_info.psi]
+    sizes = (beam.num_elem, beam.num_node, beam.n_mass, beam.n_stiff, beam.num_dof.value)
+
+    try:
+        cached_arrays, cached_sizes, pointers = _beam_pointers[beam]
+        if cached_sizes == sizes and all([array is cached for array, cached in zip(arrays, cached_arrays)]):
+            return pointers
+    except KeyError:
+        pass
+
+    pointers = dict()
+    for name, value in zip(['n_elem', 'n_nodes', 'n_mass', 'n_stiff'], sizes):
+        pointers[name] = ct.c_int(value)
+    pointers['pos_ini'] = beam.ini_info.pos.ctypes.data_as(doubleP)
+    pointers['psi_ini'] = beam.ini_info.psi.ctypes.data_as(doubleP)
+    pointers['fortran'] = dict([(name, _data_as(beam.fortran[name])) for name in names])
+    pointers['properties'] = tuple([pointers['fortran'][name] for name in beam_int_properties] +
+                                   [ct.byref(pointers['n_mass'])] +
+                                   [pointers['fortran'][name] for name in beam_mass_properties] +
+                                   [ct.byref(pointers['n_stiff'])] +
+                                   [pointers['fortran'][name] for name in beam_stiffness_properties])
+    _beam_pointers[beam] = (arrays, sizes, pointers)
+    return pointers
+
 
 def cbeam3_solv_nlnstatic(beam, settings, ts):
     """@brief Python wrapper for f_cbeam3_solv_nlnstatic
@@ -76,10 +135,9 @@ def cbeam3_solv_nlnstatic(beam, settings, ts):
     f_cbeam3_solv_nlnstatic = xbeamlib.cbeam3_solv_nlnstatic_python
     f_cbeam3_solv_nlnstatic.restype = None
 
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
 
     xbopts = Xbopts()
     xbopts.PrintInfo = ct.c_bool(settings['print_info'])
@@ -104,25 +162,10 @@ def cbeam3_solv_nlnstatic(beam, settings, ts):
 
     f_cbeam3_solv_nlnstatic(ct.byref(n_elem),
                             ct.byref(n_nodes),
-                            beam.fortran['num_nodes'].ctypes.data_as(intP),
-                            beam.fortran['num_mem'].ctypes.data_as(intP),
-                            beam.fortran['connectivities'].ctypes.data_as(intP),
-                            beam.fortran['master'].ctypes.data_as(intP),
-                            ct.byref(n_mass),
-                            beam.fortran['mass'].ctypes.data_as(doubleP),
-                            beam.fortran['mass_indices'].ctypes.data_as(intP),
-                            ct.byref(n_stiff),
-                            beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                            beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                            beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                            beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                            beam.fortran['vdof'].ctypes.data_as(intP),
-                            beam.fortran['fdof'].ctypes.data_as(intP),
+                            *pointers['properties'],
                             ct.byref(xbopts),
-                            beam.ini_info.pos.ctypes.data_as(doubleP),
-                            beam.ini_info.psi.ctypes.data_as(doubleP),
+                            pointers['pos_ini'],
+                            pointers['psi_ini'],
                             beam.timestep_info[ts].pos.ctypes.data_as(doubleP),
                             beam.timestep_info[ts].psi.ctypes.data_as(doubleP),
                             beam.timestep_info[ts].steady_applied_forces.ctypes.data_as(doubleP),
@@ -137,23 +180,24 @@ def cbeam3_loads(beam, ts):
     f_cbeam3_loads = xbeamlib.cbeam3_loads
     f_cbeam3_loads.restype = None
 
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
+    n_stiff = pointers['n_stiff']
 
     strain = np.zeros((n_elem.value, 6), dtype=ct.c_double, order='F')
     loads = np.zeros((n_elem.value, 6), dtype=ct.c_double, order='F')
 
     f_cbeam3_loads(ct.byref(n_elem),
                    ct.byref(n_nodes),
-                   beam.fortran['connectivities'].ctypes.data_as(intP),
-                   beam.ini_info.pos.ctypes.data_as(doubleP),
+                   pointers['fortran']['connectivities'],
+                   pointers['pos_ini'],
                    beam.timestep_info[ts].pos.ctypes.data_as(doubleP),
-                   beam.ini_info.psi.ctypes.data_as(doubleP),
+                   pointers['psi_ini'],
                    beam.timestep_info[ts].psi.ctypes.data_as(doubleP),
-                   beam.fortran['stiffness_indices'].ctypes.data_as(intP),
+                   pointers['fortran']['stiffness_indices'],
                    ct.byref(n_stiff),
-                   beam.fortran['stiffness'].ctypes.data_as(doubleP),
+                   pointers['fortran']['stiffness'],
                    strain.ctypes.data_as(doubleP),
                    loads.ctypes.data_as(doubleP))
 
@@ -165,10 +209,9 @@ def cbeam3_solv_nlndyn(beam, settings):
     f_cbeam3_solv_nlndyn.restype = None
 
 
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
 
 
     dt = settings['dt'].value
@@ -213,25 +256,10 @@ def cbeam3_solv_nlndyn(beam, settings):
                          ct.byref(n_nodes),
                          ct.byref(n_tsteps),
                          time.ctypes.data_as(doubleP),
-                         beam.fortran['num_nodes'].ctypes.data_as(intP),
-                         beam.fortran['num_mem'].ctypes.data_as(intP),
-                         beam.fortran['connectivities'].ctypes.data_as(intP),
-                         beam.fortran['master'].ctypes.data_as(intP),
-                         ct.byref(n_mass),
-                         beam.fortran['mass'].ctypes.data_as(doubleP),
-                         beam.fortran['mass_indices'].ctypes.data_as(intP),
-                         ct.byref(n_stiff),
-                         beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                         beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                         beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                         beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                         beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                         beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                         beam.fortran['vdof'].ctypes.data_as(intP),
-                         beam.fortran['fdof'].ctypes.data_as(intP),
+                         *pointers['properties'],
                          ct.byref(xbopts),
-                         beam.ini_info.pos.ctypes.data_as(doubleP),
-                         beam.ini_info.psi.ctypes.data_as(doubleP),
+                         pointers['pos_ini'],
+                         pointers['psi_ini'],
                          beam.timestep_info[0].pos.ctypes.data_as(doubleP),
                          beam.timestep_info[0].psi.ctypes.data_as(doubleP),
                          beam.timestep_info[0].steady_applied_forces.ctypes.data_as(doubleP),
@@ -259,10 +287,9 @@ def cbeam3_step_nlndyn(beam, settings, ts, tstep=None, dt=None):
     if tstep is None:
         tstep = beam.timestep_info[-1]
 
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
     num_dof = ct.c_int(len(tstep.q) - 10)
 
     xbopts = Xbopts()
@@ -294,25 +321,10 @@ def cbeam3_step_nlndyn(beam, settings, ts, tstep=None, dt=None):
                               ct.byref(n_elem),
                               ct.byref(n_nodes),
                               ct.byref(in_dt),
-                              beam.fortran['num_nodes'].ctypes.data_as(intP),
-                              beam.fortran['num_mem'].ctypes.data_as(intP),
-                              beam.fortran['connectivities'].ctypes.data_as(intP),
-                              beam.fortran['master'].ctypes.data_as(intP),
-                              ct.byref(n_mass),
-                              beam.fortran['mass'].ctypes.data_as(doubleP),
-                              beam.fortran['mass_indices'].ctypes.data_as(intP),
-                              ct.byref(n_stiff),
-                              beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                              beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                              beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                              beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                              beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                              beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                              beam.fortran['vdof'].ctypes.data_as(intP),
-                              beam.fortran['fdof'].ctypes.data_as(intP),
+                              *pointers['properties'],
                               ct.byref(xbopts),
-                              beam.ini_info.pos.ctypes.data_as(doubleP),
-                              beam.ini_info.psi.ctypes.data_as(doubleP),
+                              pointers['pos_ini'],
+                              pointers['psi_ini'],
                               tstep.pos.ctypes.data_as(doubleP),
                               tstep.pos_dot.ctypes.data_as(doubleP),
                               tstep.pos_ddot.ctypes.data_as(doubleP),
@@ -337,10 +349,9 @@ f_xbeam_solv_couplednlndyn.restype = None
 
 
 def xbeam_solv_couplednlndyn(beam, settings):
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
 
     dt = settings['dt'].value
     n_tsteps = settings['num_steps'].value
@@ -396,25 +407,10 @@ def xbeam_solv_couplednlndyn(beam, settings):
                                ct.byref(n_nodes),
                                ct.byref(n_tsteps),
                                time.ctypes.data_as(doubleP),
-                               beam.fortran['num_nodes'].ctypes.data_as(intP),
-                               beam.fortran['num_mem'].ctypes.data_as(intP),
-                               beam.fortran['connectivities'].ctypes.data_as(intP),
-                               beam.fortran['master'].ctypes.data_as(intP),
-                               ct.byref(n_mass),
-                               beam.fortran['mass'].ctypes.data_as(doubleP),
-                               beam.fortran['mass_indices'].ctypes.data_as(intP),
-                               ct.byref(n_stiff),
-                               beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                               beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                               beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                               beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                               beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                               beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                               beam.fortran['vdof'].ctypes.data_as(intP),
-                               beam.fortran['fdof'].ctypes.data_as(intP),
+                               *pointers['properties'],
                                ct.byref(xbopts),
-                               beam.ini_info.pos.ctypes.data_as(doubleP),
-                               beam.ini_info.psi.ctypes.data_as(doubleP),
+                               pointers['pos_ini'],
+                               pointers['psi_ini'],
                                beam.ini_info.steady_applied_forces.ctypes.data_as(doubleP),
                                dynamic_force.ctypes.data_as(doubleP),
                                for_vel.ctypes.data_as(doubleP),
@@ -463,10 +459,9 @@ def xbeam_step_couplednlndyn(beam, settings, ts, tstep=None, dt=None):
         tstep = beam.timestep_info[-1]
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
 
     xbopts = Xbopts()
     xbopts.PrintInfo = ct.c_bool(settings['print_info'])
@@ -502,25 +497,10 @@ def xbeam_step_couplednlndyn(beam, settings, ts, tstep=None, dt=None):
                                     ct.byref(n_elem),
                                     ct.byref(n_nodes),
                                     ct.byref(in_dt),
-                                    beam.fortran['num_nodes'].ctypes.data_as(intP),
-                                    beam.fortran['num_mem'].ctypes.data_as(intP),
-                                    beam.fortran['connectivities'].ctypes.data_as(intP),
-                                    beam.fortran['master'].ctypes.data_as(intP),
-                                    ct.byref(n_mass),
-                                    beam.fortran['mass'].ctypes.data_as(doubleP),
-                                    beam.fortran['mass_indices'].ctypes.data_as(intP),
-                                    ct.byref(n_stiff),
-                                    beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                                    beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                                    beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                                    beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                                    beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                                    beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                                    beam.fortran['vdof'].ctypes.data_as(intP),
-                                    beam.fortran['fdof'].ctypes.data_as(intP),
+                                    *pointers['properties'],
                                     ct.byref(xbopts),
-                                    beam.ini_info.pos.ctypes.data_as(doubleP),
-                                    beam.ini_info.psi.ctypes.data_as(doubleP),
+                                    pointers['pos_ini'],
+                                    pointers['psi_ini'],
                                     tstep.pos.ctypes.data_as(doubleP),
                                     tstep.pos_dot.ctypes.data_as(doubleP),
                                     tstep.pos_ddot.ctypes.data_as(doubleP),
@@ -544,10 +524,9 @@ def xbeam_init_couplednlndyn(beam, settings, ts, dt=None):
     f_xbeam_solv_nlndyn_init_python.restype = None
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
 
     xbopts = Xbopts()
     xbopts.PrintInfo = ct.c_bool(settings['print_info'])
@@ -575,25 +554,10 @@ def xbeam_init_couplednlndyn(beam, settings, ts, dt=None):
                                     ct.byref(n_elem),
                                     ct.byref(n_nodes),
                                     ct.byref(settings['dt']),
-                                    beam.fortran['num_nodes'].ctypes.data_as(intP),
-                                    beam.fortran['num_mem'].ctypes.data_as(intP),
-                                    beam.fortran['connectivities'].ctypes.data_as(intP),
-                                    beam.fortran['master'].ctypes.data_as(intP),
-                                    ct.byref(n_mass),
-                                    beam.fortran['mass'].ctypes.data_as(doubleP),
-                                    beam.fortran['mass_indices'].ctypes.data_as(intP),
-                                    ct.byref(n_stiff),
-                                    beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                                    beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                                    beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                                    beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                                    beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                                    beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                                    beam.fortran['vdof'].ctypes.data_as(intP),
-                                    beam.fortran['fdof'].ctypes.data_as(intP),
+                                    *pointers['properties'],
                                     ct.byref(xbopts),
-                                    beam.ini_info.pos.ctypes.data_as(doubleP),
-                                    beam.ini_info.psi.ctypes.data_as(doubleP),
+                                    pointers['pos_ini'],
+                                    pointers['psi_ini'],
                                     beam.timestep_info[ts].pos.ctypes.data_as(doubleP),
                                     beam.timestep_info[ts].pos_dot.ctypes.data_as(doubleP),
                                     beam.timestep_info[ts].psi.ctypes.data_as(doubleP),
@@ -622,24 +586,25 @@ def cbeam3_solv_state2disp(beam, tstep):
     f_cbeam3_solv_state2disp.restype = None
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
     numdof = ct.c_int(beam.num_dof.value)
 
     f_cbeam3_solv_state2disp(
         ct.byref(n_elem),
         ct.byref(n_nodes),
         ct.byref(numdof),
-        beam.ini_info.pos.ctypes.data_as(doubleP),
-        beam.ini_info.psi.ctypes.data_as(doubleP),
+        pointers['pos_ini'],
+        pointers['psi_ini'],
         tstep.pos.ctypes.data_as(doubleP),
         tstep.psi.ctypes.data_as(doubleP),
         tstep.pos_dot.ctypes.data_as(doubleP),
         tstep.psi_dot.ctypes.data_as(doubleP),
-        beam.fortran['node_master_elem'].ctypes.data_as(intP),
-        beam.fortran['vdof'].ctypes.data_as(intP),
-        beam.fortran['num_nodes'].ctypes.data_as(intP),
-        beam.fortran['master'].ctypes.data_as(intP),
+        pointers['fortran']['node_master_elem'],
+        pointers['fortran']['vdof'],
+        pointers['fortran']['num_nodes'],
+        pointers['fortran']['master'],
         tstep.q.ctypes.data_as(doubleP),
         tstep.dqdt.ctypes.data_as(doubleP))
 
@@ -660,8 +625,9 @@ def cbeam3_solv_disp2state(beam, tstep):
     f_cbeam3_solv_disp2state.restype = None
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
     numdof = ct.c_int(beam.num_dof.value)
 
     f_cbeam3_solv_disp2state(
@@ -672,8 +638,8 @@ def cbeam3_solv_disp2state(beam, tstep):
         tstep.psi.ctypes.data_as(doubleP),
         tstep.pos_dot.ctypes.data_as(doubleP),
         tstep.psi_dot.ctypes.data_as(doubleP),
-        beam.fortran['vdof'].ctypes.data_as(intP),
-        beam.fortran['node_master_elem'].ctypes.data_as(intP),
+        pointers['fortran']['vdof'],
+        pointers['fortran']['node_master_elem'],
         tstep.q.ctypes.data_as(doubleP),
         tstep.dqdt.ctypes.data_as(doubleP))
 
@@ -705,10 +671,9 @@ def cbeam3_solv_modal(beam, settings, ts, FullMglobal, FullCglobal, FullKglobal)
     f_cbeam3_solv_modal = xbeamlib.cbeam3_solv_modal_python
     f_cbeam3_solv_modal.restype = None
 
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
     num_dof = ct.c_int(beam.num_dof.value)
 
     xbopts = Xbopts()
@@ -744,25 +709,10 @@ def cbeam3_solv_modal(beam, settings, ts, FullMglobal, FullCglobal, FullKglobal)
     f_cbeam3_solv_modal(ct.byref(num_dof),
                         ct.byref(n_elem),
                         ct.byref(n_nodes),
-                        beam.fortran['num_nodes'].ctypes.data_as(intP),
-                        beam.fortran['num_mem'].ctypes.data_as(intP),
-                        beam.fortran['connectivities'].ctypes.data_as(intP),
-                        beam.fortran['master'].ctypes.data_as(intP),
-                        ct.byref(n_mass),
-                        beam.fortran['mass'].ctypes.data_as(doubleP),
-                        beam.fortran['mass_indices'].ctypes.data_as(intP),
-                        ct.byref(n_stiff),
-                        beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                        beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                        beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                        beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                        beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                        beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                        beam.fortran['vdof'].ctypes.data_as(intP),
-                        beam.fortran['fdof'].ctypes.data_as(intP),
+                        *pointers['properties'],
                         ct.byref(xbopts),
-                        beam.ini_info.pos.ctypes.data_as(doubleP),
-                        beam.ini_info.psi.ctypes.data_as(doubleP),
+                        pointers['pos_ini'],
+                        pointers['psi_ini'],
                         beam.timestep_info[ts].pos.ctypes.data_as(doubleP),
                         beam.timestep_info[ts].psi.ctypes.data_as(doubleP),
                         beam.timestep_info[ts].for_vel.ctypes.data_as(doubleP),
@@ -796,16 +746,14 @@ def cbeam3_asbly_dynamic(beam, tstep, settings):
     """
 
     # library load
-    xbeamlib = ct_utils.import_ctypes_lib(xbeam_lib_path, 'libxbeam')
     f_cbeam3_asbly_dynamic_python = xbeamlib.cbeam3_asbly_dynamic_python
     f_cbeam3_asbly_dynamic_python.restype = None
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
     num_dof = beam.num_dof.value
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
     dt = settings['dt']
 
     # Options
@@ -834,8 +782,8 @@ def cbeam3_asbly_dynamic(beam, tstep, settings):
                                   ct.byref(n_nodes),
                                   ct.byref(n_elem),
                                   ct.byref(dt),
-                                  beam.ini_info.pos.ctypes.data_as(doubleP),
-                                  beam.ini_info.psi.ctypes.data_as(doubleP),
+                                  pointers['pos_ini'],
+                                  pointers['psi_ini'],
                                   tstep.pos.ctypes.data_as(doubleP),
                                   tstep.pos_dot.ctypes.data_as(doubleP),
                                   tstep.pos_ddot.ctypes.data_as(doubleP),
@@ -846,22 +794,7 @@ def cbeam3_asbly_dynamic(beam, tstep, settings):
                                   tstep.unsteady_applied_forces.ctypes.data_as(doubleP),
                                   tstep.for_vel.ctypes.data_as(doubleP),
                                   tstep.for_acc.ctypes.data_as(doubleP),
-                                  beam.fortran['num_nodes'].ctypes.data_as(intP),
-                                  beam.fortran['num_mem'].ctypes.data_as(intP),
-                                  beam.fortran['connectivities'].ctypes.data_as(intP),
-                                  beam.fortran['master'].ctypes.data_as(intP),
-                                  ct.byref(n_mass),
-                                  beam.fortran['mass'].ctypes.data_as(doubleP),
-                                  beam.fortran['mass_indices'].ctypes.data_as(intP),
-                                  ct.byref(n_stiff),
-                                  beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                                  beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                                  beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                                  beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                                  beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                                  beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                                  beam.fortran['vdof'].ctypes.data_as(intP),
-                                  beam.fortran['fdof'].ctypes.data_as(intP),
+                                  *pointers['properties'],
                                   ct.byref(xbopts),
                                   # CAREFUL, this is dXddt, with num_dof elements,
                                   # not num_dof + 10
@@ -900,16 +833,14 @@ def xbeam3_asbly_dynamic(beam, tstep, settings):
     """
 
     # library load
-    xbeamlib = ct_utils.import_ctypes_lib(xbeam_lib_path, 'libxbeam')
     f_xbeam3_asbly_dynamic_python = xbeamlib.xbeam3_asbly_dynamic_python
     f_xbeam3_asbly_dynamic_python.restype = None
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
     num_dof = beam.num_dof.value
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
     dt = settings['dt']
 
     # Options
@@ -938,8 +869,8 @@ def xbeam3_asbly_dynamic(beam, tstep, settings):
                             ct.byref(n_nodes),
                             ct.byref(n_elem),
                             ct.byref(dt),
-                            beam.ini_info.pos.ctypes.data_as(doubleP),
-                            beam.ini_info.psi.ctypes.data_as(doubleP),
+                            pointers['pos_ini'],
+                            pointers['psi_ini'],
                             tstep.pos.ctypes.data_as(doubleP),
                             tstep.pos_dot.ctypes.data_as(doubleP),
                             tstep.pos_ddot.ctypes.data_as(doubleP),
@@ -951,22 +882,7 @@ def xbeam3_asbly_dynamic(beam, tstep, settings):
                             tstep.for_vel.ctypes.data_as(doubleP),
                             tstep.for_acc.ctypes.data_as(doubleP),
                             # ct.byref(in_dt),
-                            beam.fortran['num_nodes'].ctypes.data_as(intP),
-                            beam.fortran['num_mem'].ctypes.data_as(intP),
-                            beam.fortran['connectivities'].ctypes.data_as(intP),
-                            beam.fortran['master'].ctypes.data_as(intP),
-                            ct.byref(n_mass),
-                            beam.fortran['mass'].ctypes.data_as(doubleP),
-                            beam.fortran['mass_indices'].ctypes.data_as(intP),
-                            ct.byref(n_stiff),
-                            beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                            beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                            beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                            beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                            beam.fortran['vdof'].ctypes.data_as(intP),
-                            beam.fortran['fdof'].ctypes.data_as(intP),
+                            *pointers['properties'],
                             ct.byref(xbopts),
                             tstep.quat.ctypes.data_as(doubleP),
                             tstep.q.ctypes.data_as(doubleP),
@@ -993,36 +909,19 @@ def cbeam3_correct_gravity_forces(beam, tstep, settings):
     """
 
     # library load
-    xbeamlib = ct_utils.import_ctypes_lib(xbeam_lib_path, 'libxbeam')
     f_cbeam3_correct_gravity_forces_python = xbeamlib.cbeam3_correct_gravity_forces_python
     f_cbeam3_correct_gravity_forces_python.restype = None
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
 
     f_cbeam3_correct_gravity_forces_python(ct.byref(n_nodes),
                             ct.byref(n_elem),
-                            beam.ini_info.psi.ctypes.data_as(doubleP),
+                            pointers['psi_ini'],
                             tstep.psi.ctypes.data_as(doubleP),
-                            beam.fortran['num_nodes'].ctypes.data_as(intP),
-                            beam.fortran['num_mem'].ctypes.data_as(intP),
-                            beam.fortran['connectivities'].ctypes.data_as(intP),
-                            beam.fortran['master'].ctypes.data_as(intP),
-                            ct.byref(n_mass),
-                            beam.fortran['mass'].ctypes.data_as(doubleP),
-                            beam.fortran['mass_indices'].ctypes.data_as(intP),
-                            ct.byref(n_stiff),
-                            beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                            beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                            beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                            beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                            beam.fortran['vdof'].ctypes.data_as(intP),
-                            beam.fortran['fdof'].ctypes.data_as(intP),
+                            *pointers['properties'],
                             tstep.gravity_forces.ctypes.data_as(doubleP))
 
 def cbeam3_asbly_static(beam, tstep, settings, iLoadStep):
@@ -1047,16 +946,14 @@ def cbeam3_asbly_static(beam, tstep, settings, iLoadStep):
     """
 
     # library load
-    xbeamlib = ct_utils.import_ctypes_lib(xbeam_lib_path, 'libxbeam')
     f_cbeam3_asbly_static_python = xbeamlib.cbeam3_asbly_static_python
     f_cbeam3_asbly_static_python.restype = None
 
     # initialisation
-    n_elem = ct.c_int(beam.num_elem)
-    n_nodes = ct.c_int(beam.num_node)
+    pointers = beam_pointers(beam)
+    n_elem = pointers['n_elem']
+    n_nodes = pointers['n_nodes']
     num_dof = beam.num_dof.value
-    n_mass = ct.c_int(beam.n_mass)
-    n_stiff = ct.c_int(beam.n_stiff)
     # dt = settings['dt']
 
     # Options
@@ -1084,27 +981,12 @@ def cbeam3_asbly_static(beam, tstep, settings, iLoadStep):
     f_cbeam3_asbly_static_python(ct.byref(ct.c_int(num_dof)),
                             ct.byref(n_nodes),
                             ct.byref(n_elem),
-                            beam.ini_info.pos.ctypes.data_as(doubleP),
-                            beam.ini_info.psi.ctypes.data_as(doubleP),
+                            pointers['pos_ini'],
+                            pointers['psi_ini'],
                             tstep.pos.ctypes.data_as(doubleP),
                             tstep.psi.ctypes.data_as(doubleP),
                             tstep.steady_applied_forces.ctypes.data_as(doubleP),
-                            beam.fortran['num_nodes'].ctypes.data_as(intP),
-                            beam.fortran['num_mem'].ctypes.data_as(intP),
-                            beam.fortran['connectivities'].ctypes.data_as(intP),
-                            beam.fortran['master'].ctypes.data_as(intP),
-                            ct.byref(n_mass),
-                            beam.fortran['mass'].ctypes.data_as(doubleP),
-                            beam.fortran['mass_indices'].ctypes.data_as(intP),
-                            ct.byref(n_stiff),
-                            beam.fortran['stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['inv_stiffness'].ctypes.data_as(doubleP),
-                            beam.fortran['stiffness_indices'].ctypes.data_as(intP),
-                            beam.fortran['frame_of_reference_delta'].ctypes.data_as(doubleP),
-                            beam.fortran['rbmass'].ctypes.data_as(doubleP),
-                            beam.fortran['node_master_elem'].ctypes.data_as(intP),
-                            beam.fortran['vdof'].ctypes.data_as(intP),
-                            beam.fortran['fdof'].ctypes.data_as(intP),
+                            *pointers['properties'],
                             ct.byref(xbopts),
                             tstep.gravity_forces.ctypes.data_as(doubleP),
                             Kglobal.ctypes.data_as(doubleP),
@@ -648,6 +648,44 @@ def crv2triad_vec(crv_vec):
     return v1, v2, v3
 
 
+def crv2rotation_vec(crv_vec):
+    r"""
+    Vectorised version of :func:`crv2rotation` for an array of Cartesian rotation vectors.
+
+    Args:
+        crv_vec (np.ndarray): ``n x 3`` array of Cartesian rotation vectors.
+
+    Returns:
+        np.ndarray: ``n x 3 x 3`` array of rotation matrices.
+    """
+    n_crv = crv_vec.shape[0]
+    norm_psi = np.linalg.norm(crv_vec, axis=1)
+    small = norm_psi < 1e-15
+
+    # series expansion for small rotations, closed form otherwise
+    coeff_sin = np.ones((n_crv,))
+    coeff_cos = 0.5*np.ones((n_crv,))
+    skew_vec = crv_vec.copy()
+    skew_vec[~small] /= norm_psi[~small, None]
+    coeff_sin[~small] = np.sin(norm_psi[~small])
+    coeff_cos[~small] = 1.0 - np.cos(norm_psi[~small])
+
+    skew_mat = np.zeros((n_crv, 3, 3))
+    skew_mat[:, 0, 1] = -skew_vec[:, 2]
+    skew_mat[:, 0, 2] = skew_vec[:, 1]
+    skew_mat[:, 1, 0] = skew_vec[:, 2]
+    skew_mat[:, 1, 2] = -skew_vec[:, 0]
+    skew_mat[:, 2, 0] = -skew_vec[:, 1]
+    skew_mat[:, 2, 1] = skew_vec[:, 0]
+
+    rot_matrix = np.zeros((n_crv, 3, 3))
+    rot_matrix[:] = np.eye(3)
+    rot_matrix += coeff_sin[:, None, None]*skew_mat
+    rot_matrix += coeff_cos[:, None, None]*np.matmul(skew_mat, skew_mat)
+
+    return rot_matrix
+
+
 def quat2rotation(q1):
     r"""Calculate rotation matrix based on quaternions.
 
@@ -0,0 +1,237 @@
+"""Coupling Accelerators
+
+Accelerators of the fixed point iteration between the aerodynamic and structural solvers in the coupled solvers.
+
+The coupled solvers iterate on the vector of structural forces :math:`\\mathbf{x}`. Every iteration the structure is
+solved under :math:`\\mathbf{x}^k` and the aerodynamic forces are mapped back onto it, giving
+:math:`\\tilde{\\mathbf{x}}^k`. Instead of the constant under-relaxation of ``relaxation_factor``, an accelerator
+returns the next input :math:`\\mathbf{x}^{k+1}` from these two vectors.
+
+Accelerators are chosen in the coupled solvers with the ``coupling_accelerator`` setting and configured with the
+``coupling_accelerator_settings`` dictionary.
+"""
+from abc import ABCMeta, abstractmethod
+import collections
+
+import numpy as np
+
+import sharpy.utils.cout_utils as cout
+import sharpy.utils.exceptions as exceptions
+import sharpy.utils.settings as settings
+
+dict_of_accelerators = {}
+
+
+# decorator
+def accelerator(arg):
+    global dict_of_accelerators
+    try:
+        arg.accelerator_id
+    except AttributeError:
+        raise AttributeError('Class defined as accelerator has no accelerator_id attribute')
+    dict_of_accelerators[arg.accelerator_id] = arg
+    return arg
+
+
+def initialise_accelerator(accelerator_name, in_dict=None):
+    """
+    Returns an initialised instance of the accelerator ``accelerator_name`` or ``None`` if the name is empty.
+
+    Args:
+        accelerator_name (str): ``accelerator_id`` of the accelerator
+        in_dict (dict): settings of the accelerator
+
+    Returns:
+        BaseAccelerator: initialised accelerator
+    """
+    if not accelerator_name:
+        return None
+    try:
+        cls_type = dict_of_accelerators[accelerator_name]
+    except KeyError:
+        raise exceptions.NotValidSetting('coupling_accelerator', accelerator_name, list(dict_of_accelerators.keys()))
+    cout.cout_wrap('Generating an instance of %s' % accelerator_name, 2)
+    acc = cls_type()
+    if in_dict is None:
+        in_dict = dict()
+    acc.initialise(in_dict)
+    return acc
+
+
+class BaseAccelerator(metaclass=ABCMeta):
+
+    @property
+    def accelerator_id(self):
+        raise NotImplementedError
+
+    def initialise(self, in_dict):
+        self.settings = in_dict
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, no_ctype=True)
+
+    @abstractmethod
+    def new_step(self):
+        """
+        Signals the start of the coupling iterations of a new time or load step.
+        """
+        pass
+
+    @abstractmethod
+    def update(self, x, x_tilde):
+        """
+        Returns the input of the next coupling iteration.
+
+        Args:
+            x (np.ndarray): input of the current iteration (forces applied to the structure)
+            x_tilde (np.ndarray): output of the current iteration (forces mapped from the aerodynamics)
+
+        Returns:
+            np.ndarray: input of the next iteration
+        """
+        pass
+
+
+@accelerator
+class Aitken(BaseAccelerator):
+    r"""
+    Aitken dynamic relaxation.
+
+    The relaxation factor of the residual :math:`\mathbf{r}^k = \tilde{\mathbf{x}}^k - \mathbf{x}^k` is updated every
+    iteration as
+
+    .. math:: \omega^k = -\omega^{k-1}\frac{(\mathbf{r}^{k-1})^T(\mathbf{r}^k - \mathbf{r}^{k-1})}
+        {||\mathbf{r}^k - \mathbf{r}^{k-1}||^2}
+
+    and :math:`\mathbf{x}^{k+1} = \mathbf{x}^k + \omega^k\mathbf{r}^k`.
+    """
+    accelerator_id = 'Aitken'
+
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+
+    settings_types['initial_relaxation'] = 'float'
+    settings_default['initial_relaxation'] = 0.5
+    settings_description['initial_relaxation'] = 'Factor of the residual used in the first iteration of every step'
+
+    settings_types['max_relaxation'] = 'float'
+    settings_default['max_relaxation'] = 1.
+    settings_description['max_relaxation'] = 'Upper bound of the absolute value of the relaxation factor'
+
+    settings_table = settings.SettingsTable()
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+
+    def __init__(self):
+        self.settings = None
+        self.omega = None
+        self.previous_residual = None
+
+    def new_step(self):
+        self.omega = self.settings['initial_relaxation']
+        self.previous_residual = None
+
+    def update(self, x, x_tilde):
+        residual = x_tilde - x
+        if self.omega is None:
+            self.new_step()
+
+        if self.previous_residual is not None:
+            delta = residual - self.previous_residual
+            delta_norm = np.dot(delta.ravel(), delta.ravel())
+            if delta_norm > 0.:
+                self.omega = -self.omega*np.dot(self.previous_residual.ravel(), delta.ravel())/delta_norm
+                self.omega = np.clip(self.omega, -self.settings['max_relaxation'], self.settings['max_relaxation'])
+
+        self.previous_residual = residual
+        return x + self.omega*residual
+
+
+@accelerator
+class IQNILS(BaseAccelerator):
+    r"""
+    Interface quasi-Newton with inverse Jacobian from a least-squares model (IQN-ILS).
+
+    The differences of the residuals :math:`\mathbf{r} = \tilde{\mathbf{x}} - \mathbf{x}` and outputs
+    :math:`\tilde{\mathbf{x}}` between iterations are stored as the columns of :math:`\mathbf{V}` and
+    :math:`\mathbf{W}`. The next input is
+
+    .. math:: \mathbf{x}^{k+1} = \tilde{\mathbf{x}}^k + \mathbf{W}\mathbf{c}, \quad
+        \mathbf{c} = \arg\min ||\mathbf{V}\mathbf{c} + \mathbf{r}^k||
+
+    The columns of the last ``reuse_steps`` time (or load) steps are kept, so that the secant information is reused
+    from the first iteration of the following steps.
+    """
+    accelerator_id = 'IQNILS'
+
+    settings_types = dict()
+    settings_default = dict()
+    settings_description = dict()
+
+    settings_types['initial_relaxation'] = 'float'
+    settings_default['initial_relaxation'] = 0.5
+    settings_description['initial_relaxation'] = 'Factor of the residual used when there is no secant information'
+
+    settings_types['reuse_steps'] = 'int'
+    settings_default['reuse_steps'] = 4
+    settings_description['reuse_steps'] = 'Number of previous steps whose secant information is reused'
+
+    settings_types['max_columns'] = 'int'
+    settings_default['max_columns'] = 50
+    settings_description['max_columns'] = 'Maximum number of secant columns in the least-squares problem'
+
+    settings_types['filter_tolerance'] = 'float'
+    settings_default['filter_tolerance'] = 1e-10
+    settings_description['filter_tolerance'] = 'Relative singular value below which the least-squares problem is ' \
+                                               'truncated, to discard linearly dependent columns'
+
+    settings_table = settings.SettingsTable()
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+
+    def __init__(self):
+        self.settings = None
+        self.previous_residual = None
+        self.previous_x_tilde = None
+
+        # secant columns of the current step (newest first) and of the previous ones
+        self.v_columns = []
+        self.w_columns = []
+        self.history = None
+
+    def initialise(self, in_dict):
+        super().initialise(in_dict)
+        self.history = collections.deque(maxlen=max(self.settings['reuse_steps'], 0))
+
+    def new_step(self):
+        if self.v_columns and self.history.maxlen:
+            self.history.appendleft((self.v_columns, self.w_columns))
+        self.v_columns = []
+        self.w_columns = []
+        self.previous_residual = None
+        self.previous_x_tilde = None
+
+    def update(self, x, x_tilde):
+        shape = x.shape
+        x = x.ravel()
+        x_tilde = x_tilde.ravel()
+        residual = x_tilde - x
+
+        if self.previous_residual is not None:
+            self.v_columns.insert(0, residual - self.previous_residual)
+            self.w_columns.insert(0, x_tilde - self.previous_x_tilde)
+        self.previous_residual = residual
+        self.previous_x_tilde = x_tilde.copy()
+
+        v_columns = list(self.v_columns)
+        w_columns = list(self.w_columns)
+        for v_step, w_step in self.history:
+            v_columns.extend(v_step)
+            w_columns.extend(w_step)
+        v_columns = v_columns[:self.settings['max_columns']]
+        w_columns = w_columns[:self.settings['max_columns']]
+
+        if not v_columns:
+            return (x + self.settings['initial_relaxation']*residual).reshape(shape)
+
+        v_matrix = np.column_stack(v_columns)
+        w_matrix = np.column_stack(w_columns)
+        coeff = np.linalg.lstsq(v_matrix, -residual, rcond=self.settings['filter_tolerance'])[0]
+        return (x_tilde + w_matrix.dot(coeff)).reshape(shape)
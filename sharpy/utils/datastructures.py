@@ -2,8 +2,11 @@
 
 Classes for the Aerotimestep and Structuraltimestep, amongst others
 """
+import collections.abc
 import copy
 import ctypes as ct
+import os
+import pickle
 import numpy as np
 
 import sharpy.utils.algebra as algebra
@@ -18,84 +21,30 @@ class AeroTimeStepInfo(object):
         self.dimensions = dimensions.copy()
         self.dimensions_star = dimensions_star.copy()
         self.n_surf = self.dimensions.shape[0]
+        # the arrays of every variable are views of a single contiguous buffer
         # generate placeholder for aero grid zeta coordinates
-        self.zeta = []
-        for i_surf in range(self.n_surf):
-            self.zeta.append(np.zeros((3,
-                                       dimensions[i_surf, 0] + 1,
-                                       dimensions[i_surf, 1] + 1),
-                                      dtype=ct.c_double))
-        self.zeta_dot = []
-        for i_surf in range(self.n_surf):
-            self.zeta_dot.append(np.zeros((3,
-                                           dimensions[i_surf, 0] + 1,
-                                           dimensions[i_surf, 1] + 1),
-                                          dtype=ct.c_double))
+        self.zeta = allocate_surface_arrays(self.dimensions, 3, added_size=1)
+        self.zeta_dot = allocate_surface_arrays(self.dimensions, 3, added_size=1)
 
         # panel normals
-        self.normals = []
-        for i_surf in range(self.n_surf):
-            self.normals.append(np.zeros((3,
-                                          dimensions[i_surf, 0],
-                                          dimensions[i_surf, 1]),
-                                         dtype=ct.c_double))
+        self.normals = allocate_surface_arrays(self.dimensions, 3)
 
         # panel forces
-        self.forces = []
-        for i_surf in range(self.n_surf):
-            self.forces.append(np.zeros((6,
-                                         dimensions[i_surf, 0] + 1,
-                                         dimensions[i_surf, 1] + 1),
-                                        dtype=ct.c_double))
+        self.forces = allocate_surface_arrays(self.dimensions, 6, added_size=1)
         # panel forces
-        self.dynamic_forces = []
-        for i_surf in range(self.n_surf):
-            self.dynamic_forces.append(np.zeros((6,
-                                                 dimensions[i_surf, 0] + 1,
-                                                 dimensions[i_surf, 1] + 1),
-                                                dtype=ct.c_double))
+        self.dynamic_forces = allocate_surface_arrays(self.dimensions, 6, added_size=1)
 
         # generate placeholder for aero grid zeta_star coordinates
-        self.zeta_star = []
-        for i_surf in range(self.n_surf):
-            self.zeta_star.append(np.zeros((3,
-                                            dimensions_star[i_surf, 0] + 1,
-                                            dimensions_star[i_surf, 1] + 1),
-                                           dtype=ct.c_double))
+        self.zeta_star = allocate_surface_arrays(self.dimensions_star, 3, added_size=1)
 
         # placeholder for external velocity
-        self.u_ext = []
-        for i_surf in range(self.n_surf):
-            self.u_ext.append(np.zeros((3,
-                                        dimensions[i_surf, 0] + 1,
-                                        dimensions[i_surf, 1] + 1),
-                                       dtype=ct.c_double))
-
-        self.u_ext_star = []
-        for i_surf in range(self.n_surf):
-            self.u_ext_star.append(np.zeros((3,
-                                             dimensions_star[i_surf, 0] + 1,
-                                             dimensions_star[i_surf, 1] + 1),
-                                            dtype=ct.c_double))
+        self.u_ext = allocate_surface_arrays(self.dimensions, 3, added_size=1)
+        self.u_ext_star = allocate_surface_arrays(self.dimensions_star, 3, added_size=1)
 
         # allocate gamma and gamma star matrices
-        self.gamma = []
-        for i_surf in range(self.n_surf):
-            self.gamma.append(np.zeros((dimensions[i_surf, 0],
-                                        dimensions[i_surf, 1]),
-                                       dtype=ct.c_double))
-
-        self.gamma_star = []
-        for i_surf in range(self.n_surf):
-            self.gamma_star.append(np.zeros((dimensions_star[i_surf, 0],
-                                             dimensions_star[i_surf, 1]),
-                                            dtype=ct.c_double))
-
-        self.gamma_dot = []
-        for i_surf in range(self.n_surf):
-            self.gamma_dot.append(np.zeros((dimensions[i_surf, 0],
-                                            dimensions[i_surf, 1]),
-                                           dtype=ct.c_double))
+        self.gamma = allocate_surface_arrays(self.dimensions)
+        self.gamma_star = allocate_surface_arrays(self.dimensions_star)
+        self.gamma_dot = allocate_surface_arrays(self.dimensions)
 
         # total forces
         self.inertial_total_forces = np.zeros((self.n_surf, 6))
@@ -113,221 +62,186 @@ class AeroTimeStepInfo(object):
 
         self.control_surface_deflection = np.array([])
 
+        # pointer tables for the UVLM library, see generate_ctypes_pointers
+        self.ct_pointer_tables = dict()
+
     def copy(self):
         copied = AeroTimeStepInfo(self.dimensions, self.dimensions_star)
-        # generate placeholder for aero grid zeta coordinates
-        for i_surf in range(copied.n_surf):
-            copied.zeta[i_surf] = self.zeta[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
-
-        for i_surf in range(copied.n_surf):
-            copied.zeta_dot[i_surf] = self.zeta_dot[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
-
-        # panel normals
-        for i_surf in range(copied.n_surf):
-            copied.normals[i_surf] = self.normals[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
-
-        # panel forces
-        for i_surf in range(copied.n_surf):
-            copied.forces[i_surf] = self.forces[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
-
-        # panel forces
-        for i_surf in range(copied.n_surf):
-            copied.dynamic_forces[i_surf] = self.dynamic_forces[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
+        self.copy_into(copied)
 
-        # generate placeholder for aero grid zeta_star coordinates
-        for i_surf in range(copied.n_surf):
-            copied.zeta_star[i_surf] = self.zeta_star[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
-
-        # placeholder for external velocity
-        for i_surf in range(copied.n_surf):
-            copied.u_ext[i_surf] = self.u_ext[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
+        return copied
 
-        for i_surf in range(copied.n_surf):
-            copied.u_ext_star[i_surf] = self.u_ext_star[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
+    def copy_into(self, other):
+        """
+        Copies the contents of this time step into ``other``, reusing its arrays whenever their shape allows it.
 
-        # allocate gamma and gamma star matrices
-        for i_surf in range(copied.n_surf):
-            copied.gamma[i_surf] = self.gamma[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
+        This is the allocation-free counterpart of :meth:`copy`, meant for scratch time steps that are overwritten
+        repeatedly, such as those of the FSI iterations.
 
-        for i_surf in range(copied.n_surf):
-            copied.gamma_dot[i_surf] = self.gamma_dot[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
+        Args:
+            other (AeroTimeStepInfo): time step to be overwritten.
 
-        for i_surf in range(copied.n_surf):
-            copied.gamma_star[i_surf] = self.gamma_star[i_surf].astype(dtype=ct.c_double, copy=True, order='C')
+        Returns:
+            AeroTimeStepInfo: ``other``, for convenience.
+        """
+        other.dimensions = copy_array_into(self.dimensions, other.dimensions)
+        other.dimensions_star = copy_array_into(self.dimensions_star, other.dimensions_star)
+        other.n_surf = self.n_surf
+
+        for name in ['zeta', 'zeta_dot', 'normals', 'forces', 'dynamic_forces', 'zeta_star', 'u_ext', 'u_ext_star',
+                     'gamma', 'gamma_dot', 'gamma_star']:
+            targets = getattr(other, name)
+            if len(targets) != self.n_surf:
+                targets = [None]*self.n_surf
+            setattr(other, name, [copy_array_into(array, targets[i_surf], order='C', dtype=ct.c_double)
+                                  for i_surf, array in enumerate(getattr(self, name))])
 
         # total forces
-        copied.inertial_total_forces = self.inertial_total_forces.astype(dtype=ct.c_double, copy=True, order='C')
-        copied.body_total_forces = self.body_total_forces.astype(dtype=ct.c_double, copy=True, order='C')
-        copied.inertial_steady_forces = self.inertial_steady_forces.astype(dtype=ct.c_double, copy=True, order='C')
-        copied.body_steady_forces = self.body_steady_forces.astype(dtype=ct.c_double, copy=True, order='C')
-        copied.inertial_unsteady_forces = self.inertial_unsteady_forces.astype(dtype=ct.c_double, copy=True, order='C')
-        copied.body_unsteady_forces = self.body_unsteady_forces.astype(dtype=ct.c_double, copy=True, order='C')
+        for name in ['inertial_total_forces', 'body_total_forces', 'inertial_steady_forces', 'body_steady_forces',
+                     'inertial_unsteady_forces', 'body_unsteady_forces']:
+            setattr(other, name, copy_array_into(getattr(self, name), getattr(other, name),
+                                                 order='C', dtype=ct.c_double))
 
-        copied.postproc_cell = copy.deepcopy(self.postproc_cell)
-        copied.postproc_node = copy.deepcopy(self.postproc_node)
+        other.postproc_cell = copy_dict_into(self.postproc_cell, other.postproc_cell)
+        other.postproc_node = copy_dict_into(self.postproc_node, other.postproc_node)
 
-        copied.control_surface_deflection = self.control_surface_deflection.astype(dtype=ct.c_double, copy=True)
+        other.in_global_AFoR = self.in_global_AFoR
+        other.control_surface_deflection = copy_array_into(self.control_surface_deflection,
+                                                           other.control_surface_deflection,
+                                                           dtype=ct.c_double)
 
-        return copied
+        return other
+
+    # variables passed to the UVLM library as tables of pointers
+    ct_variables = ['zeta', 'zeta_dot', 'zeta_star', 'u_ext', 'u_ext_star', 'gamma', 'gamma_dot', 'gamma_star',
+                    'normals', 'forces', 'dynamic_forces']
 
     def generate_ctypes_pointers(self):
-        self.ct_dimensions = self.dimensions.astype(dtype=ct.c_uint, copy=True)
-        self.ct_dimensions_star = self.dimensions_star.astype(dtype=ct.c_uint, copy=True)
-
-        n_surf = len(self.dimensions)
-
-        from sharpy.utils.constants import NDIM
-
-        self.ct_zeta_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM):
-                self.ct_zeta_list.append(self.zeta[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_zeta_dot_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM):
-                self.ct_zeta_dot_list.append(self.zeta_dot[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_zeta_star_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM):
-                self.ct_zeta_star_list.append(self.zeta_star[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_u_ext_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM):
-                self.ct_u_ext_list.append(self.u_ext[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_u_ext_star_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM):
-                self.ct_u_ext_star_list.append(self.u_ext_star[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_gamma_list = []
-        for i_surf in range(self.n_surf):
-            self.ct_gamma_list.append(self.gamma[i_surf][:, :].reshape(-1))
-
-        self.ct_gamma_dot_list = []
-        for i_surf in range(self.n_surf):
-            self.ct_gamma_dot_list.append(self.gamma_dot[i_surf][:, :].reshape(-1))
-
-        self.ct_gamma_star_list = []
-        for i_surf in range(self.n_surf):
-            self.ct_gamma_star_list.append(self.gamma_star[i_surf][:, :].reshape(-1))
-
-        self.ct_normals_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM):
-                self.ct_normals_list.append(self.normals[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_forces_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM*2):
-                self.ct_forces_list.append(self.forces[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_dynamic_forces_list = []
-        for i_surf in range(self.n_surf):
-            for i_dim in range(NDIM*2):
-                self.ct_dynamic_forces_list.append(self.dynamic_forces[i_surf][i_dim, :, :].reshape(-1))
-
-        self.ct_p_dimensions = ((ct.POINTER(ct.c_uint)*n_surf)
-                                (* np.ctypeslib.as_ctypes(self.ct_dimensions)))
-        self.ct_p_dimensions_star = ((ct.POINTER(ct.c_uint)*n_surf)
-                                     (* np.ctypeslib.as_ctypes(self.ct_dimensions_star)))
-        self.ct_p_zeta = ((ct.POINTER(ct.c_double)*len(self.ct_zeta_list))
-                          (* [np.ctypeslib.as_ctypes(array) for array in self.ct_zeta_list]))
-        self.ct_p_zeta_dot = ((ct.POINTER(ct.c_double)*len(self.ct_zeta_dot_list))
-                          (* [np.ctypeslib.as_ctypes(array) for array in self.ct_zeta_dot_list]))
-        self.ct_p_zeta_star = ((ct.POINTER(ct.c_double)*len(self.ct_zeta_star_list))
-                               (* [np.ctypeslib.as_ctypes(array) for array in self.ct_zeta_star_list]))
-        self.ct_p_u_ext = ((ct.POINTER(ct.c_double)*len(self.ct_u_ext_list))
-                           (* [np.ctypeslib.as_ctypes(array) for array in self.ct_u_ext_list]))
-        self.ct_p_u_ext_star = ((ct.POINTER(ct.c_double)*len(self.ct_u_ext_star_list))
-                           (* [np.ctypeslib.as_ctypes(array) for array in self.ct_u_ext_star_list]))
-        self.ct_p_gamma = ((ct.POINTER(ct.c_double)*len(self.ct_gamma_list))
-                           (* [np.ctypeslib.as_ctypes(array) for array in self.ct_gamma_list]))
-        self.ct_p_gamma_dot = ((ct.POINTER(ct.c_double)*len(self.ct_gamma_dot_list))
-                               (* [np.ctypeslib.as_ctypes(array) for array in self.ct_gamma_dot_list]))
-        self.ct_p_gamma_star = ((ct.POINTER(ct.c_double)*len(self.ct_gamma_star_list))
-                                (* [np.ctypeslib.as_ctypes(array) for array in self.ct_gamma_star_list]))
-        self.ct_p_normals = ((ct.POINTER(ct.c_double)*len(self.ct_normals_list))
-                             (* [np.ctypeslib.as_ctypes(array) for array in self.ct_normals_list]))
-        self.ct_p_forces = ((ct.POINTER(ct.c_double)*len(self.ct_forces_list))
-                            (* [np.ctypeslib.as_ctypes(array) for array in self.ct_forces_list]))
-        self.ct_p_dynamic_forces = ((ct.POINTER(ct.c_double)*len(self.ct_dynamic_forces_list))
-                            (* [np.ctypeslib.as_ctypes(array) for array in self.ct_dynamic_forces_list]))
+        """
+        Sets the ``ct_p_<variable>`` pointer tables (and the ``ct_<variable>_list`` lists of flattened arrays) that
+        are passed to the UVLM library.
 
-    def remove_ctypes_pointers(self):
+        The tables are cached in ``ct_pointer_tables`` and reused in subsequent calls. A table is only rebuilt when
+        the arrays it points to have been reallocated or reshaped, for example when the wake grows.
+        """
         try:
-            del self.ct_p_dimensions
+            tables = self.ct_pointer_tables
         except AttributeError:
-            pass
+            tables = self.ct_pointer_tables = dict()
+
+        for name, dimensions in [('dimensions', self.dimensions), ('dimensions_star', self.dimensions_star)]:
+            table = tables.get(name)
+            if table is None or not np.array_equal(table[0], dimensions):
+                ct_dimensions = dimensions.astype(dtype=ct.c_uint, copy=True)
+                table = (ct_dimensions,
+                         ((ct.POINTER(ct.c_uint)*len(ct_dimensions))
+                          (* np.ctypeslib.as_ctypes(ct_dimensions))))
+                tables[name] = table
+            setattr(self, 'ct_' + name, table[0])
+            setattr(self, 'ct_p_' + name, table[1])
+
+        for name in self.ct_variables:
+            arrays = getattr(self, name)
+            table = tables.get(name)
+            if table is None or not table.is_valid(arrays):
+                table = CtypesPointerTable(arrays)
+                tables[name] = table
+            setattr(self, 'ct_' + name + '_list', table.ct_list)
+            setattr(self, 'ct_p_' + name, table.ct_pointer)
 
-        try:
-            del self.ct_p_dimensions_star
-        except AttributeError:
-            pass
+    def remove_ctypes_pointers(self):
+        """
+        Removes the ``ct_p_<variable>`` attributes. The cached tables are kept for the next call to
+        :meth:`generate_ctypes_pointers`.
+        """
+        for name in ['dimensions', 'dimensions_star'] + self.ct_variables:
+            try:
+                delattr(self, 'ct_p_' + name)
+            except AttributeError:
+                pass
 
-        try:
-            del self.ct_p_zeta
-        except AttributeError:
-            pass
+        for k in list(self.postproc_cell.keys()):
+            if 'ct_list' in k:
+                del self.postproc_cell[k]
+            elif 'ct_pointer' in k:
+                del self.postproc_cell[k]
 
-        try:
-            del self.ct_p_zeta_star
-        except AttributeError:
-            pass
+    def __getstate__(self):
+        # ctypes pointers cannot be pickled
+        state = self.__dict__.copy()
+        state['ct_pointer_tables'] = dict()
+        for name in ['dimensions', 'dimensions_star'] + self.ct_variables:
+            state.pop('ct_p_' + name, None)
+        return state
 
-        try:
-            del self.ct_p_zeta_dot
-        except AttributeError:
-            pass
 
-        try:
-            del self.ct_p_u_ext
-        except AttributeError:
-            pass
+class CtypesPointerTable(object):
+    """
+    Table of ``double*`` pointers to the ``[i_dim, :, :]`` planes (or to the whole ``[:, :]`` array) of every array
+    of a per surface list, as expected by the UVLM library.
 
-        try:
-            del self.ct_p_u_ext_star
-        except AttributeError:
-            pass
+    The pointers are computed as the base address of every array plus the offset of each plane, so the table can be
+    kept as long as the arrays are not reallocated. Arrays that are not C-contiguous ``float64`` are copied, as
+    ``reshape(-1)`` does, and the table is then never reused.
 
-        try:
-            del self.ct_p_gamma
-        except AttributeError:
-            pass
+    Args:
+        arrays (list(np.ndarray)): per surface arrays, of shape ``(n_dim, m, n)`` or ``(m, n)``
+    """
+    def __init__(self, arrays):
+        self.arrays = list(arrays)
+        self.shapes = [array.shape for array in arrays]
+        self.reusable = all(array.flags['C_CONTIGUOUS'] and array.dtype == ct.c_double for array in arrays)
+
+        self.ct_list = []
+        for array in arrays:
+            if array.ndim == 3:
+                self.ct_list.extend([array[i_dim, :, :].reshape(-1) for i_dim in range(array.shape[0])])
+            else:
+                self.ct_list.append(array.reshape(-1))
+
+        self.addresses = np.array([plane.__array_interface__['data'][0] for plane in self.ct_list], dtype=np.uintp)
+        self.ct_pointer = (ct.POINTER(ct.c_double)*len(self.ct_list)).from_buffer(self.addresses)
+
+    def is_valid(self, arrays):
+        """
+        Returns ``True`` if the table still points to ``arrays``.
+        """
+        if not self.reusable or len(arrays) != len(self.arrays):
+            return False
+        for i_array, array in enumerate(arrays):
+            if array is not self.arrays[i_array] or array.shape != self.shapes[i_array]:
+                return False
+        return True
 
-        try:
-            del self.ct_p_gamma_dot
-        except AttributeError:
-            pass
 
-        try:
-            del self.ct_p_gamma_star
-        except AttributeError:
-            pass
+def allocate_surface_arrays(dimensions, n_dim=None, added_size=0):
+    """
+    Allocates a list of per surface arrays of zeros, of shape ``(n_dim, M + added_size, N + added_size)`` (or
+    ``(M + added_size, N + added_size)`` if ``n_dim`` is ``None``), as views of a single contiguous buffer.
 
-        try:
-            del self.ct_p_normals
-        except AttributeError:
-            pass
+    Args:
+        dimensions (np.ndarray): ``[n_surf, 2]`` panel dimensions ``M``, ``N`` of every surface
+        n_dim (int (optional)): size of the leading dimension
+        added_size (int (optional)): ``1`` for vertex variables, ``0`` for panel variables
 
-        try:
-            del self.ct_p_forces
-        except AttributeError:
-            pass
+    Returns:
+        list(np.ndarray): C-contiguous ``c_double`` arrays
+    """
+    shapes = []
+    for i_surf in range(len(dimensions)):
+        shape = (dimensions[i_surf, 0] + added_size, dimensions[i_surf, 1] + added_size)
+        if n_dim is not None:
+            shape = (n_dim,) + shape
+        shapes.append(shape)
 
-        try:
-            del self.ct_p_dynamic_forces
-        except AttributeError:
-            pass
-
-        for k in list(self.postproc_cell.keys()):
-            if 'ct_list' in k:
-                del self.postproc_cell[k]
-            elif 'ct_pointer' in k:
-                del self.postproc_cell[k]
+    buffer = np.zeros(sum(int(np.prod(shape)) for shape in shapes), dtype=ct.c_double)
+    arrays = []
+    i_start = 0
+    for shape in shapes:
+        i_end = i_start + int(np.prod(shape))
+        arrays.append(buffer[i_start:i_end].reshape(shape))
+        i_start = i_end
+    return arrays
 
 
 def init_matrix_structure(dimensions, with_dim_dimension, added_size=0):
@@ -367,6 +281,61 @@ def standalone_ctypes_pointer(matrix):
     return ct_list, ct_pointer
 
 
+def copy_array_into(array, target, order='K', dtype=None):
+    """
+    Copies ``array`` into ``target`` in place if they have the same shape and type. Otherwise, a copy of ``array``
+    with the given memory ``order`` and ``dtype`` (by default that of ``array``) is returned.
+
+    Intended to be used as ``target = copy_array_into(array, target)``.
+    """
+    if array is None:
+        return None
+    if dtype is None:
+        dtype = array.dtype
+    if (isinstance(target, np.ndarray) and target.shape == array.shape and target.dtype == dtype and
+            target.flags.writeable):
+        target[...] = array
+        return target
+    return array.astype(dtype=dtype, order=order, copy=True)
+
+
+def copy_dict_into(dictionary, target):
+    """
+    Copies the contents of ``dictionary`` into ``target``, reusing the arrays (also in nested dictionaries) already
+    present in ``target`` with the same key. Other values are deep copied and keys not in ``dictionary`` are removed.
+
+    Returns:
+        dict: ``target``, updated.
+    """
+    for k in list(target.keys()):
+        if k not in dictionary:
+            del target[k]
+
+    for k, v in dictionary.items():
+        if isinstance(v, np.ndarray) and k in target:
+            target[k] = copy_array_into(v, target[k])
+        elif isinstance(v, dict) and isinstance(target.get(k, None), dict):
+            target[k] = copy_dict_into(v, target[k])
+        else:
+            target[k] = copy.deepcopy(v)
+    return target
+
+
+def copy_to_history(tstep, timestep_info):
+    """
+    Returns a copy of ``tstep`` to be appended to ``timestep_info``.
+
+    If ``timestep_info`` is a full :class:`TimeStepHistory`, the time step it is about to evict is overwritten, so
+    that no new arrays are allocated.
+    """
+    recycled = None
+    if isinstance(timestep_info, TimeStepHistory):
+        recycled = timestep_info.recycle()
+    if recycled is None or recycled is tstep:
+        return tstep.copy()
+    return tstep.copy_into(recycled)
+
+
 class StructTimeStepInfo(object):
     def __init__(self, num_node, num_elem, num_node_elem=3, num_dof=None, num_bodies=1):
         self.num_node = num_node
@@ -420,56 +389,50 @@ class StructTimeStepInfo(object):
 
     def copy(self):
         copied = StructTimeStepInfo(self.num_node, self.num_elem, self.num_node_elem, ct.c_int(len(self.q)-10), self.mb_quat.shape[0])
+        self.copy_into(copied)
 
-        copied.num_node = self.num_node
-        copied.num_elem = self.num_elem
-        copied.num_node_elem = self.num_node_elem
+        return copied
 
-        # generate placeholder for node coordinates
-        copied.pos = self.pos.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.pos_dot = self.pos_dot.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.pos_ddot = self.pos_ddot.astype(dtype=ct.c_double, order='F', copy=True)
-        # self.pos_dot = np.zeros((self.num_node, 3), dtype=ct.c_double, order='F')
+    def copy_into(self, other):
+        """
+        Copies the contents of this time step into ``other``, reusing its arrays whenever their shape allows it.
 
-        # placeholder for CRV
-        copied.psi = self.psi.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.psi_dot = self.psi_dot.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.psi_ddot = self.psi_ddot.astype(dtype=ct.c_double, order='F', copy=True)
+        This is the allocation-free counterpart of :meth:`copy`, meant for scratch time steps that are overwritten
+        repeatedly, such as those of the FSI iterations.
 
-        # FoR data
-        copied.quat = self.quat.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.for_pos = self.for_pos.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.for_vel = self.for_vel.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.for_acc = self.for_acc.astype(dtype=ct.c_double, order='F', copy=True)
-
-        copied.gravity_vector_inertial = self.gravity_vector_inertial.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.gravity_vector_body = self.gravity_vector_body.astype(dtype=ct.c_double, order='F', copy=True)
-
-        copied.steady_applied_forces = self.steady_applied_forces.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.unsteady_applied_forces = self.unsteady_applied_forces.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.gravity_forces = self.gravity_forces.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.total_gravity_forces = self.total_gravity_forces.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.total_forces = self.total_forces.astype(dtype=ct.c_double, order='F', copy=True)
-
-        copied.q = self.q.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.dqdt = self.dqdt.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.dqddt = self.dqddt.astype(dtype=ct.c_double, order='F', copy=True)
-
-        copied.postproc_cell = copy.deepcopy(self.postproc_cell)
-        copied.postproc_node = copy.deepcopy(self.postproc_node)
-
-        #if not self.mb_quat is None:
-        copied.mb_FoR_pos = self.mb_FoR_pos.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.mb_FoR_vel = self.mb_FoR_vel.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.mb_FoR_acc = self.mb_FoR_acc.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.mb_quat = self.mb_quat.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.mb_dqddt_quat = self.mb_dqddt_quat.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.forces_constraints_nodes = self.forces_constraints_nodes.astype(dtype=ct.c_double, order='F', copy=True)
-        copied.forces_constraints_FoR = self.forces_constraints_FoR.astype(dtype=ct.c_double, order='F', copy=True)
-
-        copied.mb_dict = copy.deepcopy(self.mb_dict)
+        Args:
+            other (StructTimeStepInfo): time step to be overwritten.
 
-        return copied
+        Returns:
+            StructTimeStepInfo: ``other``, for convenience.
+        """
+        other.num_node = self.num_node
+        other.num_elem = self.num_elem
+        other.num_node_elem = self.num_node_elem
+
+        for name in ['pos', 'pos_dot', 'pos_ddot',
+                     'psi', 'psi_dot', 'psi_ddot',
+                     'quat', 'for_pos', 'for_vel', 'for_acc',
+                     'gravity_vector_inertial', 'gravity_vector_body',
+                     'steady_applied_forces', 'unsteady_applied_forces', 'gravity_forces',
+                     'total_gravity_forces', 'total_forces',
+                     'q', 'dqdt', 'dqddt',
+                     'mb_FoR_pos', 'mb_FoR_vel', 'mb_FoR_acc', 'mb_quat', 'mb_dqddt_quat',
+                     'forces_constraints_nodes', 'forces_constraints_FoR']:
+            setattr(other, name, copy_array_into(getattr(self, name), getattr(other, name),
+                                                 order='F', dtype=ct.c_double))
+
+        other.postproc_cell = copy_dict_into(self.postproc_cell, other.postproc_cell)
+        other.postproc_node = copy_dict_into(self.postproc_node, other.postproc_node)
+
+        if self.mb_dict is None:
+            other.mb_dict = None
+        else:
+            if other.mb_dict is None:
+                other.mb_dict = dict()
+            other.mb_dict = copy_dict_into(self.mb_dict, other.mb_dict)
+
+        return other
 
     def glob_pos(self, include_rbm=True):
         coords = self.pos.copy()
@@ -523,61 +486,77 @@ class StructTimeStepInfo(object):
         # Define the nodes and elements belonging to the body
         ibody_elems, ibody_nodes = mb.get_elems_nodes_list(beam, ibody)
 
-        ibody_num_node = len(ibody_nodes)
-        ibody_num_elem = len(ibody_elems)
+        # Initialize the new StructTimeStepInfo
+        ibody_StructTimeStepInfo = StructTimeStepInfo(len(ibody_nodes), len(ibody_elems), self.num_node_elem, num_dof = num_dof_ibody, num_bodies = beam.num_bodies)
 
-        ibody_first_dof = 0
-        for index_body in range(ibody - 1):
-            aux_elems, aux_nodes = mb.get_elems_nodes_list(beam, index_body)
-            ibody_first_dof += np.sum(beam.vdof[aux_nodes] > -1)*6
+        return self.get_body_into(beam, num_dof_ibody, ibody, ibody_StructTimeStepInfo)
 
-        # Initialize the new StructTimeStepInfo
-        ibody_StructTimeStepInfo = StructTimeStepInfo(ibody_num_node, ibody_num_elem, self.num_node_elem, num_dof = num_dof_ibody, num_bodies = beam.num_bodies)
+    def get_body_into(self, beam, num_dof_ibody, ibody, other):
+        """
+        get_body_into
 
-        # Assign all the variables
-        # ibody_StructTimeStepInfo.quat = self.quat.astype(dtype=ct.c_double, order='F', copy=True)
-        # ibody_StructTimeStepInfo.for_pos = self.for_pos.astype(dtype=ct.c_double, order='F', copy=True)
-        # ibody_StructTimeStepInfo.for_vel = self.for_vel.astype(dtype=ct.c_double, order='F', copy=True)
-        # ibody_StructTimeStepInfo.for_acc = self.for_acc.astype(dtype=ct.c_double, order='F', copy=True)
+        Extract the body number 'ibody' from a multibody system into an existing StructTimeStepInfo
 
-        CAslaveG = algebra.quat2rotation(self.mb_quat[ibody, :]).T
-        ibody_StructTimeStepInfo.quat = self.mb_quat[ibody, :].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.for_pos = self.mb_FoR_pos[ibody, :].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.for_vel[0:3] = np.dot(CAslaveG, self.mb_FoR_vel[ibody, 0:3])
-        ibody_StructTimeStepInfo.for_vel[3:6] = np.dot(CAslaveG, self.mb_FoR_vel[ibody, 3:6])
-        ibody_StructTimeStepInfo.for_acc[0:3] = np.dot(CAslaveG, self.mb_FoR_acc[ibody, 0:3])
-        ibody_StructTimeStepInfo.for_acc[3:6] = np.dot(CAslaveG, self.mb_FoR_acc[ibody, 3:6])
+        This is the allocation-free counterpart of :meth:`get_body`: the arrays of ``other``, a time step of the body
+        ``ibody``, are overwritten by indexing those of the multibody system. The variables that are not extracted are
+        reset to the values of a new StructTimeStepInfo, so that ``other`` ends up equal to ``self.get_body(beam,
+        num_dof_ibody, ibody)``.
 
-        ibody_StructTimeStepInfo.pos = self.pos[ibody_nodes,:].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.pos_dot = self.pos_dot[ibody_nodes,:].astype(dtype=ct.c_double, order='F', copy=True)
+        Args:
+            self(StructTimeStepInfo): timestep information of the multibody system
+            beam(Beam): beam information of the multibody system
+            num_dof_ibody(ct.c_int): number of degrees of freedom of the body
+            ibody(int): body number to be extracted
+            other(StructTimeStepInfo): timestep information of the isolated body to be overwritten
 
-        ibody_StructTimeStepInfo.psi = self.psi[ibody_elems,:,:].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.psi_dot = self.psi_dot[ibody_elems,:,:].astype(dtype=ct.c_double, order='F', copy=True)
+        Returns:
+        	other(StructTimeStepInfo): timestep information of the isolated body
 
-        ibody_StructTimeStepInfo.gravity_vector_inertial = self.gravity_vector_inertial.astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.gravity_vector_body = self.gravity_vector_body.astype(dtype=ct.c_double, order='F', copy=True)
+        Examples:
 
-        ibody_StructTimeStepInfo.steady_applied_forces = self.steady_applied_forces[ibody_nodes,:].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.unsteady_applied_forces = self.unsteady_applied_forces[ibody_nodes,:].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.gravity_forces = self.gravity_forces[ibody_nodes,:].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.total_gravity_forces = self.total_gravity_forces.astype(dtype=ct.c_double, order='F', copy=True)
+        Notes:
 
-        ibody_StructTimeStepInfo.q[0:num_dof_ibody.value] = self.q[ibody_first_dof:ibody_first_dof+num_dof_ibody.value].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.dqdt[0:num_dof_ibody.value] = self.dqdt[ibody_first_dof:ibody_first_dof+num_dof_ibody.value].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.dqddt[0:num_dof_ibody.value] = self.dqddt[ibody_first_dof:ibody_first_dof+num_dof_ibody.value].astype(dtype=ct.c_double, order='F', copy=True)
+        """
 
-        # ibody_StructTimeStepInfo.q[-10:] = self.q[-10:].astype(dtype=ct.c_double, order='F', copy=True)
-        # ibody_StructTimeStepInfo.dqdt[-10:] = self.dqdt[-10:].astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.dqdt[-4:] = ibody_StructTimeStepInfo.quat.astype(dtype=ct.c_double, order='F', copy=True)
-        # ibody_StructTimeStepInfo.dqddt[-10:] = self.dqddt[-10:].astype(dtype=ct.c_double, order='F', copy=True)
+        # Define the nodes and elements belonging to the body
+        ibody_elems, ibody_nodes = mb.get_elems_nodes_list(beam, ibody)
+        ibody_first_dof = mb.get_body_layout(beam)['first_dof'][ibody]
+        ibody_num_dof = num_dof_ibody.value
 
-        ibody_StructTimeStepInfo.mb_quat = self.mb_quat.astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.mb_FoR_pos = self.mb_FoR_pos.astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.mb_FoR_vel = self.mb_FoR_vel.astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.mb_FoR_acc = self.mb_FoR_acc.astype(dtype=ct.c_double, order='F', copy=True)
-        ibody_StructTimeStepInfo.mb_dqddt_quat = self.mb_dqddt_quat.astype(dtype=ct.c_double, order='F', copy=True)
+        # Variables that are not extracted from the multibody system
+        for name in ['pos_ddot', 'psi_ddot', 'total_forces', 'q', 'dqdt', 'dqddt',
+                     'forces_constraints_nodes', 'forces_constraints_FoR']:
+            getattr(other, name)[...] = 0.
+        other.postproc_cell = dict()
+        other.postproc_node = dict()
+        other.mb_dict = None
 
-        return ibody_StructTimeStepInfo
+        # Assign all the variables
+        CAslaveG = algebra.quat2rotation(self.mb_quat[ibody, :]).T
+        other.quat = copy_array_into(self.mb_quat[ibody, :], other.quat, order='F', dtype=ct.c_double)
+        other.for_pos = copy_array_into(self.mb_FoR_pos[ibody, :], other.for_pos, order='F', dtype=ct.c_double)
+        other.for_vel[0:3] = np.dot(CAslaveG, self.mb_FoR_vel[ibody, 0:3])
+        other.for_vel[3:6] = np.dot(CAslaveG, self.mb_FoR_vel[ibody, 3:6])
+        other.for_acc[0:3] = np.dot(CAslaveG, self.mb_FoR_acc[ibody, 0:3])
+        other.for_acc[3:6] = np.dot(CAslaveG, self.mb_FoR_acc[ibody, 3:6])
+
+        for name in ['pos', 'pos_dot', 'steady_applied_forces', 'unsteady_applied_forces', 'gravity_forces']:
+            setattr(other, name, copy_array_into(getattr(self, name)[ibody_nodes, :], getattr(other, name),
+                                                 order='F', dtype=ct.c_double))
+        for name in ['psi', 'psi_dot']:
+            setattr(other, name, copy_array_into(getattr(self, name)[ibody_elems, :, :], getattr(other, name),
+                                                 order='F', dtype=ct.c_double))
+        for name in ['gravity_vector_inertial', 'gravity_vector_body', 'total_gravity_forces',
+                     'mb_quat', 'mb_FoR_pos', 'mb_FoR_vel', 'mb_FoR_acc', 'mb_dqddt_quat']:
+            setattr(other, name, copy_array_into(getattr(self, name), getattr(other, name),
+                                                 order='F', dtype=ct.c_double))
+
+        other.q[0:ibody_num_dof] = self.q[ibody_first_dof:ibody_first_dof+ibody_num_dof]
+        other.dqdt[0:ibody_num_dof] = self.dqdt[ibody_first_dof:ibody_first_dof+ibody_num_dof]
+        other.dqddt[0:ibody_num_dof] = self.dqddt[ibody_first_dof:ibody_first_dof+ibody_num_dof]
+        other.dqdt[-4:] = other.quat
+
+        return other
 
     def change_to_local_AFoR(self, global_ibody):
         """
@@ -609,23 +588,15 @@ class StructTimeStepInfo(object):
         delta_vel_ms = self.mb_FoR_vel[global_ibody,:] - self.mb_FoR_vel[0,:]
 
         # Modify position
-        for inode in range(self.pos.shape[0]):
-            pos_previous = self.pos[inode,:] + np.zeros((3,),)
-            self.pos[inode,:] = np.dot(Csm,self.pos[inode,:]) - np.dot(CAslaveG,delta_pos_ms[0:3])
-            # self.pos_dot[inode,:] = np.dot(Csm,self.pos_dot[inode,:]) - np.dot(CAslaveG,delta_vel_ms[0:3])
-            self.pos_dot[inode,:] = (np.dot(Csm, self.pos_dot[inode,:]) -
-                                    np.dot(CAslaveG, delta_vel_ms[0:3]) -
-                                    np.dot(algebra.skew(np.dot( CAslaveG, self.mb_FoR_vel[global_ibody,3:6])), self.pos[inode,:]) +
-                                    np.dot(Csm, np.dot(algebra.skew(np.dot(CGAmaster.T, self.mb_FoR_vel[0,3:6])), pos_previous)))
-
-            self.gravity_forces[inode,0:3] = np.dot(Csm, self.gravity_forces[inode,0:3])
-            self.gravity_forces[inode,3:6] = np.dot(Csm, self.gravity_forces[inode,3:6])
-
-            # self.pos_dot[inode,:] = (np.dot(np.transpose(Csm),self.pos_dot[inode,:]) +
-            #                         np.dot(np.transpose(CGAmaster),delta_vel_ms[0:3]) +
-            #                         np.dot(Csm.T, np.cross( np.dot(CAslaveG, self.mb_FoR_vel[global_ibody,3:6]), pos_previous)) -
-            #                         np.cross(np.dot(CGAmaster.T, self.mb_FoR_vel[0,3:6]), self.pos[inode,:]))
+        pos_previous = self.pos.copy()
+        self.pos[:] = np.dot(pos_previous, Csm.T) - np.dot(CAslaveG, delta_pos_ms[0:3])
+        self.pos_dot[:] = (np.dot(self.pos_dot, Csm.T) -
+                           np.dot(CAslaveG, delta_vel_ms[0:3]) -
+                           np.dot(self.pos, algebra.skew(np.dot(CAslaveG, self.mb_FoR_vel[global_ibody,3:6])).T) +
+                           np.dot(pos_previous, np.dot(Csm, algebra.skew(np.dot(CGAmaster.T, self.mb_FoR_vel[0,3:6]))).T))
 
+        self.gravity_forces[:,0:3] = np.dot(self.gravity_forces[:,0:3], Csm.T)
+        self.gravity_forces[:,3:6] = np.dot(self.gravity_forces[:,3:6], Csm.T)
 
         # Modify local rotations
         for ielem in range(self.psi.shape[0]):
@@ -673,17 +644,14 @@ class StructTimeStepInfo(object):
         delta_pos_ms = self.mb_FoR_pos[global_ibody,:] - self.mb_FoR_pos[0,:]
         delta_vel_ms = self.mb_FoR_vel[global_ibody,:] - self.mb_FoR_vel[0,:]
 
-        for inode in range(self.pos.shape[0]):
-            pos_previous = self.pos[inode,:] + np.zeros((3,),)
-            self.pos[inode,:] = (np.dot(np.transpose(Csm),self.pos[inode,:]) +
-                                np.dot(np.transpose(CGAmaster),delta_pos_ms[0:3]))
-            self.pos_dot[inode,:] = (np.dot(np.transpose(Csm),self.pos_dot[inode,:]) +
-                                    np.dot(np.transpose(CGAmaster),delta_vel_ms[0:3]) +
-                                    np.dot(Csm.T, np.dot(algebra.skew(np.dot(CAslaveG, self.mb_FoR_vel[global_ibody,3:6])), pos_previous)) -
-                                    np.dot(algebra.skew(np.dot(CGAmaster.T, self.mb_FoR_vel[0,3:6])), self.pos[inode,:]))
-            self.gravity_forces[inode,0:3] = np.dot(Csm.T, self.gravity_forces[inode,0:3])
-            self.gravity_forces[inode,3:6] = np.dot(Csm.T, self.gravity_forces[inode,3:6])
-                                    # np.cross(np.dot(CGAmaster.T, delta_vel_ms[3:6]), pos_previous))
+        pos_previous = self.pos.copy()
+        self.pos[:] = np.dot(pos_previous, Csm) + np.dot(np.transpose(CGAmaster), delta_pos_ms[0:3])
+        self.pos_dot[:] = (np.dot(self.pos_dot, Csm) +
+                           np.dot(np.transpose(CGAmaster), delta_vel_ms[0:3]) +
+                           np.dot(pos_previous, np.dot(Csm.T, algebra.skew(np.dot(CAslaveG, self.mb_FoR_vel[global_ibody,3:6]))).T) -
+                           np.dot(self.pos, algebra.skew(np.dot(CGAmaster.T, self.mb_FoR_vel[0,3:6])).T))
+        self.gravity_forces[:,0:3] = np.dot(self.gravity_forces[:,0:3], Csm)
+        self.gravity_forces[:,3:6] = np.dot(self.gravity_forces[:,3:6], Csm)
 
         for ielem in range(self.psi.shape[0]):
             for inode in range(3):
@@ -720,3 +688,170 @@ class LinearTimeStepInfo(object):
         copied.u = self.u.copy()
         copied.t = self.t.copy()
 
+
+
+class TimeStepHistory(collections.abc.Sequence):
+    """
+    Bounded container for the time step history (``timestep_info``) of long simulations.
+
+    It behaves like the ``list`` it replaces: it is indexed with the absolute time step number (negative indices
+    count from the latest step), ``len()`` returns the total number of time steps run so far and new steps are
+    added with ``append``. However, only the latest ``depth`` steps are kept in memory, in a preallocated ring of
+    slots. Steps older than that are either written to ``spill_folder`` (and read back on demand) or dropped. Dropped
+    steps are returned as ``None``, the same convention used by the ``Cleanup`` postprocessor.
+
+    Args:
+        depth (int): number of time steps kept in memory. Minimum of ``MIN_DEPTH``.
+        spill_folder (str (optional)): folder where evicted time steps are pickled. If ``None`` they are dropped.
+        name (str (optional)): prefix of the spilled files, to distinguish the aero from the structural history.
+    """
+    MIN_DEPTH = 3  # time steps required by ``Aerogrid.compute_gamma_dot``
+
+    def __init__(self, depth, spill_folder=None, name='tstep'):
+        self.depth = max(depth, self.MIN_DEPTH)
+        self.spill_folder = spill_folder
+        self.name = name
+
+        self._slots = [None]*self.depth
+        self._length = 0
+
+        if self.spill_folder is not None:
+            os.makedirs(self.spill_folder, exist_ok=True)
+
+    @classmethod
+    def from_list(cls, timestep_info, depth, spill_folder=None, name='tstep'):
+        """
+        Creates a ``TimeStepHistory`` with the contents of an existing ``timestep_info`` list.
+        """
+        history = cls(depth, spill_folder, name)
+        for tstep in timestep_info:
+            history.append(tstep)
+        return history
+
+    def __len__(self):
+        return self._length
+
+    def _absolute_index(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('TimeStepHistory index out of range')
+        return index
+
+    def _in_memory(self, index):
+        return index >= self._length - self.depth
+
+    def _spill_file(self, index):
+        return os.path.join(self.spill_folder, '%s_%06u.pkl' % (self.name, index))
+
+    def _evict(self, index):
+        tstep = self._slots[index % self.depth]
+        self._slots[index % self.depth] = None
+        if self.spill_folder is not None and tstep is not None:
+            self._dump(index, tstep)
+
+    def _dump(self, index, tstep):
+        if tstep is None:
+            try:
+                os.remove(self._spill_file(index))
+            except FileNotFoundError:
+                pass
+        else:
+            with open(self._spill_file(index), 'wb') as f:
+                pickle.dump(tstep, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _move(self, index, new_index):
+        try:
+            os.replace(self._spill_file(index), self._spill_file(new_index))
+        except FileNotFoundError:
+            self._dump(new_index, None)
+
+    def _load(self, index):
+        if self.spill_folder is None:
+            return None
+        try:
+            with open(self._spill_file(index), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def append(self, tstep):
+        if self._length >= self.depth:
+            self._evict(self._length - self.depth)
+        self._slots[self._length % self.depth] = tstep
+        self._length += 1
+
+    def recycle(self):
+        """
+        Removes from memory the time step that the next ``append`` would evict (spilling it if required) and returns
+        it, so that its arrays can be reused by the new time step. Returns ``None`` if the history is not full yet.
+        """
+        if self._length < self.depth:
+            return None
+        index = self._length - self.depth
+        tstep = self._slots[index % self.depth]
+        self._evict(index)
+        return tstep
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        index = self._absolute_index(index)
+        if self._in_memory(index):
+            return self._slots[index % self.depth]
+        return self._load(index)
+
+    def __setitem__(self, index, tstep):
+        index = self._absolute_index(index)
+        if self._in_memory(index):
+            self._slots[index % self.depth] = tstep
+        elif self.spill_folder is not None:
+            self._dump(index, tstep)
+        elif tstep is not None:
+            raise IndexError('Time step %u has already been dropped from the history' % index)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            deleted = set(range(*index.indices(self._length)))
+        else:
+            deleted = {self._absolute_index(index)}
+        if not deleted:
+            return
+
+        kept = [i for i in range(self._length) if i not in deleted]
+        in_memory = dict()
+        for i in range(max(self._length - self.depth, 0), self._length):
+            in_memory[i] = self._slots[i % self.depth]
+
+        # the following steps are shifted back, as in a list. Spilled files are renamed in ascending order, so that
+        # no file is overwritten before it has been moved
+        new_length = len(kept)
+        first_in_memory = max(new_length - self.depth, 0)
+        self._slots = [None]*self.depth
+        for new_index, old_index in enumerate(kept):
+            if new_index >= first_in_memory:
+                if old_index in in_memory:
+                    self._slots[new_index % self.depth] = in_memory[old_index]
+                else:
+                    self._slots[new_index % self.depth] = self._load(old_index)
+            elif self.spill_folder is not None:
+                if old_index in in_memory:
+                    self._dump(new_index, in_memory[old_index])
+                elif old_index != new_index:
+                    self._move(old_index, new_index)
+
+        if self.spill_folder is not None:
+            for i in range(first_in_memory, self._length):
+                self._dump(i, None)
+        self._length = new_length
+
+    def in_memory(self):
+        """
+        Returns the list of the time steps held in memory, without reading any spilled step back from disk.
+        """
+        return [self._slots[i % self.depth] for i in range(max(self._length - self.depth, 0), self._length)]
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self[i]
@@ -28,7 +28,12 @@ def print_available_generators():
 
 
 class BaseGenerator(metaclass=ABCMeta):
-    pass
+
+    def finalise(self):
+        """
+        Releases the resources (files, threads) held by the generator at the end of the simulation.
+        """
+        pass
 
 def generator_from_string(string):
     return dict_of_generators[string]
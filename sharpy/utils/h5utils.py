@@ -6,6 +6,7 @@
 """H5 File Management Utilities
 Set of utilities for opening/reading files
 """
+import collections.abc
 import h5py as h5
 import os
 import errno
@@ -251,7 +252,7 @@ def add_as_grp(obj, grpParent,
     """
 
     ### determine if dict, list, tuple or class
-    if isinstance(obj, list):
+    if isinstance(obj, list) or is_list_like(obj):
         ObjType = 'list'
     elif isinstance(obj, tuple):
         ObjType = 'tuple'
@@ -316,7 +317,7 @@ def add_as_grp(obj, grpParent,
 
         # ----- classes/dict/lists
         # ps: no need to delete if overwrite is True
-        if isinstance(value, SaveAsGroups):
+        if isinstance(value, SaveAsGroups) or is_list_like(value):
             add_as_grp(value, grp, attr,
                        ClassesToSave, SkipAttr, compress_float, overwrite)
             continue
@@ -351,6 +352,16 @@ def add_as_grp(obj, grpParent,
     return grpParent
 
 
+def is_list_like(obj):
+    """
+    Returns True for sequences other than lists, tuples and strings (such as the
+    :class:`~sharpy.utils.datastructures.TimeStepHistory` of the time steps), which
+    are saved as lists.
+    """
+    return (isinstance(obj, collections.abc.Sequence) and
+            not isinstance(obj, (list, tuple, str, bytes)))
+
+
 def add_array_to_grp(data, name, grp, compress_float=False):
     """ Add numpy array (data) as dataset 'name' to the group grp. If
     compress is True, 64-bit float arrays are converted to 32-bit """
@@ -413,3 +424,97 @@ def save_list_as_array(list_obj, grp_target, compress_float=False):
 
                 return True
     return False
+
+
+class StreamWriter(object):
+    """
+    Appends one slab per time step to chunked, extendible datasets.
+
+    Each variable is stored in a dataset of shape ``(n_tsteps,) + shape`` that is created the first time the variable
+    is appended and resized afterwards, rather than creating a new group per time step.
+
+    The non-time dimensions are extendible too, so variables whose shape changes between time steps (such as a growing
+    wake) can be appended. The dataset then takes the largest shape along every dimension, the unused part of the
+    smaller rows is left to the fill value (``NaN`` for floats) and the actual shape of every row is stored in the
+    ``<name>_shape`` dataset.
+
+    The datasets are chunked along time so that every chunk holds about ``chunk_bytes`` (with at least one time step
+    per chunk), since a chunk per time step makes reading the history of a variable slow and the file large.
+
+    Args:
+        grp (h5py.Group): group under which the datasets are created
+        compression (str): ``h5py`` compression filter (``gzip`` or ``lzf``). ``None`` for no compression
+        compress_float (bool): if ``True``, 64-bit float arrays are stored as 32-bit
+        chunk_bytes (int): approximate size of the chunks of the datasets
+    """
+    def __init__(self, grp, compression=None, compress_float=False, chunk_bytes=2**16):
+        self.grp = grp
+        self.compression = compression
+        self.compress_float = compress_float
+        self.chunk_bytes = chunk_bytes
+
+    def append(self, name, data):
+        """
+        Appends ``data`` as a new row of the dataset ``name``, which may include intermediate groups
+        (``aero/gamma/surf0``).
+
+        Args:
+            name (str): path of the dataset relative to ``grp``
+            data (np.ndarray): value of the variable at the current time step
+
+        Returns:
+            int: index of the appended row
+        """
+        data = np.asarray(data)
+        return self.extend(name, data.reshape((1,) + data.shape))
+
+    def extend(self, name, rows):
+        """
+        Appends the rows of ``rows``, the values of the variable at several consecutive time steps along the first
+        dimension, to the dataset ``name``.
+
+        Args:
+            name (str): path of the dataset relative to ``grp``
+            rows (np.ndarray): ``(n_rows,) + shape`` values of the variable
+
+        Returns:
+            int: index of the first appended row
+        """
+        rows = np.asarray(rows)
+        shape = rows.shape[1:]
+        try:
+            dset = self.grp[name]
+        except KeyError:
+            dtype = rows.dtype
+            if self.compress_float and dtype == float64:
+                dtype = float32
+            chunk_shape = tuple(max(n, 1) for n in shape)
+            row_bytes = np.dtype(dtype).itemsize*int(np.prod(chunk_shape))
+            dset = self.grp.create_dataset(name,
+                                           shape=(0,) + shape,
+                                           maxshape=(None,)*rows.ndim,
+                                           chunks=(max(self.chunk_bytes//row_bytes, 1),) + chunk_shape,
+                                           dtype=dtype,
+                                           fillvalue=np.nan if np.issubdtype(dtype, np.floating) else 0,
+                                           compression=self.compression)
+
+        if dset.ndim != rows.ndim:
+            raise ValueError('Cannot append data of shape %s to %s, of shape %s' % (shape,
+                                                                                    dset.name,
+                                                                                    dset.shape[1:]))
+        i_row = dset.shape[0]
+        n_rows = rows.shape[0]
+        shape_name = name + '_shape'
+        if shape_name not in self.grp and dset.shape[1:] != shape:
+            # the rows appended so far have the shape of the dataset
+            self.grp.create_dataset(shape_name,
+                                    data=np.tile(np.array(dset.shape[1:], dtype=int), (i_row, 1)),
+                                    maxshape=(None, len(shape)))
+        if shape_name in self.grp:
+            shape_dset = self.grp[shape_name]
+            shape_dset.resize(i_row + n_rows, axis=0)
+            shape_dset[i_row:] = np.array(shape, dtype=int)
+
+        dset.resize((i_row + n_rows,) + tuple(np.maximum(dset.shape[1:], shape)))
+        dset[(slice(i_row, None),) + tuple(slice(0, n) for n in shape)] = rows
+        return i_row
@@ -18,6 +18,10 @@ import sharpy.structure.utils.xbeamlib as xbeamlib
 import sharpy.utils.algebra as algebra
 import ctypes as ct
 import traceback
+import weakref
+
+# persistent layout of the bodies of each multibody Beam (see get_body_layout)
+_body_layouts = weakref.WeakKeyDictionary()
 
 
 def split_multibody(beam, tstep, mb_data_dict, ts):
@@ -40,21 +44,27 @@ def split_multibody(beam, tstep, mb_data_dict, ts):
     Examples:
 
     Notes:
+        The Beam and the time steps of each body are built only once per multibody ``beam`` (see
+        :func:`get_body_beam` and :func:`get_body_tsteps`). Every call refreshes the arrays of the body time steps
+        in place, by indexing those of the multibody system, so the time steps returned by a call are overwritten
+        by the next split of the same ``beam``.
 
     """
 
     update_mb_db_before_split(tstep, beam, mb_data_dict, ts)
+    layout = get_body_layout(beam)
 
     MB_beam = []
     MB_tstep = []
 
     for ibody in range(beam.num_bodies):
-        ibody_beam = None
-        ibody_tstep = None
-        ibody_beam = beam.get_body(ibody = ibody)
-        ibody_beam.ini_info.change_to_local_AFoR(ibody)
+        ibody_beam = get_body_beam(beam, ibody)
+        ibody_beam.ini_info.steady_applied_forces[:] = beam.ini_info.steady_applied_forces[layout['nodes'][ibody], :]
+        ibody_previous_tstep, ibody_tstep = get_body_tsteps(beam, ibody)
+        ibody_beam.timestep_info = beam.timestep_info[-1].get_body_into(beam, ibody_beam.num_dof, ibody,
+                                                                         ibody_previous_tstep)
         ibody_beam.timestep_info.change_to_local_AFoR(ibody)
-        ibody_tstep = tstep.get_body(beam, ibody_beam.num_dof, ibody = ibody)
+        tstep.get_body_into(beam, ibody_beam.num_dof, ibody, ibody_tstep)
         ibody_tstep.change_to_local_AFoR(ibody)
 
         ibody_beam.FoR_movement = mb_data_dict['body_%02d' % ibody]['FoR_movement']
@@ -99,12 +109,13 @@ def merge_multibody(MB_tstep, MB_beam, beam, tstep, mb_data_dict, dt):
     """
 
     update_mb_dB_before_merge(tstep, MB_tstep)
+    layout = get_body_layout(beam)
 
-    first_dof = 0
     for ibody in range(beam.num_bodies):
         # Renaming for clarity
-        ibody_elems = MB_beam[ibody].global_elems_num
-        ibody_nodes = MB_beam[ibody].global_nodes_num
+        ibody_elems = layout['elems'][ibody]
+        ibody_nodes = layout['nodes'][ibody]
+        first_dof = layout['first_dof'][ibody]
 
         # Merge tstep
         MB_tstep[ibody].change_to_global_AFoR(ibody)
@@ -122,7 +133,6 @@ def merge_multibody(MB_tstep, MB_beam, beam, tstep, mb_data_dict, dt):
         tstep.q[first_dof:first_dof+ibody_num_dof] = MB_tstep[ibody].q[:-10].astype(dtype=ct.c_double, order='F', copy=True)
         tstep.dqdt[first_dof:first_dof+ibody_num_dof] = MB_tstep[ibody].dqdt[:-10].astype(dtype=ct.c_double, order='F', copy=True)
         tstep.dqddt[first_dof:first_dof+ibody_num_dof] = MB_tstep[ibody].dqddt[:-10].astype(dtype=ct.c_double, order='F', copy=True)
-        first_dof += ibody_num_dof
 
     tstep.q[-10:] = MB_tstep[0].q[-10:].astype(dtype=ct.c_double, order='F', copy=True)
     tstep.dqdt[-10:] = MB_tstep[0].dqdt[-10:].astype(dtype=ct.c_double, order='F', copy=True)
@@ -348,10 +358,122 @@ def state2disp(q, dqdt, dqddt, MB_beam, MB_tstep):
         MB_tstep[ibody].mb_quat = MB_tstep[0].mb_quat.astype(dtype=ct.c_double, order='F', copy=True)
 
 
-def get_elems_nodes_list(beam, ibody):
+def get_body_layout(beam):
+    """
+    get_body_layout
+
+    Returns the persistent layout of the bodies of a multibody system
+
+    The elements, nodes and first degree of freedom of every body are computed
+    once and reused by every split and merge of the system. The layout is rebuilt
+    if the connectivities or the body numbers of the beam are replaced.
+
+    Args:
+        beam (beam): structural information of the multibody system
+
+    Returns:
+        layout (dict): with the lists ``elems``, ``nodes`` and ``first_dof`` (one
+            entry per body), ``bodies``, the Beam of each body once it has been built, and
+            ``tsteps``, the time steps of each body once they have been built
+
+    Examples:
+
+    Notes:
+
+    """
+
+    layout = _body_layouts.get(beam)
+    if (layout is not None and
+            layout['connectivities'] is beam.connectivities and
+            layout['body_number'] is beam.body_number):
+        return layout
+
+    layout = dict()
+    layout['connectivities'] = beam.connectivities
+    layout['body_number'] = beam.body_number
+    layout['elems'] = []
+    layout['nodes'] = []
+    layout['first_dof'] = []
+    layout['bodies'] = [None]*beam.num_bodies
+    layout['tsteps'] = [None]*beam.num_bodies
 
     int_list = np.arange(0, beam.num_elem, 1)
-    ibody_elements = int_list[beam.body_number == ibody]
-    ibody_nodes = list(set(beam.connectivities[ibody_elements, :].reshape(-1)))
+    first_dof = 0
+    for ibody in range(beam.num_bodies):
+        ibody_elements = int_list[beam.body_number == ibody]
+        ibody_nodes = list(set(beam.connectivities[ibody_elements, :].reshape(-1)))
+        layout['elems'].append(ibody_elements)
+        layout['nodes'].append(ibody_nodes)
+        layout['first_dof'].append(first_dof)
+        first_dof += int(np.sum(beam.vdof[ibody_nodes] > -1))*6
+
+    _body_layouts[beam] = layout
+    return layout
+
+def get_body_beam(beam, ibody):
+    """
+    get_body_beam
+
+    Returns the Beam of the body number 'ibody', referenced to its local A FoR
+
+    The Beam of the body is built with ``beam.get_body`` the first time it is
+    requested and kept in the layout of the multibody system afterwards. Its
+    ``timestep_info`` has to be updated by the caller.
+
+    Args:
+        beam (beam): structural information of the multibody system
+        ibody (int): body number
+
+    Returns:
+        ibody_beam (beam): structural information of the body
+
+    Examples:
+
+    Notes:
+
+    """
+
+    layout = get_body_layout(beam)
+    if layout['bodies'][ibody] is None:
+        ibody_beam = beam.get_body(ibody = ibody)
+        ibody_beam.ini_info.change_to_local_AFoR(ibody)
+        layout['bodies'][ibody] = ibody_beam
+
+    return layout['bodies'][ibody]
+
+def get_body_tsteps(beam, ibody):
+    """
+    get_body_tsteps
+
+    Returns the time steps of the body number 'ibody' used by :func:`split_multibody`
+
+    The previous and current time steps of the body are built the first time they
+    are requested and kept in the layout of the multibody system afterwards. Their
+    contents have to be refreshed by the caller (see ``StructTimeStepInfo.get_body_into``).
+
+    Args:
+        beam (beam): structural information of the multibody system
+        ibody (int): body number
+
+    Returns:
+        tsteps (list of StructTimeStepInfo): previous and current time steps of the body
+
+    Examples:
+
+    Notes:
+
+    """
+
+    layout = get_body_layout(beam)
+    if layout['tsteps'][ibody] is None:
+        ibody_beam = get_body_beam(beam, ibody)
+        layout['tsteps'][ibody] = [beam.timestep_info[-1].get_body(beam, ibody_beam.num_dof, ibody = ibody)
+                                   for _ in range(2)]
+
+    return layout['tsteps'][ibody]
+
+def get_elems_nodes_list(beam, ibody):
+
+    layout = get_body_layout(beam)
 
-    return ibody_elements, ibody_nodes
+    return layout['elems'][ibody], layout['nodes'][ibody]
@@ -54,6 +54,10 @@ class BaseSolver(metaclass=ABCMeta):
     def run(self):
         pass
 
+    # This releases the resources (open files, threads) held by the solver once it is no longer run
+    def finalise(self):
+        pass
+
     # @property
     def __doc__(self):
         # Generate documentation table
@@ -0,0 +1,115 @@
+import numpy as np
+import unittest
+import os
+import shutil
+
+folder = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+
+
+class TestAsyncPostprocessors(unittest.TestCase):
+    """
+    Runs ``BeamLoads`` in the background thread of ``DynamicCoupled`` and compares the loads it stores in the time
+    steps with those of the same simulation run with ``BeamLoads`` in the main thread.
+    """
+
+    cases = {'sync': 'async_postproc_sync',
+             'async': 'async_postproc_async'}
+    n_tsteps = 20
+
+    def generate_case(self, name, async_postprocessors):
+        import sharpy.utils.generate_cases as gc
+
+        # clamped beam, oscillating under a tip force and gravity
+        nnodes = 11
+        beam = gc.AeroelasticInformation()
+        node_pos = np.zeros((nnodes, 3), )
+        node_pos[:, 1] = np.linspace(0.0, 10., nnodes)
+        beam.StructuralInformation.generate_uniform_sym_beam(node_pos, 1., 1e-4, 1e7, 1e7, 1e3, 1e4,
+                                                             num_node_elem=3, y_BFoR='x_AFoR', num_lumped_mass=0)
+        beam.StructuralInformation.boundary_conditions[0] = 1
+        beam.StructuralInformation.boundary_conditions[-1] = -1
+        beam.StructuralInformation.app_forces[-1, 2] = -10.
+
+        airfoil = np.zeros((1, 20, 2),)
+        airfoil[0, :, 0] = np.linspace(0., 1., 20)
+        beam.AerodynamicInformation.create_one_uniform_aerodynamics(beam.StructuralInformation,
+                                                                    chord=1.,
+                                                                    twist=0.,
+                                                                    sweep=0.,
+                                                                    num_chord_panels=4,
+                                                                    m_distribution='uniform',
+                                                                    elastic_axis=0.5,
+                                                                    num_points_camber=20,
+                                                                    airfoil=airfoil)
+
+        SimInfo = gc.SimulationInformation()
+        SimInfo.set_default_values()
+
+        SimInfo.define_uinf(np.array([1.0, 0.0, 0.0]), 10.)
+
+        SimInfo.solvers['SHARPy']['flow'] = ['BeamLoader',
+                                             'AerogridLoader',
+                                             'DynamicCoupled']
+        SimInfo.solvers['SHARPy']['case'] = name
+        SimInfo.solvers['SHARPy']['write_screen'] = 'off'
+        SimInfo.solvers['SHARPy']['route'] = folder + '/'
+        SimInfo.solvers['SHARPy']['log_folder'] = folder + '/output/'
+        SimInfo.set_variable_all_dicts('dt', 0.01)
+        SimInfo.set_variable_all_dicts('rho', 0.0)
+        SimInfo.set_variable_all_dicts('velocity_field_input', SimInfo.solvers['SteadyVelocityField'])
+        SimInfo.set_variable_all_dicts('folder', folder + '/output/')
+
+        SimInfo.solvers['BeamLoader']['unsteady'] = 'on'
+
+        SimInfo.solvers['AerogridLoader']['unsteady'] = 'on'
+        SimInfo.solvers['AerogridLoader']['mstar'] = 2
+
+        SimInfo.solvers['NonLinearDynamicPrescribedStep']['gravity_on'] = True
+        SimInfo.solvers['NonLinearDynamicPrescribedStep']['newmark_damp'] = 1e-3
+
+        SimInfo.solvers['DynamicCoupled']['structural_solver'] = 'NonLinearDynamicPrescribedStep'
+        SimInfo.solvers['DynamicCoupled']['structural_solver_settings'] = SimInfo.solvers['NonLinearDynamicPrescribedStep']
+        SimInfo.solvers['DynamicCoupled']['aero_solver'] = 'StepUvlm'
+        SimInfo.solvers['DynamicCoupled']['aero_solver_settings'] = SimInfo.solvers['StepUvlm']
+        SimInfo.solvers['DynamicCoupled']['postprocessors'] = ['BeamLoads']
+        SimInfo.solvers['DynamicCoupled']['postprocessors_settings'] = {'BeamLoads': SimInfo.solvers['BeamLoads']}
+        SimInfo.solvers['DynamicCoupled']['async_postprocessors'] = async_postprocessors
+        SimInfo.solvers['DynamicCoupled']['async_queue_size'] = 3
+
+        SimInfo.define_num_steps(self.n_tsteps)
+        SimInfo.with_forced_vel = False
+        SimInfo.with_dynamic_forces = False
+
+        gc.clean_test_files(SimInfo.solvers['SHARPy']['route'], SimInfo.solvers['SHARPy']['case'])
+        SimInfo.generate_solver_file()
+        SimInfo.generate_dyn_file(self.n_tsteps)
+        beam.generate_h5_files(SimInfo.solvers['SHARPy']['route'], SimInfo.solvers['SHARPy']['case'])
+
+    def setUp(self):
+        self.generate_case(self.cases['sync'], [])
+        self.generate_case(self.cases['async'], ['BeamLoads'])
+
+    def test_async_beamloads(self):
+        import sharpy.sharpy_main
+
+        data = dict()
+        for case, name in self.cases.items():
+            data[case] = sharpy.sharpy_main.main(['', folder + '/' + name + '.sharpy'])
+
+        sync_tsteps = data['sync'].structure.timestep_info
+        async_tsteps = data['async'].structure.timestep_info
+        self.assertEqual(len(async_tsteps), len(sync_tsteps))
+        for ts in range(1, len(sync_tsteps)):
+            for variable in ['loads', 'strain', 'coords_a']:
+                np.testing.assert_allclose(async_tsteps[ts].postproc_cell[variable],
+                                           sync_tsteps[ts].postproc_cell[variable],
+                                           rtol=1e-10, atol=1e-10)
+        # the beam is actually loaded and moving
+        self.assertFalse(np.allclose(sync_tsteps[1].postproc_cell['loads'], sync_tsteps[-1].postproc_cell['loads']))
+
+    def tearDown(self):
+        for name in self.cases.values():
+            for extension in ['.aero.h5', '.dyn.h5', '.fem.h5', '.sharpy']:
+                if os.path.isfile(folder + '/' + name + extension):
+                    os.remove(folder + '/' + name + extension)
+        shutil.rmtree(folder + '/output/', ignore_errors=True)
@@ -2,6 +2,7 @@ import numpy as np
 import unittest
 import os
 import shutil
+from unittest import mock
 
 # Data from Geradin
 # time[s] theta[rad]
@@ -299,6 +300,7 @@ class TestDoublePendulum(unittest.TestCase):
         SimInfo.generate_dyn_file(numtimesteps)
         beam1.generate_h5_files(SimInfo.solvers['SHARPy']['route'], SimInfo.solvers['SHARPy']['case'])
         gc.generate_multibody_file(LC, MB,SimInfo.solvers['SHARPy']['route'], SimInfo.solvers['SHARPy']['case'])
+        self.SimInfo = SimInfo
 
     def test_doublependulum(self):
         import sharpy.sharpy_main
@@ -313,6 +315,80 @@ class TestDoublePendulum(unittest.TestCase):
         self.assertAlmostEqual(pos_tip_data[-1, 2], 0.000000, 4)
         self.assertAlmostEqual(pos_tip_data[-1, 3], -0.9986984, 4)
 
+    def test_doublependulum_sparse(self):
+        import sharpy.sharpy_main
+
+        solver_path = os.path.abspath(os.path.dirname(os.path.realpath(__file__)) + '/double_pendulum_geradin.sharpy')
+        output_path = os.path.abspath(os.path.dirname(os.path.realpath(__file__))) + '/output/double_pendulum_geradin/WriteVariablesTime/'
+
+        pos_tip_data = dict()
+        quat_data = dict()
+        for use_sparse in [False, True]:
+            self.SimInfo.solvers['NonLinearDynamicMultibody']['use_sparse'] = use_sparse
+            self.SimInfo.generate_solver_file()
+            shutil.rmtree(output_path, ignore_errors=True)
+            sharpy.sharpy_main.main(['', solver_path])
+
+            pos_tip_data[use_sparse] = np.atleast_2d(np.genfromtxt(output_path + "struct_pos_node" + str(nnodes1*2-1) + ".dat", delimiter=' '))
+            quat_data[use_sparse] = np.atleast_2d(np.genfromtxt(output_path + "FoR_01_mb_quat.dat", delimiter=' '))
+
+        # the sparse assembly and solution give the results of the dense ones
+        np.testing.assert_allclose(pos_tip_data[True], pos_tip_data[False], rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(quat_data[True], quat_data[False], rtol=1e-8, atol=1e-10)
+
+    def test_doublependulum_modified_newton(self):
+        import sharpy.sharpy_main
+        from sharpy.solvers.nonlineardynamicmultibody import NonLinearDynamicMultibody
+
+        solver_path = os.path.abspath(os.path.dirname(os.path.realpath(__file__)) + '/double_pendulum_geradin.sharpy')
+        output_path = os.path.abspath(os.path.dirname(os.path.realpath(__file__))) + '/output/double_pendulum_geradin/WriteVariablesTime/'
+
+        factorise = NonLinearDynamicMultibody.factorise
+        assembly = NonLinearDynamicMultibody.assembly_MB_eq_system
+
+        # full Newton, modified Newton and modified Newton refreshing the factorisation in every iteration
+        cases = {'full': {'newton_method': 'full'},
+                 'modified': {'newton_method': 'modified'},
+                 'refreshed': {'newton_method': 'modified', 'jacobian_refresh_ratio': 0.}}
+        pos_tip_data = dict()
+        num_factorisations = dict()
+        num_iterations = dict()
+        for case, case_settings in cases.items():
+            self.SimInfo.solvers['NonLinearDynamicMultibody']['use_sparse'] = True
+            self.SimInfo.solvers['NonLinearDynamicMultibody']['jacobian_refresh_ratio'] = 0.5
+            self.SimInfo.solvers['NonLinearDynamicMultibody'].update(case_settings)
+            self.SimInfo.generate_solver_file()
+            shutil.rmtree(output_path, ignore_errors=True)
+
+            calls = {'factorise': 0, 'assembly': 0}
+
+            def counted_factorise(solver, *args):
+                calls['factorise'] += 1
+                return factorise(solver, *args)
+
+            def counted_assembly(solver, *args):
+                calls['assembly'] += 1
+                return assembly(solver, *args)
+
+            with mock.patch.object(NonLinearDynamicMultibody, 'factorise', counted_factorise), \
+                    mock.patch.object(NonLinearDynamicMultibody, 'assembly_MB_eq_system', counted_assembly):
+                sharpy.sharpy_main.main(['', solver_path])
+
+            pos_tip_data[case] = np.atleast_2d(np.genfromtxt(output_path + "struct_pos_node" + str(nnodes1*2-1) + ".dat", delimiter=' '))
+            num_factorisations[case] = calls['factorise']
+            num_iterations[case] = calls['assembly']
+
+        # full Newton factorises the system in every iteration and modified Newton reuses the factorisation
+        self.assertEqual(num_factorisations['full'], num_iterations['full'])
+        self.assertLess(num_factorisations['modified'], num_iterations['modified'])
+        self.assertLess(num_factorisations['modified'], num_factorisations['full'])
+        # the factorisation is refreshed whenever the corrections do not decrease by the refresh ratio, which with a
+        # null ratio is every iteration, and it is then full Newton
+        self.assertEqual(num_factorisations['refreshed'], num_iterations['refreshed'])
+        np.testing.assert_allclose(pos_tip_data['refreshed'], pos_tip_data['full'], rtol=1e-8, atol=1e-10)
+        # both converge to the same solution within the tolerance of the iterations
+        np.testing.assert_allclose(pos_tip_data['modified'], pos_tip_data['full'], rtol=1e-4, atol=1e-5)
+
     def tearDown(self):
         solver_path = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
         solver_path += '/'
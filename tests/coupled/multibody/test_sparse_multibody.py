@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+import scipy.sparse as sp
+import sharpy.utils.settings as settings
+import sharpy.structure.utils.lagrangeconstraints as lagrangeconstraints
+from sharpy.solvers.nonlineardynamicmultibody import NonLinearDynamicMultibody
+
+
+class TestSparseMultibody(unittest.TestCase):
+    """
+    Tests the sparse assembly of the Lagrange multipliers equations and the sparse solution of the multibody system
+    against the dense ones
+    """
+
+    def setUp(self):
+        np.random.seed(3)
+
+    def test_sparse_lagrange_matrix(self):
+        size = 12
+        dense = np.zeros((size, size))
+        sparse = lagrangeconstraints.SparseLagrangeMatrix((size, size))
+        for matrix in [dense, sparse]:
+            np.random.seed(4)
+            matrix[8:, 0:3] += np.random.rand(4, 3)
+            matrix[0:3, 8:] += np.random.rand(3, 4)
+            matrix[9, 3:6] -= np.random.rand(3)
+            matrix[3:6, 9] += np.random.rand(3)
+            matrix[8:, 0:3] += np.random.rand(4, 3)
+            matrix[10, 11] -= 2.
+            # the assignment replaces the terms added before
+            matrix[8:10, 1:5] = np.random.rand(2, 4)
+            matrix[11, 0:3] = 0.
+
+        np.testing.assert_array_equal(sparse.tocsc().toarray(), dense)
+
+    def get_solver(self, use_sparse, **kwargs):
+        solver = NonLinearDynamicMultibody()
+        solver.settings = {'use_sparse': use_sparse, **kwargs}
+        settings.to_custom_types(solver.settings, solver.settings_types, solver.settings_default,
+                                 solver.settings_options)
+        return solver
+
+    def test_sparse_solve(self):
+        size = 40
+        pattern = sp.random(size, size, density=0.1, format='csc') + sp.eye(size, format='csc')
+        pattern.data[:] = 1.
+
+        dense_solver = self.get_solver(use_sparse=False)
+        sparse_solver = self.get_solver(use_sparse=True)
+        # the first factorisation computes the column permutation, which the following ones reuse
+        for i_iter in range(3):
+            MB_Asys = pattern.copy()
+            MB_Asys.data = np.random.rand(MB_Asys.nnz)
+            MB_Asys += 10.*sp.eye(size, format='csc')
+            MB_Q = np.random.rand(size)
+
+            Dq_dense = dense_solver.factorise(MB_Asys.toarray())(MB_Q)
+            Dq_sparse = sparse_solver.solve_sparse(MB_Asys.tocsc(), MB_Q)
+            np.testing.assert_allclose(Dq_sparse, Dq_dense, rtol=1e-10, atol=1e-12)
+            np.testing.assert_allclose(MB_Asys.dot(Dq_sparse), -MB_Q, rtol=1e-10, atol=1e-12)
+            self.assertIsNotNone(sparse_solver.perm_c)
+
+    def test_modified_newton_refresh(self):
+        size = 10
+        dt = 0.1
+        solver = self.get_solver(use_sparse=False, newton_method='modified', max_jacobian_age=3)
+        systems = [np.random.rand(size, size) + 10.*np.eye(size) for i_system in range(7)]
+        MB_Q = np.random.rand(size)
+
+        def check_solution(Dq, MB_Asys, num_factorisations):
+            np.testing.assert_allclose(MB_Asys.dot(Dq), -MB_Q, rtol=1e-10, atol=1e-12)
+            self.assertEqual(solver.num_factorisations, num_factorisations)
+
+        # the first system is factorised and its factorisation reused for the next ones
+        check_solution(solver.solve_modified_newton(systems[0], MB_Q, dt, refresh=False), systems[0], 1)
+        check_solution(solver.solve_modified_newton(systems[1], MB_Q, dt, refresh=False), systems[0], 1)
+        check_solution(solver.solve_modified_newton(systems[2], MB_Q, dt, refresh=False), systems[0], 1)
+        # until it has been used max_jacobian_age times
+        check_solution(solver.solve_modified_newton(systems[3], MB_Q, dt, refresh=False), systems[3], 2)
+        # the convergence rate requests a refresh
+        check_solution(solver.solve_modified_newton(systems[4], MB_Q, dt, refresh=True), systems[4], 3)
+        check_solution(solver.solve_modified_newton(systems[5], MB_Q, dt, refresh=False), systems[4], 3)
+        # the time step changes
+        check_solution(solver.solve_modified_newton(systems[6], MB_Q, 2.*dt, refresh=False), systems[6], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
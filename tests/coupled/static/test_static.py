@@ -140,3 +140,40 @@ class TestCoupledStatic(unittest.TestCase):
         # tstep |   fx_st    |   fy_st    |   fz_st
         #     0 |  1.996e+00 | -2.116e-06 |  3.888e+02
         # 142 seconds
+
+    def test_warm_start(self):
+        """
+        A StaticCoupled run started from a stored converged state converges to the same deformation in fewer
+        iterations than one started from the undeformed structure.
+        """
+        import sharpy.sharpy_main
+        import sharpy.utils.solver_interface as solver_interface
+        solver_path = os.path.abspath(os.path.dirname(os.path.realpath(__file__)) +
+                                      '/smith_nog_2deg/smith_nog_2deg.sharpy')
+        data = sharpy.sharpy_main.main(['', solver_path])
+
+        static_coupled = solver_interface.initialise_solver('StaticCoupled')
+        static_coupled.initialise(data)
+        structural_run = static_coupled.structural_solver.run
+        n_iter = [0]
+
+        def counted_structural_run():
+            n_iter[0] += 1
+            return structural_run()
+        static_coupled.structural_solver.run = counted_structural_run
+
+        def run_from_undeformed(warm_start):
+            static_coupled.set_initial_state(data.structure.ini_info)
+            if warm_start:
+                self.assertTrue(static_coupled.warm_start(np.array([2.])))
+            n_iter[0] = 0
+            static_coupled.run()
+            return n_iter[0], data.structure.timestep_info[data.ts].pos.copy()
+
+        self.assertFalse(static_coupled.warm_start(np.array([2.])))
+        n_iter_cold, pos_cold = run_from_undeformed(warm_start=False)
+        static_coupled.save_converged_state(np.array([2.]))
+
+        n_iter_warm, pos_warm = run_from_undeformed(warm_start=True)
+        self.assertLess(n_iter_warm, n_iter_cold)
+        np.testing.assert_allclose(pos_warm, pos_cold, rtol=1e-5, atol=1e-5)
@@ -0,0 +1,151 @@
+import unittest
+import os
+import shutil
+import numpy as np
+import sharpy.utils.settings as settings
+import sharpy.utils.cout_utils as cout
+from sharpy.solvers.statictrim import StaticTrim
+
+
+class AnalyticTrimSolver(object):
+    """
+    Stands for the static solver wrapped by ``StaticTrim``, with resultants that are analytic, nonlinear functions of
+    the trim inputs ``[alpha, alpha + delta, thrust]``.
+    """
+    def __init__(self):
+        self.x = np.zeros(3)
+        self.n_runs = 0
+
+    def change_trim(self, alpha, thrust, thrust_nodes, tail_deflection, tail_cs_index):
+        self.x = np.array([alpha, tail_deflection + alpha, thrust])
+
+    def run(self):
+        self.n_runs += 1
+
+    @staticmethod
+    def outputs(x):
+        alpha, gamma, thrust = x
+        return np.array([10.*alpha + 3.*alpha**2 + 0.5*gamma - 1.,
+                         2.*alpha - 4.*gamma + 0.3*gamma**2 + 0.1,
+                         thrust - 0.5 - 3.*alpha**2])
+
+    @staticmethod
+    def jacobian(x):
+        alpha, gamma, thrust = x
+        return np.array([[10. + 6.*alpha, 0.5, 0.],
+                         [2., -4. + 0.6*gamma, 0.],
+                         [-6.*alpha, 0., 1.]])
+
+    def extract_resultants(self):
+        fz, my, fx = self.outputs(self.x)
+        return np.array([fx, 0., fz]), np.array([0., my, 0.])
+
+
+class WarmStartTrimSolver(AnalyticTrimSolver):
+    """
+    Analytic trim solver that records the parameters with which it is warm started and its converged states saved,
+    as done by ``StaticCoupled``.
+    """
+    def __init__(self):
+        super().__init__()
+        self.warm_started = []
+        self.saved = []
+
+    def warm_start(self, parameters):
+        self.warm_started.append(np.array(parameters))
+        return len(self.saved) > 0
+
+    def save_converged_state(self, parameters):
+        self.saved.append(np.array(parameters))
+
+
+class TestStaticTrimBroyden(unittest.TestCase):
+    """
+    Tests the Broyden trim method and the finite difference trim Jacobian on an analytic trim problem
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/statictrim/'
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+        os.makedirs(self.output_folder, exist_ok=True)
+
+    def get_trim(self, **custom_settings):
+        trim = StaticTrim()
+        trim.settings = {'trim_method': 'broyden',
+                         'fz_tolerance': 1e-8,
+                         'fx_tolerance': 1e-8,
+                         'm_tolerance': 1e-8,
+                         'initial_angle_eps': 1e-6,
+                         'initial_thrust_eps': 1e-6}
+        trim.settings.update(custom_settings)
+        settings.to_custom_types(trim.settings, trim.settings_types, trim.settings_default,
+                                 options=trim.settings_options)
+        trim.solver = AnalyticTrimSolver()
+        trim.folder = self.output_folder
+        trim.table = cout.TablePrinter(10, 8, ['g', 'f', 'f', 'f', 'f', 'f', 'f', 'f', 'f', 'f'],
+                                       filename=self.output_folder + 'trim_iterations.txt')
+        trim.table.print_header(['iter', 'alpha[deg]', 'elev[deg]', 'thrust', 'Fx', 'Fy', 'Fz', 'Mx', 'My', 'Mz'])
+        return trim
+
+    def assert_trimmed(self, trim):
+        x = np.array(trim.trimmed_values)
+        self.assertTrue(all(trim.convergence(*AnalyticTrimSolver.outputs(x))))
+
+        # Broyden's update makes the Jacobian of every accepted step satisfy the secant condition
+        for i_iter in range(1, len(trim.input_history)):
+            dx = np.array(trim.input_history[i_iter]) - np.array(trim.input_history[i_iter - 1])
+            if trim.gradient_history[i_iter] is None or not np.any(dx):
+                continue
+            df = np.array(trim.output_history[i_iter]) - np.array(trim.output_history[i_iter - 1])
+            np.testing.assert_allclose(trim.gradient_history[i_iter].dot(dx), df, rtol=1e-8, atol=1e-12)
+
+        # the residual never increases
+        residual = [np.linalg.norm(f) for f in trim.output_history]
+        self.assertTrue(np.all(np.diff(residual) <= 0.))
+
+    def test_convergence(self):
+        trim = self.get_trim()
+        trim.broyden_trim_algorithm()
+        self.assert_trimmed(trim)
+        # a finite difference Jacobian only at the start, Broyden updates afterwards
+        self.assertLess(trim.i_iter, 10)
+        self.assertLess(trim.solver.n_runs, 3 + 2*trim.i_iter + 2)
+
+    def test_backtracking(self):
+        # with a Jacobian that is too small, the full steps overshoot and have to be shortened
+        initial_jacobian = 0.2*AnalyticTrimSolver.jacobian(np.zeros(3))
+        trim = self.get_trim(initial_jacobian=list(initial_jacobian.reshape(-1)), max_iter=50)
+        trim.broyden_trim_algorithm()
+        self.assert_trimmed(trim)
+        # more evaluations than steps: some of them were halved
+        self.assertGreater(trim.solver.n_runs, trim.i_iter + 1)
+
+    def test_warm_start(self):
+        trim = self.get_trim(warm_start=True)
+        trim.solver = WarmStartTrimSolver()
+        trim.broyden_trim_algorithm()
+        self.assert_trimmed(trim)
+
+        # every evaluation is warm started from, and then stores, the closest converged state
+        self.assertEqual(len(trim.solver.warm_started), trim.solver.n_runs)
+        self.assertEqual(len(trim.solver.saved), trim.solver.n_runs)
+        for warm_started, saved in zip(trim.solver.warm_started, trim.solver.saved):
+            np.testing.assert_array_equal(warm_started, saved)
+        np.testing.assert_array_equal(trim.solver.saved[-1], trim.trimmed_values)
+
+    def test_parallel_jacobian(self):
+        x = np.array([0.05, 0.02, 0.4])
+        f = AnalyticTrimSolver.outputs(x)
+        jacobian_serial = self.get_trim(num_cores=1).finite_difference_jacobian(x, f)
+        jacobian_parallel = self.get_trim(num_cores=3).finite_difference_jacobian(x, f)
+        np.testing.assert_array_equal(jacobian_parallel, jacobian_serial)
+        np.testing.assert_allclose(jacobian_serial, AnalyticTrimSolver.jacobian(x), atol=1e-4)
+
+    def tearDown(self):
+        shutil.rmtree(self.route_test_dir + '/output/', ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
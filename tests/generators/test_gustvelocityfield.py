@@ -0,0 +1,113 @@
+import unittest
+import os
+import shutil
+import numpy as np
+import sharpy.generators.gustvelocityfield as gustvelocityfield
+import sharpy.utils.cout_utils as cout
+
+
+class TestGustVelocityField(unittest.TestCase):
+    """
+    Tests that the gust profiles evaluated on whole lattices match their evaluation one vertex at a time.
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/gust/'
+
+    gust_length = 2.
+    gust_intensity = 0.3
+    span = 4.
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+        np.random.seed(2)
+        os.makedirs(self.output_folder, exist_ok=True)
+
+        # two surfaces of different size, spanning from in front of to behind the gust
+        self.zeta = [np.random.rand(3, 4, 6) * np.array([6., 4., 1.])[:, None, None] - np.array([3., 2., 0.5])[:, None, None],
+                     np.random.rand(3, 3, 5) * np.array([6., 4., 1.])[:, None, None] - np.array([3., 2., 0.5])[:, None, None]]
+
+        time_file = self.output_folder + 'time_varying.txt'
+        time = np.linspace(0, 2, 11)
+        np.savetxt(time_file, np.column_stack((time, np.sin(time), np.cos(time), time ** 2)))
+
+        self.gust_parameters = {'1-cos': {'gust_length': self.gust_length,
+                                          'gust_intensity': self.gust_intensity},
+                                'DARPA': {'gust_length': self.gust_length,
+                                          'gust_intensity': self.gust_intensity,
+                                          'span': self.span},
+                                'continuous_sin': {'gust_length': self.gust_length,
+                                                   'gust_intensity': self.gust_intensity},
+                                'lateral 1-cos': {'gust_length': self.gust_length,
+                                                  'gust_intensity': self.gust_intensity},
+                                'time varying': {'file': time_file},
+                                'time varying global': {'file': time_file},
+                                'span sine': {'gust_intensity': self.gust_intensity,
+                                              'span': self.span,
+                                              'periods_per_span': 2,
+                                              'span_with_gust': 3.,
+                                              'perturbation_dir': np.array([0., 0.6, 0.8])}}
+
+    def tearDown(self):
+        shutil.rmtree(self.output_folder, ignore_errors=True)
+
+    def generate(self, gust_shape, relative_motion=False):
+        generator = gustvelocityfield.GustVelocityField()
+        generator.initialise({'u_inf': 1.5,
+                              'u_inf_direction': np.array([1., 0., 0.]),
+                              'offset': 0.4,
+                              'relative_motion': relative_motion,
+                              'gust_shape': gust_shape,
+                              'gust_parameters': self.gust_parameters[gust_shape]})
+
+        params = {'zeta': self.zeta,
+                  'override': True,
+                  'ts': 3,
+                  't': 0.6,
+                  'dt': 0.2,
+                  'for_pos': np.array([0.1, -0.2, 0.05, 0., 0., 0.])}
+        uext = [np.ones_like(zeta) for zeta in self.zeta]
+        generator.generate(params, uext)
+        return generator, params, uext
+
+    def test_lattice_evaluation(self):
+        for gust_shape in self.gust_parameters:
+            for relative_motion in [False, True]:
+                with self.subTest(gust_shape=gust_shape, relative_motion=relative_motion):
+                    generator, params, uext = self.generate(gust_shape, relative_motion)
+                    t = params['t'] if gust_shape != 'span sine' else 0
+
+                    offset = generator.settings['offset'].value
+                    if relative_motion:
+                        offset -= generator.settings['u_inf'].value * t
+                    total_offset = offset * generator.settings['u_inf_direction'] + params['for_pos'][:3]
+
+                    for i_surf, zeta in enumerate(self.zeta):
+                        self.assertEqual(uext[i_surf].shape, zeta.shape)
+                        for i in range(zeta.shape[1]):
+                            for j in range(zeta.shape[2]):
+                                x, y, z = zeta[:, i, j] + total_offset
+                                vel = generator.gust.gust_shape(x, y, z, t)
+                                self.assertEqual(vel.shape, (3,))
+                                if relative_motion:
+                                    vel = vel + generator.settings['u_inf'].value * generator.settings['u_inf_direction']
+                                np.testing.assert_allclose(uext[i_surf][:, i, j], vel, rtol=1e-12, atol=1e-14)
+
+    def test_one_minus_cos(self):
+        generator, params, uext = self.generate('1-cos')
+        total_offset = generator.settings['offset'].value * generator.settings['u_inf_direction'] + params['for_pos'][:3]
+        n_in_gust = 0
+        for i_surf, zeta in enumerate(self.zeta):
+            x = zeta[0] + total_offset[0]
+            in_gust = (x <= 0.) & (x >= -self.gust_length)
+            n_in_gust += np.count_nonzero(in_gust)
+            w = np.where(in_gust, 0.5 * self.gust_intensity * (1 - np.cos(2 * np.pi * x / self.gust_length)), 0.)
+            np.testing.assert_allclose(uext[i_surf][2], w, rtol=1e-12, atol=1e-14)
+            np.testing.assert_array_equal(uext[i_surf][:2], 0.)
+        # the lattice is partly inside the gust
+        self.assertGreater(n_in_gust, 0)
+        self.assertLess(n_in_gust, sum(zeta[0].size for zeta in self.zeta))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import unittest.mock
+import os
+import shutil
+import numpy as np
+import sharpy.utils.settings as settings
+import sharpy.generators.turbvelocityfield as turbvelocityfield
+import sharpy.utils.cout_utils as cout
+
+
+class TestTurbVelocityFieldPrefetch(unittest.TestCase):
+    """
+    Tests the background reading of the snapshots of a time varying field and the shutdown of its thread.
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/turb/'
+
+    n_grid = 4
+    dimensions = np.array([3, 4, 5])
+    store_field = True
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+        np.random.seed(4)
+        os.makedirs(self.output_folder, exist_ok=True)
+
+        # binary snapshots, as referenced by the xdmf file
+        grid = []
+        for i_grid in range(self.n_grid):
+            grid.append(dict())
+            for velocity in ['ux', 'uy', 'uz']:
+                file_name = '%s%03u.bin' % (velocity, i_grid)
+                np.random.rand(np.prod(self.dimensions)).tofile(self.output_folder + file_name)
+                grid[-1][velocity] = {'file': file_name, 'Precision': np.float64}
+
+        self.generator = turbvelocityfield.TurbVelocityField()
+        self.generator.settings = {'turbulent_field': self.output_folder + 'field.xdmf',
+                                   'frozen': False,
+                                   'store_field': self.store_field}
+        settings.to_custom_types(self.generator.settings, self.generator.settings_types,
+                                 self.generator.settings_default)
+        self.generator.route = self.output_folder
+        self.generator.grid_data = {'dimensions': self.dimensions,
+                                    'n_grid': self.n_grid,
+                                    'time': np.array([0., 1.]),
+                                    'grid': grid,
+                                    'initial_x_grid': np.linspace(-1., 0., self.dimensions[2]),
+                                    'initial_y_grid': np.linspace(0., 1., self.dimensions[1]),
+                                    'initial_z_grid': np.linspace(0., 1., self.dimensions[0])}
+
+    def tearDown(self):
+        self.generator.finalise()
+        shutil.rmtree(self.output_folder, ignore_errors=True)
+
+    def assert_snapshot(self, interpolator, i_grid):
+        _, reference = self.generator.load_grid(i_grid)
+        for i_dim in range(3):
+            np.testing.assert_array_equal(interpolator[i_dim].values, reference[i_dim].values)
+
+    def test_prefetch(self):
+        self.assert_snapshot(self.generator.read_grid(0, i_cache=0), 0)
+        self.assertIsNone(self.generator._prefetch_executor)
+        for i_grid in range(1, self.n_grid - 1):
+            self.assert_snapshot(self.generator.read_grid(i_grid, i_cache=1), i_grid)
+            # the following snapshot is being read in the background
+            self.assertIsNotNone(self.generator._prefetch_executor)
+            self.assertEqual(self.generator._prefetch_it, i_grid + 1)
+        executor = self.generator._prefetch_executor
+
+        # the last snapshot is taken from the background thread, which is then shut down
+        self.assert_snapshot(self.generator.read_grid(self.n_grid - 1, i_cache=1), self.n_grid - 1)
+        self.assertIsNone(self.generator._prefetch_executor)
+        self.assertIsNone(self.generator._prefetch_future)
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+
+    def test_finalise(self):
+        self.generator.read_grid(0, i_cache=0)
+        self.generator.read_grid(1, i_cache=1)
+        executor = self.generator._prefetch_executor
+        self.assertIsNotNone(executor)
+
+        # the pending snapshot is discarded
+        self.generator.finalise()
+        self.assertIsNone(self.generator._prefetch_executor)
+        self.assertIsNone(self.generator._prefetch_future)
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+
+        # the snapshots can still be read afterwards
+        self.assert_snapshot(self.generator.read_grid(2, i_cache=1), 2)
+        self.assertEqual(self.generator._prefetch_it, 3)
+
+
+
+class TestTurbVelocityFieldPrefetchMapped(TestTurbVelocityFieldPrefetch):
+    """
+    Tests the background reading of the snapshots when the field is not stored, but mapped from the binary files.
+    """
+
+    store_field = False
+
+    def test_read_mapped(self):
+        with unittest.mock.patch.object(turbvelocityfield.TurbVelocityField, 'read_mapped',
+                                        wraps=turbvelocityfield.TurbVelocityField.read_mapped) as read_mapped:
+            self.generator.read_grid(0, i_cache=0)
+            self.generator.read_grid(1, i_cache=1)
+            interpolator = self.generator.read_grid(2, i_cache=1)
+            self.generator._prefetch_future.result()
+
+            # only the prefetched snapshots (2 and 3) are read through in the background
+            self.assertEqual(read_mapped.call_count, 6)
+            for call in read_mapped.call_args_list:
+                self.assertIsInstance(call[0][0], np.memmap)
+            self.assertIsInstance(self.generator.vel_holder1[0], np.memmap)
+        self.assert_snapshot(interpolator, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+import scipy.interpolate as interpolate
+import sharpy.utils.settings as settings
+import sharpy.generators.turbvelocityfieldbts as turbvelocityfieldbts
+import sharpy.utils.cout_utils as cout
+
+
+class TestTurbVelocityFieldBts(unittest.TestCase):
+    """
+    Tests the batched trilinear interpolation of the turbulent velocity field against ``scipy``.
+    """
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+        np.random.seed(3)
+        self.regular_grid = (np.linspace(-4., 0., 9), np.linspace(-1.5, 1.5, 7), np.linspace(-1., 1., 5))
+        self.irregular_grid = tuple(np.sort(np.concatenate((grid[[0, -1]], grid[0] + (grid[-1] - grid[0])*np.random.rand(len(grid) - 2))))
+                                    for grid in self.regular_grid)
+        self.vel = np.random.rand(3, 9, 7, 5)
+        self.u_out = np.array([1., 2., 3.])
+
+        # points inside and outside the grid, on its boundaries and on grid nodes
+        points = np.random.rand(200, 3)*np.array([5., 4., 3.]) - np.array([4.5, 2., 1.5])
+        self.points = np.concatenate((points,
+                                      [[-4., -1.5, -1.], [0., 1.5, 1.], [-4., 0., 0.], [-2., -1.5, 0.5]]))
+
+    def reference(self, grid):
+        output = np.zeros((self.points.shape[0], 3))
+        for ivel in range(3):
+            interpolator = interpolate.RegularGridInterpolator(grid, self.vel[ivel], bounds_error=False,
+                                                               fill_value=self.u_out[ivel])
+            output[:, ivel] = interpolator(self.points)
+        return output
+
+    def test_interp_rectgrid_vectorfield(self):
+        for regular_grid, grid in [(True, self.regular_grid), (False, self.regular_grid), (False, self.irregular_grid)]:
+            reference = self.reference(grid)
+            for num_cores in [1, 3]:
+                with self.subTest(regular_grid=regular_grid, num_cores=num_cores):
+                    output = turbvelocityfieldbts.interp_rectgrid_vectorfield(self.points, grid, self.vel, self.u_out,
+                                                                              regularGrid=regular_grid,
+                                                                              num_cores=num_cores)
+                    np.testing.assert_allclose(output, reference, rtol=1e-12, atol=1e-12)
+
+    def test_interpolate_zeta(self):
+        generator = turbvelocityfieldbts.TurbVelocityFieldBts()
+        generator.x_grid, generator.y_grid, generator.z_grid = self.regular_grid
+        generator.vel = self.vel
+        generator.settings = {'turbulent_field': 'unused.bts', 'u_out': self.u_out, 'num_cores': 2}
+        settings.to_custom_types(generator.settings, generator.settings_types, generator.settings_default)
+
+        zeta = [self.points[:120].T.reshape(3, 10, 12), self.points[120:].T.reshape(3, 4, 21)]
+        for_pos = np.array([0.2, -0.1, 0.05, 0., 0., 0.])
+        offset = np.array([-0.3, 0., 0.])
+        u_ext = [np.zeros_like(zeta[0]), np.zeros_like(zeta[1])]
+        generator.interpolate_zeta(zeta, for_pos, u_ext, offset=offset)
+
+        shifted_points = self.points + for_pos[:3] + offset
+        reference = np.zeros((self.points.shape[0], 3))
+        for ivel in range(3):
+            interpolator = interpolate.RegularGridInterpolator(self.regular_grid, self.vel[ivel], bounds_error=False,
+                                                               fill_value=self.u_out[ivel])
+            reference[:, ivel] = interpolator(shifted_points)
+        np.testing.assert_allclose(u_ext[0], reference[:120].T.reshape(3, 10, 12), rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(u_ext[1], reference[120:].T.reshape(3, 4, 21), rtol=1e-12, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1030,5 +1030,51 @@ class Test_assembly(unittest.TestCase):
                 'Prop. from trailing edge not correct'
 
 
+
+class Test_parallel_assembly(unittest.TestCase):
+    """
+    Tests that the surface blocks assembled in a pool of processes are identical to the serial ones, on a case with
+    two lifting surfaces
+    """
+
+    def setUp(self):
+        fname = os.path.dirname(os.path.abspath(__file__)) + '/h5input/goland_mod_Nsurf02_M003_N004_a040.aero_state.h5'
+        haero = h5utils.readh5(fname)
+        tsdata = haero.ts00000
+
+        MS = multisurfaces.MultiAeroGridSurfaces(tsdata)
+        MS.get_normal_ind_velocities_at_collocation_points()
+        MS.get_joukovski_qs()
+        self.MS = MS
+
+    def assert_blocks_equal(self, blocks_serial, blocks_parallel):
+        if isinstance(blocks_serial, (list, tuple)):
+            self.assertEqual(len(blocks_serial), len(blocks_parallel))
+            for block_serial, block_parallel in zip(blocks_serial, blocks_parallel):
+                self.assert_blocks_equal(block_serial, block_parallel)
+        else:
+            np.testing.assert_array_equal(blocks_parallel, blocks_serial)
+
+    def test_parallel_assembly(self):
+        MS = self.MS
+        self.assertEqual(MS.n_surf, 2)
+
+        assemblers = {'AICs': lambda num_processes: assembly.AICs(MS.Surfs, MS.Surfs_star,
+                                                                  num_processes=num_processes),
+                      'AICs_segments': lambda num_processes: assembly.AICs(MS.Surfs, MS.Surfs_star,
+                                                                           target='segments', Project=False,
+                                                                           num_processes=num_processes),
+                      'nc_dqcdzeta': lambda num_processes: assembly.nc_dqcdzeta(MS.Surfs, MS.Surfs_star,
+                                                                                num_processes=num_processes),
+                      'dfqsdvind_gamma': lambda num_processes: assembly.dfqsdvind_gamma(MS.Surfs, MS.Surfs_star,
+                                                                                        num_processes=num_processes),
+                      'dfqsdvind_zeta': lambda num_processes: assembly.dfqsdvind_zeta(MS.Surfs, MS.Surfs_star,
+                                                                                      num_processes=num_processes)}
+
+        for name, assembler in assemblers.items():
+            with self.subTest(assembler=name):
+                self.assert_blocks_equal(assembler(1), assembler(2))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,157 @@
+import numpy as np
+import os
+import shutil
+import unittest
+import cases.templates.flying_wings as wings
+import sharpy.sharpy_main
+import sharpy.linear.src.libsparse as libsp
+
+
+class TestLinearAeroelasticCache(unittest.TestCase):
+    """
+    Assembles the linear aeroelastic system of a wing with control surfaces twice, with the linear system cache, and
+    checks that the second (cached) assembly gives the same system and input bookkeeping as the first one.
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+
+    def run_case(self):
+        ws = wings.GolandControlSurface(M=4,
+                                        N=8,
+                                        Mstar_fact=4,
+                                        u_inf=10.,
+                                        alpha=0.,
+                                        cs_deflection=[0, 0],
+                                        rho=1.02,
+                                        sweep=0,
+                                        physical_time=1,
+                                        n_surfaces=2,
+                                        route=self.route_test_dir + '/cases',
+                                        case_name='goland_cache')
+
+        ws.clean_test_files()
+        ws.update_derived_params()
+        ws.set_default_config_dict()
+
+        ws.generate_aero_file()
+        ws.generate_fem_file()
+
+        ws.config['SHARPy'] = {
+            'flow': ['BeamLoader', 'AerogridLoader', 'StaticCoupled', 'Modal', 'LinearAssembler'],
+            'case': ws.case_name, 'route': ws.route,
+            'write_screen': 'off', 'write_log': 'on',
+            'log_folder': self.route_test_dir + '/output/',
+            'log_file': ws.case_name + '.log'}
+
+        ws.config['BeamLoader'] = {'unsteady': 'off',
+                                   'orientation': ws.quat}
+
+        ws.config['AerogridLoader'] = {'unsteady': 'off',
+                                       'aligned_grid': 'on',
+                                       'mstar': ws.Mstar_fact * ws.M,
+                                       'freestream_dir': ws.u_inf_direction}
+
+        ws.config['StaticCoupled'] = {
+            'print_info': 'off',
+            'max_iter': 200,
+            'n_load_steps': 1,
+            'tolerance': 1e-10,
+            'relaxation_factor': 0.,
+            'aero_solver': 'StaticUvlm',
+            'aero_solver_settings': {'rho': ws.rho,
+                                     'print_info': 'off',
+                                     'horseshoe': 'off',
+                                     'num_cores': 1,
+                                     'n_rollup': 0,
+                                     'rollup_dt': ws.dt,
+                                     'rollup_aic_refresh': 1,
+                                     'rollup_tolerance': 1e-4,
+                                     'velocity_field_generator': 'SteadyVelocityField',
+                                     'velocity_field_input': {'u_inf': ws.u_inf,
+                                                              'u_inf_direction': ws.u_inf_direction}},
+            'structural_solver': 'NonLinearStatic',
+            'structural_solver_settings': {'print_info': 'off',
+                                           'max_iterations': 150,
+                                           'num_load_steps': 4,
+                                           'delta_curved': 1e-1,
+                                           'min_delta': 1e-10,
+                                           'gravity_on': 'on',
+                                           'gravity': 9.754}}
+
+        ws.config['Modal'] = {'folder': self.route_test_dir + '/output/',
+                              'NumLambda': 20,
+                              'rigid_body_modes': 'off',
+                              'print_matrices': 'off',
+                              'keep_linear_matrices': 'on',
+                              'write_dat': 'off',
+                              'continuous_eigenvalues': 'off',
+                              'plot_eigenvalues': False,
+                              'write_modes_vtk': False,
+                              'use_undamped_modes': True}
+
+        ws.config['LinearAssembler'] = {'linear_system': 'LinearAeroelastic',
+                                        'use_cache': 'on',
+                                        'cache_folder': self.route_test_dir + '/output/linear_cache/',
+                                        'linear_system_settings': {
+                                            'beam_settings': {'modal_projection': 'on',
+                                                              'inout_coords': 'modes',
+                                                              'discrete_time': 'on',
+                                                              'newmark_damp': 0.5e-4,
+                                                              'discr_method': 'newmark',
+                                                              'dt': ws.dt,
+                                                              'proj_modes': 'undamped',
+                                                              'use_euler': 'off',
+                                                              'num_modes': 4,
+                                                              'print_info': 'off',
+                                                              'gravity': 'on',
+                                                              'remove_sym_modes': 'on',
+                                                              'remove_dofs': []},
+                                            'aero_settings': {'dt': ws.dt,
+                                                              'integr_order': 2,
+                                                              'density': ws.rho,
+                                                              'remove_predictor': False,
+                                                              'use_sparse': True,
+                                                              'remove_inputs': ['u_gust']},
+                                            'rigid_body_motion': False}}
+
+        ws.config.write()
+
+        return sharpy.sharpy_main.main(['', ws.route + ws.case_name + '.sharpy'])
+
+    def test_cached_assembly(self):
+        data_assembled = self.run_case()
+        data_cached = self.run_case()
+
+        aeroelastic = data_assembled.linear.linear_system
+        aeroelastic_cached = data_cached.linear.linear_system
+        self.assertFalse(aeroelastic.load_uvlm_from_cache)
+        self.assertTrue(aeroelastic_cached.load_uvlm_from_cache)
+        # neither the UVLM system nor the velocities it requires are computed again
+        self.assertIsNone(aeroelastic_cached.uvlm.sys.SS)
+        self.assertFalse(hasattr(aeroelastic_cached.uvlm.sys.MS.Surfs[0], 'u_ind_coll'))
+
+        for matrix_name in ['A', 'B', 'C', 'D']:
+            np.testing.assert_array_equal(libsp.dense(getattr(aeroelastic_cached.ss, matrix_name)),
+                                          libsp.dense(getattr(aeroelastic.ss, matrix_name)))
+
+        # the UVLM input vector is unpacked with the trimmed input variables and the control surface gain
+        uvlm, uvlm_cached = aeroelastic.uvlm, aeroelastic_cached.uvlm
+        self.assertNotIn('u_gust', uvlm_cached.input_variables.vector_vars)
+        self.assertEqual(list(uvlm_cached.input_variables.vector_vars), list(uvlm.input_variables.vector_vars))
+        self.assertIsNotNone(uvlm_cached.gain_cs)
+        np.testing.assert_array_equal(libsp.dense(uvlm_cached.gain_cs), libsp.dense(uvlm.gain_cs))
+
+        Kas = aeroelastic_cached.couplings['Kas']
+        u_aero = Kas.dot(np.random.rand(Kas.shape[1]))
+        for unpacked, unpacked_cached in zip(uvlm.unpack_input_vector(u_aero),
+                                             uvlm_cached.unpack_input_vector(u_aero)):
+            for i_surf in range(len(unpacked)):
+                np.testing.assert_array_equal(unpacked_cached[i_surf], unpacked[i_surf])
+
+    def tearDown(self):
+        for folder in ['cases', 'output']:
+            shutil.rmtree(self.route_test_dir + '/' + folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
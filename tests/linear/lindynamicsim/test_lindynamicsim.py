@@ -0,0 +1,68 @@
+import unittest
+import os
+import shutil
+import numpy as np
+import h5py
+import sharpy.linear.src.libss as libss
+import sharpy.utils.settings as settings
+from sharpy.solvers.lindynamicsim import LinDynamicSim
+
+
+class TestLinDynamicSimStreaming(unittest.TestCase):
+    """
+    Tests that marching a discrete-time system in chunks (``streaming``) gives the same state and output histories
+    as the solution over the whole time horizon with ``scipy.signal``, with one input sample per time step
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/'
+
+    def setUp(self):
+        np.random.seed(5)
+        n_states, n_inputs, n_outputs = 6, 2, 3
+        A = np.random.rand(n_states, n_states)
+        A *= 0.9 / np.max(np.abs(np.linalg.eigvals(A)))
+        self.ss = libss.ss(A,
+                           np.random.rand(n_states, n_inputs),
+                           np.random.rand(n_outputs, n_states),
+                           np.random.rand(n_outputs, n_inputs),
+                           dt=0.05)
+        self.n_steps = 23
+        self.x0 = np.random.rand(n_states)
+        self.u = np.random.rand(self.n_steps, n_inputs)
+        self.t_dom = np.arange(self.n_steps) * self.ss.dt
+
+        os.makedirs(self.output_folder, exist_ok=True)
+
+    def run_streaming(self, simulation_method):
+        solver = LinDynamicSim()
+        solver.settings = {'streaming': True,
+                           'chunk_size': 5,
+                           'simulation_method': simulation_method,
+                           'stream_variables': ['x', 'y', 't']}
+        settings.to_custom_types(solver.settings, solver.settings_types, solver.settings_default,
+                                 options=solver.settings_options)
+        solver.folder = self.output_folder
+        solver.run_streaming(self.ss, self.x0, self.u, self.t_dom)
+
+        with h5py.File(self.output_folder + '/lindynamicsim.h5', 'r') as hdfile:
+            return hdfile['t'][()], hdfile['y'][()], hdfile['x'][()]
+
+    def test_streaming(self):
+        _, y_out, x_out = libss.ss_to_scipy(self.ss).output(self.u, t=None, x0=self.x0)
+        self.assertEqual(y_out.shape, (self.n_steps, self.ss.outputs))
+        np.testing.assert_allclose(x_out[0], self.x0)
+
+        for simulation_method in ['direct', 'diagonal', 'schur']:
+            with self.subTest(simulation_method=simulation_method):
+                t_stream, y_stream, x_stream = self.run_streaming(simulation_method)
+                np.testing.assert_array_equal(t_stream, self.t_dom)
+                np.testing.assert_allclose(y_stream, y_out, rtol=1e-10, atol=1e-12)
+                np.testing.assert_allclose(x_stream, x_out, rtol=1e-10, atol=1e-12)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
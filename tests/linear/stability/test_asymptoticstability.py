@@ -0,0 +1,112 @@
+import unittest
+import types
+import numpy as np
+import scipy.linalg as sclalg
+import sharpy.utils.settings as settings
+import sharpy.utils.cout_utils as cout
+import sharpy.linear.src.libss as libss
+from sharpy.postproc.asymptoticstability import AsymptoticStability
+
+
+class ParametricSystem(object):
+    """
+    Discrete time system of two uncoupled oscillators whose continuous time eigenvalues
+    :math:`\\sigma_k(u) \\pm i\\omega_k` depend on the free stream velocity :math:`u`, as returned by the ``update``
+    method of the linear aeroelastic system. The first oscillator becomes unstable at ``u_flutter``.
+    """
+    u_flutter = 5.
+    frequencies = np.array([2., 5.])
+    dt = 0.1
+
+    def __init__(self):
+        self.uvlm = types.SimpleNamespace(sys=types.SimpleNamespace(ScalingFacts={'length': 1.}))
+
+    @classmethod
+    def damping(cls, u_inf):
+        return np.array([0.2*(u_inf - cls.u_flutter), -0.3 - 0.05*u_inf])
+
+    @classmethod
+    def eigenvalues(cls, u_inf):
+        eigs = cls.damping(u_inf) + 1j*cls.frequencies
+        return np.concatenate((eigs, eigs.conj()))
+
+    def update(self, u_inf):
+        A_cont = sclalg.block_diag(*[np.array([[sigma, omega], [-omega, sigma]])
+                                     for sigma, omega in zip(self.damping(u_inf), self.frequencies)])
+        dt_dimensional = self.uvlm.sys.ScalingFacts['length'] / u_inf * self.dt
+        return libss.ss(sclalg.expm(A_cont * dt_dimensional), np.ones((4, 1)), np.ones((1, 4)), np.zeros((1, 1)),
+                        dt=self.dt)
+
+
+class TestAsymptoticStability(unittest.TestCase):
+    """
+    Tests the velocity sweep, its refinement and the mode tracking of ``AsymptoticStability`` on a parametric system
+    with known eigenvalues
+    """
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+        self.stability = AsymptoticStability()
+        self.stability.settings = {'num_cores': 3,
+                                   'num_evals': 4}
+        settings.to_custom_types(self.stability.settings, self.stability.settings_types,
+                                 self.stability.settings_default, no_ctype=True)
+        self.stability.num_evals = self.stability.settings['num_evals']
+        self.stability.data = types.SimpleNamespace(linear=types.SimpleNamespace(linear_system=ParametricSystem()))
+
+    def assert_eigenvalues(self, eigenvalues, u_inf):
+        np.testing.assert_allclose(np.sort_complex(eigenvalues), np.sort_complex(ParametricSystem.eigenvalues(u_inf)),
+                                   atol=1e-10)
+
+    def test_sweep(self):
+        u_inf_vec = np.linspace(1., 9., 7)
+        eigenvalues = self.stability.sweep_eigenvalues(u_inf_vec)
+        self.assertEqual(sorted(eigenvalues.keys()), list(u_inf_vec))
+
+        # serial loop
+        linear_system = self.stability.data.linear.linear_system
+        for u_inf in u_inf_vec:
+            ss = linear_system.update(u_inf)
+            eigs_serial = self.stability.continuous_time_eigenvalues(
+                ss.A, linear_system.uvlm.sys.ScalingFacts['length'] / u_inf * ss.dt)
+            np.testing.assert_array_equal(eigenvalues[u_inf], eigs_serial)
+            self.assert_eigenvalues(eigenvalues[u_inf], u_inf)
+
+    def test_refinement(self):
+        tolerance = 1e-2
+        eigenvalues = self.stability.sweep_eigenvalues(np.array([1., 3., 6., 9.]))
+        self.stability.refine_velocity_grid(eigenvalues, tolerance)
+
+        u_inf_vec = np.array(sorted(eigenvalues.keys()))
+        unstable = np.array([np.any(eigenvalues[u_inf].real > 0) for u_inf in u_inf_vec])
+        # the crossing is bracketed within the tolerance, and the grid is only refined around it
+        u_stable = u_inf_vec[~unstable].max()
+        u_unstable = u_inf_vec[unstable].min()
+        self.assertLess(u_stable, ParametricSystem.u_flutter)
+        self.assertGreaterEqual(u_unstable, ParametricSystem.u_flutter)
+        self.assertLessEqual(u_unstable - u_stable, tolerance)
+        np.testing.assert_array_equal(u_inf_vec[[0, 1, -2, -1]], [1., 3., 6., 9.])
+        self.assertTrue(np.all(u_inf_vec[2:-2] > 3.) and np.all(u_inf_vec[2:-2] < 6.))
+        for u_inf in u_inf_vec:
+            self.assert_eigenvalues(eigenvalues[u_inf], u_inf)
+
+    def test_track_modes(self):
+        # the damping of the two oscillators cross, so that the order by real part swaps along the sweep
+        u_inf_vec = np.linspace(1., 9., 41)
+        modes = np.array([ParametricSystem.eigenvalues(u_inf) for u_inf in u_inf_vec])
+        np.random.seed(5)
+        eigenvalue_list = [eigs[np.random.permutation(len(eigs))] for eigs in modes]
+
+        tracked = self.stability.track_modes(eigenvalue_list, 4)
+        self.assertEqual(tracked.shape, (len(u_inf_vec), 4))
+        order = [np.argmin(np.abs(modes[0] - eig)) for eig in tracked[0]]
+        np.testing.assert_array_equal(tracked, modes[:, order])
+
+        # only the least stable modes of the first velocity are tracked
+        tracked = self.stability.track_modes(eigenvalue_list, 2)
+        np.testing.assert_array_equal(np.sort_complex(tracked[0]), np.sort_complex(modes[0, [1, 3]]))
+        np.testing.assert_array_equal(tracked, modes[:, [np.argmin(np.abs(modes[0] - eig)) for eig in tracked[0]]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+import scipy.sparse as sparse
+import sharpy.linear.src.libsparse as libsp
+import sharpy.linear.src.lowrank as lowrank
+
+
+class TestBlockMerge(unittest.TestCase):
+    """
+    Tests the merge of block matrices of dense, sparse and block low-rank blocks into single matrices
+    """
+
+    rows = [2, 3, 4]
+    cols = [3, 1, 2]
+
+    def setUp(self):
+        np.random.seed(5)
+
+    def reference(self, A):
+        return np.block([[np.zeros((self.rows[ii], self.cols[jj])) if A[ii][jj] is None else libsp.dense(A[ii][jj])
+                          for jj in range(len(self.cols))] for ii in range(len(self.rows))])
+
+    def random_blocks(self, pattern):
+        """
+        Blocks of the types given by ``pattern``: ``d`` for dense, ``s`` for sparse, ``l`` for block low-rank and
+        ``None`` for an empty block.
+        """
+        A = []
+        for ii, prow in enumerate(pattern):
+            arow = []
+            for jj, block_type in enumerate(prow):
+                shape = (self.rows[ii], self.cols[jj])
+                if block_type == 'd':
+                    arow.append(np.random.rand(*shape))
+                elif block_type == 's':
+                    arow.append(libsp.csc_matrix(sparse.random(*shape, density=0.5)))
+                elif block_type == 'l':
+                    block = lowrank.BlockLowRankMatrix(shape)
+                    block.add_block(0, 0, np.random.rand(shape[0], 1))
+                    block.add_block(1, 0, np.outer(np.random.rand(shape[0] - 1), np.random.rand(shape[1])), tol=1e-12)
+                    arow.append(block)
+                else:
+                    arow.append(None)
+            A.append(arow)
+        return A
+
+    def test_dense(self):
+        # the second row and column of blocks are empty
+        A = self.random_blocks([['d', None, 'd'], [None, None, None], ['l', None, 'd']])
+        M = libsp.block_merge(A, self.rows, self.cols)
+        self.assertIsInstance(M, np.ndarray)
+        np.testing.assert_array_equal(M, self.reference(A))
+
+    def test_sparse(self):
+        A = self.random_blocks([['d', None, 's'], [None, None, None], ['l', None, None]])
+        M = libsp.block_merge(A, self.rows, self.cols)
+        self.assertIsInstance(M, libsp.csc_matrix)
+        np.testing.assert_allclose(M.toarray(), self.reference(A), rtol=1e-14, atol=1e-14)
+
+    def test_block_product(self):
+        # the product of the merged matrix gives that of the block one
+        A = self.random_blocks([['d', 's', None], [None, 'd', 'l'], ['s', None, 'd']])
+        X = np.random.rand(sum(self.cols))
+        X_blocks = np.split(X, np.cumsum(self.cols)[:-1])
+        Y_blocks = libsp.block_dot(A, [[x_block] for x_block in X_blocks])
+        np.testing.assert_allclose(libsp.block_merge(A, self.rows, self.cols).dot(X),
+                                   np.concatenate([y_block[0] for y_block in Y_blocks]), rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+
+
+class TestFrequencyResponse(unittest.TestCase):
+    """
+    Tests the frequency response methods of ``libss.freqresp`` against each other and against the direct evaluation
+    of :math:`\\mathbf{C}(z\\mathbf{I} - \\mathbf{A})^{-1}\\mathbf{B} + \\mathbf{D}`
+    """
+
+    def setUp(self):
+        np.random.seed(10)
+        self.SS = libss.random_ss(30, 3, 4, dt=0.1, stable=True)
+        self.SSsp = libss.ss(libsp.csc_matrix(self.SS.A), libsp.csc_matrix(self.SS.B), self.SS.C, self.SS.D,
+                             dt=self.SS.dt)
+        self.kv = np.linspace(0, 10, 12)
+
+    def reference(self, kv):
+        Yref = np.empty((self.SS.outputs, self.SS.inputs, len(kv)), dtype=complex)
+        for ii, kk in enumerate(kv):
+            zval = np.exp(1j * kk * self.SS.dt)
+            Yref[:, :, ii] = self.SS.C.dot(np.linalg.solve(zval * np.eye(self.SS.states) - self.SS.A, self.SS.B)) + \
+                self.SS.D
+        return Yref
+
+    def test_methods(self):
+        Yref = self.reference(self.kv)
+        for method in ['direct', 'schur', 'shifted_lu']:
+            for SS in [self.SS, self.SSsp]:
+                Y = SS.freqresp(self.kv, method=method)
+                np.testing.assert_allclose(Y, Yref, rtol=1e-10, atol=1e-10,
+                                           err_msg='freqresp with method %s failed' % method)
+
+    def test_channels_and_processes(self):
+        Yref = self.reference(self.kv)
+        Y = self.SS.freqresp(self.kv, method='schur', num_processes=2, inputs=[1], outputs=[0, 2])
+        np.testing.assert_allclose(Y, Yref[[0, 2], 1:2, :], rtol=1e-10, atol=1e-10)
+
+    def test_default_method(self):
+        # the Schur decomposition is only used by default when there are enough frequencies to pay for it
+        for kv in [self.kv[:1], np.linspace(0, 10, 60)]:
+            Yref = self.reference(kv)
+            np.testing.assert_allclose(self.SS.freqresp(kv), Yref, rtol=1e-10, atol=1e-10)
+            np.testing.assert_allclose(self.SSsp.freqresp(kv), Yref, rtol=1e-10, atol=1e-10)
+
+
+class TestDiscreteTimeSimulator(unittest.TestCase):
+    """
+    Tests the ``direct``, ``diagonal`` and ``schur`` methods of the discrete time simulator against a time marching
+    loop
+    """
+
+    def setUp(self):
+        np.random.seed(11)
+        self.SS = libss.random_ss(20, 3, 4, dt=0.1, stable=True)
+        self.NT, self.Nr = 30, 5
+        self.U = np.random.rand(self.NT, self.SS.inputs, self.Nr)
+        self.x0 = np.random.rand(self.SS.states, self.Nr)
+
+    def reference(self, ir):
+        X = np.zeros((self.NT, self.SS.states))
+        X[0] = self.x0[:, ir]
+        for ii in range(1, self.NT):
+            X[ii] = self.SS.A.dot(X[ii - 1]) + self.SS.B.dot(self.U[ii - 1, :, ir])
+        Y = X.dot(self.SS.C.T) + self.U[:, :, ir].dot(self.SS.D.T)
+        return Y, X
+
+    def test_methods(self):
+        for ir in range(self.Nr):
+            Yref, Xref = self.reference(ir)
+            for method in ['direct', 'diagonal', 'schur']:
+                Y, X = libss.simulate(self.SS, self.U[:, :, ir], x0=self.x0[:, ir], method=method)
+                np.testing.assert_allclose(Y, Yref, atol=1e-8, err_msg='simulate with method %s failed' % method)
+                np.testing.assert_allclose(X, Xref, atol=1e-8, err_msg='simulate with method %s failed' % method)
+
+    def test_batched_chunks(self):
+        for method in ['direct', 'diagonal', 'schur']:
+            sim = libss.DiscreteTimeSimulator(self.SS, method=method)
+            Y0, _ = sim.simulate(self.U[:self.NT // 2], x0=self.x0)
+            Y1, X1 = sim.simulate(self.U[self.NT // 2:], x0=sim.x_final, return_states=False)
+            self.assertIsNone(X1)
+            Y = np.concatenate((Y0, Y1))
+            for ir in range(self.Nr):
+                np.testing.assert_allclose(Y[:, :, ir], self.reference(ir)[0], atol=1e-8,
+                                           err_msg='batched simulate with method %s failed' % method)
+
+    def test_single_precision(self):
+        Y32, _ = libss.simulate(self.SS, self.U, x0=self.x0, method='schur', dtype=np.float32)
+        self.assertEqual(Y32.dtype, np.float32)
+        np.testing.assert_allclose(Y32, libss.simulate(self.SS, self.U, x0=self.x0)[0], atol=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
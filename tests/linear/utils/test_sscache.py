@@ -0,0 +1,101 @@
+import unittest
+import os
+import shutil
+import types
+import numpy as np
+import sharpy.linear.src.libss as libss
+import sharpy.linear.src.libsparse as libsp
+import sharpy.linear.utils.sscache as sscache
+
+
+class TestLinearSystemCache(unittest.TestCase):
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    cache_folder = route_test_dir + '/output/linear_cache/'
+
+    def setUp(self):
+        self.tsstruct0 = types.SimpleNamespace(pos=np.random.rand(5, 3), psi=np.random.rand(2, 3, 3),
+                                               quat=np.array([1., 0, 0, 0]))
+        self.tsaero0 = types.SimpleNamespace(zeta=[np.random.rand(3, 4, 5)], gamma=[np.random.rand(3, 4)])
+        self.settings = {'linear_system': 'LinearAeroelastic', 'linear_system_settings': {'dt': 0.1}}
+
+    def test_key(self):
+        key = sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings, version='test')
+        self.assertEqual(key, sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings, version='test'))
+
+        self.tsaero0.gamma[0][0, 0] += 1e-12
+        self.assertNotEqual(key, sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings,
+                                                           version='test'))
+
+        self.settings['linear_system_settings']['dt'] = 0.2
+        self.assertNotEqual(key, sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings,
+                                                           version='test'))
+
+    def test_key_modes(self):
+        self.tsstruct0.modal = {'eigenvalues': np.array([1j, -1j, 2j, -2j]),
+                                'eigenvectors': np.random.rand(12, 4),
+                                'M': libsp.csc_matrix(np.eye(12)),
+                                'K': np.diag(np.random.rand(12))}
+        key = sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings, version='test')
+
+        for name in ['eigenvectors', 'M', 'K']:
+            with self.subTest(name=name):
+                modal = self.tsstruct0.modal.copy()
+                self.tsstruct0.modal[name] = 2 * self.tsstruct0.modal[name]
+                self.assertNotEqual(key, sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings,
+                                                                   version='test'))
+                self.tsstruct0.modal = modal
+
+        # the imaginary part of the eigenvalues is part of the key
+        self.tsstruct0.modal['eigenvalues'] = np.array([2j, -2j, 1j, -1j])
+        self.assertNotEqual(key, sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings,
+                                                           version='test'))
+
+    def test_code_version(self):
+        source_dir = self.route_test_dir + '/output/src/'
+        os.makedirs(source_dir + 'sharpy/')
+        with open(source_dir + 'sharpy/module.py', 'w') as source:
+            source.write('a = 1\n')
+
+        sharpy_dir = sscache.sharpydir.SharpyDir
+        try:
+            sscache.sharpydir.SharpyDir = source_dir
+            version = sscache.code_version()
+            self.assertEqual(version, sscache.code_version())
+
+            # uncommitted changes to the sources give a new version
+            with open(source_dir + 'sharpy/module.py', 'a') as source:
+                source.write('b = 2\n')
+            self.assertNotEqual(version, sscache.code_version())
+        finally:
+            sscache.sharpydir.SharpyDir = sharpy_dir
+
+    def test_save_load(self):
+        key = sscache.linearisation_key(self.tsstruct0, self.tsaero0, self.settings, version='test')
+        cache = sscache.LinearSystemCache(self.cache_folder, key)
+        self.assertFalse('uvlm' in cache)
+
+        A = np.random.rand(6, 6)
+        ss = libss.ss(libsp.csc_matrix(A * (A > 0.5)), np.random.rand(6, 2), np.random.rand(3, 6),
+                      np.zeros((3, 2)), dt=0.1)
+        cache.save_ss('uvlm', ss)
+        cache.save_matrix('Kas', np.eye(4))
+        cache.save_matrix('Ksa', libsp.csc_matrix(np.eye(3)))
+
+        self.assertTrue('uvlm' in cache)
+        self.assertTrue(cache.has_matrix('Kas'))
+        ss_cached = sscache.LinearSystemCache(self.cache_folder, key).load_ss('uvlm')
+        self.assertIsInstance(ss_cached.A, libsp.csc_matrix)
+        self.assertEqual(ss_cached.dt, 0.1)
+        for matrix_name in ['A', 'B', 'C', 'D']:
+            np.testing.assert_array_equal(libsp.dense(getattr(ss_cached, matrix_name)),
+                                          libsp.dense(getattr(ss, matrix_name)))
+        np.testing.assert_array_equal(cache.load_matrix('Kas'), np.eye(4))
+        np.testing.assert_array_equal(cache.load_matrix('Ksa').toarray(), np.eye(3))
+
+    def tearDown(self):
+        shutil.rmtree(self.route_test_dir + '/output/', ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Time stepping of the block linear UVLM
+
+Compares the step of ``DynamicBlock`` with the block matrices merged into single operators against the block one, and
+the packing of the inputs and outputs of ``StepLinearUVLM`` against a vertex by vertex loop.
+"""
+
+import unittest
+import types
+import numpy as np
+import sharpy.utils.sharpydir as sharpydir
+import sharpy.utils.h5utils as h5utils
+import sharpy.utils.settings as settings
+import sharpy.utils.algebra as algebra
+import sharpy.linear.src.libsparse as libsp
+import sharpy.linear.src.linuvlm as linuvlm
+from sharpy.solvers.steplinearuvlm import StepLinearUVLM
+
+
+class TestMergedStep(unittest.TestCase):
+
+    test_dir = sharpydir.SharpyDir + '/tests/linear/assembly/h5input/'
+
+    def setUp(self):
+        haero = h5utils.readh5(self.test_dir + 'goland_mod_Nsurf01_M003_N004_a040.aero_state.h5')
+        self.tsdata = haero.ts00000
+
+    def assemble(self, use_sparse, remove_predictor):
+        dynamic_settings = {'dt': 0.05,
+                            'integr_order': 2,
+                            'remove_predictor': remove_predictor,
+                            'use_sparse': use_sparse}
+        settings.to_custom_types(dynamic_settings, linuvlm.settings_types_dynamic, linuvlm.settings_default_dynamic,
+                                 no_ctype=True)
+        uvlm = linuvlm.DynamicBlock(self.tsdata, dynamic_settings=dynamic_settings)
+        uvlm.assemble_ss()
+        return uvlm
+
+    def test_merged_step(self):
+        for use_sparse in [False, True]:
+            for remove_predictor in [False, True]:
+                uvlm = self.assemble(use_sparse, remove_predictor)
+
+                # the merged operators are the block ones
+                uvlm.assemble_step_operators()
+                # the sparse state matrix stays sparse
+                self.assertIsInstance(uvlm.step_operators['A'], libsp.csc_matrix if use_sparse else np.ndarray)
+                for name, blocks, rows, cols in [('A', uvlm.SS.A, uvlm.SS.S_x, uvlm.SS.S_x),
+                                                 ('B', uvlm.SS.B, uvlm.SS.S_x, uvlm.SS.S_u),
+                                                 ('C', uvlm.SS.C, uvlm.SS.S_y, uvlm.SS.S_x),
+                                                 ('D', uvlm.SS.D, uvlm.SS.S_y, uvlm.SS.S_u)]:
+                    np.testing.assert_array_equal(libsp.dense(uvlm.step_operators[name]),
+                                                  libsp.dense(libsp.block_merge(blocks, rows, cols)))
+                self.assertEqual('CBplusD' in uvlm.step_operators, remove_predictor)
+                step_operators = uvlm.step_operators
+
+                np.random.seed(2)
+                for transform_state in [False, True]:
+                    x_block = np.zeros(uvlm.SS.states)
+                    x_merged = np.zeros(uvlm.SS.states)
+                    for n in range(10):
+                        u_n = 1e-2 * np.random.rand(uvlm.SS.inputs)
+                        u_n1 = 1e-2 * np.random.rand(uvlm.SS.inputs)
+
+                        uvlm.step_operators = None
+                        x_block, y_block = uvlm.solve_step(x_block, u_n, u_n1, transform_state=transform_state)
+                        uvlm.step_operators = step_operators
+                        x_merged, y_merged = uvlm.solve_step(x_merged, u_n, u_n1, transform_state=transform_state)
+
+                        np.testing.assert_allclose(x_merged, x_block, rtol=1e-10, atol=1e-12 * np.max(np.abs(x_block)))
+                        np.testing.assert_allclose(y_merged, y_block, rtol=1e-10, atol=1e-12 * np.max(np.abs(y_block)))
+
+
+class TestStepLinearUVLMPacking(unittest.TestCase):
+    """
+    Tests the packing of the input vector and the unpacking of the output and state vectors of ``StepLinearUVLM``
+    against the loops over the surfaces and grid vertices
+    """
+
+    def setUp(self):
+        np.random.seed(6)
+        dimensions = np.array([[3, 4], [2, 5]])
+        dimensions_star = np.array([[6, 4], [6, 5]])
+        self.K = np.sum(np.prod(dimensions, axis=1))
+        self.K_star = np.sum(np.prod(dimensions_star, axis=1))
+        self.K_zeta = np.sum(np.prod(dimensions + 1, axis=1))
+
+        aero_tstep = types.SimpleNamespace(
+            n_surf=2,
+            dimensions=dimensions,
+            zeta=[np.random.rand(3, m + 1, n + 1) for m, n in dimensions],
+            zeta_dot=[np.random.rand(3, m + 1, n + 1) for m, n in dimensions],
+            u_ext=[np.random.rand(3, m + 1, n + 1) for m, n in dimensions],
+            gamma=[np.random.rand(m, n) for m, n in dimensions],
+            gamma_star=[np.random.rand(m, n) for m, n in dimensions_star])
+        system = types.SimpleNamespace(
+            unpack_state=lambda x: (x[:self.K], x[self.K:self.K + self.K_star], x[self.K + self.K_star:]))
+        self.data = types.SimpleNamespace(aero=types.SimpleNamespace(timestep_info=[aero_tstep],
+                                                                     aero_dimensions=dimensions,
+                                                                     aero_dimensions_star=dimensions_star,
+                                                                     linear={'System': system}))
+
+    def get_solver(self, track_body):
+        solver = StepLinearUVLM()
+        solver.data = self.data
+        solver.settings = {'track_body': track_body}
+        solver.Cga0 = algebra.quat2rotation(algebra.unit_vector(np.array([0.9, 0.1, 0.3, 0.2])))
+        solver.Cga = algebra.quat2rotation(algebra.unit_vector(np.array([0.8, 0.3, 0.1, 0.2])))
+        solver.get_packing_maps(self.data.aero.timestep_info[-1])
+        return solver
+
+    @staticmethod
+    def reference_input(solver, aero_tstep):
+        u = []
+        for variable in [aero_tstep.zeta, aero_tstep.zeta_dot, aero_tstep.u_ext]:
+            for i_surf in range(aero_tstep.n_surf):
+                variable_uvlm = variable[i_surf].copy()
+                if solver.settings['track_body']:
+                    for mm in range(variable_uvlm.shape[1]):
+                        for nn in range(variable_uvlm.shape[2]):
+                            variable_uvlm[:, mm, nn] = np.dot(np.dot(solver.Cga0, solver.Cga.T),
+                                                              variable[i_surf][:, mm, nn])
+                u.append(variable_uvlm.reshape(-1, order='C'))
+        return np.concatenate(u)
+
+    @staticmethod
+    def reference_forces(solver, aero_tstep, y_n):
+        forces = []
+        worked_points = 0
+        for i_surf in range(aero_tstep.n_surf):
+            dimensions = aero_tstep.zeta[i_surf].shape
+            forces.append(np.zeros((6,) + dimensions[1:]))
+            forces[i_surf][:3] = y_n[worked_points:worked_points + aero_tstep.zeta[i_surf].size].reshape(dimensions)
+            if solver.settings['track_body']:
+                for mm in range(dimensions[1]):
+                    for nn in range(dimensions[2]):
+                        forces[i_surf][:3, mm, nn] = np.dot(np.dot(solver.Cga, solver.Cga0.T),
+                                                            forces[i_surf][:3, mm, nn])
+            worked_points += aero_tstep.zeta[i_surf].size
+        return forces
+
+    def test_packing(self):
+        aero_tstep = self.data.aero.timestep_info[-1]
+        for track_body in [False, True]:
+            solver = self.get_solver(track_body)
+
+            u_n = solver.pack_input_vector()
+            np.testing.assert_allclose(u_n, self.reference_input(solver, aero_tstep), rtol=1e-14)
+
+            y_n = np.random.rand(3 * self.K_zeta)
+            x_n = np.random.rand(2 * self.K + self.K_star)
+            forces, gamma, gamma_dot, gamma_star = solver.unpack_ss_vectors(y_n, x_n, u_n, aero_tstep)
+            for i_surf, forces_ref in enumerate(self.reference_forces(solver, aero_tstep, y_n)):
+                np.testing.assert_allclose(forces[i_surf], forces_ref, rtol=1e-14)
+            gamma_vec, gamma_star_vec, gamma_dot_vec = self.data.aero.linear['System'].unpack_state(x_n)
+            np.testing.assert_array_equal(np.concatenate([g.reshape(-1) for g in gamma]), gamma_vec)
+            np.testing.assert_array_equal(np.concatenate([g.reshape(-1) for g in gamma_dot]), gamma_dot_vec)
+            np.testing.assert_array_equal(np.concatenate([g.reshape(-1) for g in gamma_star]), gamma_star_vec)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Compression of the far wake in the block form of the linear UVLM
+
+Compares the responses of the block UVLM (``DynamicBlock``) with the far wake in block low-rank form against those of
+the dense one.
+"""
+
+import unittest
+import numpy as np
+import sharpy.utils.sharpydir as sharpydir
+import sharpy.utils.h5utils as h5utils
+import sharpy.utils.settings as settings
+import sharpy.linear.src.linuvlm as linuvlm
+import sharpy.linear.src.lowrank as lowrank
+
+
+class TestWakeCompression(unittest.TestCase):
+
+    test_dir = sharpydir.SharpyDir + '/tests/linear/assembly/h5input/'
+    wake_compression_tol = 1e-6
+
+    def setUp(self):
+        haero = h5utils.readh5(self.test_dir + 'goland_mod_Nsurf01_M003_N004_a040.aero_state.h5')
+        tsdata = haero.ts00000
+
+        # extend the wake downstream, at the spacing of its last row, so that there is a far field to compress
+        M_star = 32
+        for name in ['zeta', 'zeta_star', 'zeta_dot', 'gamma', 'gamma_star', 'gamma_dot', 'u_ext', 'u_ext_star',
+                     'normals', 'forces', 'dynamic_forces']:
+            setattr(tsdata, name, [np.array(value) for value in getattr(tsdata, name)])
+        for i_surf in range(tsdata.n_surf):
+            zeta_star = tsdata.zeta_star[i_surf]
+            n_rows = M_star - tsdata.gamma_star[i_surf].shape[0]
+            spacing = zeta_star[:, -1, :] - zeta_star[:, -2, :]
+            extension = zeta_star[:, -1:, :] + \
+                np.arange(1, n_rows + 1)[None, :, None] * spacing[:, None, :]
+            tsdata.zeta_star[i_surf] = np.concatenate((zeta_star, extension), axis=1)
+            tsdata.gamma_star[i_surf] = np.concatenate(
+                (tsdata.gamma_star[i_surf], np.repeat(tsdata.gamma_star[i_surf][-1:, :], n_rows, axis=0)))
+            tsdata.u_ext_star[i_surf] = np.concatenate(
+                (tsdata.u_ext_star[i_surf], np.repeat(tsdata.u_ext_star[i_surf][:, -1:, :], n_rows, axis=1)), axis=1)
+            tsdata.dimensions_star[i_surf, 0] = M_star
+        self.tsdata = tsdata
+
+    def assemble(self, compress_wake):
+        dynamic_settings = {'dt': 0.05,
+                            'integr_order': 2,
+                            'remove_predictor': False,
+                            'use_sparse': True,
+                            'compress_wake': compress_wake,
+                            'wake_compression_tol': self.wake_compression_tol,
+                            'wake_near_field_rows': 2}
+        settings.to_custom_types(dynamic_settings, linuvlm.settings_types_dynamic, linuvlm.settings_default_dynamic,
+                                 no_ctype=True)
+        uvlm = linuvlm.DynamicBlock(self.tsdata, dynamic_settings=dynamic_settings)
+        uvlm.assemble_ss()
+        return uvlm
+
+    def test_compressed_response(self):
+        uvlm_dense = self.assemble(compress_wake=False)
+        uvlm_compressed = self.assemble(compress_wake=True)
+
+        # the far wake is stored in low-rank form
+        A_wake = uvlm_compressed.SS.A[0][1]
+        self.assertIsInstance(A_wake, lowrank.BlockLowRankMatrix)
+        self.assertLess(A_wake.compression, 1.)
+
+        # frequency response
+        kv = np.linspace(0, 1, 4)
+        Y_dense = uvlm_dense.freqresp(kv)
+        Y_compressed = uvlm_compressed.freqresp(kv)
+        self.assertLess(np.max(np.abs(Y_compressed - Y_dense)), self.wake_compression_tol * np.max(np.abs(Y_dense)))
+
+        # time domain response
+        np.random.seed(2)
+        x_dense = np.zeros(uvlm_dense.SS.states)
+        x_compressed = np.zeros(uvlm_compressed.SS.states)
+        for n in range(20):
+            u_n = 1e-2 * np.random.rand(uvlm_dense.SS.inputs)
+            x_dense, y_dense = uvlm_dense.solve_step(x_dense, u_n)
+            x_compressed, y_compressed = uvlm_compressed.solve_step(x_compressed, u_n)
+            self.assertLess(np.max(np.abs(y_compressed - y_dense)),
+                            self.wake_compression_tol * np.max(np.abs(y_dense)))
+
+
+if __name__ == '__main__':
+    unittest.main()
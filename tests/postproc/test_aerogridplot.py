@@ -0,0 +1,87 @@
+import unittest
+import types
+import numpy as np
+import sharpy.utils.settings as settings
+from sharpy.postproc.aerogridplot import AerogridPlot
+
+
+class TestAerogridPlotArrays(unittest.TestCase):
+    """
+    Tests the coordinates, connectivities and point and panel arrays of the lattice of ``AerogridPlot`` against a loop
+    over the grid vertices, with the chordwise index running fastest
+    """
+
+    def setUp(self):
+        np.random.seed(7)
+        self.m, self.n = 3, 4
+        self.ts = 2
+        self.plotter = AerogridPlot()
+        self.plotter.settings = {'include_rbm': True,
+                                 'include_forward_motion': True,
+                                 'dt': 0.1,
+                                 'u_inf': 2.}
+        settings.to_custom_types(self.plotter.settings, self.plotter.settings_types, self.plotter.settings_default,
+                                 options=self.plotter.settings_options)
+        self.plotter.ts = self.ts
+        structure_tstep = types.SimpleNamespace(for_pos=np.random.rand(6))
+        self.plotter.data = types.SimpleNamespace(
+            structure=types.SimpleNamespace(timestep_info=[structure_tstep] * (self.ts + 1)))
+
+    def reference(self, zeta, m, n, vertex_arrays, panel_arrays):
+        coords = np.zeros(((m + 1)*(n + 1), 3))
+        points = [np.zeros(((m + 1)*(n + 1),) + array.shape[:-2]) for array in vertex_arrays]
+        panels = [np.zeros((m*n,) + array.shape[:-2]) for array in panel_arrays]
+        conn = []
+        node_counter = -1
+        counter = -1
+        for i_n in range(n + 1):
+            for i_m in range(m + 1):
+                node_counter += 1
+                coords[node_counter, :] = zeta[:, i_m, i_n] + \
+                    self.plotter.data.structure.timestep_info[self.ts].for_pos[0:3]
+                coords[node_counter, 0] -= self.plotter.settings['dt'].value*self.ts*self.plotter.settings['u_inf'].value
+                for point, array in zip(points, vertex_arrays):
+                    point[node_counter] = array[..., i_m, i_n]
+                if i_n < n and i_m < m:
+                    counter += 1
+                else:
+                    continue
+                conn.append([node_counter + 0,
+                             node_counter + 1,
+                             node_counter + m + 2,
+                             node_counter + m + 1])
+                for panel, array in zip(panels, panel_arrays):
+                    panel[counter] = array[..., i_m, i_n]
+        return coords, np.array(conn), points, panels
+
+    def test_body(self):
+        m, n = self.m, self.n
+        zeta = np.random.rand(3, m + 1, n + 1)
+        forces = np.random.rand(6, m + 1, n + 1)
+        gamma = np.random.rand(m, n)
+        normals = np.random.rand(3, m, n)
+
+        coords_ref, conn_ref, (cf_ref,), (gamma_ref, normal_ref) = \
+            self.reference(zeta, m, n, [forces[0:3]], [gamma, normals])
+
+        np.testing.assert_allclose(self.plotter.get_coordinates(zeta, m, n), coords_ref, rtol=1e-14)
+        np.testing.assert_array_equal(self.plotter.get_connectivities((m, n)), conn_ref)
+        np.testing.assert_array_equal(self.plotter.vector_array(forces, m + 1, n + 1), cf_ref)
+        np.testing.assert_array_equal(self.plotter.scalar_array(gamma, m, n), gamma_ref)
+        np.testing.assert_array_equal(self.plotter.vector_array(normals, m, n), normal_ref)
+
+    def test_wake(self):
+        # the last rows of the wake are not plotted (minus_m_star)
+        m_star, n_star = self.m + 2, self.n
+        zeta_star = np.random.rand(3, m_star + 3, n_star + 1)
+        gamma_star = np.random.rand(m_star + 2, n_star)
+
+        coords_ref, conn_ref, _, (gamma_ref,) = self.reference(zeta_star, m_star, n_star, [], [gamma_star])
+
+        np.testing.assert_allclose(self.plotter.get_coordinates(zeta_star, m_star, n_star), coords_ref, rtol=1e-14)
+        np.testing.assert_array_equal(self.plotter.get_connectivities((m_star, n_star)), conn_ref)
+        np.testing.assert_array_equal(self.plotter.scalar_array(gamma_star, m_star, n_star), gamma_ref)
+
+
+if __name__ == '__main__':
+    unittest.main()
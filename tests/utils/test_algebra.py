@@ -142,6 +142,18 @@ class TestAlgebra(unittest.TestCase):
         assert np.linalg.norm(Cgb - Cgb_exp) < 1e-15, \
             'combined rotation not as expected!'
 
+    def test_crv2rotation_vec(self):
+        """
+        Checks the vectorised conversion of CRVs to rotation matrices against the scalar one, including a
+        null rotation.
+        """
+        crv_vec = np.pi*(2.*np.random.rand(100, 3) - 1.)
+        crv_vec[0, :] = 0.
+        rot_vec = algebra.crv2rotation_vec(crv_vec)
+        for i_crv in range(crv_vec.shape[0]):
+            assert np.linalg.norm(rot_vec[i_crv] - algebra.crv2rotation(crv_vec[i_crv])) < 1e-12, \
+                'Error in crv2rotation_vec'
+
     def test_rotation_matrices_derivatives(self):
         """
         Checks derivatives of rotation matrix derivatives with respect to
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+
+import sharpy.utils.coupling_accelerators as coupling_accelerators
+import sharpy.utils.cout_utils as cout
+
+
+class TestCouplingAccelerators(unittest.TestCase):
+    """
+    Tests the accelerators on the linear fixed point problem x = A x + b, which does not converge without relaxation
+    """
+
+    n_dof = 30
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+        np.random.seed(0)
+        eigenvectors = np.linalg.qr(np.random.rand(self.n_dof, self.n_dof))[0]
+        self.a = eigenvectors.dot(np.diag(np.linspace(-1.6, 0.3, self.n_dof))).dot(eigenvectors.T)
+
+    def fixed_point(self, accelerator, b, x, max_iter=500, tolerance=1e-9):
+        accelerator.new_step()
+        for i_iter in range(max_iter):
+            x_tilde = self.a.dot(x) + b
+            if np.linalg.norm(x_tilde - x) < tolerance:
+                return i_iter, x
+            x = accelerator.update(x, x_tilde)
+        return max_iter, x
+
+    def run_steps(self, accelerator_id):
+        accelerator = coupling_accelerators.initialise_accelerator(accelerator_id)
+        x = np.zeros((self.n_dof,))
+        n_iter = []
+        for i_step in range(3):
+            b = np.random.rand(self.n_dof)
+            i_iter, x = self.fixed_point(accelerator, b, x)
+            np.testing.assert_allclose(x, np.linalg.solve(np.eye(self.n_dof) - self.a, b), atol=1e-7)
+            n_iter.append(i_iter)
+        return n_iter
+
+    def test_aitken(self):
+        n_iter = self.run_steps('Aitken')
+        self.assertLess(max(n_iter), 100)
+
+    def test_iqnils(self):
+        n_iter = self.run_steps('IQNILS')
+        self.assertLess(max(n_iter), 50)
+        # secant information reused from previous steps
+        self.assertLess(n_iter[-1], n_iter[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
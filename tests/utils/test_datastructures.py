@@ -0,0 +1,275 @@
+import ctypes as ct
+import os
+import shutil
+import unittest
+
+import h5py
+import numpy as np
+
+import sharpy.utils.cout_utils as cout
+from sharpy.utils.datastructures import TimeStepHistory, AeroTimeStepInfo, StructTimeStepInfo, copy_to_history
+
+
+class TestTimeStepHistory(unittest.TestCase):
+    """
+    Tests the bounded time step history container
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/history/'
+    spill_folder = output_folder + 'spill/'
+
+    n_steps = 12
+    depth = 4
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+
+    @staticmethod
+    def aero_step(ts):
+        tstep = AeroTimeStepInfo(np.array([[3, 4], [2, 5]]), np.array([[6, 4], [6, 5]]))
+        for i_surf in range(tstep.n_surf):
+            tstep.gamma[i_surf][:] = ts
+            tstep.zeta[i_surf][:] = ts + np.random.rand(*tstep.zeta[i_surf].shape)
+        return tstep
+
+    @staticmethod
+    def struct_step(ts):
+        tstep = StructTimeStepInfo(5, 2, 3, ct.c_int(24), 1)
+        tstep.pos[:] = ts
+        return tstep
+
+    def fill_history(self, spill_folder, step=None):
+        if step is None:
+            step = self.aero_step
+        history = TimeStepHistory.from_list([step(0), step(1)], self.depth, spill_folder, name='test')
+        for ts in range(2, self.n_steps):
+            history.append(step(ts))
+        return history
+
+    def assert_steps(self, history, steps):
+        self.assertEqual(len(history), len(steps))
+        for tstep, ts in zip(history, steps):
+            if ts is None:
+                self.assertIsNone(tstep)
+            else:
+                self.assertEqual(tstep.gamma[1][0, 0], ts)
+
+    def test_dropped_history(self):
+        history = self.fill_history(None)
+
+        self.assertEqual(len(history), self.n_steps)
+        self.assertIsInstance(history[-1], AeroTimeStepInfo)
+        self.assertEqual(history[-1].gamma[0][0, 0], self.n_steps - 1)
+        self.assertEqual([tstep.gamma[0][0, 0] for tstep in history[-3:]], [9, 10, 11])
+        self.assertEqual([tstep.gamma[0][0, 0] for tstep in history.in_memory()], [8, 9, 10, 11])
+        self.assertIsNone(history[0])
+        with self.assertRaises(IndexError):
+            history[self.n_steps]
+        with self.assertRaises(IndexError):
+            history[2] = self.aero_step(2)
+
+        # the following steps are shifted back, as in a list
+        del history[-2]
+        self.assert_steps(history, [None]*8 + [8, 9, 11])
+        del history[3:5]
+        self.assert_steps(history, [None]*6 + [8, 9, 11])
+
+        # delete all steps but the first, as done by DynamicCoupled.cleanup_timestep_info
+        last = history[-1]
+        del history[1:]
+        history[0] = last
+        self.assertEqual(len(history), 1)
+        self.assertIs(history[0], last)
+
+    def test_spilled_history(self):
+        history = self.fill_history(self.spill_folder)
+
+        self.assert_steps(history, list(range(self.n_steps)))
+        self.assertEqual(len(os.listdir(self.spill_folder)), self.n_steps - self.depth)
+
+        history[2] = self.aero_step(-2)
+        self.assertEqual(history[2].gamma[0][0, 0], -2)
+
+        del history[1]
+        self.assert_steps(history, [0, -2] + list(range(3, self.n_steps)))
+        del history[-3:-1]
+        self.assert_steps(history, [0, -2] + list(range(3, self.n_steps - 3)) + [self.n_steps - 1])
+        self.assertEqual(len(os.listdir(self.spill_folder)), len(history) - self.depth)
+
+    def test_struct_history(self):
+        history = self.fill_history(self.spill_folder, step=self.struct_step)
+        for ts, tstep in enumerate(history):
+            self.assertIsInstance(tstep, StructTimeStepInfo)
+            np.testing.assert_array_equal(tstep.pos, ts*np.ones((5, 3)))
+            self.assertTrue(tstep.pos.flags['F_CONTIGUOUS'])
+
+    def test_recycle(self):
+        history = self.fill_history(None)
+        oldest = history[-self.depth]
+        oldest_gamma = oldest.gamma[0]
+
+        tstep = self.aero_step(self.n_steps)
+        history.append(copy_to_history(tstep, history))
+
+        # the evicted step and its arrays are reused by the new one
+        self.assertIs(history[-1], oldest)
+        self.assertIs(history[-1].gamma[0], oldest_gamma)
+        for i_surf in range(tstep.n_surf):
+            np.testing.assert_array_equal(history[-1].zeta[i_surf], tstep.zeta[i_surf])
+            np.testing.assert_array_equal(history[-1].gamma[i_surf], tstep.gamma[i_surf])
+        self.assertIsNone(history[-self.depth - 1])
+        self.assertEqual(len(history), self.n_steps + 1)
+
+        # a list is not recycled
+        steps = [self.aero_step(0)]
+        steps.append(copy_to_history(steps[0], steps))
+        self.assertIsNot(steps[1], steps[0])
+
+    def test_savedata(self):
+        import sharpy.presharpy.presharpy
+        import sharpy.aero.models.aerogrid as aerogrid
+        import sharpy.structure.models.beam as beam
+        from sharpy.postproc.savedata import SaveData
+
+        class Data(object):
+            pass
+
+        data = Data()
+        data.settings = {'SHARPy': {'case': 'history'}}
+        data.aero = aerogrid.Aerogrid.__new__(aerogrid.Aerogrid)
+        data.aero.timestep_info = TimeStepHistory(self.depth, self.spill_folder, name='aero')
+        data.structure = beam.Beam.__new__(beam.Beam)
+        data.structure.timestep_info = TimeStepHistory(self.depth, self.spill_folder, name='struct')
+
+        # online SaveData, as run by DynamicCoupled
+        postproc = SaveData()
+        for ts in range(self.n_steps):
+            data.ts = ts
+            data.aero.timestep_info.append(self.aero_step(ts))
+            data.structure.timestep_info.append(self.struct_step(ts))
+            if ts == 0:
+                postproc.initialise(data, {'folder': self.output_folder})
+            postproc.run(online=True)
+
+        with h5py.File(self.output_folder + 'history/history.data.h5', 'r') as hdfile:
+            aero_grp = hdfile['data/aero/timestep_info']
+            struct_grp = hdfile['data/structure/timestep_info']
+            for ts in range(self.n_steps):
+                np.testing.assert_array_equal(aero_grp['%05d' % ts]['gamma']['00001'][()],
+                                              data.aero.timestep_info[ts].gamma[1])
+                np.testing.assert_array_equal(aero_grp['%05d' % ts]['zeta']['00000'][()],
+                                              data.aero.timestep_info[ts].zeta[0])
+                np.testing.assert_array_equal(struct_grp['%05d' % ts]['pos'][()],
+                                              data.structure.timestep_info[ts].pos)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_folder, ignore_errors=True)
+
+
+class TestTimeStepInfoCopy(unittest.TestCase):
+    """
+    Tests the in place copy of time steps
+    """
+
+    def test_aero_copy_into(self):
+        tstep = AeroTimeStepInfo(np.array([[3, 4], [2, 5]]), np.array([[10, 4], [10, 5]]))
+        for i_surf in range(tstep.n_surf):
+            tstep.zeta[i_surf][:] = np.random.rand(*tstep.zeta[i_surf].shape)
+            tstep.gamma_star[i_surf][:] = np.random.rand(*tstep.gamma_star[i_surf].shape)
+        tstep.postproc_cell['incidence_angle'] = [np.ones((3, 4)), np.ones((2, 5))]
+
+        copied = tstep.copy()
+        gamma_star_arrays = copied.gamma_star
+        tstep.gamma_star[1][:] = 2.
+        tstep.copy_into(copied)
+
+        for i_surf in range(tstep.n_surf):
+            np.testing.assert_array_equal(copied.zeta[i_surf], tstep.zeta[i_surf])
+            np.testing.assert_array_equal(copied.gamma_star[i_surf], tstep.gamma_star[i_surf])
+            self.assertIs(copied.gamma_star[i_surf], gamma_star_arrays[i_surf])
+            self.assertIsNot(copied.zeta[i_surf], tstep.zeta[i_surf])
+        self.assertIsNot(copied.postproc_cell['incidence_angle'], tstep.postproc_cell['incidence_angle'])
+
+    def test_struct_copy_into(self):
+        tstep = StructTimeStepInfo(5, 2, 3, ct.c_int(24), 1)
+        tstep.pos[:] = np.random.rand(5, 3)
+        tstep.mb_dict = {'constraint_00': {'velocity': np.zeros((3,))}}
+
+        copied = tstep.copy()
+        pos = copied.pos
+        velocity = copied.mb_dict['constraint_00']['velocity']
+        tstep.pos[0, 0] = 10.
+        tstep.mb_dict['constraint_00']['velocity'][:] = 1.
+        tstep.copy_into(copied)
+
+        self.assertIs(copied.pos, pos)
+        self.assertTrue(copied.pos.flags['F_CONTIGUOUS'])
+        np.testing.assert_array_equal(copied.pos, tstep.pos)
+        self.assertIs(copied.mb_dict['constraint_00']['velocity'], velocity)
+        np.testing.assert_array_equal(velocity, np.ones((3,)))
+
+    def test_struct_get_body_into(self):
+        class Beam(object):
+            # two bodies of two elements, with the first node clamped
+            num_elem = 4
+            num_bodies = 2
+            connectivities = np.array([[0, 2, 1], [2, 4, 3], [5, 7, 6], [7, 9, 8]])
+            body_number = np.array([0, 0, 1, 1])
+            vdof = np.array([-1, 0, 1, 2, 3, 4, 5, 6, 7, 8])
+
+        beam = Beam()
+        tstep = StructTimeStepInfo(10, 4, 3, ct.c_int(54), 2)
+        for name in ['pos', 'pos_dot', 'psi', 'psi_dot', 'steady_applied_forces', 'gravity_forces', 'q', 'dqdt',
+                     'dqddt', 'mb_FoR_pos', 'mb_FoR_vel', 'mb_FoR_acc']:
+            getattr(tstep, name)[:] = np.random.rand(*getattr(tstep, name).shape)
+        tstep.mb_quat[1, :] = np.array([np.cos(0.1), 0., np.sin(0.1), 0.])
+
+        num_dof_ibody = ct.c_int(30)
+        body = tstep.get_body(beam, num_dof_ibody, 1)
+        np.testing.assert_array_equal(body.pos, tstep.pos[5:, :])
+        np.testing.assert_array_equal(body.q[:30], tstep.q[24:54])
+
+        # overwrite every variable of an existing time step of the body
+        target = tstep.get_body(beam, num_dof_ibody, 1)
+        pos = target.pos
+        for name, value in target.__dict__.items():
+            if isinstance(value, np.ndarray):
+                value[:] = np.random.rand(*value.shape)
+        target.postproc_cell['loads'] = np.ones((2, 6))
+        tstep.get_body_into(beam, num_dof_ibody, 1, target)
+
+        self.assertIs(target.pos, pos)
+        self.assertEqual(target.postproc_cell, dict())
+        for name, value in body.__dict__.items():
+            if isinstance(value, np.ndarray):
+                np.testing.assert_array_equal(getattr(target, name), value, err_msg=name)
+
+
+
+class TestAeroCtypesPointers(unittest.TestCase):
+    """
+    Tests the cached pointer tables passed to the UVLM library
+    """
+
+    def test_pointer_tables(self):
+        tstep = AeroTimeStepInfo(np.array([[3, 4], [2, 5]]), np.array([[10, 4], [10, 5]]))
+        tstep.generate_ctypes_pointers()
+        for i_plane, plane in enumerate(tstep.ct_zeta_list):
+            self.assertEqual(ct.addressof(tstep.ct_p_zeta[i_plane].contents), plane.ctypes.data)
+        zeta_table = tstep.ct_pointer_tables['zeta']
+        zeta_star_table = tstep.ct_pointer_tables['zeta_star']
+        tstep.remove_ctypes_pointers()
+
+        # the wake grows
+        tstep.zeta_star[1] = np.zeros((3, 12, 6))
+        tstep.generate_ctypes_pointers()
+        self.assertIs(tstep.ct_pointer_tables['zeta'], zeta_table)
+        self.assertIsNot(tstep.ct_pointer_tables['zeta_star'], zeta_star_table)
+        self.assertEqual(len(tstep.ct_p_zeta_star), 6)
+        self.assertEqual(ct.addressof(tstep.ct_p_zeta_star[5].contents), tstep.zeta_star[1][2, :, :].ctypes.data)
+        tstep.remove_ctypes_pointers()
+
+
+if __name__ == '__main__':
+    unittest.main()
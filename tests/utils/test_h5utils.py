@@ -0,0 +1,160 @@
+import unittest
+import os
+import shutil
+import numpy as np
+import h5py
+import sharpy.utils.h5utils as h5utils
+import sharpy.utils.cout_utils as cout
+
+
+class TestStreamWriter(unittest.TestCase):
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/stream/'
+
+    def setUp(self):
+        os.makedirs(self.output_folder, exist_ok=True)
+
+    def test_append(self):
+        filename = self.output_folder + 'stream.h5'
+        pos = [np.random.rand(5, 3) for _ in range(4)]
+        with h5py.File(filename, 'w') as hdfile:
+            writer = h5utils.StreamWriter(hdfile.require_group('stream'), compression='gzip')
+            for ts in range(len(pos)):
+                self.assertEqual(writer.append('ts', ts), ts)
+                writer.append('structure/pos', pos[ts])
+
+            with self.assertRaises(ValueError):
+                writer.append('structure/pos', np.zeros((5, 3, 1)))
+
+        with h5py.File(filename, 'r') as hdfile:
+            np.testing.assert_array_equal(hdfile['stream/ts'][()], np.arange(len(pos)))
+            np.testing.assert_array_equal(hdfile['stream/structure/pos'][()], np.array(pos))
+            # about 64 kB per chunk
+            self.assertEqual(hdfile['stream/structure/pos'].chunks, (2**16//(5*3*8), 5, 3))
+
+    def test_chunks(self):
+        filename = self.output_folder + 'stream_chunks.h5'
+        with h5py.File(filename, 'w') as hdfile:
+            writer = h5utils.StreamWriter(hdfile, compress_float=True, chunk_bytes=1024)
+            writer.append('small', np.zeros(4))
+            writer.append('large', np.zeros((100, 10)))
+
+            self.assertEqual(hdfile['small'].chunks, (1024//(4*4), 4))
+            # at least one time step per chunk
+            self.assertEqual(hdfile['large'].chunks, (1, 100, 10))
+
+    def test_append_varying_shape(self):
+        filename = self.output_folder + 'stream_shape.h5'
+        # a wake that grows by one row per time step up to a maximum, after which it is cut
+        gamma_star = [np.random.rand(min(ts, 3), 4) for ts in range(6)] + [np.random.rand(2, 4)]
+        with h5py.File(filename, 'w') as hdfile:
+            writer = h5utils.StreamWriter(hdfile)
+            for ts in range(len(gamma_star)):
+                self.assertEqual(writer.append('gamma_star', gamma_star[ts]), ts)
+            writer.append('gamma', np.ones((2, 4)))
+            writer.append('gamma', np.ones((2, 4)))
+
+        with h5py.File(filename, 'r') as hdfile:
+            self.assertEqual(hdfile['gamma_star'].shape, (len(gamma_star), 3, 4))
+            shapes = hdfile['gamma_star_shape'][()]
+            np.testing.assert_array_equal(shapes, [value.shape for value in gamma_star])
+            for ts in range(len(gamma_star)):
+                n_rows = shapes[ts, 0]
+                np.testing.assert_array_equal(hdfile['gamma_star'][ts, :n_rows, :], gamma_star[ts])
+                self.assertTrue(np.all(np.isnan(hdfile['gamma_star'][ts, n_rows:, :])))
+            # the shapes are only stored for variables whose shape changes
+            self.assertNotIn('gamma_shape', hdfile)
+
+    def test_extend(self):
+        filename = self.output_folder + 'stream_extend.h5'
+        y = np.random.rand(10, 4)
+        with h5py.File(filename, 'w') as hdfile:
+            writer = h5utils.StreamWriter(hdfile)
+            self.assertEqual(writer.extend('y', y[:6]), 0)
+            self.assertEqual(writer.append('y', y[6]), 6)
+            self.assertEqual(writer.extend('y', y[7:]), 7)
+
+        with h5py.File(filename, 'r') as hdfile:
+            np.testing.assert_array_equal(hdfile['y'][()], y)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_folder, ignore_errors=True)
+
+
+class TestSaveDataStream(unittest.TestCase):
+    """
+    Tests the online streaming of the time steps by ``SaveData``
+    """
+
+    route_test_dir = os.path.abspath(os.path.dirname(os.path.realpath(__file__)))
+    output_folder = route_test_dir + '/output/savedata/'
+
+    n_steps = 7
+    n_wake = 3
+
+    def setUp(self):
+        cout.cout_wrap.initialise(False, False)
+
+    def test_stream(self):
+        import ctypes as ct
+        import sharpy.presharpy.presharpy
+        import sharpy.aero.models.aerogrid as aerogrid
+        import sharpy.structure.models.beam as beam
+        from sharpy.utils.datastructures import AeroTimeStepInfo, StructTimeStepInfo
+        from sharpy.postproc.savedata import SaveData
+
+        class Data(object):
+            pass
+
+        data = Data()
+        data.settings = {'SHARPy': {'case': 'stream'}}
+        data.aero = aerogrid.Aerogrid.__new__(aerogrid.Aerogrid)
+        data.aero.timestep_info = []
+        data.structure = beam.Beam.__new__(beam.Beam)
+        data.structure.timestep_info = []
+
+        postproc = SaveData()
+        for ts in range(self.n_steps):
+            data.ts = ts
+            # the wake grows up to n_wake panels
+            n_wake = min(ts, self.n_wake)
+            aero_tstep = AeroTimeStepInfo(np.array([[2, 3], [2, 4]]), np.array([[n_wake, 3], [n_wake, 4]]))
+            for i_surf in range(aero_tstep.n_surf):
+                aero_tstep.gamma[i_surf][:] = np.random.rand(*aero_tstep.gamma[i_surf].shape)
+                aero_tstep.gamma_star[i_surf][:] = np.random.rand(*aero_tstep.gamma_star[i_surf].shape)
+            struct_tstep = StructTimeStepInfo(5, 2, 3, ct.c_int(24), 1)
+            struct_tstep.pos[:] = np.random.rand(5, 3)
+            data.aero.timestep_info.append(aero_tstep)
+            data.structure.timestep_info.append(struct_tstep)
+            if ts == 0:
+                postproc.initialise(data, {'folder': self.output_folder,
+                                           'stream': True,
+                                           'stream_flush_interval': 3,
+                                           'stream_aero_variables': ['gamma', 'gamma_star'],
+                                           'stream_struct_variables': ['pos']})
+            postproc.run(online=True)
+        self.assertIsNotNone(postproc.hdfile)
+        postproc.finalise()
+        self.assertIsNone(postproc.hdfile)
+
+        with h5py.File(self.output_folder + 'stream/stream.data.h5', 'r') as hdfile:
+            stream = hdfile['stream']
+            np.testing.assert_array_equal(stream['ts'][()], np.arange(self.n_steps))
+            np.testing.assert_array_equal(stream['structure/pos'][()],
+                                          [tstep.pos for tstep in data.structure.timestep_info])
+            for i_surf in range(2):
+                np.testing.assert_array_equal(stream['aero/gamma/surf%u' % i_surf][()],
+                                              [tstep.gamma[i_surf] for tstep in data.aero.timestep_info])
+                gamma_star = stream['aero/gamma_star/surf%u' % i_surf][()]
+                shapes = stream['aero/gamma_star/surf%u_shape' % i_surf][()]
+                for ts, tstep in enumerate(data.aero.timestep_info):
+                    np.testing.assert_array_equal(shapes[ts], tstep.gamma_star[i_surf].shape)
+                    np.testing.assert_array_equal(gamma_star[ts, :shapes[ts, 0], :], tstep.gamma_star[i_surf])
+
+    def tearDown(self):
+        shutil.rmtree(self.output_folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
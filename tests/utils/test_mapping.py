@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+
+import sharpy.utils.algebra as algebra
+import sharpy.aero.utils.mapping as mapping
+
+
+def loop_aero2struct_force_mapping(aero_forces, struct2aero_mapping, zeta, pos_def, psi_def, conn, cag,
+                                   aero_dict=None):
+    """
+    Per vertex mapping of the aerodynamic forces, as it was done before the introduction of
+    :class:`~sharpy.aero.utils.mapping.AeroStructForceMapping`
+    """
+    n_node, _ = pos_def.shape
+    n_elem, _, _ = psi_def.shape
+    struct_forces = np.zeros((n_node, 6))
+
+    force_efficiency = None
+    moment_efficiency = None
+    struct2aero_force_function = mapping.local_aero2struct_forces
+    if aero_dict is not None:
+        airfoil_efficiency = aero_dict['airfoil_efficiency']
+        force_efficiency = np.zeros((n_elem, 3, 2, 3))
+        force_efficiency[:, :, :, 1] = airfoil_efficiency[:, :, :, 0]
+        force_efficiency[:, :, :, 2] = airfoil_efficiency[:, :, :, 1]
+        moment_efficiency = np.zeros_like(force_efficiency)
+        moment_efficiency[:, :, :, 0] = airfoil_efficiency[:, :, :, 2]
+        struct2aero_force_function = mapping.efficiency_local_aero2struct_forces
+
+    nodes = []
+    for i_elem in range(n_elem):
+        for i_local_node in range(3):
+            i_global_node = conn[i_elem, i_local_node]
+            if i_global_node in nodes:
+                continue
+            nodes.append(i_global_node)
+
+            for node_mapping in struct2aero_mapping[i_global_node]:
+                i_surf = node_mapping['i_surf']
+                i_n = node_mapping['i_n']
+                _, n_m, _ = aero_forces[i_surf].shape
+
+                cbg = np.dot(algebra.crv2rotation(psi_def[i_elem, i_local_node, :]).T, cag)
+                for i_m in range(n_m):
+                    chi_g = zeta[i_surf][:, i_m, i_n] - np.dot(cag.T, pos_def[i_global_node, :])
+                    struct_forces[i_global_node, :] += struct2aero_force_function(aero_forces[i_surf][:, i_m, i_n],
+                                                                                  chi_g,
+                                                                                  cbg,
+                                                                                  force_efficiency,
+                                                                                  moment_efficiency,
+                                                                                  i_elem,
+                                                                                  i_local_node)
+    return struct_forces
+
+
+class TestAeroStructForceMapping(unittest.TestCase):
+    """
+    Tests the vectorised mapping of the aerodynamic forces against the original per vertex loop, on a wing of two
+    beams (and lifting surfaces with different chordwise discretisations) that share the root node.
+    """
+
+    def setUp(self):
+        np.random.seed(1)
+        # two beams of two 3-noded elements sharing node 0
+        self.conn = np.array([[0, 2, 1], [2, 4, 3], [0, 6, 5], [6, 8, 7]])
+        n_node = 9
+        n_elem = self.conn.shape[0]
+
+        surface_nodes = [[0, 1, 2, 3, 4], [0, 5, 6, 7, 8]]
+        chordwise_vertices = [4, 6]
+        self.struct2aero_mapping = [[] for _ in range(n_node)]
+        self.zeta = []
+        self.aero_forces = []
+        for i_surf, nodes in enumerate(surface_nodes):
+            for i_n, node in enumerate(nodes):
+                self.struct2aero_mapping[node].append({'i_surf': i_surf, 'i_n': i_n})
+            self.zeta.append(np.random.rand(3, chordwise_vertices[i_surf], len(nodes)))
+            self.aero_forces.append(np.random.rand(6, chordwise_vertices[i_surf], len(nodes)) - 0.5)
+
+        self.pos_def = np.random.rand(n_node, 3)
+        self.psi_def = 0.5*(np.random.rand(n_elem, 3, 3) - 0.5)
+        self.cag = algebra.crv2rotation(np.array([0.1, -0.2, 0.3]))
+
+    def test_map_forces(self):
+        reference = loop_aero2struct_force_mapping(self.aero_forces, self.struct2aero_mapping, self.zeta,
+                                                   self.pos_def, self.psi_def, self.conn, self.cag)
+        force_mapping = mapping.AeroStructForceMapping(self.struct2aero_mapping, self.conn)
+        struct_forces = force_mapping.map_forces(self.aero_forces, self.zeta, self.pos_def, self.psi_def, self.cag)
+        np.testing.assert_allclose(struct_forces, reference, rtol=1e-12, atol=1e-12)
+
+        # the shared root node collects the forces of both surfaces
+        self.assertTrue(np.all(struct_forces[0, :] != 0.))
+
+        # the function keeps its signature and results
+        struct_forces = mapping.aero2struct_force_mapping(self.aero_forces, self.struct2aero_mapping, self.zeta,
+                                                          self.pos_def, self.psi_def, None, self.conn, self.cag)
+        np.testing.assert_allclose(struct_forces, reference, rtol=1e-12, atol=1e-12)
+
+    def test_map_forces_efficiency(self):
+        aero_dict = {'airfoil_efficiency': np.random.rand(self.conn.shape[0], 3, 2, 3)}
+        reference = loop_aero2struct_force_mapping(self.aero_forces, self.struct2aero_mapping, self.zeta,
+                                                   self.pos_def, self.psi_def, self.conn, self.cag, aero_dict)
+        force_mapping = mapping.AeroStructForceMapping(self.struct2aero_mapping, self.conn)
+        struct_forces = force_mapping.map_forces(self.aero_forces, self.zeta, self.pos_def, self.psi_def, self.cag,
+                                                 aero_dict)
+        np.testing.assert_allclose(struct_forces, reference, rtol=1e-12, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()